@@ -39,12 +39,39 @@ __version_assign()
 del __version_assign
 
 
-import kolena.errors
-import kolena.fr
-import kolena.detection
-import kolena.classification
+import importlib
+from typing import Any
+from typing import List
+from typing import TYPE_CHECKING
+
+# the client's initialization entrypoint is kept lightweight and imported eagerly, such that `kolena.initialize` always
+# refers to the function rather than to the module of the same name
 from .initialize import initialize
 
+# submodules are imported on first access (PEP 562), such that e.g. `import kolena.workflow` does not pay for the
+# imports of `kolena.fr` and `kolena.detection`
+_LAZY_SUBMODULES = {"errors", "fr", "detection", "classification", "workflow", "aio", "tracing"}
+
+if TYPE_CHECKING:
+    import kolena.errors
+    import kolena.fr
+    import kolena.detection
+    import kolena.classification
+    import kolena.workflow
+    import kolena.aio
+    import kolena.tracing
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals().keys(), *_LAZY_SUBMODULES})
+
+
 __all__ = [
     "initialize",
     "errors",
@@ -52,4 +79,6 @@ __all__ = [
     "detection",
     "classification",
     "workflow",
+    "aio",
+    "tracing",
 ]
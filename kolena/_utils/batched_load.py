@@ -11,14 +11,25 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import contextvars
 import dataclasses
 import io
 import json
 import math
+import queue
 import tempfile
+import threading
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from types import TracebackType
+from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import Generic
+from typing import Hashable
 from typing import Iterable
 from typing import Iterator
+from typing import List
 from typing import Optional
 from typing import Type
 from typing import TypeVar
@@ -33,16 +44,24 @@ from kolena._api.v1.batched_load import BatchedLoad as API
 from kolena._utils import krequests
 from kolena._utils import krequests_v2
 from kolena._utils import log
+from kolena._utils.cache import get_content_cache
+from kolena._utils.concurrency import iter_ordered
+from kolena._utils.consts import UPLOAD_CHUNK_BYTES
+from kolena._utils.consts import UPLOAD_CONCURRENCY
 from kolena._utils.datatypes import LoadableDataFrame
 from kolena._utils.serde import from_dict
 from kolena._utils.state import API_V1
 from kolena._utils.state import DEFAULT_API_VERSION
+from kolena._utils.tracing import count
+from kolena._utils.tracing import span
+from kolena._utils.tracing import traced
 
 VALIDATION_COUNT_LIMIT = 100
 STAGE_STATUS__LOADED = "LOADED"
 
 
 def init_upload() -> API.InitiateUploadResponse:
+    count("requests")
     init_res = krequests.put(endpoint_path=API.Path.INIT_UPLOAD.value)
     krequests.raise_for_status(init_res)
     init_response = from_dict(data_class=API.InitiateUploadResponse, data=init_res.json())
@@ -55,27 +74,233 @@ def upload_data_frame(df: pd.DataFrame, batch_size: int, load_uuid: str) -> None
 
     # only display progress bar if there are multiple chunks to upload
     chunk_iter_logged = log.progress_bar(chunk_iter) if num_chunks > 1 else chunk_iter
-    for df_chunk in chunk_iter_logged:
-        upload_data_frame_chunk(df_chunk, load_uuid)
+    with span("upload_data_frame", rows=len(df)):
+        for df_chunk in chunk_iter_logged:
+            upload_data_frame_chunk(df_chunk, load_uuid)
 
 
-@retry(stop_max_attempt_number=3)
+def _to_parquet_buffer(df: pd.DataFrame) -> io.BytesIO:
+    with span("encode_parquet", rows=len(df)):
+        buffer = io.BytesIO()
+        df.to_parquet(buffer)
+        count("bytes", buffer.tell())
+        buffer.seek(0)
+        return buffer
+
+
+def _count_retry(attempt_number: int, delay_since_first_attempt_ms: int) -> int:
+    count("retries")
+    return 0  # retry immediately
+
+
+@retry(stop_max_attempt_number=3, wait_func=_count_retry)
 def upload_data_frame_chunk(df_chunk: pd.DataFrame, load_uuid: str) -> None:
-    # We use a file-like object here so that requests chunks the file upload
-    # For reasons not entirely clear, this upload can fail with a broken connection if it is not chunked.
-    df_chunk_buffer = io.BytesIO()
-    df_chunk.to_parquet(df_chunk_buffer)
-    df_chunk_buffer.seek(0)
-    signed_url_response = krequests.get(endpoint_path=API.Path.upload_signed_url(load_uuid))
-    krequests.raise_for_status(signed_url_response)
-    signed_url = from_dict(data_class=API.SignedURL, data=signed_url_response.json())
-    upload_response = requests.put(
-        url=signed_url.signed_url,
-        data=df_chunk_buffer,
-        headers={"Content-Type": "application/octet-stream"},
-        **krequests.get_connection_args(),
-    )
-    krequests.raise_for_status(upload_response)
+    with span("upload_chunk", rows=len(df_chunk)):
+        count("rows", len(df_chunk))
+        # We use a file-like object here so that requests chunks the file upload
+        # For reasons not entirely clear, this upload can fail with a broken connection if it is not chunked.
+        df_chunk_buffer = _to_parquet_buffer(df_chunk)
+        count("requests", 2)
+        signed_url_response = krequests.get(endpoint_path=API.Path.upload_signed_url(load_uuid))
+        krequests.raise_for_status(signed_url_response)
+        signed_url = from_dict(data_class=API.SignedURL, data=signed_url_response.json())
+        upload_response = requests.put(
+            url=signed_url.signed_url,
+            data=df_chunk_buffer,
+            headers={"Content-Type": "application/octet-stream"},
+            **krequests.get_connection_args(),
+        )
+        krequests.raise_for_status(upload_response)
+
+
+class BackgroundUploader:
+    """
+    Uploads data frame chunks to a single batched-load upload from a background thread, such that the producer of the
+    chunks can continue working while previous chunks are in flight.
+
+    The upload is initialized lazily on the first submitted chunk, after which ``uuid`` is populated. At most
+    ``max_pending`` chunks are buffered at once, beyond which ``submit`` blocks. Any failure in the background thread
+    is raised on the next call to ``submit`` or on ``close``.
+    """
+
+    uuid: Optional[str]
+    n_chunks: int
+
+    def __init__(self, max_pending: int = 2) -> None:
+        self.uuid = None
+        self.n_chunks = 0
+        self._queue: "queue.Queue[Optional[pd.DataFrame]]" = queue.Queue(maxsize=max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._aborted = False
+
+    def submit(self, df_chunk: pd.DataFrame) -> None:
+        self._raise_for_error()
+        if self._thread is None:
+            self.uuid = init_upload().uuid
+            context = contextvars.copy_context()  # propagate client state, e.g. from kolena_session
+            self._thread = threading.Thread(target=context.run, args=(self._run,), name="kolena-uploader", daemon=True)
+            self._thread.start()
+        self._queue.put(df_chunk)
+        self.n_chunks += 1
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._raise_for_error()
+
+    def _run(self) -> None:
+        while True:
+            df_chunk = self._queue.get()
+            if df_chunk is None:
+                return
+            if self._error is not None or self._aborted:
+                continue  # drain remaining chunks without uploading
+            try:
+                upload_data_frame_chunk(df_chunk, self.uuid)
+            except BaseException as e:
+                self._error = e
+
+    def _raise_for_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "BackgroundUploader":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        self._aborted = True  # do not mask the original exception with any upload failure
+        try:
+            self.close()
+        except BaseException:
+            ...
+
+
+class UploadSession:
+    """
+    Batches the uploads of an operation producing many data frames, e.g. the evaluation of a test run, onto a shared
+    pool of ``max_workers`` threads.
+
+    Data frames added under the same ``key`` are accumulated into parts of approximately ``part_bytes`` in memory, each
+    uploaded concurrently to the batched-load upload for that key. Calling ``commit`` for a key schedules the provided
+    commit function, invoked with the upload's UUID, once all of that key's parts have been uploaded. ``wait`` blocks
+    until all scheduled work has completed, raising the first failure, if any.
+
+    At most ``2 * max_workers`` parts are pending at once, beyond which ``add`` blocks.
+    """
+
+    def __init__(self, max_workers: int = UPLOAD_CONCURRENCY, part_bytes: int = UPLOAD_CHUNK_BYTES) -> None:
+        if max_workers <= 0:
+            raise ValueError(f"invalid max_workers '{max_workers}': expected positive integer")
+        self._part_bytes = part_bytes
+        self._upload_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kolena-upload")
+        self._commit_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kolena-commit")
+        self._pending_parts = threading.BoundedSemaphore(2 * max_workers)
+        self._buffers: Dict[Hashable, List[pd.DataFrame]] = {}
+        self._buffer_bytes: Dict[Hashable, int] = {}
+        self._uuids: Dict[Hashable, Future] = {}
+        self._parts: Dict[Hashable, List[Future]] = {}
+        self._futures: List[Future] = []
+
+    def add(self, key: Hashable, df: pd.DataFrame) -> None:
+        self._raise_for_error()
+        self._buffers.setdefault(key, []).append(df)
+        self._buffer_bytes[key] = self._buffer_bytes.get(key, 0) + int(df.memory_usage(deep=True).sum())
+        if self._buffer_bytes[key] >= self._part_bytes:
+            self._flush(key)
+
+    def commit(self, key: Hashable, commit_fn: Callable[[str], None]) -> None:
+        """Schedule ``commit_fn`` for the upload of ``key``. No-op when no data has been added under ``key``."""
+        self._raise_for_error()
+        self._flush(key)
+        if key not in self._uuids:
+            return
+        uuid_future = self._uuids.pop(key)
+        parts = self._parts.pop(key)
+
+        def run_commit() -> None:
+            for part in parts:
+                part.result()
+            commit_fn(uuid_future.result().uuid)
+
+        self._submit(self._commit_executor, run_commit)
+
+    def wait(self) -> None:
+        """Wait for all scheduled uploads and commits to complete."""
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        try:
+            self.wait()
+        finally:
+            self._upload_executor.shutdown(wait=True)
+            self._commit_executor.shutdown(wait=True)
+
+    def _flush(self, key: Hashable) -> None:
+        dfs = self._buffers.pop(key, [])
+        self._buffer_bytes.pop(key, None)
+        if len(dfs) == 0:
+            return
+
+        if key not in self._uuids:
+            # submitted before any of its parts, such that the executor's FIFO queue starts it before they wait on it
+            self._uuids[key] = self._submit(self._upload_executor, init_upload)
+            self._parts[key] = []
+        uuid_future = self._uuids[key]
+        df_part = pd.concat(dfs, ignore_index=True) if len(dfs) > 1 else dfs[0]
+
+        def upload_part() -> None:
+            try:
+                upload_data_frame_chunk(df_part, uuid_future.result().uuid)
+            finally:
+                self._pending_parts.release()
+
+        self._pending_parts.acquire()
+        self._parts[key].append(self._submit(self._upload_executor, upload_part))
+
+    def _submit(self, executor: ThreadPoolExecutor, fn: Callable[[], Any]) -> Future:
+        # propagate client state, e.g. from kolena_session, into worker threads
+        future = executor.submit(contextvars.copy_context().run, fn)
+        self._futures.append(future)
+        return future
+
+    def _raise_for_error(self) -> None:
+        done = [future for future in self._futures if future.done()]
+        for future in done:
+            future.result()
+        if len(done) > 0:
+            self._futures = [future for future in self._futures if not future.done()]
+
+    def __enter__(self) -> "UploadSession":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        for future in self._futures:
+            future.cancel()
+        try:
+            self.close()
+        except BaseException:
+            ...  # do not mask the original exception with any upload failure
 
 
 DFType = TypeVar("DFType", bound=LoadableDataFrame)
@@ -84,23 +309,43 @@ DFType = TypeVar("DFType", bound=LoadableDataFrame)
 class _BatchedLoader(Generic[DFType]):
     @staticmethod
     def load_path(path: str, df_class: Optional[Type[DFType]]) -> Union[DFType, pd.DataFrame]:
+        df = _BatchedLoader._download_path(path)
+        return _BatchedLoader._from_serializable(df, df_class)
+
+    @staticmethod
+    def _from_serializable(df: pd.DataFrame, df_class: Optional[Type[DFType]]) -> Union[DFType, pd.DataFrame]:
+        if df_class is None:
+            return df
+        with span("deserialize", rows=len(df)):
+            return df_class.from_serializable(df)
+
+    @staticmethod
+    @traced("download")
+    def _download_path(path: str) -> pd.DataFrame:
+        count("requests")
+        with krequests.get(
+            endpoint_path=API.Path.download_by_path(path),
+            allow_redirects=True,
+            stream=True,
+        ) as download_response:
+            krequests.raise_for_status(download_response)
+            return _BatchedLoader._read_download(download_response)
+
+    @staticmethod
+    def _read_download(download_response: requests.Response) -> pd.DataFrame:
         with tempfile.TemporaryFile() as tmp:
-            with krequests.get(
-                endpoint_path=API.Path.download_by_path(path),
-                allow_redirects=True,
-                stream=True,
-            ) as download_response:
-                krequests.raise_for_status(download_response)
-                for chunk in download_response.iter_content(chunk_size=8 * 1024**2):
-                    tmp.write(chunk)
+            for chunk in download_response.iter_content(chunk_size=8 * 1024**2):
+                tmp.write(chunk)
+                count("bytes", len(chunk))
             tmp.seek(0)
-            df = pd.read_parquet(tmp)
+            with span("decode_parquet"):
+                df = pd.read_parquet(tmp)
+                count("rows", len(df))
 
         # common postprocessing
         column_mapping = {col_name: col_name.lower() for col_name in df.columns}
         df.rename(columns=column_mapping, inplace=True)
-
-        return df_class.from_serializable(df) if df_class else df
+        return df
 
     @staticmethod
     def concat(dfs: Iterable[pd.DataFrame], df_class: Type[DFType]) -> DFType:
@@ -116,6 +361,7 @@ class _BatchedLoader(Generic[DFType]):
         if uuid is None:
             return
         kreq = krequests if api_version == "v1" else krequests_v2
+        count("requests")
         complete_request = API.CompleteDownloadRequest(uuid=uuid)
         complete_res = kreq.put(
             endpoint_path=API.Path.COMPLETE_DOWNLOAD.value,
@@ -129,8 +375,40 @@ class _BatchedLoader(Generic[DFType]):
         endpoint_path: str,
         df_class: Optional[Type[DFType]],
         endpoint_api_version: int = DEFAULT_API_VERSION,
+        cache_key: Optional[str] = None,
+        prefetch: int = 0,
     ) -> Iterator[DFType]:
+        """
+        Load the data frames produced by the provided download request.
+
+        When ``cache_key`` is provided, the request is assumed to download immutable contents, e.g. those of a specific
+        test case version, and the downloaded data frames are stored in and served from the local content cache, when
+        configured. See [`get_content_cache`][kolena._utils.cache.get_content_cache].
+
+        Up to ``prefetch`` batches beyond the batch currently being consumed are downloaded in the background.
+        """
+        cache = get_content_cache() if cache_key is not None else None
+        if cache is None:
+            dfs = _BatchedLoader._iter_download(init_request, endpoint_path, endpoint_api_version, prefetch)
+        else:
+            dfs = cache.iter_data(
+                cache_key,
+                lambda: _BatchedLoader._iter_download(init_request, endpoint_path, endpoint_api_version, prefetch),
+            )
+        for df in dfs:
+            yield _BatchedLoader._from_serializable(df, df_class)
+
+    @staticmethod
+    def _iter_download(
+        init_request: API.BaseInitDownloadRequest,
+        endpoint_path: str,
+        endpoint_api_version: int = DEFAULT_API_VERSION,
+        prefetch: int = 0,
+    ) -> Iterator[pd.DataFrame]:
+        if prefetch < 0:
+            raise ValueError(f"invalid prefetch '{prefetch}': expected non-negative integer")
         kreq = krequests if endpoint_api_version == API_V1 else krequests_v2
+        count("requests")
         with kreq.put(
             endpoint_path=endpoint_path,
             data=json.dumps(dataclasses.asdict(init_request)),
@@ -138,13 +416,21 @@ class _BatchedLoader(Generic[DFType]):
         ) as init_res:
             krequests.raise_for_status(init_res)
             load_uuid = None
-            try:
+
+            def iter_paths() -> Iterator[str]:
+                nonlocal load_uuid
                 for line in init_res.iter_lines():
                     partial_response = from_dict(
                         data_class=API.InitDownloadPartialResponse,
                         data=json.loads(line),
                     )
                     load_uuid = partial_response.uuid
-                    yield _BatchedLoader.load_path(partial_response.path, df_class)
+                    yield partial_response.path
+
+            dfs = iter_ordered(_BatchedLoader._download_path, iter_paths(), max_workers=prefetch + 1)
+            try:
+                for _, df in dfs:
+                    yield df
             finally:
+                dfs.close()  # cancel any prefetched batches before completing the load
                 _BatchedLoader.complete_load(load_uuid)
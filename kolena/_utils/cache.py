@@ -0,0 +1,197 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import contextlib
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Callable
+from typing import Generator
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import pandas as pd
+
+from kolena._utils.consts import KOLENA_CACHE_DIR_ENV
+from kolena._utils.consts import KOLENA_CACHE_MAX_BYTES_ENV
+from kolena._utils.state import get_client_state
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover -- not available on Windows, where entries rely on atomic renames alone
+    fcntl = None  # type: ignore
+
+DEFAULT_CACHE_MAX_BYTES = 10 * 1024**3
+_MANIFEST = "manifest.json"
+
+
+@contextlib.contextmanager
+def _file_lock(path: str, exclusive: bool, blocking: bool = True) -> Iterator[bool]:
+    """Advisory inter-process lock on ``path``, yielding whether the lock was acquired."""
+    if fcntl is None:
+        yield True
+        return
+
+    fd = os.open(path, os.O_CREAT | os.O_RDWR, 0o644)
+    try:
+        flags = (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | (0 if blocking else fcntl.LOCK_NB)
+        try:
+            fcntl.flock(fd, flags)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+class ContentCache:
+    """
+    On-disk cache for the contents of immutable entities, e.g. a specific version of a test case, stored as the parquet
+    batches downloaded from the server.
+
+    Each entry is written to a temporary directory and atomically moved into place once complete, such that readers
+    never observe partial entries. Per-entry lockfiles are only held briefly, while checking or publishing an entry and
+    while reading each of its parts, such that no lock is held while the caller consumes data. Once the total size of
+    the cache exceeds ``max_bytes``, least recently used entries are evicted, skipping any entry being read.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries_dir = os.path.join(directory, "entries")
+        self._locks_dir = os.path.join(directory, "locks")
+        os.makedirs(self._entries_dir, exist_ok=True)
+        os.makedirs(self._locks_dir, exist_ok=True)
+
+    def iter_data(self, key: str, load: Callable[[], Iterator[pd.DataFrame]]) -> Iterator[pd.DataFrame]:
+        """
+        Iterate over the data frames cached under ``key``, populating the entry from ``load`` on miss.
+        """
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        entry_dir = os.path.join(self._entries_dir, digest)
+        lock_path = os.path.join(self._locks_dir, f"{digest}.lock")
+
+        n_rows = yield from self._iter_entry(entry_dir, lock_path)
+        if n_rows is None:
+            return
+
+        # miss, or the entry was evicted while being read: resume from the rows that have already been yielded
+        yield from self._populate(key, entry_dir, lock_path, load, skip_rows=n_rows)
+        self._evict()
+
+    @staticmethod
+    def _read_manifest(entry_dir: str) -> Optional[List[str]]:
+        try:
+            with open(os.path.join(entry_dir, _MANIFEST)) as f:
+                return json.load(f)["parts"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @staticmethod
+    def _iter_entry(entry_dir: str, lock_path: str) -> Generator[pd.DataFrame, None, Optional[int]]:
+        """
+        Yield the parts of a cached entry, returning ``None`` once the complete entry has been read, or otherwise the
+        number of rows read before the entry was found to be missing.
+        """
+        with _file_lock(lock_path, exclusive=False):
+            parts = ContentCache._read_manifest(entry_dir)
+            if parts is None:
+                return 0
+            os.utime(entry_dir)  # record access for LRU eviction
+
+        n_rows = 0
+        for part in parts:
+            # only hold the lock while reading each part, such that it is never held while the caller consumes data
+            with _file_lock(lock_path, exclusive=False):
+                try:
+                    df = pd.read_parquet(os.path.join(entry_dir, part))
+                except OSError:
+                    return n_rows  # concurrently evicted
+            n_rows += len(df)
+            yield df
+        return None
+
+    def _populate(
+        self,
+        key: str,
+        entry_dir: str,
+        lock_path: str,
+        load: Callable[[], Iterator[pd.DataFrame]],
+        skip_rows: int = 0,
+    ) -> Iterator[pd.DataFrame]:
+        tmp_dir = tempfile.mkdtemp(dir=self._entries_dir, prefix=".tmp-")
+        try:
+            parts = []
+            for i, df in enumerate(load()):
+                part = f"part-{i:06d}.parquet"
+                df.to_parquet(os.path.join(tmp_dir, part))
+                parts.append(part)
+                if skip_rows < len(df):
+                    yield df.iloc[skip_rows:] if skip_rows > 0 else df
+                skip_rows = max(skip_rows - len(df), 0)
+
+            with open(os.path.join(tmp_dir, _MANIFEST), "w") as f:
+                json.dump(dict(key=key, parts=parts), f)
+            with _file_lock(lock_path, exclusive=True):
+                if self._read_manifest(entry_dir) is None:  # may have been populated by another process meanwhile
+                    shutil.rmtree(entry_dir, ignore_errors=True)  # remove any corrupt entry left behind
+                    os.replace(tmp_dir, entry_dir)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)  # only present when loading fails or is abandoned
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        for entry_dir in glob.glob(os.path.join(self._entries_dir, "*")):  # excludes in-progress '.tmp-' entries
+            try:
+                size = sum(os.path.getsize(path) for path in glob.glob(os.path.join(entry_dir, "*")))
+                entries.append((os.path.getmtime(entry_dir), size, entry_dir))
+            except OSError:
+                ...  # concurrently evicted
+        return entries
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, entry_dir in entries:
+            if total_bytes <= self.max_bytes:
+                return
+            lock_path = os.path.join(self._locks_dir, f"{os.path.basename(entry_dir)}.lock")
+            with _file_lock(lock_path, exclusive=True, blocking=False) as locked:
+                if not locked:
+                    continue  # in use
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                total_bytes -= size
+
+
+def get_content_cache() -> Optional[ContentCache]:
+    """
+    Return the content cache configured via the ``KOLENA_CACHE_DIR`` environment variable, if any, with its maximum
+    size optionally configured in bytes via ``KOLENA_CACHE_MAX_BYTES``. Entries are namespaced by API URL and tenant.
+    """
+    directory = os.environ.get(KOLENA_CACHE_DIR_ENV)
+    if not directory:
+        return None
+
+    max_bytes = int(os.environ.get(KOLENA_CACHE_MAX_BYTES_ENV) or DEFAULT_CACHE_MAX_BYTES)
+    client_state = get_client_state()
+    namespace = hashlib.sha256(f"{client_state.base_url}|{client_state.tenant}".encode("utf-8")).hexdigest()[:16]
+    return ContentCache(os.path.join(directory, namespace), max_bytes=max_bytes)
@@ -0,0 +1,104 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import contextvars
+import inspect
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any
+from typing import Callable
+from typing import Deque
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Tuple
+from typing import TypeVar
+
+T = TypeVar("T")
+U = TypeVar("U")
+
+
+def chunked(items: Iterable[T], chunk_size: int) -> Iterator[List[T]]:
+    """Lazily group the provided items into lists of at most ``chunk_size`` elements."""
+    if chunk_size <= 0:
+        raise ValueError(f"invalid chunk_size '{chunk_size}': expected positive integer")
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if len(chunk) == 0:
+            return
+        yield chunk
+
+
+@contextmanager
+def _event_loop_thread() -> Iterator[asyncio.AbstractEventLoop]:
+    loop = asyncio.new_event_loop()
+    # tasks inherit the context of the loop thread, so propagate client state, e.g. from kolena_session
+    context = contextvars.copy_context()
+    thread = threading.Thread(target=context.run, args=(loop.run_forever,), name="kolena-event-loop", daemon=True)
+    thread.start()
+    try:
+        yield loop
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def iter_ordered(fn: Callable[[T], Any], items: Iterable[T], max_workers: int = 1) -> Iterator[Tuple[T, U]]:
+    """
+    Apply ``fn`` to each of the provided items, keeping at most ``max_workers`` calls in flight at once, and yield each
+    item paired with its result in the order of the input items.
+
+    Plain functions are run in a thread pool. Coroutine functions are run on a dedicated event loop. Items are consumed
+    lazily, such that only the items currently in flight are held in memory.
+    """
+    if max_workers <= 0:
+        raise ValueError(f"invalid max_workers '{max_workers}': expected positive integer")
+
+    is_coroutine = inspect.iscoroutinefunction(fn)
+    if max_workers == 1 and not is_coroutine:
+        for item in items:
+            yield item, fn(item)
+        return
+
+    with _submitter(fn, max_workers, is_coroutine) as submit:
+        in_flight: Deque[Tuple[T, Future]] = deque()
+        try:
+            for item in items:
+                in_flight.append((item, submit(item)))
+                if len(in_flight) >= max_workers:
+                    head, future = in_flight.popleft()
+                    yield head, future.result()
+            while len(in_flight) > 0:
+                head, future = in_flight.popleft()
+                yield head, future.result()
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+
+@contextmanager
+def _submitter(fn: Callable[[T], Any], max_workers: int, is_coroutine: bool) -> Iterator[Callable[[T], Future]]:
+    if is_coroutine:
+        with _event_loop_thread() as loop:
+            yield lambda item: asyncio.run_coroutine_threadsafe(fn(item), loop)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # propagate client state, e.g. from kolena_session, into worker threads
+            yield lambda item: executor.submit(contextvars.copy_context().run, fn, item)
@@ -14,6 +14,18 @@
 from enum import Enum
 
 KOLENA_TOKEN_ENV = "KOLENA_TOKEN"
+KOLENA_TOKEN_CACHE_DIR_ENV = "KOLENA_TOKEN_CACHE_DIR"
+KOLENA_CACHE_DIR_ENV = "KOLENA_CACHE_DIR"
+KOLENA_CACHE_MAX_BYTES_ENV = "KOLENA_CACHE_MAX_BYTES"
+KOLENA_METADATA_CACHE_TTL_ENV = "KOLENA_METADATA_CACHE_TTL"
+KOLENA_METADATA_CACHE_DIR_ENV = "KOLENA_METADATA_CACHE_DIR"
+KOLENA_PROFILE_DIR_ENV = "KOLENA_PROFILE_DIR"
+
+# approximate upper bound on the serialized size of a single streamed upload chunk
+UPLOAD_CHUNK_BYTES = 64 * 1024**2
+
+# number of upload and commit requests kept in flight at once by an upload session
+UPLOAD_CONCURRENCY = 8
 
 
 class BatchSize(int, Enum):
@@ -21,10 +33,15 @@ class BatchSize(int, Enum):
     UPLOAD_RECORDS = 10_000_000
     UPLOAD_RESULTS = 1_000_000
     UPLOAD_EMBEDDINGS = 1_000_000
+    UPLOAD_INFERENCES = 100_000
+    JOURNAL_SEGMENT = 1_000
 
     LOAD_RECORDS = UPLOAD_RECORDS
     LOAD_SAMPLES = 1_000_000
 
+    EVALUATION_CHUNK = 10_000
+    INFER = 32
+
 
 class FieldName(str, Enum):
     TEST_CASE_NAME = "Test Case name"
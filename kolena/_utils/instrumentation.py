@@ -11,23 +11,43 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import atexit
+import contextvars
 import dataclasses
 import datetime
 import functools
 import inspect
 import json
+import os
+import threading
+import time
 import traceback as tb
 from abc import ABCMeta
+from collections import deque
 from enum import Enum
 from typing import Any
 from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import requests
+from requests_toolbelt.adapters import socket_options
 
 import kolena
 from kolena._api.v1.client_log import ClientLog as API
 from kolena._api.v1.core import TestRun as CoreAPI
 from kolena._api.v1.event import EventAPI
 from kolena._utils import krequests
+from kolena._utils.endpoints import get_endpoint
 from kolena._utils.state import _client_state
+from kolena._utils.state import DEFAULT_API_VERSION
+from kolena._utils.state import get_client_state
+
+# seconds to wait at interpreter exit for queued events to be delivered
+EVENT_FLUSH_TIMEOUT = 5.0
 
 
 class DatadogLogLevels(str, Enum):
@@ -48,6 +68,100 @@ def telemetry(func: Callable) -> Callable:
     return wrapper
 
 
+class EventQueue:
+    """
+    Bounded queue of telemetry payloads delivered on a background thread, such that recording events and logs never
+    blocks the caller on a network request.
+
+    Queued payloads are delivered in batches of up to ``batch_size`` over a shared connection. Once ``max_size``
+    payloads are pending, further payloads are dropped. Payloads are sent with the client state, e.g. the token of a
+    ``kolena_session``, that was active when they were queued. Delivery is best-effort: failures are ignored.
+    """
+
+    def __init__(self, max_size: int = 1_000, batch_size: int = 100) -> None:
+        if max_size <= 0 or batch_size <= 0:
+            raise ValueError(f"invalid max_size '{max_size}' or batch_size '{batch_size}': expected positive integers")
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.n_dropped = 0
+        self._pending: Deque[Tuple[contextvars.Context, str, str, Optional[Dict[str, Any]]]] = deque()
+        self._n_in_flight = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = os.getpid()
+
+    def put(self, endpoint_path: str, payload: Optional[Dict[str, Any]], method: str = "post") -> bool:
+        """Queue ``payload`` to be sent to ``endpoint_path``, returning ``False`` if it was dropped."""
+        with self._condition:
+            if self._pid != os.getpid():  # forked: the worker thread does not exist in this process
+                self._pending.clear()
+                self._n_in_flight = 0
+                self._thread = None
+                self._pid = os.getpid()
+            if len(self._pending) >= self.max_size:
+                self.n_dropped += 1
+                return False
+            self._pending.append((contextvars.copy_context(), method, endpoint_path, payload))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="kolena-events", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+            return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for all queued payloads to be delivered, returning ``False`` if ``timeout`` elapsed first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while len(self._pending) > 0 or self._n_in_flight > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def _next_batch(self) -> List[Tuple[contextvars.Context, str, str, Optional[Dict[str, Any]]]]:
+        with self._condition:
+            while len(self._pending) == 0:
+                self._condition.wait()
+            batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+            self._n_in_flight = len(batch)
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            try:
+                with requests.Session() as session:
+                    session.mount("https://", socket_options.TCPKeepAliveAdapter(max_retries=krequests.MAX_RETRIES))
+                    for context, method, endpoint_path, payload in batch:
+                        context.run(_send_event, session, method, endpoint_path, payload)
+            finally:
+                with self._condition:
+                    self._n_in_flight = 0
+                    self._condition.notify_all()
+
+
+def _send_event(session: requests.Session, method: str, endpoint_path: str, payload: Optional[Dict[str, Any]]) -> None:
+    try:
+        get_client_state().assert_initialized()
+        url = get_endpoint(endpoint_path=endpoint_path, api_version=DEFAULT_API_VERSION)
+        getattr(session, method)(url=url, json=payload, **krequests._with_default_kwargs())
+    except Exception:
+        """
+        Delivering telemetry is best-effort. Failures are dropped rather than surfaced from the background thread.
+        """
+        ...
+
+
+_event_queue = EventQueue()
+
+
+@atexit.register
+def flush_events(timeout: Optional[float] = EVENT_FLUSH_TIMEOUT) -> bool:
+    """Wait for queued telemetry events and logs to be delivered. Called automatically at interpreter exit."""
+    return _event_queue.flush(timeout)
+
+
 def upload_log(message: str, status: str) -> None:
     request = API.UploadLogRequest(
         client_version=kolena.__version__,
@@ -55,7 +169,7 @@ def upload_log(message: str, status: str) -> None:
         message=message,
         status=status,
     )
-    krequests.post(endpoint_path=API.Path.UPLOAD.value, json=dataclasses.asdict(request))
+    _event_queue.put(API.Path.UPLOAD.value, dataclasses.asdict(request))
 
 
 def log_telemetry(e: BaseException) -> None:
@@ -92,7 +206,8 @@ def report_crash(id: int, endpoint_path: str):
 
 def set_profile():
     try:
-        krequests.put(endpoint_path=EventAPI.Path.PROFILE)
+        # deferred to the event queue, which delivers it ahead of any subsequently recorded events
+        _event_queue.put(EventAPI.Path.PROFILE.value, None, method="put")
     except Exception:
         """
         Attempting to set up event profile is best-effort. We don't want to have exceptions in that
@@ -103,7 +218,7 @@ def set_profile():
 
 def record_event(request: EventAPI.RecordEventRequest):
     try:
-        krequests.post(endpoint_path=EventAPI.Path.EVENT, json=dataclasses.asdict(request))
+        _event_queue.put(EventAPI.Path.EVENT.value, dataclasses.asdict(request))
     except Exception:
         """
         Attempting to record event is best-effort. We don't want to have exceptions in that
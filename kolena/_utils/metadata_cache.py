@@ -0,0 +1,179 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import dataclasses
+import glob
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from kolena._utils import krequests
+from kolena._utils.cache import _file_lock
+from kolena._utils.consts import KOLENA_METADATA_CACHE_DIR_ENV
+from kolena._utils.consts import KOLENA_METADATA_CACHE_TTL_ENV
+from kolena._utils.state import get_client_state
+
+
+_N_KEY_LOCKS = 64
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:32]
+
+
+class MetadataCache:
+    """
+    Cache for the responses of entity load-by-name requests, e.g. the ``EntityData`` returned when loading a test suite.
+
+    Responses are cached in-process and, when ``directory`` is provided, on disk to be shared between processes. Entries
+    expire after ``ttl`` seconds and are invalidated explicitly when the corresponding entity is created or edited.
+    Concurrent loads of the same entity are coalesced into a single request, within a process via a fixed set of locks
+    striped over keys and between processes via lockfiles.
+    """
+
+    def __init__(self, ttl: float, directory: Optional[str] = None) -> None:
+        self.ttl = ttl
+        self.directory = directory
+        self._entries: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._key_locks = [threading.Lock() for _ in range(_N_KEY_LOCKS)]
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def load(self, endpoint_path: str, request: Any) -> Any:
+        key = self._key(endpoint_path, request)
+        data = self._get(key)
+        if data is not None:
+            return data
+
+        with self._key_lock(key):
+            data = self._get(key)  # loaded by another thread in the meantime
+            if data is not None:
+                return data
+            if self.directory is None:
+                data = _load(endpoint_path, request)
+            else:
+                with _file_lock(os.path.join(self.directory, f"{key[0]}-{key[1]}.lock"), exclusive=True):
+                    data = self._get(key)  # loaded by another process in the meantime
+                    if data is None:
+                        data = _load(endpoint_path, request)
+                        self._write(key, data)
+            self._set(key, time.time() + self.ttl, data)
+            return data
+
+    def invalidate(self, endpoint_path: str, name: str) -> None:
+        """Invalidate all cached responses, at any version, of the entity with the provided name."""
+        name_digest = self._name_digest(endpoint_path, name)
+        with self._lock:
+            self._entries = {key: entry for key, entry in self._entries.items() if key[0] != name_digest}
+        if self.directory is not None:
+            for path in glob.glob(os.path.join(self.directory, f"{name_digest}-*.json")):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    ...
+
+    @staticmethod
+    def _name_digest(endpoint_path: str, name: str) -> str:
+        client_state = get_client_state()
+        return _digest(f"{client_state.base_url}|{client_state.tenant}|{endpoint_path}|{name}")
+
+    def _key(self, endpoint_path: str, request: Any) -> Tuple[str, str]:
+        request_json = json.dumps(dataclasses.asdict(request), sort_keys=True)
+        return self._name_digest(endpoint_path, request.name), _digest(request_json)
+
+    def _key_lock(self, key: Tuple[str, str]) -> threading.Lock:
+        return self._key_locks[int(key[1][:8], 16) % len(self._key_locks)]
+
+    def _set(self, key: Tuple[str, str], expires_at: float, data: Any) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, data)
+
+    def _get(self, key: Tuple[str, str]) -> Optional[Any]:
+        with self._lock:
+            expires_at, data = self._entries.get(key, (0.0, None))
+        if time.time() < expires_at:
+            return data
+        if self.directory is None:
+            return None
+
+        path = os.path.join(self.directory, f"{key[0]}-{key[1]}.json")
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            expires_at, data = float(entry["expires_at"]), entry["data"]
+        except OSError:
+            return None
+        except (ValueError, KeyError, TypeError):
+            # malformed entry, e.g. written by an incompatible client: evict it and treat it as a miss
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                ...
+            return None
+        if time.time() >= expires_at:
+            return None
+        self._set(key, expires_at, data)
+        return data
+
+    def _write(self, key: Tuple[str, str], data: Any) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(dict(expires_at=time.time() + self.ttl, data=data), f)
+        os.chmod(tmp_path, 0o600)
+        os.replace(tmp_path, os.path.join(self.directory, f"{key[0]}-{key[1]}.json"))
+
+
+def _load(endpoint_path: str, request: Any) -> Any:
+    res = krequests.put(endpoint_path=endpoint_path, data=json.dumps(dataclasses.asdict(request)))
+    krequests.raise_for_status(res)
+    return res.json()
+
+
+_metadata_cache: Optional[MetadataCache] = None
+
+
+def get_metadata_cache() -> Optional[MetadataCache]:
+    """
+    Return the metadata cache configured via the ``KOLENA_METADATA_CACHE_TTL`` environment variable, in seconds, if any.
+    Entries are additionally persisted to the directory configured via ``KOLENA_METADATA_CACHE_DIR``, when set.
+    """
+    global _metadata_cache
+    ttl = float(os.environ.get(KOLENA_METADATA_CACHE_TTL_ENV) or 0)
+    if ttl <= 0:
+        return None
+
+    directory = os.environ.get(KOLENA_METADATA_CACHE_DIR_ENV) or None
+    if _metadata_cache is None or _metadata_cache.ttl != ttl or _metadata_cache.directory != directory:
+        _metadata_cache = MetadataCache(ttl, directory)
+    return _metadata_cache
+
+
+def load_metadata(endpoint_path: str, request: Any) -> Any:
+    """Issue the provided load-by-name request, serving the response from the metadata cache when configured."""
+    cache = get_metadata_cache()
+    return _load(endpoint_path, request) if cache is None else cache.load(endpoint_path, request)
+
+
+def invalidate_metadata(endpoint_path: str, name: str) -> None:
+    """Invalidate cached load responses for the named entity, e.g. after it has been created or edited."""
+    cache = get_metadata_cache()
+    if cache is not None:
+        cache.invalidate(endpoint_path, name)
@@ -0,0 +1,127 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any
+from typing import ContextManager
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+from kolena._utils import log
+from kolena._utils.consts import KOLENA_PROFILE_DIR_ENV
+from kolena._utils.tracing import span
+
+# number of functions listed per phase in the summary written alongside the profiles
+SUMMARY_N_FUNCTIONS = 25
+
+_profile_dir: Optional[str] = None
+_local = threading.local()
+
+
+def configure_profiling(directory: Optional[str]) -> None:
+    """
+    Profile each phase of subsequent test runs, writing the profiles to ``directory``. Takes precedence over the
+    ``KOLENA_PROFILE_DIR`` environment variable. Pass ``None`` to defer to the environment variable again.
+    """
+    global _profile_dir
+    _profile_dir = directory
+
+
+def get_profile_dir() -> Optional[str]:
+    return _profile_dir or os.environ.get(KOLENA_PROFILE_DIR_ENV) or None
+
+
+class _ProfileSession:
+    """
+    Profiles of the phases nested within an outermost phase on a single thread. Each phase is profiled exclusive of
+    the phases nested within it, and repeated phases of the same name accumulate into a single profile.
+    """
+
+    def __init__(self, directory: str, name: str) -> None:
+        self.directory = directory
+        self.name = name
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.stack: List[cProfile.Profile] = []
+
+    def write(self) -> str:
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        out_dir = os.path.join(self.directory, f"{self.name}-{timestamp}-{os.getpid()}-{threading.get_ident()}")
+        os.makedirs(out_dir, exist_ok=True)
+        with open(os.path.join(out_dir, "summary.txt"), "w") as summary:
+            for name, profile in self.profiles.items():
+                profile.dump_stats(os.path.join(out_dir, f"{name}.prof"))
+                buffer = io.StringIO()
+                stats = pstats.Stats(profile, stream=buffer)
+                stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(SUMMARY_N_FUNCTIONS)
+                summary.write(f"===== {name} =====\n{buffer.getvalue()}\n")
+        return out_dir
+
+
+def phase(name: str, **attributes: Any) -> ContextManager[Any]:
+    """
+    Mark a phase of a test run, e.g. inference or the computation of test case metrics, recorded as a tracing
+    [`span`][kolena.tracing.span] and, when profiling is configured, profiled with ``cProfile``.
+
+    Profiling is configured via ``kolena.initialize(..., profile_dir=...)`` or the ``KOLENA_PROFILE_DIR`` environment
+    variable. Once the outermost phase completes, a ``<phase>.prof`` profile per phase, loadable with ``pstats`` or
+    visualizers such as ``snakeviz``, is written to a new subdirectory alongside a ``summary.txt`` of the top
+    functions of each phase by cumulative time. Only the thread executing the phase is profiled.
+    """
+    directory = get_profile_dir()
+    if directory is None:
+        return span(name, **attributes)
+    return _profiled_phase(directory, name, attributes)
+
+
+@contextmanager
+def _profiled_phase(directory: str, name: str, attributes: Dict[str, Any]) -> Iterator[Any]:
+    session: Optional[_ProfileSession] = getattr(_local, "session", None)
+    is_outermost = session is None
+    if is_outermost:
+        if sys.getprofile() is not None:
+            log.warn(f"not profiling phase '{name}': another profiler is active")
+            with span(name, **attributes) as current:
+                yield current
+            return
+        session = _local.session = _ProfileSession(directory, name)
+
+    profile = session.profiles.setdefault(name, cProfile.Profile())
+    parent = session.stack[-1] if len(session.stack) > 0 else None
+    if parent is not None:
+        parent.disable()
+    session.stack.append(profile)
+    profile.enable()
+    try:
+        with span(name, **attributes) as current:
+            yield current
+    finally:
+        profile.disable()
+        session.stack.pop()
+        if parent is not None:
+            parent.enable()
+        if is_outermost:
+            _local.session = None
+            try:
+                out_dir = session.write()
+                log.info(f"wrote profiles of phases {list(session.profiles.keys())} to '{out_dir}'")
+            except OSError as e:
+                log.warn(f"failed to write profiles of phase '{name}': {e}")
@@ -18,15 +18,21 @@ from enum import Enum
 from io import BytesIO
 from typing import Any
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
+from typing import Set
+from typing import Tuple
 from typing import Type
+from typing import TYPE_CHECKING
 from typing import TypeVar
 from typing import Union
 
 import dacite
 import numpy as np
-import pandas as pd
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def serialize_embedding_vector(embedding_vector: np.ndarray) -> str:
@@ -37,6 +43,31 @@ def serialize_embedding_vector(embedding_vector: np.ndarray) -> str:
     return embedding_b64_bytes.decode("utf-8")
 
 
+def serialize_embedding_vectors(embedding_vectors: Iterable[np.ndarray]) -> List[str]:
+    """
+    Equivalent to applying :func:`serialize_embedding_vector` to each of the provided vectors. The npy header is written
+    once per distinct dtype, shape, and memory layout rather than once per vector.
+    """
+    headers: Dict[Tuple[np.dtype, Tuple[int, ...], bool], bytes] = {}
+    serialized = []
+    for vector in embedding_vectors:
+        if type(vector) is not np.ndarray or vector.dtype.hasobject:
+            serialized.append(serialize_embedding_vector(vector))  # defer to np.save, e.g. for its error handling
+            continue
+
+        # matches the layout written by np.save: fortran order only for arrays that are not also C-contiguous
+        fortran_order = vector.flags.f_contiguous and not vector.flags.c_contiguous
+        data = vector.tobytes(order="F" if fortran_order else "C")
+        key = (vector.dtype, vector.shape, fortran_order)
+        header = headers.get(key)
+        if header is None:
+            memfile = BytesIO()
+            np.save(memfile, vector, allow_pickle=False)
+            header = headers[key] = memfile.getvalue()[: memfile.tell() - len(data)]
+        serialized.append(b64encode(header + data).decode("utf-8"))
+    return serialized
+
+
 def deserialize_embedding_vector(b64blob: str) -> np.ndarray:
     embedding_bytes = b64decode(b64blob)
     memfile = BytesIO()
@@ -45,6 +76,90 @@ def deserialize_embedding_vector(b64blob: str) -> np.ndarray:
     return np.load(memfile)
 
 
+# dtype, shape, and fortran order of an npy payload
+NpyHeader = Tuple[np.dtype, Tuple[int, ...], bool]
+
+
+def _npy_header_length(preamble: bytes) -> Optional[int]:
+    major = preamble[6]  # following the 6-byte magic string
+    if major == 1:
+        return 10 + int.from_bytes(preamble[8:10], "little")
+    if major == 2:
+        return 12 + int.from_bytes(preamble[8:12], "little")
+    return None  # e.g. version 3.0 headers, which are rare enough to leave to np.load
+
+
+def _parse_npy_header(header_bytes: bytes) -> Optional[NpyHeader]:
+    memfile = BytesIO(header_bytes)
+    major, _ = np.lib.format.read_magic(memfile)
+    read_header = np.lib.format.read_array_header_1_0 if major == 1 else np.lib.format.read_array_header_2_0
+    shape, fortran_order, dtype = read_header(memfile)
+    return None if dtype.hasobject else (dtype, shape, fortran_order)
+
+
+class NpyHeaderReader:
+    """
+    Reads the npy headers of arrays serialized by :func:`serialize_embedding_vector`, decoding only the leading bytes
+    of each blob. Headers are cached by the base64 prefix covering them, such that blobs sharing a header, e.g. the
+    embeddings of a single model, are read without decoding.
+    """
+
+    def __init__(self) -> None:
+        self._headers: Dict[str, Tuple[int, Optional[NpyHeader]]] = {}
+        self._prefix_lengths: Set[int] = set()
+
+    def read(self, b64blob: str) -> Tuple[int, Optional[NpyHeader]]:
+        """
+        Return the length of the header in bytes and the header, which is ``None`` when it cannot be read without
+        ``np.load``, e.g. for object arrays.
+        """
+        for prefix_length in self._prefix_lengths:
+            cached = self._headers.get(b64blob[:prefix_length])
+            if cached is not None:
+                return cached
+
+        header_length = _npy_header_length(b64decode(b64blob[:16]))
+        if header_length is None:
+            return 0, None
+        header = _parse_npy_header(b64decode(b64blob[: -(-header_length // 3) * 4])[:header_length])
+        # the prefix determines the header: any bytes of the header beyond it are the padding and trailing newline
+        prefix_length = header_length // 3 * 4
+        self._prefix_lengths.add(prefix_length)
+        self._headers[b64blob[:prefix_length]] = (header_length, header)
+        return header_length, header
+
+
+def npy_view(raw: bytes, header_length: int, header: NpyHeader) -> np.ndarray:
+    """Read-only view of the array within the decoded npy bytes ``raw``, without copying."""
+    dtype, shape, fortran_order = header
+    count = 1
+    for dimension in shape:
+        count *= dimension
+    array = np.frombuffer(raw, dtype=dtype, count=count, offset=header_length)
+    return array.reshape(shape, order="F" if fortran_order else "C")
+
+
+def deserialize_embedding_vectors(b64blobs: Iterable[str]) -> List[np.ndarray]:
+    """
+    Equivalent to applying :func:`deserialize_embedding_vector` to each of the provided blobs. Arrays are read directly
+    from the decoded bytes rather than through ``np.load``, parsing each distinct npy header once.
+    """
+    cache: Dict[bytes, Optional[NpyHeader]] = {}
+    deserialized = []
+    for b64blob in b64blobs:
+        raw = b64decode(b64blob)
+        header_length = _npy_header_length(raw)
+        header_bytes = raw[:header_length] if header_length is not None else b""
+        if header_length is not None and header_bytes not in cache:
+            cache[header_bytes] = _parse_npy_header(header_bytes)
+        header = cache.get(header_bytes)
+        if header_length is None or header is None:
+            deserialized.append(deserialize_embedding_vector(b64blob))  # defer to np.load, e.g. for its error handling
+            continue
+        deserialized.append(npy_view(raw, header_length, header).copy(order="K"))
+    return deserialized
+
+
 def as_float64_array(maybe_arr: Optional[List[Union[float, int]]]) -> Optional[np.ndarray]:
     return np.array(maybe_arr).astype(np.float64) if maybe_arr is not None else None
 
@@ -59,7 +174,7 @@ def as_deserialized_json(maybe_json_string: Optional[str]) -> Optional[Any]:
     return json.loads(maybe_json_string) if maybe_json_string is not None else None
 
 
-def with_serialized_columns(df: pd.DataFrame, object_columns: List[str]) -> pd.DataFrame:
+def with_serialized_columns(df: "pd.DataFrame", object_columns: List[str]) -> "pd.DataFrame":
     df_serializable = df.copy()
     for col in object_columns:
         df_serializable[col] = df_serializable[col].apply(as_serialized_json)
@@ -0,0 +1,160 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import base64
+import dataclasses
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict
+from typing import Optional
+
+import kolena._api.v1.token as API
+from kolena._utils import log
+from kolena._utils import state
+from kolena._utils.consts import KOLENA_TOKEN_CACHE_DIR_ENV
+from kolena._utils.serde import from_dict
+
+# cached tokens expiring within this many seconds are refreshed in the background
+REFRESH_MARGIN = 300.0
+
+# cached tokens expiring within this many seconds are not used at all
+MIN_VALIDITY = 60.0
+
+# seconds to wait before retrying a failed background refresh
+REFRESH_RETRY_INTERVAL = 30.0
+
+
+def jwt_expiry(jwt: str) -> Optional[float]:
+    """Expiry of the provided JWT, in seconds since the epoch, read without verifying its signature."""
+    try:
+        payload = jwt.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenCache:
+    """
+    On-disk cache of the JWTs exchanged for API tokens, such that processes started within a JWT's lifetime skip the
+    login request. Entries are keyed by a digest of the API URL and API token, such that the API token itself is never
+    stored, and are only readable by the current user.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def _path(self, api_token: str, base_url: str) -> str:
+        digest = hashlib.sha256(f"{base_url}|{api_token}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def load(self, api_token: str, base_url: str) -> Optional[API.ValidateResponse]:
+        """Return the cached response for the API token, if any and not yet expired."""
+        try:
+            with open(self._path(api_token, base_url)) as f:
+                response = from_dict(data_class=API.ValidateResponse, data=json.load(f))
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+        expires_at = jwt_expiry(response.access_token)
+        if expires_at is None or expires_at - time.time() < MIN_VALIDITY:
+            return None
+        return response
+
+    def store(self, api_token: str, base_url: str, response: API.ValidateResponse) -> None:
+        if jwt_expiry(response.access_token) is None:
+            return  # unable to determine when the entry expires
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")  # created with mode 0600
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(dataclasses.asdict(response), f)
+            os.replace(tmp_path, self._path(api_token, base_url))
+        except OSError as e:
+            log.warn(f"failed to cache token: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def get_token_cache() -> Optional[TokenCache]:
+    """Return the token cache configured via the ``KOLENA_TOKEN_CACHE_DIR`` environment variable, if any."""
+    directory = os.environ.get(KOLENA_TOKEN_CACHE_DIR_ENV)
+    return TokenCache(directory) if directory else None
+
+
+def get_token(
+    api_token: str,
+    base_url: Optional[str] = None,
+    proxies: Optional[Dict[str, str]] = None,
+) -> API.ValidateResponse:
+    """
+    Exchange the API token for a JWT as [`state.get_token`][kolena._utils.state.get_token], serving the JWT from the
+    token cache when configured.
+    """
+    cache = get_token_cache()
+    if cache is None:
+        return state.get_token(api_token, base_url=base_url, proxies=proxies)
+
+    base_url = base_url or state.get_client_state().base_url
+    response = cache.load(api_token, base_url)
+    if response is None:
+        response = state.get_token(api_token, base_url=base_url, proxies=proxies)
+        cache.store(api_token, base_url, response)
+    return response
+
+
+_refresh_lock = threading.Lock()
+_refresh_timer: Optional[threading.Timer] = None
+
+
+def schedule_refresh(client_state: state._ClientState) -> None:
+    """
+    When the token cache is configured, refresh the JWT of the provided client state in the background shortly before
+    it expires, keeping the cached entry up to date.
+    """
+    cache = get_token_cache()
+    expires_at = jwt_expiry(client_state.jwt_token or "")
+    if cache is None or expires_at is None or client_state.api_token is None:
+        return
+    _schedule(cache, client_state, client_state.api_token, max(expires_at - REFRESH_MARGIN - time.time(), 0))
+
+
+def _schedule(cache: TokenCache, client_state: state._ClientState, api_token: str, delay: float) -> None:
+    global _refresh_timer
+    with _refresh_lock:
+        if _refresh_timer is not None:
+            _refresh_timer.cancel()
+        _refresh_timer = threading.Timer(delay, _refresh, args=(cache, client_state, api_token))
+        _refresh_timer.daemon = True
+        _refresh_timer.start()
+
+
+def _refresh(cache: TokenCache, client_state: state._ClientState, api_token: str) -> None:
+    if client_state.api_token != api_token:
+        return  # re-initialized with another token in the meantime
+
+    base_url = client_state.base_url or state._get_api_base_url()
+    try:
+        response = state.get_token(api_token, base_url=base_url, proxies=client_state.proxies)
+    except Exception as e:
+        log.warn(f"failed to refresh token, retrying in {REFRESH_RETRY_INTERVAL:0.0f} seconds: {e}")
+        _schedule(cache, client_state, api_token, REFRESH_RETRY_INTERVAL)
+        return
+
+    cache.store(api_token, base_url, response)
+    if client_state.api_token == api_token:
+        client_state.jwt_token = response.access_token
+        schedule_refresh(client_state)
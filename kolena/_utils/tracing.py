@@ -0,0 +1,237 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import contextlib
+import contextvars
+import dataclasses
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any
+from typing import Callable
+from typing import ContextManager
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+SpanHook = Callable[["Span"], None]
+
+
+@dataclasses.dataclass
+class Span:
+    """A timed, named phase of client work, e.g. the download of a single data frame batch."""
+
+    name: str
+    span_id: int
+    parent_id: Optional[int]
+    thread_id: int
+    start_time: float
+    """Wall-clock start time of the span, in seconds since the epoch."""
+
+    duration: float = 0.0
+    """Duration of the span, in seconds."""
+
+    attributes: Dict[str, Any] = dataclasses.field(default_factory=dict)
+    """Attributes describing the span, e.g. the test case being evaluated."""
+
+    counters: Dict[str, float] = dataclasses.field(default_factory=dict)
+    """Counters, e.g. ``rows``, ``bytes``, ``requests`` or ``retries``, incremented while the span was active."""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dataclasses.asdict(self)
+
+
+class Tracer:
+    """
+    Collector of the [`Span`][kolena.tracing.Span]s completed while it is active, and of counter totals across
+    all spans.
+    """
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self.counters: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def _count(self, span: Optional[Span], name: str, value: float) -> None:
+        with self._lock:
+            self.counters[name] += value
+            if span is not None:
+                span.counters[name] = span.counters.get(name, 0) + value
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Number of occurrences and total duration, in seconds, of the spans recorded under each name."""
+        summary: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for span in self.spans:
+                entry = summary.setdefault(span.name, dict(count=0, duration=0.0))
+                entry["count"] += 1
+                entry["duration"] += span.duration
+        return summary
+
+    def to_json(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(spans=[span.to_dict() for span in self.spans], counters=dict(self.counters))
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Recorded spans in the Chrome trace-event format, viewable in ``chrome://tracing`` or Perfetto."""
+        pid = os.getpid()
+        with self._lock:
+            events = [
+                dict(
+                    name=span.name,
+                    ph="X",
+                    ts=span.start_time * 1e6,
+                    dur=span.duration * 1e6,
+                    pid=pid,
+                    tid=span.thread_id,
+                    args={**span.attributes, **span.counters},
+                )
+                for span in self.spans
+            ]
+        return dict(traceEvents=events, displayTimeUnit="ms")
+
+    def export(self, path: str, format: str = "json") -> None:
+        """
+        Write the recorded spans and counters to ``path``.
+
+        :param path: The file to write.
+        :param format: Either ``"json"``, for the spans and counter totals as JSON, or ``"chrome"``, for the Chrome
+            trace-event format.
+        """
+        if format == "json":
+            data = self.to_json()
+        elif format == "chrome":
+            data = self.to_chrome_trace()
+        else:
+            raise ValueError(f"invalid format '{format}': expected 'json' or 'chrome'")
+        with open(path, "w") as f:
+            json.dump(data, f, default=str)
+
+
+_tracer: Optional[Tracer] = None
+_hooks: List[SpanHook] = []
+_hook_lock = threading.Lock()
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("kolena_current_span", default=None)
+_span_ids = itertools.count(1)
+_NOOP: ContextManager[Optional[Span]] = contextlib.nullcontext()
+
+
+def start_tracing() -> Tracer:
+    """Start recording spans and counters into a new [`Tracer`][kolena.tracing.Tracer], which is returned."""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def stop_tracing() -> Optional[Tracer]:
+    """Stop recording spans and counters, returning the tracer that was active, if any."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+@contextlib.contextmanager
+def tracing() -> Iterator[Tracer]:
+    """Record the spans and counters of the client work performed within this context."""
+    tracer = start_tracing()
+    try:
+        yield tracer
+    finally:
+        if _tracer is tracer:
+            stop_tracing()
+
+
+def add_span_hook(hook: SpanHook) -> None:
+    """Register a callable invoked with each completed [`Span`][kolena.tracing.Span], e.g. to forward spans to
+    an external metrics system. Hooks are invoked on the thread that completed the span and must not raise."""
+    _hooks.append(hook)
+
+
+def remove_span_hook(hook: SpanHook) -> None:
+    _hooks.remove(hook)
+
+
+def _enabled() -> bool:
+    return _tracer is not None or len(_hooks) > 0
+
+
+def span(name: str, **attributes: Any) -> ContextManager[Optional[Span]]:
+    """
+    Time the work performed within this context as a span nested within the currently active span, if any. Spans are
+    propagated to threads that copy the current context. Free of overhead while tracing is disabled.
+    """
+    if not _enabled():
+        return _NOOP
+    return _span(name, attributes)
+
+
+@contextlib.contextmanager
+def _span(name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+    parent = _current_span.get()
+    current = Span(
+        name=name,
+        span_id=next(_span_ids),
+        parent_id=parent.span_id if parent is not None else None,
+        thread_id=threading.get_ident(),
+        start_time=time.time(),
+        attributes=attributes,
+    )
+    token = _current_span.set(current)
+    t0 = time.perf_counter()
+    try:
+        yield current
+    finally:
+        current.duration = time.perf_counter() - t0
+        _current_span.reset(token)
+        tracer = _tracer
+        if tracer is not None:
+            tracer._record(current)
+        for hook in list(_hooks):
+            hook(current)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """Decorator recording each call of the decorated function as a span."""
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore
+
+    return decorator
+
+
+def count(name: str, value: float = 1) -> None:
+    """Increment the named counter, e.g. ``rows`` or ``bytes``, on the active span and in the active tracer's totals."""
+    current = _current_span.get()
+    tracer = _tracer
+    if tracer is not None:
+        tracer._count(current, name, value)
+    elif current is not None:  # no totals to keep, but hooks observe the counters of completed spans
+        with _hook_lock:
+            current.counters[name] = current.counters.get(name, 0) + value
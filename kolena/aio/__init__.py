@@ -0,0 +1,50 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Asynchronous (`asyncio`) counterparts of the client's load and upload paths, for use within event loops that evaluate
+many models or test cases concurrently.
+
+```python
+import kolena.aio
+
+async def load_all(test_cases):
+    return await asyncio.gather(*(kolena.aio.load_test_samples(test_case) for test_case in test_cases))
+```
+
+Requests are issued through a shared [`AsyncTransport`][kolena.aio.AsyncTransport], which can be replaced per call.
+"""
+# noreorder
+from ._transport import AsyncTransport
+from ._transport import get_transport
+from ._batched_load import init_upload
+from ._batched_load import iter_data
+from ._batched_load import upload_data_frame
+from ._batched_load import upload_data_frame_chunk
+from ._workflow import iter_test_samples
+from ._workflow import load_test_samples
+from ._workflow import iter_inferences
+from ._workflow import upload_inferences
+
+__all__ = [
+    "AsyncTransport",
+    "get_transport",
+    "init_upload",
+    "iter_data",
+    "upload_data_frame",
+    "upload_data_frame_chunk",
+    "iter_test_samples",
+    "load_test_samples",
+    "iter_inferences",
+    "upload_inferences",
+]
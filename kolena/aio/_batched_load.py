@@ -0,0 +1,160 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import dataclasses
+import json
+from collections import deque
+from typing import AsyncIterator
+from typing import Deque
+from typing import Optional
+from typing import Type
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+from kolena._api.v1.batched_load import BatchedLoad as API
+from kolena._utils import krequests
+from kolena._utils.batched_load import _BatchedLoader
+from kolena._utils.batched_load import _to_parquet_buffer
+from kolena._utils.batched_load import DFType
+from kolena._utils.consts import BatchSize
+from kolena._utils.serde import from_dict
+from kolena._utils.state import DEFAULT_API_VERSION
+from kolena.aio._transport import AsyncTransport
+from kolena.aio._transport import get_transport
+
+UPLOAD_ATTEMPTS = 3
+
+
+async def init_upload(transport: Optional[AsyncTransport] = None) -> API.InitiateUploadResponse:
+    """Asynchronous version of `kolena._utils.batched_load.init_upload`."""
+    transport = transport or get_transport()
+    init_res = await transport.put(API.Path.INIT_UPLOAD.value)
+    krequests.raise_for_status(init_res)
+    return from_dict(data_class=API.InitiateUploadResponse, data=init_res.json())
+
+
+async def upload_data_frame_chunk(
+    df_chunk: pd.DataFrame,
+    load_uuid: str,
+    transport: Optional[AsyncTransport] = None,
+) -> None:
+    """Asynchronous version of `kolena._utils.batched_load.upload_data_frame_chunk`, retrying failed uploads."""
+    transport = transport or get_transport()
+    for attempt in range(UPLOAD_ATTEMPTS):
+        try:
+            df_chunk_buffer = await transport.run(_to_parquet_buffer, df_chunk)
+            signed_url_response = await transport.get(API.Path.upload_signed_url(load_uuid))
+            krequests.raise_for_status(signed_url_response)
+            signed_url = from_dict(data_class=API.SignedURL, data=signed_url_response.json())
+            upload_response = await transport.put_url(
+                signed_url.signed_url,
+                data=df_chunk_buffer,
+                headers={"Content-Type": "application/octet-stream"},
+            )
+            krequests.raise_for_status(upload_response)
+            return
+        except Exception:
+            if attempt == UPLOAD_ATTEMPTS - 1:
+                raise
+
+
+async def upload_data_frame(
+    df: pd.DataFrame,
+    load_uuid: str,
+    batch_size: int = BatchSize.UPLOAD_RECORDS.value,
+    max_concurrency: int = 4,
+    transport: Optional[AsyncTransport] = None,
+) -> None:
+    """
+    Upload the provided data frame in chunks of ``batch_size`` rows, keeping at most ``max_concurrency`` chunk uploads
+    in flight at once.
+    """
+    num_chunks = int(np.ceil(len(df) / batch_size))
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def upload_chunk(start: int) -> None:
+        async with semaphore:
+            await upload_data_frame_chunk(df.iloc[start : start + batch_size], load_uuid, transport)
+
+    await asyncio.gather(*(upload_chunk(i * batch_size) for i in range(num_chunks)))
+
+
+async def complete_load(uuid: Optional[str], transport: Optional[AsyncTransport] = None) -> None:
+    if uuid is None:
+        return
+    transport = transport or get_transport()
+    complete_request = API.CompleteDownloadRequest(uuid=uuid)
+    complete_res = await transport.put(
+        API.Path.COMPLETE_DOWNLOAD.value,
+        data=json.dumps(dataclasses.asdict(complete_request)),
+    )
+    krequests.raise_for_status(complete_res)
+
+
+async def _load_path(
+    path: str,
+    df_class: Optional[Type[DFType]],
+    transport: AsyncTransport,
+) -> Union[DFType, pd.DataFrame]:
+    download_response = await transport.get(API.Path.download_by_path(path), allow_redirects=True, stream=True)
+    try:
+        krequests.raise_for_status(download_response)
+        df = await transport.run(_BatchedLoader._read_download, download_response)
+    finally:
+        download_response.close()
+    return df_class.from_serializable(df) if df_class else df
+
+
+async def iter_data(
+    init_request: API.BaseInitDownloadRequest,
+    endpoint_path: str,
+    df_class: Optional[Type[DFType]],
+    endpoint_api_version: str = DEFAULT_API_VERSION,
+    prefetch: int = 1,
+    transport: Optional[AsyncTransport] = None,
+) -> AsyncIterator[DFType]:
+    """
+    Asynchronous version of `_BatchedLoader.iter_data`. Up to ``prefetch`` batches beyond the batch currently being
+    consumed are downloaded concurrently.
+    """
+    transport = transport or get_transport()
+    init_res = await transport.put(
+        endpoint_path,
+        api_version=endpoint_api_version,
+        data=json.dumps(dataclasses.asdict(init_request)),
+        stream=True,
+    )
+    load_uuid = None
+    pending: Deque["asyncio.Future[DFType]"] = deque()
+    try:
+        krequests.raise_for_status(init_res)
+        lines = init_res.iter_lines()
+        while True:
+            line = await transport.run(next, lines, None)
+            if line is None:
+                break
+            partial_response = from_dict(data_class=API.InitDownloadPartialResponse, data=json.loads(line))
+            load_uuid = partial_response.uuid
+            pending.append(asyncio.ensure_future(_load_path(partial_response.path, df_class, transport)))
+            if len(pending) > prefetch:
+                yield await pending.popleft()
+        while len(pending) > 0:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+        init_res.close()
+        await complete_load(load_uuid, transport)
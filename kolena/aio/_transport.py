@@ -0,0 +1,110 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import TypeVar
+
+import requests
+from requests_toolbelt.adapters import socket_options
+
+from kolena._utils import krequests
+from kolena._utils.endpoints import get_endpoint
+from kolena._utils.state import DEFAULT_API_VERSION
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONNECTIONS = 16
+
+
+class AsyncTransport:
+    """
+    Pooled transport for issuing Kolena requests from `asyncio` code.
+
+    Requests are issued on a bounded pool of ``max_connections`` worker threads, each holding a persistent connection
+    pool, such that many requests can be in flight at once without blocking the event loop. The client state of the
+    calling task, e.g. from `kolena_session`, is used for each request.
+    """
+
+    def __init__(self, max_connections: int = DEFAULT_MAX_CONNECTIONS) -> None:
+        if max_connections <= 0:
+            raise ValueError(f"invalid max_connections '{max_connections}': expected positive integer")
+        self.max_connections = max_connections
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix="kolena-aio")
+        self._local = threading.local()
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run the provided blocking function on the transport's worker pool."""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._executor, functools.partial(context.run, fn, *args, **kwargs))
+
+    async def request(
+        self,
+        method: str,
+        endpoint_path: str,
+        api_version: str = DEFAULT_API_VERSION,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Issue an authenticated request against the provided Kolena endpoint."""
+        return await self.run(self._request, method, endpoint_path, api_version, **kwargs)
+
+    async def get(self, endpoint_path: str, **kwargs: Any) -> requests.Response:
+        return await self.request("GET", endpoint_path, **kwargs)
+
+    async def put(self, endpoint_path: str, **kwargs: Any) -> requests.Response:
+        return await self.request("PUT", endpoint_path, **kwargs)
+
+    async def post(self, endpoint_path: str, **kwargs: Any) -> requests.Response:
+        return await self.request("POST", endpoint_path, **kwargs)
+
+    async def put_url(self, url: str, **kwargs: Any) -> requests.Response:
+        """Issue an unauthenticated PUT request against an arbitrary URL, e.g. a signed upload URL."""
+        return await self.run(self._put_url, url, **kwargs)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def _session(self) -> requests.Session:
+        session: Optional[requests.Session] = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", socket_options.TCPKeepAliveAdapter(max_retries=krequests.MAX_RETRIES))
+            self._local.session = session
+        return session
+
+    def _request(self, method: str, endpoint_path: str, api_version: str, **kwargs: Any) -> requests.Response:
+        url = get_endpoint(endpoint_path=endpoint_path, api_version=api_version)
+        return self._session().request(method, url=url, **krequests._with_default_kwargs(**kwargs))
+
+    def _put_url(self, url: str, **kwargs: Any) -> requests.Response:
+        return self._session().put(url=url, **kwargs, **krequests.get_connection_args())
+
+
+_transport: Optional[AsyncTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> AsyncTransport:
+    """Return the default transport shared by `kolena.aio` calls that are not provided with a transport."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = AsyncTransport()
+        return _transport
@@ -0,0 +1,134 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import dataclasses
+import json
+from typing import AsyncIterator
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from kolena._api.v1.core import TestCase as CoreAPI
+from kolena._api.v1.generic import Model as ModelAPI
+from kolena._api.v1.generic import TestCase as TestCaseAPI
+from kolena._api.v1.generic import TestRun as TestRunAPI
+from kolena._utils import krequests
+from kolena._utils import log
+from kolena._utils.consts import BatchSize
+from kolena.aio._batched_load import init_upload
+from kolena.aio._batched_load import iter_data
+from kolena.aio._batched_load import upload_data_frame
+from kolena.aio._transport import AsyncTransport
+from kolena.aio._transport import get_transport
+from kolena.workflow import GroundTruth
+from kolena.workflow import Inference
+from kolena.workflow import Model
+from kolena.workflow import TestCase
+from kolena.workflow import TestRun
+from kolena.workflow import TestSample
+from kolena.workflow._datatypes import TestSampleDataFrame
+from kolena.workflow._validators import assert_workflows_match
+from kolena.workflow.test_run import _serialize_inference
+
+
+async def iter_test_samples(
+    test_case: TestCase,
+    transport: Optional[AsyncTransport] = None,
+) -> AsyncIterator[Tuple[TestSample, GroundTruth]]:
+    """
+    Asynchronously iterate through all test samples and ground truths contained in a test case. See
+    [`TestCase.iter_test_samples`][kolena.workflow.TestCase.iter_test_samples].
+
+    :param test_case: The test case to load.
+    :param transport: Optional transport with which to issue requests. Defaults to a shared transport.
+    """
+    init_request = CoreAPI.InitLoadContentsRequest(batch_size=BatchSize.LOAD_SAMPLES.value, test_case_id=test_case._id)
+    async for df in iter_data(
+        init_request=init_request,
+        endpoint_path=TestCaseAPI.Path.INIT_LOAD_TEST_SAMPLES.value,
+        df_class=TestSampleDataFrame,
+        transport=transport,
+    ):
+        for test_sample, ground_truth in test_case._test_samples_from_data_frame(df):
+            yield test_sample, ground_truth
+
+
+async def load_test_samples(
+    test_case: TestCase,
+    transport: Optional[AsyncTransport] = None,
+) -> List[Tuple[TestSample, GroundTruth]]:
+    """
+    Asynchronously load all test samples and ground truths contained in a test case. See
+    [`TestCase.load_test_samples`][kolena.workflow.TestCase.load_test_samples].
+
+    :param test_case: The test case to load.
+    :param transport: Optional transport with which to issue requests. Defaults to a shared transport.
+    """
+    return [record async for record in iter_test_samples(test_case, transport)]
+
+
+async def iter_inferences(
+    model: Model,
+    test_case: TestCase,
+    transport: Optional[AsyncTransport] = None,
+) -> AsyncIterator[Tuple[TestSample, GroundTruth, Inference]]:
+    """
+    Asynchronously iterate over all inferences stored for a model on a test case. See
+    [`Model.iter_inferences`][kolena.workflow.Model.iter_inferences].
+
+    :param model: The model for which to load inferences.
+    :param test_case: The test case over which to iterate inferences.
+    :param transport: Optional transport with which to issue requests. Defaults to a shared transport.
+    """
+    assert_workflows_match(model.workflow.name, test_case.workflow.name)
+    async for df_batch in iter_data(
+        init_request=model._load_inferences_request(test_case),
+        endpoint_path=ModelAPI.Path.LOAD_INFERENCES.value,
+        df_class=TestSampleDataFrame,
+        transport=transport,
+    ):
+        for record in model._inferences_from_data_frame(df_batch):
+            yield record
+
+
+async def upload_inferences(
+    test_run: TestRun,
+    inferences: Iterable[Tuple[TestSample, Inference]],
+    transport: Optional[AsyncTransport] = None,
+) -> None:
+    """
+    Asynchronously upload inferences for a test run. See
+    [`TestRun.upload_inferences`][kolena.workflow.TestRun.upload_inferences].
+
+    :param test_run: The test run for which to upload inferences.
+    :param inferences: The inferences, paired with their corresponding test samples, to upload.
+    :param transport: Optional transport with which to issue requests. Defaults to a shared transport.
+    """
+    records = [_serialize_inference(ts, inf) for ts, inf in inferences]
+    if len(records) == 0:
+        return
+
+    transport = transport or get_transport()
+    df = await transport.run(test_run._inferences_data_frame, records)
+    init_response = await init_upload(transport)
+    await upload_data_frame(df, init_response.uuid, batch_size=BatchSize.UPLOAD_INFERENCES.value, transport=transport)
+
+    request = TestRunAPI.UploadInferencesRequest(
+        uuid=init_response.uuid,
+        test_run_id=test_run._id,
+        reset=test_run.reset,
+    )
+    res = await transport.put(TestRunAPI.Path.UPLOAD_INFERENCES.value, data=json.dumps(dataclasses.asdict(request)))
+    krequests.raise_for_status(res)
+    log.info(f"uploaded {len(records)} inferences")
@@ -54,6 +54,11 @@ class TestRun(BaseTestRun):
         The callback would be passed inferences of images in each testcase and should return a dictionary with metric
         name as key and metric value as value.
     :param reset: Overwrites existing inferences if set.
+    :param custom_metrics_concurrency: The number of test cases for which to compute custom metrics at once. Values
+        larger than 1 invoke `custom_metrics_callback` from a pool of threads.
+    :param custom_metrics_processes: Invoke `custom_metrics_callback` from a pool of `custom_metrics_concurrency`
+        processes rather than threads, e.g. for callbacks holding the GIL. The callback must then be picklable, e.g. a
+        module-level function.
     """
 
     _TestImageClass = TestImage
@@ -69,6 +74,8 @@ class TestRun(BaseTestRun):
         test_config: Optional[TestConfig] = None,
         custom_metrics_callback: Optional[CustomMetricsCallback[_TestImageClass, _InferenceClass]] = None,
         reset: bool = False,
+        custom_metrics_concurrency: int = 1,
+        custom_metrics_processes: bool = False,
     ):
         config = AccuracyOptimal() if test_config is None else test_config
         super().__init__(
@@ -77,6 +84,8 @@ class TestRun(BaseTestRun):
             config=config._to_run_config(),
             custom_metrics_callback=custom_metrics_callback,
             reset=reset,
+            custom_metrics_concurrency=custom_metrics_concurrency,
+            custom_metrics_processes=custom_metrics_processes,
         )
 
     @validate_arguments(config=ValidatorConfig)
@@ -106,6 +115,8 @@ def test(
     test_config: Optional[TestConfig] = None,
     custom_metrics_callback: Optional[CustomMetricsCallback[TestImage, Tuple[str, float]]] = None,
     reset: bool = False,
+    custom_metrics_concurrency: int = 1,
+    custom_metrics_processes: bool = False,
 ) -> None:
     """
     Test the provided [`InferenceModel`][kolena.classification.InferenceModel] on a
@@ -123,6 +134,11 @@ def test(
         The callback would be passed inferences of images in each testcase and should return a dictionary with metric
         name as key and metric value as value.
     :param reset: Overwrites existing inferences if set.
+    :param custom_metrics_concurrency: The number of test cases for which to compute custom metrics at once. Values
+        larger than 1 invoke `custom_metrics_callback` from a pool of threads.
+    :param custom_metrics_processes: Invoke `custom_metrics_callback` from a pool of `custom_metrics_concurrency`
+        processes rather than threads, e.g. for callbacks holding the GIL. The callback must then be picklable, e.g. a
+        module-level function.
     """
     with TestRun(
         model,
@@ -130,6 +146,8 @@ def test(
         test_config=test_config,
         custom_metrics_callback=custom_metrics_callback,
         reset=reset,
+        custom_metrics_concurrency=custom_metrics_concurrency,
+        custom_metrics_processes=custom_metrics_processes,
     ) as test_run:
         log.info("performing inference")
         for image in log.progress_bar(test_run.iter_images()):
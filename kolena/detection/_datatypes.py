@@ -11,14 +11,16 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Any
+import itertools
 from typing import cast
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Sequence
 from typing import Tuple
 from typing import Type
 
+import numpy as np
 import pandas as pd
 import pandera as pa
 from pandera.extensions import register_check_method
@@ -30,15 +32,15 @@ from kolena._utils.serde import as_deserialized_json
 from kolena._utils.serde import as_serialized_json
 from kolena._utils.serde import with_serialized_columns
 from kolena.detection import Inference
+from kolena.detection._internal import InferenceType
 
 
 @register_check_method()
 def _validate_ground_truths(series: pa.typing.Series) -> bool:
     # expectation: Optional[List[dict(data_type=str, data_object=dict)]]
-    def validate_cell(cell: List[Dict[str, Any]]) -> bool:
-        return all("data_type" in gt and "data_object" in gt and "label" in gt["data_object"] for gt in cell)
-
-    return series.dropna().apply(validate_cell).all()
+    # validate the ground truths of all cells in a single pass rather than cell by cell
+    ground_truths = itertools.chain.from_iterable(series.dropna().to_numpy(dtype=object))
+    return all("data_type" in gt and "data_object" in gt and "label" in gt["data_object"] for gt in ground_truths)
 
 
 JSONObject = object
@@ -125,6 +127,57 @@ class ImageResultDataFrame(pa.typing.DataFrame[ImageResultDataFrameSchema], Load
         df_stage["model_id"] = model_id
         return ImageResultDataFrame(validate_df_schema(df_stage, ImageResultDataFrameSchema, trusted=True))
 
+    @classmethod
+    def serializable_from_inference_arrays(
+        cls,
+        test_run_id: int,
+        model_id: int,
+        image_ids: np.ndarray,
+        counts: np.ndarray,
+        ignored: np.ndarray,
+        labels: np.ndarray,
+        confidences: np.ndarray,
+        boxes: Optional[np.ndarray],
+    ) -> pd.DataFrame:
+        """
+        Build the serializable form of the frame from ragged arrays of inferences, where the first ``counts[i]``
+        remaining entries of ``labels``, ``confidences``, and ``boxes`` belong to image ``image_ids[i]``. As with
+        [`from_image_inference_mapping`][kolena.detection._datatypes.ImageResultDataFrame.from_image_inference_mapping],
+        images without inferences are represented by a single empty record and ignored images by a single ignored
+        record. Inferences are bounding boxes when ``boxes`` are provided, otherwise classification labels.
+        """
+        n_records = np.where(counts == 0, 1, counts)
+        has_inference = np.repeat(counts > 0, n_records)
+        n_rows = len(has_inference)
+
+        def with_inferences(values: Sequence[object]) -> np.ndarray:
+            column = np.full(n_rows, None, dtype=object)
+            column[has_inference] = values
+            return column
+
+        data_type = InferenceType.BOUNDING_BOX if boxes is not None else InferenceType.CLASSIFICATION_LABEL
+        confidence = np.full(n_rows, np.nan)
+        confidence[has_inference] = confidences
+        # equivalent to as_serialized_json of the points [top_left, bottom_right] of each box
+        polygons = (
+            [f"[[{x0!r}, {y0!r}], [{x1!r}, {y1!r}]]" for x0, y0, x1, y1 in boxes.tolist()]
+            if boxes is not None
+            else None
+        )
+        df_stage = pd.DataFrame(
+            dict(
+                test_sample_id=np.repeat(image_ids, n_records),
+                ignore=np.repeat(ignored, n_records),
+                data_type=with_inferences(data_type.value),
+                label=with_inferences(labels),
+                confidence=confidence,
+                polygon=with_inferences(polygons) if polygons is not None else np.full(n_rows, None, dtype=object),
+                test_run_id=test_run_id,
+                model_id=model_id,
+            ),
+        )
+        return validate_df_schema(df_stage, ImageResultDataFrameSchema, trusted=True)
+
 
 class LoadInferencesDataFrameSchema(TestImageDataFrameSchema):
     test_case_id: Series[pa.typing.Int64] = pa.Field(coerce=True)
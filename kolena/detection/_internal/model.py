@@ -25,6 +25,7 @@ from typing import Type
 from typing import TypeVar
 from typing import Union
 
+import numpy as np
 import pandas as pd
 from pydantic import validate_arguments
 
@@ -56,6 +57,8 @@ from kolena.errors import NotFoundError
 InferenceType = TypeVar("InferenceType")
 SampleInferences = Tuple[TestImageType, Optional[List[InferenceType]]]
 
+_SAMPLE_COLUMNS = ["locator", "dataset", "ground_truths", "metadata", "inferences"]
+
 
 class BaseModel(ABC, Frozen, WithTelemetry):
     """
@@ -171,20 +174,59 @@ class BaseModel(ABC, Frozen, WithTelemetry):
         test_suite: _TestSuiteClass,
     ) -> Dict[int, List[SampleInferences[_TestImageClass, _InferenceClass]]]:
         """Retrieve the uploaded inferences of a test suite for each image, grouped by test case."""
-        batches = list(self._iter_inference_batch_for_test_suite(test_suite))
-        df_all = pd.concat(batches)
-        df = pd.DataFrame(columns=["test_case_id", "test_sample"])
-        df["test_case_id"] = df_all["test_case_id"]
-        df["test_sample"] = df_all.apply(lambda record: self._inferences_from_record(record), axis=1)
-        df_by_testcase = df.groupby("test_case_id")["test_sample"].agg(list).to_dict()
-        return df_by_testcase
+        return dict(self.iter_inferences_by_test_case(test_suite))
+
+    @validate_arguments(config=ValidatorConfig)
+    def iter_inferences_by_test_case(
+        self,
+        test_suite: _TestSuiteClass,
+    ) -> Iterator[Tuple[int, List[SampleInferences[_TestImageClass, _InferenceClass]]]]:
+        """
+        Iterate the uploaded inferences of a test suite for each image, grouped by test case.
+
+        Each image is hydrated once, even when it belongs to multiple test cases of the test suite, and the same
+        image and inference objects are shared between the groups of these test cases.
+
+        :return: Iterator over `(test_case_id, inferences)` pairs in ascending order of test case ID.
+        """
+        df_samples, groups = self._group_inferences_by_test_case(test_suite)
+        hydrate = _SampleHydrator(self, df_samples)
+        for test_case_id, sample_indices in groups:
+            yield test_case_id, hydrate(sample_indices)
+
+    def _group_inferences_by_test_case(
+        self,
+        test_suite: _TestSuiteClass,
+    ) -> Tuple[_LoadInferencesDataFrameClass, List[Tuple[int, np.ndarray]]]:
+        """
+        Load the inferences of a test suite as a frame of unique samples and, for each test case in ascending order of
+        ID, the indices of its samples in this frame.
+        """
+        batches = list(self._iter_inference_batch_for_test_suite(test_suite, deserialize=False))
+        df_all = pd.concat(batches, ignore_index=True) if len(batches) > 0 else pd.DataFrame(columns=_SAMPLE_COLUMNS)
+        if len(df_all) == 0:
+            return self._LoadInferencesDataFrameClass.from_serializable(df_all.assign(test_case_id=[])), []
+
+        # samples are keyed by their serialized contents, such that only one row per unique sample is deserialized
+        sample_index = df_all.groupby(_SAMPLE_COLUMNS, sort=False, dropna=False).ngroup().to_numpy()
+        _, first_index = np.unique(sample_index, return_index=True)
+        df_samples = self._LoadInferencesDataFrameClass.from_serializable(
+            df_all.iloc[first_index].reset_index(drop=True),
+        )
+
+        test_case_ids = df_all["test_case_id"].to_numpy()
+        order = np.argsort(test_case_ids, kind="stable")
+        boundaries = np.flatnonzero(np.diff(test_case_ids[order])) + 1
+        groups = [(int(test_case_ids[group[0]]), sample_index[group]) for group in np.split(order, boundaries)]
+        return df_samples, groups
 
     @validate_arguments(config=ValidatorConfig)
     def _iter_inference_batch_for_test_suite(
         self,
         test_suite: _TestSuiteClass,
         batch_size: int = BatchSize.LOAD_SAMPLES.value,
-    ) -> Iterator[_LoadInferencesDataFrameClass]:
+        deserialize: bool = True,
+    ) -> Iterator[Union[_LoadInferencesDataFrameClass, pd.DataFrame]]:
         if batch_size <= 0:
             raise InputValidationError(f"invalid batch_size '{batch_size}': expected positive integer")
         log.info(f"loading inferences from model '{self.name}' on test suite '{test_suite.name}'")
@@ -193,10 +235,26 @@ class BaseModel(ABC, Frozen, WithTelemetry):
         yield from _BatchedLoader.iter_data(
             init_request=init_request,
             endpoint_path=API.Path.INIT_LOAD_INFERENCES_BY_TEST_CASE.value,
-            df_class=self._LoadInferencesDataFrameClass,
+            df_class=self._LoadInferencesDataFrameClass if deserialize else None,
         )
         log.info(f"loaded inferences from model '{self.name}' on test suite '{test_suite.name}'")
 
     @abstractmethod
     def _inferences_from_record(self, record: Any) -> Tuple[_TestImageClass, Optional[List[_InferenceClass]]]:
         ...
+
+
+class _SampleHydrator:
+    """Hydrates the samples of a frame of unique samples on first access, sharing them between subsequent accesses."""
+
+    def __init__(self, model: BaseModel, df_samples: pd.DataFrame) -> None:
+        self._inferences_from_record = model._inferences_from_record
+        self._records = list(df_samples.itertuples())
+        self._samples: List[Any] = [None] * len(self._records)
+
+    def __call__(self, sample_indices: np.ndarray) -> List[SampleInferences]:
+        samples, indices = self._samples, sample_indices.tolist()
+        for i in indices:
+            if samples[i] is None:
+                samples[i] = self._inferences_from_record(self._records[i])
+        return [samples[i] for i in indices]
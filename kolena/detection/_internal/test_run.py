@@ -12,33 +12,44 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import dataclasses
+import functools
 import json
 from abc import ABC
 from abc import abstractmethod
 from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from contextlib import closing
 from types import TracebackType
 from typing import Any
 from typing import Callable
+from typing import Collection
 from typing import Dict
 from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Sequence
+from typing import Tuple
 from typing import Type
 from typing import TypeVar
 from typing import Union
 
+import numpy as np
+import pandas as pd
 import pandera as pa
 from pydantic import validate_arguments
 
 from kolena._api.v1.detection import CustomMetrics
 from kolena._api.v1.detection import Metrics
 from kolena._api.v1.detection import TestRun as API
+from kolena._api.v1.workflow import WorkflowType
 from kolena._utils import krequests
 from kolena._utils import log
 from kolena._utils.batched_load import _BatchedLoader
+from kolena._utils.batched_load import BackgroundUploader
 from kolena._utils.batched_load import DFType
-from kolena._utils.batched_load import init_upload
-from kolena._utils.batched_load import upload_data_frame_chunk
+from kolena._utils.concurrency import iter_ordered
 from kolena._utils.consts import BatchSize
 from kolena._utils.datatypes import LoadableDataFrame
 from kolena._utils.frozen import Frozen
@@ -50,6 +61,7 @@ from kolena.detection._internal import BaseModel
 from kolena.detection._internal import BaseTestImage
 from kolena.detection._internal import BaseTestSuite
 from kolena.detection._internal import Inference
+from kolena.detection._internal.model import _SampleHydrator
 from kolena.detection._internal.model import SampleInferences
 from kolena.errors import CustomMetricsException
 from kolena.errors import IncorrectUsageError
@@ -82,12 +94,19 @@ class BaseTestRun(ABC, Frozen, WithTelemetry):
         config: Optional[Metrics.RunConfig] = None,
         custom_metrics_callback: Optional[CustomMetricsCallback[_TestImageClass, _InferenceClass]] = None,
         reset: bool = False,
+        custom_metrics_concurrency: int = 1,
+        custom_metrics_processes: bool = False,
     ):
         if model._workflow != test_suite._workflow:
             raise WorkflowMismatchError(
                 f"mismatching test suite workflow for model of type '{model._workflow}': '{test_suite._workflow}'",
             )
 
+        if custom_metrics_concurrency <= 0:
+            raise InputValidationError(
+                f"invalid custom_metrics_concurrency '{custom_metrics_concurrency}': expected positive integer",
+            )
+
         if reset:
             log.warn("overwriting existing inferences from this model (reset=True)")
         else:
@@ -110,9 +129,12 @@ class BaseTestRun(ABC, Frozen, WithTelemetry):
         self._locator_to_image_id: Dict[str, int] = {}
         self._inferences: Dict[int, List[Optional[Inference]]] = OrderedDict()
         self._ignored_image_ids: List[int] = []
-        self._upload_uuid: Optional[str] = None
+        self._staged_frames: List[pd.DataFrame] = []  # serializable frames staged by add_inferences_batch
+        self._uploader = BackgroundUploader()
         self._n_inferences = 0
         self._custom_metrics_callback: CustomMetricsCallback = custom_metrics_callback
+        self._custom_metrics_concurrency = custom_metrics_concurrency
+        self._custom_metrics_processes = custom_metrics_processes
         self._active = False
         self._reset = reset
         # note not calling self._freeze()
@@ -128,6 +150,7 @@ class BaseTestRun(ABC, Frozen, WithTelemetry):
         exc_tb: Optional[TracebackType],
     ) -> None:
         self._upload_chunk()
+        self._uploader.close()
         self._finalize_upload()
         self._submit_custom_metrics()
         self._active = False
@@ -165,7 +188,105 @@ class BaseTestRun(ABC, Frozen, WithTelemetry):
             self._inferences[image_id] = context_image_inferences
 
         if self._n_inferences >= BatchSize.UPLOAD_RESULTS.value:
-            self._upload_chunk()
+            self._upload_chunk(final=False)
+
+    def add_inferences_batch(
+        self,
+        locators: Sequence[str],
+        counts: Sequence[int],
+        labels: Sequence[str],
+        confidences: Sequence[float],
+        boxes: Optional[np.ndarray] = None,
+        ignored: Optional[Sequence[bool]] = None,
+    ) -> None:
+        """
+        Add inferences for a batch of test images to the test run results, equivalent to calling
+        [`add_inferences`][kolena.detection._internal.BaseTestRun.add_inferences] for each image. Inferences are
+        provided as ragged arrays, where the `counts[i]` inferences for the image at `locators[i]` directly follow the
+        inferences of the previous image in `labels`, `confidences`, and `boxes`:
+
+        ```python
+        # image "a.jpg" has two inferences, image "b.jpg" has none, image "c.jpg" has one
+        test_run.add_inferences_batch(
+            locators=["s3://bucket/a.jpg", "s3://bucket/b.jpg", "s3://bucket/c.jpg"],
+            counts=[2, 0, 1],
+            labels=["car", "bus", "car"],
+            confidences=[0.9, 0.4, 0.7],
+            boxes=np.array([[10, 10, 20, 20], [0, 0, 5, 5], [30, 30, 40, 40]]),
+        )
+        ```
+
+        Records are assembled column by column without constructing an inference object per box. Full chunks are
+        uploaded in the background, such that inference can continue while previous chunks are in flight.
+
+        :param locators: The locators of the images that inferences are evaluated on.
+        :param counts: The number of inferences for each image.
+        :param labels: The label of each inference.
+        :param confidences: The confidence score of each inference, between 0 and 1.
+        :param boxes: The `(N, 4)` array of bounding boxes of each inference, with rows of the form
+            `[top_left_x, top_left_y, bottom_right_x, bottom_right_y]`. Required for detection test runs and omitted
+            for classification test runs.
+        :param ignored: Optionally specify the images to ignore, equivalent to providing `None` inferences to
+            [`add_inferences`][kolena.detection._internal.BaseTestRun.add_inferences]. Ignored images must not have
+            any inferences.
+        """
+        self._assert_active()
+
+        image_ids = pd.Series(np.asarray(locators, dtype=object)).map(self._locator_to_image_id)
+        unrecognized = image_ids.isna().to_numpy()
+        if unrecognized.any():
+            raise InputValidationError(
+                f"Unrecognized locator '{locators[int(np.argmax(unrecognized))]}'. "
+                "Images must be loaded and processed in the same context",
+            )
+        counts = np.asarray(counts)
+        if counts.shape != (len(locators),) or (len(counts) > 0 and not np.issubdtype(counts.dtype, np.integer)):
+            raise InputValidationError("expected one integer count of inferences per locator")
+        if np.any(counts < 0):
+            raise InputValidationError("counts of inferences must be non-negative")
+        ignored = np.zeros(len(locators), dtype=bool) if ignored is None else np.asarray(ignored, dtype=bool)
+        if ignored.shape != (len(locators),):
+            raise InputValidationError("expected one value of 'ignored' per locator")
+        if np.any(counts[ignored] > 0):
+            raise InputValidationError("ignored images must not have inferences")
+
+        n_inferences = int(counts.sum())
+        labels = np.asarray(labels, dtype=object)
+        confidences = np.asarray(confidences, dtype=np.float64)
+        if labels.shape != (n_inferences,) or confidences.shape != (n_inferences,):
+            raise InputValidationError(f"expected {n_inferences} labels and confidences, one per inference")
+        if not all(label_type is str for label_type in set(map(type, labels))):
+            raise InputValidationError("labels must be strings")
+        if np.any(pd.Series(labels, dtype=object).str.strip().to_numpy() == ""):
+            raise InputValidationError("labels must contain non-whitespace characters")
+        if not np.all((confidences >= 0) & (confidences <= 1)):
+            raise InputValidationError("confidences must be between 0 and 1 (inclusive)")
+        if self._model._workflow == WorkflowType.DETECTION and boxes is None:
+            raise InputValidationError("boxes are required for detection inferences")
+        if self._model._workflow != WorkflowType.DETECTION and boxes is not None:
+            raise InputValidationError(f"boxes are not supported for {self._model._workflow.value.lower()} inferences")
+        if boxes is not None:
+            boxes = np.asarray(boxes, dtype=np.float64)
+            if boxes.shape != (n_inferences, 4):
+                raise InputValidationError(f"expected boxes of shape ({n_inferences}, 4), got {boxes.shape}")
+            if not np.all(np.isfinite(boxes)):
+                raise InputValidationError("boxes must be finite")
+
+        df_staged = self._ImageResultDataFrameClass.serializable_from_inference_arrays(
+            self._id,
+            self._model._id,
+            image_ids.to_numpy(dtype=np.int64),
+            counts,
+            ignored,
+            labels,
+            confidences,
+            boxes,
+        )
+        self._staged_frames.append(df_staged)
+        self._n_inferences += len(df_staged)
+
+        if self._n_inferences >= BatchSize.UPLOAD_RESULTS.value:
+            self._upload_chunk(final=False)
 
     @validate_arguments(config=ValidatorConfig)
     def iter_images(self) -> Iterator[_TestImageClass]:
@@ -212,35 +333,39 @@ class BaseTestRun(ABC, Frozen, WithTelemetry):
         )
 
     @validate_arguments(config=ValidatorConfig)
-    def _upload_chunk(self) -> None:
+    def _upload_chunk(self, final: bool = True) -> None:
         if self._n_inferences == 0:
             # Bail if this happens to being run by fencepost immediately after being run by add_inference
             return
 
-        log.info(f"uploading {self._n_inferences} inferences for test run")
-        if self._upload_uuid is None:
-            init_response = init_upload()
-            self._upload_uuid = init_response.uuid
-
-        df_chunk = self._ImageResultDataFrameClass.from_image_inference_mapping(
-            self._id,
-            self._model._id,
-            self._inferences,
-            self._ignored_image_ids,
-        )
-        df_chunk_serializable = df_chunk.as_serializable()
-        upload_data_frame_chunk(df_chunk_serializable, load_uuid=self._upload_uuid)
-        log.success(f"uploaded {self._n_inferences} inferences for test run")
-        self._n_inferences = 0
-        self._inferences = OrderedDict()
+        if len(self._inferences) > 0 or len(self._ignored_image_ids) > 0:
+            df_chunk = self._ImageResultDataFrameClass.from_image_inference_mapping(
+                self._id,
+                self._model._id,
+                self._inferences,
+                self._ignored_image_ids,
+            )
+            self._staged_frames.append(df_chunk.as_serializable())
+            self._inferences = OrderedDict()
+            self._ignored_image_ids = []
+
+        df_staged = pd.concat(self._staged_frames, ignore_index=True)
+        batch_size = BatchSize.UPLOAD_RESULTS.value
+        # only full chunks are uploaded until the final chunk, the remainder is carried over to the next chunk
+        n_upload = len(df_staged) if final else len(df_staged) - len(df_staged) % batch_size
+        log.info(f"uploading {n_upload} inferences for test run")
+        for start in range(0, n_upload, batch_size):
+            self._uploader.submit(df_staged.iloc[start : start + batch_size])
+        self._staged_frames = [df_staged.iloc[n_upload:]] if n_upload < len(df_staged) else []
+        self._n_inferences = len(df_staged) - n_upload
 
     def _finalize_upload(self) -> None:
-        if self._upload_uuid is None:
+        if self._uploader.uuid is None:
             # nothing was uploaded
             return
 
         log.info("finalizing inference upload for test run")
-        request = API.UploadImageResultsRequest(uuid=self._upload_uuid, test_run_id=self._id, reset=self._reset)
+        request = API.UploadImageResultsRequest(uuid=self._uploader.uuid, test_run_id=self._id, reset=self._reset)
         finalize_res = krequests.put(
             endpoint_path=API.Path.UPLOAD_IMAGE_RESULTS.value,
             data=json.dumps(dataclasses.asdict(request)),
@@ -259,32 +384,82 @@ class BaseTestRun(ABC, Frozen, WithTelemetry):
     @validate_arguments(config=ValidatorConfig)
     def _compute_custom_metrics(self) -> Dict[int, Dict[int, CustomMetrics]]:
         log.info("computing custom metrics for test run")
-        test_case_metrics = {}
         custom_metrics = {}  # { test_suite_id: { test_case_id: CustomMetrics } }
 
         test_suite = self._test_suite
         log.info(f"computing custom metrics for test suite '{test_suite.name}'")
-        test_suite_metrics = {}
-        all_inferences = self._model.load_inferences_by_test_case(test_suite)
-        for test_case in log.progress_bar(test_suite.test_cases):
-            test_case_id = test_case._id
-            if test_case_id not in test_case_metrics:
-                inferences = all_inferences.get(test_case_id, [])
-                try:
-                    test_case_metrics[test_case_id] = self._custom_metrics_callback(inferences)
-                except Exception as e:
-                    raise CustomMetricsException(
-                        f"Error encountered computing custom metrics for test case '{test_case.name}'",
-                    ) from e
-
-            test_suite_metrics[test_case_id] = test_case_metrics[test_case_id]
-
+        test_cases = OrderedDict((test_case._id, test_case) for test_case in test_suite.test_cases)
+        test_case_metrics: Dict[int, CustomMetrics] = {}
+
+        def compute(test_case_id: int, get_metrics: Callable[[], CustomMetrics]) -> None:
+            try:
+                test_case_metrics[test_case_id] = get_metrics()
+            except Exception as e:
+                raise CustomMetricsException(
+                    f"Error encountered computing custom metrics for test case '{test_cases[test_case_id].name}'",
+                ) from e
+
+        with closing(self._iter_custom_metrics(test_cases.keys())) as results:
+            for test_case_id, get_metrics in log.progress_bar(results, total=len(test_cases)):
+                compute(test_case_id, get_metrics)
+        for test_case_id in [
+            test_case_id for test_case_id in test_cases.keys() if test_case_id not in test_case_metrics
+        ]:
+            compute(test_case_id, functools.partial(self._custom_metrics_callback, []))
+
+        test_suite_metrics = {test_case_id: test_case_metrics[test_case_id] for test_case_id in test_cases.keys()}
         custom_metrics[test_suite._id] = test_suite_metrics
         log.success(f"computed custom metrics for test suite '{test_suite.name}'")
 
         log.success("computed custom metrics for test run")
         return custom_metrics
 
+    def _iter_custom_metrics(
+        self,
+        test_case_ids: Collection[int],
+    ) -> Iterator[Tuple[int, Callable[[], CustomMetrics]]]:
+        """
+        Yield a function retrieving the custom metrics of each test case with inferences among ``test_case_ids``.
+
+        Callbacks are run in a thread or process pool as the inferences of each test case are grouped, with at most
+        ``custom_metrics_concurrency`` test cases in flight at once. Any error raised by the callback is raised when the
+        returned function is called.
+        """
+        callback = self._custom_metrics_callback
+        concurrency = self._custom_metrics_concurrency
+        if not self._custom_metrics_processes:
+            groups = self._model.iter_inferences_by_test_case(self._test_suite)
+
+            def compute(group: Tuple[int, List[Any]]) -> Future:
+                future: Future = Future()
+                try:
+                    future.set_result(callback(group[1]))
+                except Exception as e:
+                    future.set_exception(e)
+                return future
+
+            results = iter_ordered(compute, (group for group in groups if group[0] in test_case_ids), concurrency)
+            for (test_case_id, _), future in results:
+                yield test_case_id, future.result
+            return
+
+        # samples are shipped to each worker process once, and each test case as an array of sample indices
+        df_samples, sample_groups = self._model._group_inferences_by_test_case(self._test_suite)
+        with ProcessPoolExecutor(
+            max_workers=concurrency,
+            initializer=_init_custom_metrics_worker,
+            initargs=(self._model, df_samples, callback),
+        ) as executor:
+
+            def submit(group: Tuple[int, np.ndarray]) -> Future:
+                future = executor.submit(_compute_custom_metrics_worker, group[1])
+                wait([future])
+                return future
+
+            groups = (group for group in sample_groups if group[0] in test_case_ids)
+            for (test_case_id, _), future in iter_ordered(submit, groups, concurrency):
+                yield test_case_id, future.result
+
     def _submit_custom_metrics(self) -> None:
         if self._custom_metrics_callback is None:
             return
@@ -298,3 +473,15 @@ class BaseTestRun(ABC, Frozen, WithTelemetry):
         )
         krequests.raise_for_status(res)
         log.success("computed and uploaded custom metrics for test run")
+
+
+_custom_metrics_worker_state: Dict[str, Any] = {}
+
+
+def _init_custom_metrics_worker(model: BaseModel, df_samples: pd.DataFrame, callback: CustomMetricsCallback) -> None:
+    _custom_metrics_worker_state.update(hydrate=_SampleHydrator(model, df_samples), callback=callback)
+
+
+def _compute_custom_metrics_worker(sample_indices: np.ndarray) -> CustomMetrics:
+    state = _custom_metrics_worker_state
+    return state["callback"](state["hydrate"](sample_indices))
@@ -53,6 +53,11 @@ class TestRun(BaseTestRun):
         The callback would be passed inferences of images in each testcase and should return a dictionary with metric
         name as key and metric value as value.
     :param reset: Overwrites existing inferences if set.
+    :param custom_metrics_concurrency: The number of test cases for which to compute custom metrics at once. Values
+        larger than 1 invoke `custom_metrics_callback` from a pool of threads.
+    :param custom_metrics_processes: Invoke `custom_metrics_callback` from a pool of `custom_metrics_concurrency`
+        processes rather than threads, e.g. for callbacks holding the GIL. The callback must then be picklable, e.g. a
+        module-level function.
     """
 
     _TestImageClass = TestImage
@@ -68,6 +73,8 @@ class TestRun(BaseTestRun):
         test_config: Optional[TestConfig] = None,
         custom_metrics_callback: Optional[CustomMetricsCallback[_TestImageClass, _InferenceClass]] = None,
         reset: bool = False,
+        custom_metrics_concurrency: int = 1,
+        custom_metrics_processes: bool = False,
     ):
         config = F1Optimal(iou_threshold=0.5) if test_config is None else test_config
         super().__init__(
@@ -76,6 +83,8 @@ class TestRun(BaseTestRun):
             config=config._to_run_config(),
             custom_metrics_callback=custom_metrics_callback,
             reset=reset,
+            custom_metrics_concurrency=custom_metrics_concurrency,
+            custom_metrics_processes=custom_metrics_processes,
         )
 
     def _image_from_load_image_record(self, record: Any) -> _TestImageClass:
@@ -96,6 +105,8 @@ def test(
     test_config: Optional[TestConfig] = None,
     custom_metrics_callback: Optional[CustomMetricsCallback[TestImage, Inference]] = None,
     reset: bool = False,
+    custom_metrics_concurrency: int = 1,
+    custom_metrics_processes: bool = False,
 ) -> None:
     """
     Test the provided [`InferenceModel`][kolena.detection.InferenceModel] on the provided
@@ -110,6 +121,11 @@ def test(
         The callback would be passed inferences of images in each testcase and should return a dictionary with metric
         name as key and metric value as value.
     :param reset: Overwrites existing inferences if set.
+    :param custom_metrics_concurrency: The number of test cases for which to compute custom metrics at once. Values
+        larger than 1 invoke `custom_metrics_callback` from a pool of threads.
+    :param custom_metrics_processes: Invoke `custom_metrics_callback` from a pool of `custom_metrics_concurrency`
+        processes rather than threads, e.g. for callbacks holding the GIL. The callback must then be picklable, e.g. a
+        module-level function.
     """
     with TestRun(
         model,
@@ -117,6 +133,8 @@ def test(
         test_config=test_config,
         custom_metrics_callback=custom_metrics_callback,
         reset=reset,
+        custom_metrics_concurrency=custom_metrics_concurrency,
+        custom_metrics_processes=custom_metrics_processes,
     ) as test_run:
         log.info("performing inference")
         for image in log.progress_bar(test_run.iter_images()):
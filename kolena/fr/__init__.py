@@ -14,6 +14,7 @@
 
 # noreorder
 from .datatypes import EmbeddingDataFrame
+from .datatypes import EmbeddingMatrix
 from .datatypes import ImageDataFrame
 from .datatypes import ImageResultDataFrame
 from .datatypes import PairDataFrame
@@ -30,6 +31,7 @@ from .test_run import test
 
 __all__ = [
     "EmbeddingDataFrame",
+    "EmbeddingMatrix",
     "ImageDataFrame",
     "ImageResultDataFrame",
     "PairDataFrame",
@@ -0,0 +1,142 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from typing import Iterator
+from typing import Optional
+from typing import Union
+
+import numpy as np
+import pandas as pd
+from pydantic.typing import Literal
+
+from kolena.errors import InputValidationError
+from kolena.fr.datatypes import EmbeddingDataFrame
+from kolena.fr.datatypes import EmbeddingMatrix
+from kolena.fr.datatypes import PairDataFrame
+
+SimilarityMetric = Literal["cosine", "l2"]
+SimilarityReduction = Literal["max", "all"]
+
+# upper bound on the number of embedding values gathered at once when computing a block of similarities
+_BLOCK_VALUES = 2**24
+
+
+def _similarities(
+    matrix: np.ndarray,
+    inverse_norms: Optional[np.ndarray],
+    rows_a: np.ndarray,
+    rows_b: np.ndarray,
+) -> np.ndarray:
+    """
+    Compute the similarity of each pair of embedding rows, gathering at most ``_BLOCK_VALUES`` values at a time: the
+    cosine similarity when the inverse norms of the rows are provided, otherwise the negated L2 distance.
+    """
+    similarities = np.empty(len(rows_a), dtype=np.float64)
+    block_size = max(1, _BLOCK_VALUES // max(1, matrix.shape[1]))
+    for start in range(0, len(rows_a), block_size):
+        block_a, block_b = rows_a[start : start + block_size], rows_b[start : start + block_size]
+        embeddings_a, embeddings_b = matrix[block_a], matrix[block_b]
+        if inverse_norms is not None:
+            dot = np.einsum("ij,ij->i", embeddings_a, embeddings_b)
+            similarities[start : start + block_size] = dot * inverse_norms[block_a] * inverse_norms[block_b]
+        else:
+            similarities[start : start + block_size] = -np.linalg.norm(embeddings_a - embeddings_b, axis=1)
+    return similarities
+
+
+def _inverse_norms(matrix: np.ndarray) -> np.ndarray:
+    inverse_norms = np.empty(len(matrix), dtype=np.float32)
+    block_size = max(1, _BLOCK_VALUES // max(1, matrix.shape[1]))
+    with np.errstate(divide="ignore"):  # zero vectors have undefined cosine similarity
+        for start in range(0, len(matrix), block_size):
+            block = matrix[start : start + block_size]
+            inverse_norms[start : start + block_size] = 1 / np.sqrt(np.einsum("ij,ij->i", block, block))
+    return inverse_norms
+
+
+def _pair_results(
+    embeddings: EmbeddingMatrix,
+    inverse_norms: Optional[np.ndarray],
+    df_pair: pd.DataFrame,
+    reduction: SimilarityReduction,
+) -> pd.DataFrame:
+    pair_ids = df_pair["image_pair_id"].to_numpy()
+    offsets_a, counts_a = embeddings.locate(df_pair["image_a_id"].to_numpy())
+    offsets_b, counts_b = embeddings.locate(df_pair["image_b_id"].to_numpy())
+
+    # expand each pair into the M x N combinations of its embeddings, in row-major order of (index_a, index_b)
+    n_combinations = counts_a * counts_b
+    pair_index = np.repeat(np.arange(len(pair_ids)), n_combinations)
+    pair_starts = np.cumsum(n_combinations) - n_combinations
+    combination = np.arange(len(pair_index)) - pair_starts[pair_index]
+    index_a, index_b = np.divmod(combination, counts_b[pair_index])
+    similarities = _similarities(
+        embeddings.matrix,
+        inverse_norms,
+        offsets_a[pair_index] + index_a,
+        offsets_b[pair_index] + index_b,
+    )
+
+    failed = n_combinations == 0  # either image failed to enroll
+    if reduction == "max":
+        similarity = np.full(len(pair_ids), np.nan)
+        if len(similarities) > 0:
+            similarity[~failed] = np.maximum.reduceat(similarities, pair_starts[~failed])
+        return pd.DataFrame(dict(image_pair_id=pair_ids, similarity=similarity))
+
+    n_failed = int(failed.sum())
+    return pd.DataFrame(
+        dict(
+            image_pair_id=np.concatenate([pair_ids[pair_index], pair_ids[failed]]),
+            similarity=np.concatenate([similarities, np.full(n_failed, np.nan)]),
+            # the pair result schema does not admit empty indices: failures are indicated by the empty similarity alone
+            embedding_a_index=np.concatenate([index_a, np.zeros(n_failed, dtype=np.int64)]),
+            embedding_b_index=np.concatenate([index_b, np.zeros(n_failed, dtype=np.int64)]),
+        ),
+    )
+
+
+def iter_pair_results(
+    df_embedding: Union[EmbeddingDataFrame, EmbeddingMatrix],
+    df_pair: PairDataFrame,
+    metric: SimilarityMetric = "cosine",
+    reduction: SimilarityReduction = "max",
+    batch_size: int = 1_000_000,
+) -> Iterator[pd.DataFrame]:
+    """
+    Compute the similarity of each of the provided image pairs from the provided embeddings, yielding pair result
+    frames for batches of at most ``batch_size`` pairs. All records for a given pair are yielded in the same frame.
+
+    Similarity is the cosine similarity or the negated Euclidean (L2) distance between two embeddings, computed in
+    float32. For images with multiple embeddings, the ``"max"`` reduction yields a single record per pair with the
+    highest similarity across all combinations of embeddings, while ``"all"`` yields one record per combination with
+    ``embedding_a_index`` and ``embedding_b_index`` populated. Pairs where either image failed to enroll yield a
+    single record with an empty similarity (and, for ``"all"``, embedding indices of 0).
+
+    Embeddings may be provided as an :class:`EmbeddingMatrix`, e.g. as yielded by ``TestRun.iter_remaining_pairs``, in
+    which case they are used in place rather than gathered into a new matrix.
+    """
+    if batch_size <= 0:
+        raise InputValidationError(f"invalid batch_size '{batch_size}': expected positive integer")
+    if metric not in ("cosine", "l2"):
+        raise InputValidationError(f"invalid metric '{metric}': expected 'cosine' or 'l2'")
+    if reduction not in ("max", "all"):
+        raise InputValidationError(f"invalid reduction '{reduction}': expected 'max' or 'all'")
+
+    if isinstance(df_embedding, EmbeddingMatrix):
+        embeddings = df_embedding
+    else:
+        embeddings = EmbeddingMatrix.from_embedding_data_frame(df_embedding)
+    inverse_norms = _inverse_norms(embeddings.matrix) if metric == "cosine" else None
+    for start in range(0, len(df_pair), batch_size):
+        yield _pair_results(embeddings, inverse_norms, df_pair.iloc[start : start + batch_size], reduction)
@@ -12,33 +12,37 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import io
-import math
+from typing import List
 from typing import Tuple
 
 import numpy as np
-import pandas as pd
 from PIL import Image
 from requests_toolbelt import MultipartEncoder
 
 from kolena._api.v1.fr import Asset as AssetAPI
 from kolena._utils import krequests
 from kolena._utils.asset_path_mapper import AssetPathMapper
+from kolena._utils.concurrency import iter_ordered
 from kolena._utils.consts import BatchSize
+from kolena._utils.consts import UPLOAD_CONCURRENCY
+from kolena._utils.tracing import count
+from kolena._utils.tracing import span
 from kolena.fr.datatypes import _ImageChipsDataFrame
 
 
-def upload_image_chips(df: _ImageChipsDataFrame, batch_size: int = BatchSize.UPLOAD_CHIPS.value) -> None:
-    def upload_batch(df_batch: _ImageChipsDataFrame) -> None:
-        df_batch = df_batch.reset_index(drop=True)  # reset indices so we match the signed_url indices
+def _encode_png(image: np.ndarray) -> io.BytesIO:
+    image_buf = io.BytesIO()
+    Image.fromarray(image).convert("RGB").save(image_buf, "png")
+    image_buf.seek(0)
+    return image_buf
 
-        def as_path_stub_and_buffer(row: pd.Series) -> Tuple[str, io.BytesIO]:
-            pil_image = Image.fromarray(row["image"]).convert("RGB")
-            image_buf = io.BytesIO()
-            pil_image.save(image_buf, "png")
-            image_buf.seek(0)
-            return AssetPathMapper.path_stub(row["test_run_id"], row["uuid"], row["image_id"], row["key"]), image_buf
 
-        data = MultipartEncoder(fields=[("files", as_path_stub_and_buffer(row)) for _, row in df_batch.iterrows()])
+def _upload_batch(files: List[Tuple[str, io.BytesIO]]) -> None:
+    # the multipart body is streamed from the encoded chips as it is sent rather than copied into a single buffer
+    data = MultipartEncoder(fields=[("files", file) for file in files])
+    with span("upload_chips", rows=len(files)):
+        count("requests")
+        count("bytes", data.len)
         upload_response = krequests.put(
             endpoint_path=AssetAPI.Path.BULK_UPLOAD.value,
             data=data,
@@ -46,7 +50,35 @@ def upload_image_chips(df: _ImageChipsDataFrame, batch_size: int = BatchSize.UPL
         )
         krequests.raise_for_status(upload_response)
 
-    num_chunks = math.ceil(len(df) / batch_size)
-    chunk_iter = np.array_split(df, num_chunks) if len(df) > 0 else []
-    for df_chunk in chunk_iter:
-        upload_batch(df_chunk)
+
+def upload_image_chips(
+    df: _ImageChipsDataFrame,
+    batch_size: int = BatchSize.UPLOAD_CHIPS.value,
+    max_workers: int = UPLOAD_CONCURRENCY,
+) -> None:
+    """
+    Upload the provided image chips as PNGs in bulk-upload requests of at most ``batch_size`` chips each.
+
+    Batches are PNG-encoded by up to ``max_workers`` threads and up to ``max_workers`` upload requests are kept in
+    flight at once, such that at most ``2 * max_workers`` encoded batches are held in memory.
+    """
+    path_stubs = [
+        AssetPathMapper.path_stub(test_run_id, uuid, image_id, key)
+        for test_run_id, uuid, image_id, key in zip(
+            df["test_run_id"].tolist(),
+            df["uuid"].tolist(),
+            df["image_id"].tolist(),
+            df["key"].tolist(),
+        )
+    ]
+    images = df["image"].tolist()
+
+    def encode_batch(start: int) -> List[Tuple[str, io.BytesIO]]:
+        with span("encode_chips", rows=min(batch_size, len(images) - start)):
+            end = start + batch_size
+            return list(zip(path_stubs[start:end], map(_encode_png, images[start:end])))
+
+    encoded_batches = (files for _, files in iter_ordered(encode_batch, range(0, len(df), batch_size), max_workers))
+    # consume the uploads in order such that any upload error is raised here
+    for _ in iter_ordered(_upload_batch, encoded_batches, max_workers):
+        pass
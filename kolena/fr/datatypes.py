@@ -15,10 +15,16 @@
 Schema declarations for the [Pandas DataFrames](https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.html) used
 in `kolena.fr`.
 """
+import dataclasses
+import itertools
 import json
+import operator
+from base64 import b64decode
 from typing import Any
+from typing import Callable
 from typing import cast
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
 from typing import Tuple
@@ -27,6 +33,7 @@ from typing import Type
 import numpy as np
 import pandas as pd
 import pandera as pa
+from pandas.api.types import is_integer_dtype
 from pandera.extensions import register_check_method
 from pandera.typing import Series
 
@@ -34,8 +41,13 @@ from kolena._utils.asset_path_mapper import AssetPathMapper
 from kolena._utils.dataframes.validators import validate_df_schema
 from kolena._utils.datatypes import LoadableDataFrame
 from kolena._utils.serde import deserialize_embedding_vector
-from kolena._utils.serde import serialize_embedding_vector
+from kolena._utils.serde import deserialize_embedding_vectors
+from kolena._utils.serde import npy_view
+from kolena._utils.serde import NpyHeader
+from kolena._utils.serde import NpyHeaderReader
+from kolena._utils.serde import serialize_embedding_vectors
 from kolena._utils.serde import with_serialized_columns
+from kolena.errors import InputValidationError
 
 
 __ALLOWED_INTEGRAL_DTYPES = {
@@ -79,59 +91,77 @@ JSONObject = object
 
 
 # note that all checks accept nulls -- rely on pandera to properly enforce nullability
-def _validate_ndarray(series: Series) -> bool:
-    return series.dropna().apply(lambda cell: isinstance(cell, np.ndarray)).all()
+# checks inspect the distinct types, dtypes, and shapes of all cells en masse rather than validating cell by cell
+_dtype_and_shape_of = operator.attrgetter("dtype", "shape")
+
+
+def _all_instances(cells: Iterable[Any], cls: type) -> bool:
+    return all(issubclass(cell_type, cls) for cell_type in set(map(type, cells)))
+
+
+def _non_null_cells(series: Series, cls: type) -> Optional[np.ndarray]:
+    """Return the non-null cells of the series if all are instances of ``cls``, otherwise ``None``."""
+    cells = series.to_numpy(dtype=object)
+    if _all_instances(cells, cls):  # no nulls present, skip null detection
+        return cells
+    cells = series.dropna().to_numpy(dtype=object)
+    return cells if _all_instances(cells, cls) else None
+
+
+def _validate_ndarrays(
+    series: Series,
+    validate_dtype: Callable[[np.dtype], bool] = lambda _: True,
+    validate_shape: Callable[[Tuple[int, ...]], bool] = lambda _: True,
+) -> bool:
+    cells = _non_null_cells(series, np.ndarray)
+    if cells is None:
+        return False
+    return all(validate_dtype(dtype) and validate_shape(shape) for dtype, shape in set(map(_dtype_and_shape_of, cells)))
 
 
 @register_check_method()
 def _validate_bounding_box(series: Series) -> bool:
-    def validate_cell(cell: np.ndarray) -> bool:
-        return cell.dtype in __ALLOWED_NUMERIC_DTYPES and cell.shape == (4,)
-
-    return _validate_ndarray(series) and series.dropna().apply(validate_cell).all()
+    return _validate_ndarrays(series, lambda dtype: dtype in __ALLOWED_NUMERIC_DTYPES, lambda shape: shape == (4,))
 
 
 @register_check_method()
 def _validate_landmarks(series: Series) -> bool:
-    def validate_cell(cell: np.ndarray) -> bool:
-        return cell.dtype in __ALLOWED_NUMERIC_DTYPES and cell.shape == (10,)
-
-    return _validate_ndarray(series) and series.dropna().apply(validate_cell).all()
+    return _validate_ndarrays(series, lambda dtype: dtype in __ALLOWED_NUMERIC_DTYPES, lambda shape: shape == (10,))
 
 
 @register_check_method()
 def _validate_rgb_image(series: Series) -> bool:
-    def validate_cell(cell: np.ndarray) -> bool:
-        return cell.dtype == np.uint8 and len(cell.shape) == 3 and cell.shape[2] == 3
-
-    return _validate_ndarray(series) and series.dropna().apply(validate_cell).all()
+    return _validate_ndarrays(series, lambda dtype: dtype == np.uint8, lambda shape: len(shape) == 3 and shape[2] == 3)
 
 
 @register_check_method()
 def _validate_embedding_vector(series: Series) -> bool:
-    return _validate_ndarray(series)
+    return _validate_ndarrays(series)
 
 
 @register_check_method()
 def _validate_optional_dimension(series: Series) -> bool:
     # treat -1 as the value for "not specified"
-    return (
-        series.dropna().apply(lambda cell: type(cell) in __ALLOWED_INTEGRAL_DTYPES and (cell > 0 or cell == -1)).all()
-    )
+    values = series.dropna()
+    if is_integer_dtype(values.dtype):
+        return bool(((values > 0) | (values == -1)).all())
+    return values.apply(lambda cell: type(cell) in __ALLOWED_INTEGRAL_DTYPES and (cell > 0 or cell == -1)).all()
 
 
 @register_check_method()
 def _validate_json_object(series: Series) -> bool:
     # TODO: more detailed validation? validate that each cell can serialize to JSON
-    return series.dropna().apply(lambda cell: isinstance(cell, dict)).all()
+    return _non_null_cells(series, dict) is not None
 
 
 @register_check_method()
 def _validate_tags(series: Series) -> bool:
-    def is_dict_str_str(cell: dict) -> bool:
-        return all(isinstance(k, str) and isinstance(v, str) for k, v in cell.items())
-
-    return series.dropna().apply(lambda cell: isinstance(cell, dict) and is_dict_str_str(cell)).all()
+    cells = _non_null_cells(series, dict)
+    if cells is None:
+        return False
+    keys = itertools.chain.from_iterable(map(dict.keys, cells))
+    values = itertools.chain.from_iterable(map(dict.values, cells))
+    return _all_instances(keys, str) and _all_instances(values, str)
 
 
 def _as_json(value: Optional[Any]) -> Optional[str]:
@@ -375,6 +405,29 @@ class ImageResultDataFrame(pa.typing.DataFrame[ImageResultDataFrameSchema]):
     ...
 
 
+def _serialize_non_null(series: pd.Series, serialize: Callable[[List[Any]], List[str]]) -> pd.Series:
+    """Serialize the non-null cells of the series in one call, leaving null cells as ``None``."""
+    mask = series.notna().to_numpy()
+    serialized = np.full(len(series), None, dtype=object)
+    if mask.any():
+        serialized[mask] = serialize(series[mask].tolist())
+    return pd.Series(serialized, index=series.index)
+
+
+def _serialize_arrays(arrays: List[np.ndarray]) -> List[str]:
+    """
+    JSON-serialize the provided arrays. Arrays sharing a single dtype and shape are converted to lists with one call
+    rather than one call per array.
+    """
+    if len(set(map(_dtype_and_shape_of, arrays))) != 1:
+        return [json.dumps(array.tolist()) for array in arrays]
+    stacked = np.stack(arrays)
+    if stacked.dtype.kind in "iu" or (stacked.dtype.kind == "f" and np.isfinite(stacked).all()):
+        # the repr of a (nested) list of ints or finite floats is identical to its JSON encoding
+        return [repr(values) for values in stacked.tolist()]
+    return [json.dumps(values) for values in stacked.tolist()]
+
+
 class _ResultStageFrame(pa.typing.DataFrame[_ResultStageFrameSchema]):
     @classmethod
     def from_image_result_data_frame(
@@ -384,52 +437,49 @@ class _ResultStageFrame(pa.typing.DataFrame[_ResultStageFrameSchema]):
         df: ImageResultDataFrame,
         path_mapper: AssetPathMapper,
     ) -> "_ResultStageFrame":
+        image_ids = df["image_id"].tolist()
+        asset_masks = [
+            (key, df[f"{key}_input_image"].notna().tolist())
+            for key in ["landmarks", "quality", "fr"]
+            if f"{key}_input_image" in df.columns
+        ]
+        assets = [
+            json.dumps(
+                {
+                    f"{key}_input_image": path_mapper.absolute_locator(
+                        test_run_id=test_run_id,
+                        load_uuid=load_uuid,
+                        image_id=image_id,
+                        key=key,
+                    )
+                    for key, mask in asset_masks
+                    if mask[i]
+                },
+            )
+            for i, image_id in enumerate(image_ids)
+        ]
+        # this works because both quality and acceptability are float types
+        metadata_columns = [
+            (key, df[key].tolist(), df[key].notna().tolist())
+            for key in ["quality", "acceptability"]
+            if key in df.columns
+        ]
+        metadata = [
+            json.dumps({key: values[i] for key, values, mask in metadata_columns if mask[i]})
+            for i in range(len(image_ids))
+        ]
+
         df_stage = pd.DataFrame(
             dict(
                 test_run_id=test_run_id,
                 image_id=df["image_id"],
-                bbox=[
-                    json.dumps(record.bounding_box.tolist())
-                    if "bounding_box" in df.columns and record.bounding_box is not None
-                    else None
-                    for record in df.itertuples()
-                ],
-                lmks=[
-                    json.dumps(record.landmarks.tolist())
-                    if "landmarks" in df.columns and record.landmarks is not None
-                    else None
-                    for record in df.itertuples()
-                ],
-                embedding=[
-                    serialize_embedding_vector(record.embedding) if record.embedding is not None else None
-                    for record in df.itertuples()
-                ],
-                assets=[
-                    json.dumps(
-                        {
-                            f"{key}_input_image": path_mapper.absolute_locator(
-                                test_run_id=test_run_id,
-                                load_uuid=load_uuid,
-                                image_id=getattr(record, "image_id"),
-                                key=key,
-                            )
-                            for key in ["landmarks", "quality", "fr"]
-                            if f"{key}_input_image" in df.columns and getattr(record, f"{key}_input_image") is not None
-                        },
-                    )
-                    for record in df.itertuples()
-                ],
-                metadata=[
-                    json.dumps(
-                        {
-                            key: getattr(record, key)
-                            for key in ["quality", "acceptability"]
-                            # this works because both quality and acceptability are float types
-                            if key in df.columns and not pd.isna(getattr(record, key))
-                        },
-                    )
-                    for record in df.itertuples()
-                ],
+                bbox=_serialize_non_null(df["bounding_box"], _serialize_arrays)
+                if "bounding_box" in df.columns
+                else None,
+                lmks=_serialize_non_null(df["landmarks"], _serialize_arrays) if "landmarks" in df.columns else None,
+                embedding=_serialize_non_null(df["embedding"], serialize_embedding_vectors),
+                assets=assets,
+                metadata=metadata,
                 failure_reason=df["failure_reason"] if "failure_reason" in df.columns else [None] * len(df),
             ),
         )
@@ -476,25 +526,189 @@ class EmbeddingDataFrame(pa.typing.DataFrame[EmbeddingDataFrameSchema], Loadable
 
     @classmethod
     def from_serializable(cls, df: pd.DataFrame) -> "EmbeddingDataFrame":
+        # prevented from including both embeddings and None (FTE) for an image during ingest
+        df_present = df[df["embedding"].notna()]
+        embeddings_by_id: Dict[int, List[np.ndarray]] = {}
+        for image_id, embedding in zip(
+            df_present["image_id"].tolist(),
+            deserialize_embedding_vectors(df_present["embedding"].tolist()),
+        ):
+            embeddings_by_id.setdefault(int(image_id), []).append(embedding)
+
         records: List[Tuple[int, Optional[np.ndarray]]] = []
-        for image_id, df_embedding in df.groupby("image_id"):
-            image_id_int = int(image_id)  # type: ignore
-            embeddings = [  # prevented from including both embeddings and None (FTE) during ingest
-                deserialize_embedding_vector(record.embedding)
-                for record in df_embedding.itertuples()
-                if record.embedding is not None
-            ]
+        for image_id in sorted({int(image_id) for image_id in df["image_id"].tolist()}):
+            embeddings = embeddings_by_id.get(image_id, [])
             if len(embeddings) == 0:
-                records.append((image_id_int, None))
+                records.append((image_id, None))
             elif len(embeddings) == 1:
-                records.append((image_id_int, embeddings[0]))
+                records.append((image_id, embeddings[0]))
             else:
                 embeddings_arr = np.concatenate([embedding.reshape(1, len(embedding)) for embedding in embeddings])
-                records.append((image_id_int, embeddings_arr))
+                records.append((image_id, embeddings_arr))
         df_stage = pd.DataFrame(records, columns=["image_id", "embedding"])
         return cast(EmbeddingDataFrame, validate_df_schema(df_stage, EmbeddingDataFrameSchema, trusted=True))
 
 
+def _embedding_dimension(shapes: Iterable[Tuple[int, ...]]) -> int:
+    dimensions = set()
+    for shape in shapes:
+        if len(shape) not in (1, 2):
+            raise InputValidationError(f"invalid embedding shape {shape}: expected one or two dimensions")
+        dimensions.add(shape[-1])
+    if len(dimensions) > 1:
+        raise InputValidationError(f"embeddings must share a single dimension, found: {sorted(dimensions)}")
+    return dimensions.pop() if len(dimensions) > 0 else 0
+
+
+@dataclasses.dataclass(frozen=True)
+class EmbeddingMatrix:
+    """
+    The embeddings of a set of images gathered into a single contiguous `(n_embeddings, dimension)` matrix, as an
+    alternative to the one-array-per-image representation of an [`EmbeddingDataFrame`][kolena.fr.EmbeddingDataFrame].
+
+    The embeddings of the image at position `i` are the rows `matrix[offsets[i] : offsets[i] + counts[i]]`. Images that
+    failed to enroll have a count of 0.
+    """
+
+    image_ids: np.ndarray
+    """The IDs of the images, in ascending order."""
+
+    offsets: np.ndarray
+    """The index of the first row in `matrix` of each image's embeddings."""
+
+    counts: np.ndarray
+    """The number of embeddings extracted from each image."""
+
+    matrix: np.ndarray
+    """
+    The embeddings of all images, one per row. When written to disk, this is a memory-mapped array backed by an `.npy`
+    file readable via `np.load`.
+    """
+
+    def __len__(self) -> int:
+        return len(self.image_ids)
+
+    def embeddings(self, image_id: int) -> Optional[np.ndarray]:
+        """
+        Return a view of the `(count, dimension)` embeddings of the provided image, or `None` for a failure to enroll.
+        """
+        offsets, counts = self.locate(np.array([image_id]))
+        return self.matrix[offsets[0] : offsets[0] + counts[0]] if counts[0] > 0 else None
+
+    def locate(self, image_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the row offsets and embedding counts of the provided images.
+
+        :raises InputValidationError: Any of the provided images is not present in this matrix.
+        """
+        positions = np.searchsorted(self.image_ids, image_ids).clip(max=max(len(self.image_ids) - 1, 0))
+        found = self.image_ids[positions] == image_ids if len(self.image_ids) > 0 else np.zeros(len(image_ids), bool)
+        if not found.all():
+            missing = np.unique(image_ids[~found]).tolist()
+            raise InputValidationError(f"no embedding record for image_id(s): {missing[:10]}")
+        return self.offsets[positions], self.counts[positions]
+
+    def to_embedding_data_frame(self) -> EmbeddingDataFrame:
+        """
+        Convert to an [`EmbeddingDataFrame`][kolena.fr.EmbeddingDataFrame] whose cells are views into `matrix`, with
+        one-dimensional cells for images with a single embedding.
+        """
+        embeddings = [
+            None if count == 0 else self.matrix[offset] if count == 1 else self.matrix[offset : offset + count]
+            for offset, count in zip(self.offsets.tolist(), self.counts.tolist())
+        ]
+        df = pd.DataFrame(dict(image_id=self.image_ids, embedding=embeddings))
+        return cast(EmbeddingDataFrame, validate_df_schema(df, EmbeddingDataFrameSchema, trusted=True))
+
+    @classmethod
+    def from_embedding_data_frame(
+        cls,
+        df: EmbeddingDataFrame,
+        dtype: np.dtype = np.float32,
+    ) -> "EmbeddingMatrix":
+        """
+        Gather the embeddings of the provided [`EmbeddingDataFrame`][kolena.fr.EmbeddingDataFrame] into a matrix.
+
+        :raises InputValidationError: The frame contains multiple records for an image, or embeddings of different
+            dimensions.
+        """
+        image_ids = df["image_id"].to_numpy(dtype=np.int64)
+        order = np.argsort(image_ids, kind="stable")
+        image_ids = image_ids[order]
+        if (np.diff(image_ids) == 0).any():
+            duplicates = np.unique(image_ids[1:][np.diff(image_ids) == 0]).tolist()
+            raise InputValidationError(f"duplicate embedding records for image_id(s): {duplicates[:10]}")
+
+        cells = df["embedding"].to_numpy(dtype=object)[order]
+        embeddings = [np.atleast_2d(cell) for cell in cells if cell is not None]
+        counts = np.array([len(np.atleast_2d(cell)) if cell is not None else 0 for cell in cells], dtype=np.int64)
+        dimension = _embedding_dimension(embedding.shape for embedding in embeddings)
+        matrix = np.empty((int(counts.sum()), dimension), dtype=dtype)
+        if len(embeddings) > 0:
+            np.concatenate(embeddings, out=matrix, casting="unsafe")
+        return cls(image_ids=image_ids, offsets=np.cumsum(counts) - counts, counts=counts, matrix=matrix)
+
+    @classmethod
+    def from_serializable(
+        cls,
+        df: pd.DataFrame,
+        path: Optional[str] = None,
+        dtype: np.dtype = np.float32,
+    ) -> "EmbeddingMatrix":
+        """
+        Decode the serialized embeddings of a downloaded batch, with one base64-encoded npy blob per record, directly
+        into a preallocated matrix. Multiple records for the same image are gathered in order.
+
+        :param df: The serialized embeddings, with `image_id` and `embedding` columns.
+        :param path: Optionally write the matrix to an `.npy` file at this path and memory-map it, rather than holding
+            it in memory.
+        :param dtype: The dtype of the matrix.
+        :raises InputValidationError: The embeddings have different dimensions.
+        """
+        image_ids = df["image_id"].to_numpy(dtype=np.int64)
+        order = np.argsort(image_ids, kind="stable")
+        image_ids = image_ids[order]
+        blobs = df["embedding"].to_numpy(dtype=object)[order]
+
+        # first pass: size the matrix from the npy headers alone, decoding only the leading bytes of each blob
+        reader = NpyHeaderReader()
+        headers: Dict[int, Tuple[int, Optional[NpyHeader]]] = {}
+        fallbacks: Dict[int, np.ndarray] = {}  # arrays whose headers cannot be read directly
+        rows = np.zeros(len(blobs), dtype=np.int64)
+        shapes = []
+        for i, blob in enumerate(blobs):
+            if not isinstance(blob, str):  # a failure to enroll
+                continue
+            headers[i] = reader.read(blob)
+            header = headers[i][1]
+            if header is None:
+                fallbacks[i] = deserialize_embedding_vector(blob)
+            shape = header[1] if header is not None else fallbacks[i].shape
+            rows[i] = shape[0] if len(shape) == 2 else 1
+            shapes.append(shape)
+
+        dimension = _embedding_dimension(shapes)
+        row_offsets = np.cumsum(rows) - rows
+        shape = (int(rows.sum()), dimension)
+        if path is None:
+            matrix = np.empty(shape, dtype=dtype)
+        else:
+            matrix = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+
+        # second pass: decode each blob directly into its rows of the matrix
+        for i, (header_length, header) in headers.items():
+            if rows[i] == 0:
+                continue
+            array = fallbacks[i] if header is None else npy_view(b64decode(blobs[i]), header_length, header)
+            matrix[row_offsets[i] : row_offsets[i] + rows[i]] = array.reshape(rows[i], dimension)
+        if isinstance(matrix, np.memmap):
+            matrix.flush()
+
+        unique_ids, starts = np.unique(image_ids, return_index=True)
+        counts = np.add.reduceat(rows, starts) if len(rows) > 0 else np.zeros(0, dtype=np.int64)
+        return cls(image_ids=unique_ids, offsets=row_offsets[starts], counts=counts, matrix=matrix)
+
+
 class PairDataFrame(pa.typing.DataFrame[PairDataFrameSchema], LoadableDataFrame["PairDataFrame"]):
     @classmethod
     def get_schema(cls) -> Type[PairDataFrameSchema]:
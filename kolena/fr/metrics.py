@@ -0,0 +1,472 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Streaming verification metrics computed from pair results, e.g. as returned by
+[`Model.iter_pair_results`][kolena.fr.Model.iter_pair_results].
+
+Pair results are consumed batch by batch into a [`ScoreDistribution`][kolena.fr.metrics.ScoreDistribution] of genuine
+and imposter similarity scores, from which thresholds at target false match rates (FMR), the corresponding false
+non-match rates (FNMR), and DET/ROC curves are computed without holding the pair results in memory:
+
+```python
+from kolena.fr.metrics import ScoreDistribution
+
+distribution = ScoreDistribution()
+for df_batch in model.iter_pair_results(test_case):
+    distribution.update(df_batch)
+metrics = distribution.metrics_at_fmr([1e-4, 1e-3, 1e-2])
+```
+
+An image pair is considered a match when its similarity score is greater than or equal to the threshold. Pairs where
+either image failed to enroll (FTE), i.e. with a null similarity score, never match: genuine FTE pairs are always
+counted as false non-matches. Pairs with multiple records in a batch, e.g. one per pair of embeddings when multiple
+embeddings are extracted per image, are counted once with their highest similarity score.
+"""
+import dataclasses
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+from kolena.errors import InputValidationError
+from kolena.fr.model import Model
+from kolena.fr.test_case import TestCase
+
+DEFAULT_BINS = 2**16
+"""Default number of histogram bins used by [`ScoreDistribution`][kolena.fr.metrics.ScoreDistribution]."""
+
+DEFAULT_FMRS = tuple(np.logspace(-6, 0, 61).tolist())
+"""Default target false match rates at which DET/ROC curves are computed, log-spaced from `1e-6` to `1`."""
+
+# tolerance when mapping thresholds onto histogram bin edges, absorbing floating point error in edge computation
+_EDGE_TOLERANCE = 1e-9
+
+
+@dataclasses.dataclass(frozen=True)
+class ThresholdMetrics:
+    """Verification metrics at a single similarity score threshold."""
+
+    target_fmr: float
+    """The target false match rate from which the threshold was computed."""
+
+    threshold: float
+    """The similarity score threshold, at or above which an image pair is considered a match."""
+
+    fmr: float
+    """The false match rate at the threshold, i.e. the fraction of imposter pairs considered a match."""
+
+    fnmr: float
+    """The false non-match rate at the threshold, i.e. the fraction of genuine pairs not considered a match."""
+
+
+@dataclasses.dataclass(frozen=True)
+class ErrorTradeoffCurve:
+    """
+    Detection error tradeoff (DET) curve, plotting FNMR against FMR over a series of thresholds. The corresponding ROC
+    curve plots the true match rate, `1 - fnmr`, against FMR.
+    """
+
+    thresholds: np.ndarray
+    """The similarity score thresholds at which the curve is evaluated, in ascending order of FMR."""
+
+    fmr: np.ndarray
+    """The false match rate at each threshold."""
+
+    fnmr: np.ndarray
+    """The false non-match rate at each threshold."""
+
+    @property
+    def tmr(self) -> np.ndarray:
+        """The true match rate, `1 - fnmr`, at each threshold."""
+        return 1 - self.fnmr
+
+
+class _SortedRuns:
+    """
+    Scores held as sorted runs, merged pairwise whenever a run is at least as long as the run before it such that at
+    most a logarithmic number of runs is held at once.
+    """
+
+    def __init__(self) -> None:
+        self._runs: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return sum(len(run) for run in self._runs)
+
+    def add(self, scores: np.ndarray) -> None:
+        if len(scores) == 0:
+            return
+        self._runs.append(np.sort(scores))
+        while len(self._runs) > 1 and len(self._runs[-2]) <= len(self._runs[-1]):
+            self._merge_last()
+
+    def merge(self, other: "_SortedRuns") -> None:
+        for run in other._runs:
+            self.add(run)
+
+    def sorted(self) -> np.ndarray:
+        while len(self._runs) > 1:
+            self._merge_last()
+        return self._runs[0] if len(self._runs) > 0 else np.empty(0, dtype=np.float64)
+
+    def count_at_or_above(self, thresholds: np.ndarray) -> np.ndarray:
+        scores = self.sorted()
+        return len(scores) - np.searchsorted(scores, thresholds, side="left")
+
+    def _merge_last(self) -> None:
+        run = self._runs.pop()
+        # a stable sort of two concatenated sorted runs is a linear-time merge
+        self._runs[-1] = np.sort(np.concatenate([self._runs[-1], run]), kind="stable")
+
+
+class ScoreDistribution:
+    """
+    Distribution of the similarity scores of genuine and imposter image pairs, accumulated batch by batch.
+
+    By default, scores are counted into a fixed-resolution histogram of `bins` bins spanning `score_range`, such that
+    memory use is independent of the number of pairs and thresholds are resolved to the nearest bin edge. Scores
+    outside of `score_range` are counted in the outermost bins. Thresholds are chosen conservatively, such that the FMR
+    at the threshold never exceeds the target FMR.
+
+    When `bins` is `None`, all scores are instead retained as sorted runs and metrics are exact, at the cost of memory
+    linear in the number of pairs.
+
+    :param bins: The number of histogram bins, or `None` to retain all scores for exact metrics.
+    :param score_range: The `(min, max)` range of similarity scores spanned by the histogram.
+    """
+
+    bins: Optional[int]
+    score_range: Tuple[float, float]
+
+    n_genuine: int
+    """The number of genuine pairs, including pairs that failed to enroll."""
+
+    n_imposter: int
+    """The number of imposter pairs, including pairs that failed to enroll."""
+
+    n_genuine_fte: int
+    """The number of genuine pairs where either image failed to enroll."""
+
+    n_imposter_fte: int
+    """The number of imposter pairs where either image failed to enroll."""
+
+    def __init__(self, bins: Optional[int] = DEFAULT_BINS, score_range: Tuple[float, float] = (-1.0, 1.0)) -> None:
+        if bins is not None and bins <= 0:
+            raise InputValidationError(f"invalid bins '{bins}': expected positive integer")
+        low, high = score_range
+        if not low < high:
+            raise InputValidationError(f"invalid score_range '{score_range}': expected (min, max)")
+        self.bins = bins
+        self.score_range = (float(low), float(high))
+        self.n_genuine = 0
+        self.n_imposter = 0
+        self.n_genuine_fte = 0
+        self.n_imposter_fte = 0
+        if bins is not None:
+            self._genuine_counts = np.zeros(bins, dtype=np.int64)
+            self._imposter_counts = np.zeros(bins, dtype=np.int64)
+        else:
+            self._genuine_runs = _SortedRuns()
+            self._imposter_runs = _SortedRuns()
+
+    def update(
+        self,
+        pair_results: Union[pd.DataFrame, np.ndarray, Sequence[Optional[float]]],
+        is_same: Optional[Union[np.ndarray, Sequence[bool]]] = None,
+    ) -> None:
+        """
+        Add a batch of pair results to the distribution.
+
+        :param pair_results: A DataFrame of pair results with `similarity` and `is_same` columns, e.g. as yielded by
+            [`Model.iter_pair_results`][kolena.fr.Model.iter_pair_results], or an array of similarity scores with
+            null or `NaN` scores for pairs that failed to enroll. When a DataFrame with an `image_pair_id` column holds
+            multiple records for a pair, e.g. one per pair of embeddings, the pair is counted once with the highest of
+            its similarity scores. All records of a pair must then be provided in the same batch.
+        :param is_same: Whether each pair is genuine (`True`) or imposter (`False`). Omitted when a DataFrame is
+            provided.
+        """
+        if isinstance(pair_results, pd.DataFrame):
+            if is_same is not None:
+                raise InputValidationError("'is_same' must be omitted when providing a DataFrame")
+            if "image_pair_id" in pair_results.columns and pair_results["image_pair_id"].duplicated().any():
+                pair_results = _max_similarity_per_pair(pair_results)
+            similarity, is_same = pair_results["similarity"], pair_results["is_same"]
+        elif is_same is None:
+            raise InputValidationError("'is_same' is required when providing similarity scores")
+        else:
+            similarity = pair_results
+
+        scores = pd.to_numeric(pd.Series(similarity), errors="raise").to_numpy(dtype=np.float64, na_value=np.nan)
+        genuine = np.asarray(is_same, dtype=bool)
+        if scores.shape != genuine.shape:
+            raise InputValidationError(
+                f"mismatched lengths for similarity ({len(scores)}) and is_same ({len(genuine)})",
+            )
+
+        enrolled = ~np.isnan(scores)
+        n_genuine = int(np.count_nonzero(genuine))
+        n_genuine_enrolled = int(np.count_nonzero(genuine & enrolled))
+        n_imposter_enrolled = int(np.count_nonzero(enrolled)) - n_genuine_enrolled
+        self.n_genuine += n_genuine
+        self.n_imposter += len(scores) - n_genuine
+        self.n_genuine_fte += n_genuine - n_genuine_enrolled
+        self.n_imposter_fte += len(scores) - n_genuine - n_imposter_enrolled
+
+        genuine_scores, imposter_scores = scores[genuine & enrolled], scores[~genuine & enrolled]
+        if self.bins is not None:
+            self._genuine_counts += np.bincount(self._bin_indices(genuine_scores), minlength=self.bins)
+            self._imposter_counts += np.bincount(self._bin_indices(imposter_scores), minlength=self.bins)
+        else:
+            self._genuine_runs.add(genuine_scores)
+            self._imposter_runs.add(imposter_scores)
+
+    def merge(self, other: "ScoreDistribution") -> "ScoreDistribution":
+        """
+        Merge the provided distribution into this one, e.g. to combine the distributions of multiple test cases.
+
+        :param other: A distribution with the same `bins` and `score_range` as this distribution.
+        :return: This distribution.
+        """
+        if other.bins != self.bins or other.score_range != self.score_range:
+            raise InputValidationError("unable to merge distributions with different bins or score_range")
+        self.n_genuine += other.n_genuine
+        self.n_imposter += other.n_imposter
+        self.n_genuine_fte += other.n_genuine_fte
+        self.n_imposter_fte += other.n_imposter_fte
+        if self.bins is not None:
+            self._genuine_counts += other._genuine_counts
+            self._imposter_counts += other._imposter_counts
+        else:
+            self._genuine_runs.merge(other._genuine_runs)
+            self._imposter_runs.merge(other._imposter_runs)
+        return self
+
+    def thresholds_at_fmr(self, fmrs: Sequence[float]) -> np.ndarray:
+        """
+        Compute the lowest threshold at which the FMR does not exceed each of the target FMRs.
+
+        :param fmrs: The target false match rates, each between `0` and `1`.
+        :return: The threshold for each target FMR. `inf` when there are no imposter pairs.
+        """
+        targets = np.asarray(fmrs, dtype=np.float64)
+        if not np.all((targets >= 0) & (targets <= 1)):
+            raise InputValidationError(f"invalid target FMRs '{list(fmrs)}': expected values between 0 and 1")
+        # the number of false matches allowed at each target, of which FTE pairs never contribute
+        allowed = np.floor(targets * self.n_imposter + _EDGE_TOLERANCE).astype(np.int64)
+        if self.n_imposter == 0:
+            return np.full(len(targets), np.inf)
+
+        if self.bins is not None:
+            edges = self._edges()
+            at_or_above = self._suffix_counts(self._imposter_counts)  # non-increasing with edge index
+            # first edge at which the number of imposter pairs at or above the edge is within the allowance
+            edge_indices = np.searchsorted(-at_or_above, -allowed, side="left")
+            return edges[edge_indices]
+
+        scores = self._imposter_runs.sorted()
+        thresholds = np.full(len(targets), -np.inf)
+        limited = allowed < len(scores)
+        # just above the highest imposter score that would exceed the allowance
+        thresholds[limited] = np.nextafter(scores[len(scores) - 1 - allowed[limited]], np.inf)
+        return thresholds
+
+    def fmr(self, thresholds: Sequence[float]) -> np.ndarray:
+        """
+        Compute the false match rate at each of the provided thresholds.
+
+        :param thresholds: The similarity score thresholds.
+        :return: The fraction of imposter pairs with similarity at or above each threshold. `NaN` when there are no
+            imposter pairs.
+        """
+        matches = self._count_at_or_above(np.asarray(thresholds, dtype=np.float64), genuine=False)
+        return matches / self.n_imposter if self.n_imposter > 0 else np.full(len(matches), np.nan)
+
+    def fnmr(self, thresholds: Sequence[float]) -> np.ndarray:
+        """
+        Compute the false non-match rate at each of the provided thresholds.
+
+        :param thresholds: The similarity score thresholds.
+        :return: The fraction of genuine pairs with similarity below each threshold or that failed to enroll. `NaN` when
+            there are no genuine pairs.
+        """
+        matches = self._count_at_or_above(np.asarray(thresholds, dtype=np.float64), genuine=True)
+        return 1 - matches / self.n_genuine if self.n_genuine > 0 else np.full(len(matches), np.nan)
+
+    def metrics_at_fmr(
+        self,
+        fmrs: Sequence[float],
+        thresholds: Optional[Sequence[float]] = None,
+    ) -> List[ThresholdMetrics]:
+        """
+        Compute verification metrics at the threshold corresponding to each of the target FMRs.
+
+        :param fmrs: The target false match rates.
+        :param thresholds: Optionally specify the threshold for each target FMR, e.g. as computed from a baseline
+            distribution via [`thresholds_at_fmr`][kolena.fr.metrics.ScoreDistribution.thresholds_at_fmr]. When absent,
+            thresholds are computed from this distribution.
+        :return: The metrics at each target FMR.
+        """
+        if thresholds is None:
+            thresholds = self.thresholds_at_fmr(fmrs)
+        elif len(thresholds) != len(fmrs):
+            raise InputValidationError(f"mismatched lengths for fmrs ({len(fmrs)}) and thresholds ({len(thresholds)})")
+        thresholds = np.asarray(thresholds, dtype=np.float64)
+        return [
+            ThresholdMetrics(target_fmr=float(target_fmr), threshold=float(threshold), fmr=float(fmr), fnmr=float(fnmr))
+            for target_fmr, threshold, fmr, fnmr in zip(fmrs, thresholds, self.fmr(thresholds), self.fnmr(thresholds))
+        ]
+
+    def curve(self, fmrs: Sequence[float] = DEFAULT_FMRS) -> ErrorTradeoffCurve:
+        """
+        Compute the DET curve of this distribution at the thresholds corresponding to the provided target FMRs.
+
+        :param fmrs: The target false match rates at which to evaluate the curve, log-spaced between `1e-6` and `1` by
+            default.
+        :return: The DET curve, from which the ROC curve is also available.
+        """
+        thresholds = self.thresholds_at_fmr(sorted(fmrs))
+        return ErrorTradeoffCurve(thresholds=thresholds, fmr=self.fmr(thresholds), fnmr=self.fnmr(thresholds))
+
+    def _edges(self) -> np.ndarray:
+        # the outermost edges are unbounded, as the outermost bins also hold any scores outside of the score range
+        low, high = self.score_range
+        edges = np.linspace(low, high, self.bins + 1)
+        edges[0], edges[-1] = -np.inf, np.inf
+        return edges
+
+    def _bin_indices(self, scores: np.ndarray) -> np.ndarray:
+        low, high = self.score_range
+        indices = np.floor((scores - low) * (self.bins / (high - low)))
+        return np.clip(indices, 0, self.bins - 1).astype(np.int64)
+
+    @staticmethod
+    def _suffix_counts(counts: np.ndarray) -> np.ndarray:
+        """The number of scores in each bin and above, followed by zero for the unbounded upper edge."""
+        return np.concatenate([np.cumsum(counts[::-1])[::-1], [0]])
+
+    def _count_at_or_above(self, thresholds: np.ndarray, genuine: bool) -> np.ndarray:
+        if self.bins is not None:
+            low, high = self.score_range
+            edge_indices = np.ceil((thresholds - low) * (self.bins / (high - low)) - _EDGE_TOLERANCE)
+            edge_indices = np.clip(np.nan_to_num(edge_indices, posinf=self.bins, neginf=0), 0, self.bins)
+            counts = self._genuine_counts if genuine else self._imposter_counts
+            return self._suffix_counts(counts)[edge_indices.astype(np.int64)]
+        runs = self._genuine_runs if genuine else self._imposter_runs
+        return runs.count_at_or_above(thresholds)
+
+
+@dataclasses.dataclass(frozen=True)
+class TestCaseMetrics:
+    """Verification metrics computed for a single test case."""
+
+    distribution: ScoreDistribution
+    """The distribution of similarity scores of pairs in the test case."""
+
+    metrics: List[ThresholdMetrics]
+    """The metrics at each target FMR."""
+
+    curve: ErrorTradeoffCurve
+    """The DET curve of the test case."""
+
+
+def score_distribution(
+    pair_results: Iterable[pd.DataFrame],
+    bins: Optional[int] = DEFAULT_BINS,
+    score_range: Tuple[float, float] = (-1.0, 1.0),
+) -> ScoreDistribution:
+    """
+    Accumulate the provided batches of pair results into a [`ScoreDistribution`][kolena.fr.metrics.ScoreDistribution].
+
+    :param pair_results: Batches of pair results, e.g. as yielded by
+        [`Model.iter_pair_results`][kolena.fr.Model.iter_pair_results]. Pairs with multiple records, e.g. one per pair
+        of embeddings, are counted once with their highest similarity score, including when their records continue
+        from one batch into the next.
+    :param bins: The number of histogram bins, or `None` to retain all scores for exact metrics.
+    :param score_range: The `(min, max)` range of similarity scores spanned by the histogram.
+    :return: The distribution of scores in the provided pair results.
+    """
+    distribution = ScoreDistribution(bins=bins, score_range=score_range)
+    df_carried: Optional[pd.DataFrame] = None
+    for df_batch in pair_results:
+        if df_carried is not None:
+            df_batch = pd.concat([df_carried, df_batch], ignore_index=True)
+            df_carried = None
+        if "image_pair_id" in df_batch.columns and len(df_batch) > 0:
+            # the records of the last pair may continue in the next batch, so they are carried over until then
+            is_last_pair = (df_batch["image_pair_id"] == df_batch["image_pair_id"].iloc[-1]).to_numpy()
+            df_carried, df_batch = df_batch[is_last_pair], df_batch[~is_last_pair]
+        distribution.update(df_batch)
+    if df_carried is not None:
+        distribution.update(df_carried)
+    return distribution
+
+
+def _max_similarity_per_pair(df: pd.DataFrame) -> pd.DataFrame:
+    df_scores = pd.DataFrame(
+        dict(
+            image_pair_id=df["image_pair_id"].to_numpy(),
+            similarity=pd.to_numeric(df["similarity"], errors="raise").astype(np.float64),
+            is_same=df["is_same"].to_numpy(),
+        ),
+    )
+    # NaN scores are skipped by max, such that a pair is only a failure to enroll when all of its scores are null
+    return df_scores.groupby("image_pair_id", sort=False).agg(
+        similarity=("similarity", "max"),
+        is_same=("is_same", "first"),
+    )
+
+
+def compute_test_case_metrics(
+    model: Model,
+    test_cases: Iterable[Union[TestCase, TestCase.Data]],
+    fmrs: Sequence[float],
+    baseline: Optional[ScoreDistribution] = None,
+    bins: Optional[int] = DEFAULT_BINS,
+    score_range: Tuple[float, float] = (-1.0, 1.0),
+    batch_size: int = 10_000_000,
+) -> Dict[str, TestCaseMetrics]:
+    """
+    Compute verification metrics for each of the provided test cases, streaming the model's pair results for each test
+    case in batches of at most `batch_size` pairs.
+
+    :param model: The model for which to compute metrics.
+    :param test_cases: The test cases for which to compute metrics.
+    :param fmrs: The target false match rates at which to compute metrics.
+    :param baseline: Optionally specify the distribution from which thresholds are computed, e.g. the distribution of
+        the baseline test cases of a test suite. When absent, thresholds are computed from each test case's own
+        distribution.
+    :param bins: The number of histogram bins, or `None` to retain all scores for exact metrics.
+    :param score_range: The `(min, max)` range of similarity scores spanned by the histogram.
+    :param batch_size: Optionally specify the maximum number of pair results to load at once.
+    :return: The metrics for each test case, by test case name.
+    """
+    thresholds = baseline.thresholds_at_fmr(fmrs) if baseline is not None else None
+    test_case_metrics: Dict[str, TestCaseMetrics] = {}
+    for test_case in test_cases:
+        name = test_case.name
+        if name in test_case_metrics:
+            continue
+        distribution = score_distribution(model.iter_pair_results(test_case, batch_size), bins, score_range)
+        test_case_metrics[name] = TestCaseMetrics(
+            distribution=distribution,
+            metrics=distribution.metrics_at_fmr(fmrs, thresholds),
+            curve=distribution.curve(),
+        )
+    return test_case_metrics
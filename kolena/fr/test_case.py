@@ -20,7 +20,12 @@ from typing import Dict
 from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Tuple
+from typing import Union
 
+import numpy as np
 import pandas as pd
 from deprecation import deprecated
 from pydantic import validate_arguments
@@ -30,8 +35,8 @@ from kolena._api.v1.fr import TestCase as API
 from kolena._utils import krequests
 from kolena._utils import log
 from kolena._utils.batched_load import _BatchedLoader
+from kolena._utils.batched_load import BackgroundUploader
 from kolena._utils.batched_load import init_upload
-from kolena._utils.batched_load import upload_data_frame
 from kolena._utils.consts import BatchSize
 from kolena._utils.consts import FieldName
 from kolena._utils.dataframes.validators import validate_df_schema
@@ -39,8 +44,10 @@ from kolena._utils.frozen import Frozen
 from kolena._utils.instrumentation import with_event
 from kolena._utils.instrumentation import WithTelemetry
 from kolena._utils.serde import from_dict
+from kolena._utils.tracing import span
 from kolena._utils.validators import validate_name
 from kolena._utils.validators import ValidatorConfig
+from kolena.errors import InputValidationError
 from kolena.errors import NotFoundError
 from kolena.fr.datatypes import TEST_CASE_COLUMNS
 from kolena.fr.datatypes import TestCaseDataFrame
@@ -218,8 +225,7 @@ class TestCase(ABC, Frozen, WithTelemetry):
         with self.edit(reset=True) as editor:
             if description is not None:
                 editor.description(description)
-            for locator_a, locator_b, is_same in test_samples:
-                editor.add(locator_a, locator_b, is_same)
+            editor.add_pairs(pd.DataFrame(test_samples, columns=TEST_CASE_COLUMNS))
 
     def _populate_from_other(self, other: "TestCase") -> None:
         with self._unfrozen():
@@ -234,16 +240,23 @@ class TestCase(ABC, Frozen, WithTelemetry):
 
     class Editor:
         _samples: Dict[str, TestCaseRecord]
+        _frames: List[pd.DataFrame]
+        _frame_hashes: List[Tuple[np.ndarray, np.ndarray]]
+        _removed: Set[Tuple[str, str]]
         _reset: bool
         _description: str
         _initial_description: str
-        _initial_samples: Optional[Dict[str, TestCaseRecord]] = None
+        _initial_samples: Optional[pd.DataFrame] = None
 
         def __init__(self, description: str, reset: bool = False) -> None:
             self._reset = reset
             self._description = description
             self._initial_description = description
             self._samples: Dict[str, TestCaseRecord] = OrderedDict()
+            self._frames: List[pd.DataFrame] = []
+            # sorted pair hashes of each frame and their row positions, computed on first removal
+            self._frame_hashes: List[Tuple[np.ndarray, np.ndarray]] = []
+            self._removed: Set[Tuple[str, str]] = set()  # pairs removed from the frames, applied in _data_frame
 
         @validate_arguments(config=ValidatorConfig)
         def description(self, description: str) -> None:
@@ -272,6 +285,66 @@ class TestCase(ABC, Frozen, WithTelemetry):
                 log.info(f"no op: {val} already in test case")
                 return
             self._samples[key] = val
+            self._removed.discard((locator_a, locator_b))  # this addition follows any removal from the frames
+
+        def add_pairs(
+            self,
+            locator_a: Union[pd.DataFrame, Sequence[str], np.ndarray],
+            locator_b: Optional[Union[Sequence[str], np.ndarray]] = None,
+            is_same: Optional[Union[Sequence[bool], np.ndarray]] = None,
+        ) -> None:
+            """
+            Add the provided image pairs to the test case in bulk. Equivalent to calling
+            [`Editor.add`][kolena.fr.TestCase.Editor.add] for each pair, in order, but validated and stored as a
+            DataFrame rather than pair by pair:
+
+            ```python
+            with test_case.edit() as editor:
+                editor.add_pairs(df_pairs)  # DataFrame with 'locator_a', 'locator_b', and 'is_same' columns
+                editor.add_pairs(locators_a, locators_b, is_same)  # or equal-length arrays
+            ```
+
+            When a pair is added more than once, the value for `is_same` from the last addition is used.
+
+            :param locator_a: The left locators for the image pairs, or a DataFrame with `locator_a`, `locator_b`, and
+                `is_same` columns describing the image pairs.
+            :param locator_b: The right locators for the image pairs. Omitted when a DataFrame is provided.
+            :param is_same: Whether to treat each image pair as a genuine pair (`True`) or an imposter pair (`False`).
+                Omitted when a DataFrame is provided.
+            :raises InputValidationError: If the provided image pairs are invalid.
+            """
+            if isinstance(locator_a, pd.DataFrame):
+                if locator_b is not None or is_same is not None:
+                    raise InputValidationError("'locator_b' and 'is_same' must be omitted when providing a DataFrame")
+                missing_columns = set(TEST_CASE_COLUMNS) - set(locator_a.columns)
+                if len(missing_columns) > 0:
+                    raise InputValidationError(f"missing required columns: {sorted(missing_columns)}")
+                df = locator_a[TEST_CASE_COLUMNS].copy()
+            else:
+                if locator_b is None or is_same is None:
+                    raise InputValidationError("'locator_b' and 'is_same' are required when providing arrays")
+                lengths = {len(locator_a), len(locator_b), len(is_same)}
+                if len(lengths) > 1:
+                    raise InputValidationError("mismatched lengths for 'locator_a', 'locator_b', and 'is_same'")
+                df = pd.DataFrame(
+                    dict(
+                        locator_a=np.asarray(locator_a, dtype=object),
+                        locator_b=np.asarray(locator_b, dtype=object),
+                        is_same=np.asarray(is_same),
+                    ),
+                )
+
+            if len(df) == 0:
+                return
+            if df["is_same"].isna().any():
+                raise InputValidationError("missing values for 'is_same'")
+            df_validated = validate_df_schema(df.reset_index(drop=True), TestCaseDataFrameSchema)
+
+            # pairs added individually before these are ordered before them
+            self._flush_samples()
+            self._frames.append(df_validated)
+            if len(self._removed) > 0:
+                self._removed.difference_update(zip(df_validated["locator_a"], df_validated["locator_b"]))
 
         @validate_arguments(config=ValidatorConfig)
         def remove(self, locator_a: str, locator_b: str) -> None:
@@ -283,19 +356,63 @@ class TestCase(ABC, Frozen, WithTelemetry):
             :raises KeyError: If the provided locator pair is not in the test case.
             """
             key = self._key(locator_a, locator_b)
-            if key not in self._samples.keys():
+            removed_sample = self._samples.pop(key, None) is not None
+            pair = (locator_a, locator_b)
+            in_frames = pair not in self._removed and self._in_frames(locator_a, locator_b)
+            if not removed_sample and not in_frames:
                 raise KeyError(f"pair not in test case: {locator_a}, {locator_b}")
-            self._samples.pop(key)
+            if in_frames:
+                self._removed.add(pair)
 
         @staticmethod
         def _key(locator_a: str, locator_b: str) -> str:
             # newline is guaranteed to not be present in the locators
             return f"{locator_a}\n{locator_b}"
 
+        def _in_frames(self, locator_a: str, locator_b: str) -> bool:
+            for df in self._frames[len(self._frame_hashes) :]:
+                hashes = _pair_hashes(df["locator_a"], df["locator_b"])
+                order = np.argsort(hashes, kind="stable")
+                self._frame_hashes.append((hashes[order], order))
+            (pair_hash,) = _pair_hashes([locator_a], [locator_b])
+            for df, (hashes, order) in zip(self._frames, self._frame_hashes):
+                start = np.searchsorted(hashes, pair_hash, side="left")
+                stop = np.searchsorted(hashes, pair_hash, side="right")
+                for i in order[start:stop]:  # distinct pairs may collide on hash
+                    if df["locator_a"].iat[i] == locator_a and df["locator_b"].iat[i] == locator_b:
+                        return True
+            return False
+
+        def _flush_samples(self) -> None:
+            if len(self._samples) > 0:
+                self._frames.append(pd.DataFrame(list(self._samples.values()), columns=TEST_CASE_COLUMNS))
+                self._samples = OrderedDict()
+
+        def _data_frame(self) -> pd.DataFrame:
+            """All pairs in the edited test case, deduplicated such that the last addition of each pair is kept."""
+            self._flush_samples()
+            if len(self._frames) == 0:
+                return pd.DataFrame(columns=TEST_CASE_COLUMNS)
+            df = pd.concat(self._frames, ignore_index=True) if len(self._frames) > 1 else self._frames[0]
+            with span("deduplicate_pairs", rows=len(df)):
+                if len(self._removed) > 0:
+                    pairs = pd.MultiIndex.from_arrays([df["locator_a"].values, df["locator_b"].values])
+                    df = df[~pairs.isin(list(self._removed))]
+                df = df.drop_duplicates(subset=["locator_a", "locator_b"], keep="last", ignore_index=True)
+            self._frames = [df]
+            self._frame_hashes = []
+            self._removed = set()
+            return df
+
         def _edited(self) -> bool:
-            return (
-                self._reset or self._description != self._initial_description or self._samples != self._initial_samples
-            )
+            if self._reset or self._description != self._initial_description:
+                return True
+            if self._initial_samples is None:
+                return True
+            df = self._data_frame()
+            if len(df) != len(self._initial_samples):
+                return True
+            return not np.array_equal(_sorted_hashes(df), _sorted_hashes(self._initial_samples))
 
     @contextmanager
     @with_event(event_name=EventAPI.Event.EDIT_TEST_CASE)
@@ -317,15 +434,10 @@ class TestCase(ABC, Frozen, WithTelemetry):
         editor = self.Editor(self.description, reset)
 
         if not reset:
-            df_existing = self.load_data()
             # avoid calling the expensive self.load_data() multiple times
-            _initial_samples: Dict[str, TestCaseRecord] = OrderedDict()
-            for record in df_existing.itertuples():
-                locator_a, locator_b, is_same = record.locator_a, record.locator_b, record.is_same
-                test_case_record = (locator_a, locator_b, is_same)
-                editor.add(*test_case_record)
-                _initial_samples[editor._key(locator_a, locator_b)] = test_case_record
-            editor._initial_samples = _initial_samples
+            df_existing = pd.DataFrame(self.load_data()[TEST_CASE_COLUMNS]).reset_index(drop=True)
+            editor._frames.append(df_existing)
+            editor._initial_samples = df_existing
 
         yield editor
 
@@ -334,17 +446,21 @@ class TestCase(ABC, Frozen, WithTelemetry):
             return
 
         log.info(f"editing test case '{self.name}' (v{self.version})")
-        init_response = init_upload()
-        df = pd.DataFrame(editor._samples.values(), columns=TEST_CASE_COLUMNS)
-        df_validated = validate_df_schema(df, TestCaseDataFrameSchema)
+        df = editor._data_frame()
+        batch_size = BatchSize.UPLOAD_RECORDS.value
+        # pairs are validated as they are added, such that each chunk is only coerced here as it is uploaded
+        with BackgroundUploader() as uploader:
+            for start in range(0, len(df), batch_size):
+                df_chunk = df.iloc[start : start + batch_size].copy()
+                uploader.submit(validate_df_schema(df_chunk, TestCaseDataFrameSchema, trusted=True))
+        load_uuid = uploader.uuid if uploader.uuid is not None else init_upload().uuid
 
-        upload_data_frame(df=df_validated, batch_size=BatchSize.UPLOAD_RECORDS.value, load_uuid=init_response.uuid)
         request = API.CompleteEditRequest(
             test_case_id=self._id,
             current_version=self.version,
             name=self.name,
             description=editor._description,
-            uuid=init_response.uuid,
+            uuid=load_uuid,
         )
         complete_res = krequests.post(
             endpoint_path=API.Path.COMPLETE_EDIT.value,
@@ -370,3 +486,19 @@ class TestCase(ABC, Frozen, WithTelemetry):
             df_class=TestCaseDataFrame,
         )
         log.info(f"loaded image pairs in test case '{self.name}' (v{self.version})")
+
+
+def _pair_hashes(
+    locator_a: Union[pd.Series, Sequence[str]],
+    locator_b: Union[pd.Series, Sequence[str]],
+) -> np.ndarray:
+    df = pd.DataFrame(
+        dict(locator_a=np.asarray(locator_a, dtype=object), locator_b=np.asarray(locator_b, dtype=object)),
+    )
+    return pd.util.hash_pandas_object(df, index=False).values
+
+
+def _sorted_hashes(df: pd.DataFrame) -> np.ndarray:
+    # order-independent comparison of (deduplicated) pairs without sorting the locator strings themselves
+    df_typed = df[TEST_CASE_COLUMNS].astype(dict(locator_a=object, locator_b=object, is_same=bool))
+    return np.sort(pd.util.hash_pandas_object(df_typed, index=False).values)
@@ -32,12 +32,14 @@ from kolena._api.v1.fr import TestImages as API
 from kolena._utils import krequests
 from kolena._utils import log
 from kolena._utils.batched_load import _BatchedLoader
+from kolena._utils.batched_load import BackgroundUploader
 from kolena._utils.batched_load import init_upload
-from kolena._utils.batched_load import upload_data_frame
 from kolena._utils.consts import BatchSize
 from kolena._utils.dataframes.validators import validate_df_schema
+from kolena._utils.tracing import span
 from kolena._utils.uninstantiable import Uninstantiable
 from kolena._utils.validators import ValidatorConfig
+from kolena.errors import InputValidationError
 from kolena.fr import TestCase
 from kolena.fr import TestSuite
 from kolena.fr.datatypes import TEST_IMAGE_COLUMNS
@@ -179,20 +181,57 @@ class TestImages(Uninstantiable[None]):
         registrar = TestImages.Registrar.__factory__(TestImages._Registrar(records=[], locators=set()))
         yield registrar
 
-        init_response = init_upload()
         df = pd.DataFrame(registrar.data.records, columns=TEST_IMAGE_COLUMNS)
-        df["image_id"] = -1
-        df_validated = TestImageDataFrame(validate_df_schema(df, TestImageDataFrameSchema))
-        df_serializable = df_validated.as_serializable()
+        cls._upload_registered(df, BatchSize.UPLOAD_RECORDS.value)
+        log.success("registered test images")
+
+    @classmethod
+    def register_frame(cls, df: pd.DataFrame, batch_size: int = BatchSize.UPLOAD_RECORDS.value) -> None:
+        """
+        Register the images described by the provided DataFrame with Kolena, equivalent to calling
+        [`Registrar.add`][kolena.fr.TestImages.Registrar.add] and
+        [`Registrar.add_augmented`][kolena.fr.TestImages.Registrar.add_augmented] for each row within a
+        [`TestImages.register`][kolena.fr.TestImages.register] context. Images with locators that already exist in the
+        platform will have their metadata updated.
+
+        Each row of the DataFrame describes a single image. Rows with an `original_locator` describe augmented
+        images, for which `augmentation_spec` is required and `data_source` must be empty. All other rows describe
+        original images, for which `data_source`, `width`, and `height` are required. Omitted optional columns, i.e.
+        `original_locator`, `augmentation_spec`, `bounding_box`, `landmarks`, and `tags`, are treated as empty.
+
+        The DataFrame is validated and uploaded in chunks of `batch_size` rows, such that each chunk is uploaded while
+        the next is validated and serialized.
+
+        :param df: DataFrame with the columns of [`TestImageDataFrame`][kolena.fr.TestImageDataFrame], excluding
+            `image_id`.
+        :param batch_size: Optionally specify the maximum number of images to upload in a single chunk.
+        :raises InputValidationError: The provided DataFrame is invalid, e.g. contains duplicate locators.
+        :raises RemoteError: The registered images were unable to be successfully committed for any reason.
+        """
+        if batch_size <= 0:
+            raise InputValidationError(f"invalid batch_size '{batch_size}': expected positive integer")
+        log.info("registering test images")
+        df_prepared = _prepare_register_frame(df)
+        cls._upload_registered(df_prepared, batch_size)
+        log.success(f"registered {len(df_prepared)} test images")
 
-        upload_data_frame(df=df_serializable, batch_size=BatchSize.UPLOAD_RECORDS.value, load_uuid=init_response.uuid)
-        request = LoadAPI.WithLoadUUID(uuid=init_response.uuid)
+    @staticmethod
+    def _upload_registered(df: pd.DataFrame, batch_size: int) -> None:
+        with BackgroundUploader() as uploader:
+            for start in range(0, len(df), batch_size):
+                df_chunk = df.iloc[start : start + batch_size].copy()
+                df_chunk["image_id"] = -1
+                with span("validate_images", rows=len(df_chunk)):
+                    df_validated = TestImageDataFrame(validate_df_schema(df_chunk, TestImageDataFrameSchema))
+                uploader.submit(df_validated.as_serializable())
+        load_uuid = uploader.uuid if uploader.uuid is not None else init_upload().uuid
+
+        request = LoadAPI.WithLoadUUID(uuid=load_uuid)
         finalize_res = krequests.put(
             endpoint_path=API.Path.COMPLETE_REGISTER.value,
             data=json.dumps(dataclasses.asdict(request)),
         )
         krequests.raise_for_status(finalize_res)
-        log.success("registered test images")
 
     @classmethod
     @validate_arguments(config=ValidatorConfig)
@@ -247,3 +286,43 @@ class TestImages(Uninstantiable[None]):
         if isinstance(data_source, (TestSuite, TestSuite.Data)):
             return f"test suite '{data_source.data.name if isinstance(data_source, TestSuite) else data_source.name}'"
         return None
+
+
+def _prepare_register_frame(df: pd.DataFrame) -> pd.DataFrame:
+    if "locator" not in df.columns:
+        raise InputValidationError("missing required column: 'locator'")
+    unexpected_columns = set(df.columns) - set(TEST_IMAGE_COLUMNS)
+    if len(unexpected_columns) > 0:
+        raise InputValidationError(f"unexpected columns: {sorted(unexpected_columns)}")
+
+    n_rows = len(df)
+    columns = {
+        col: df[col].to_numpy(dtype=object) if col in df.columns else np.full(n_rows, None, dtype=object)
+        for col in TEST_IMAGE_COLUMNS
+    }
+    is_null = {col: pd.isna(values) for col, values in columns.items()}
+
+    duplicated = pd.Series(columns["locator"]).duplicated(keep=False).to_numpy()
+    if duplicated.any():
+        duplicates = pd.unique(columns["locator"][duplicated])
+        raise InputValidationError(f"duplicate locators ({len(duplicates)}): {list(duplicates[:10])}")
+
+    is_augmented = ~is_null["original_locator"]
+    is_original = ~is_augmented
+    for col in ["data_source", "width", "height"]:
+        if (is_original & is_null[col]).any():
+            raise InputValidationError(f"missing '{col}' for original images")
+    if (is_augmented & is_null["augmentation_spec"]).any():
+        raise InputValidationError("missing 'augmentation_spec' for augmented images")
+    if (is_augmented & ~is_null["data_source"]).any():
+        raise InputValidationError("unexpected 'data_source' for augmented images")
+    if (is_original & ~is_null["augmentation_spec"]).any():
+        raise InputValidationError("unexpected 'augmentation_spec' for original images without 'original_locator'")
+
+    # match the defaults applied by Registrar.add and Registrar.add_augmented
+    for col in ["width", "height"]:
+        columns[col][is_null[col]] = -1
+    columns["tags"][is_null["tags"]] = [{} for _ in range(int(is_null["tags"].sum()))]
+    for col in ["data_source", "original_locator", "augmentation_spec", "bounding_box", "landmarks"]:
+        columns[col][is_null[col]] = None
+    return pd.DataFrame(columns, columns=TEST_IMAGE_COLUMNS)
@@ -12,17 +12,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import dataclasses
+import hashlib
 import json
+import os
 from abc import ABC
+from typing import Iterator
 from typing import List
+from typing import Optional
 from typing import Tuple
+from typing import Union
 
 from deprecation import deprecated
 from pydantic import validate_arguments
 from pydantic.dataclasses import dataclass
+from pydantic.typing import Literal
 from tqdm import tqdm
 
-from kolena._api.v1.batched_load import BatchedLoad as LoadAPI
 from kolena._api.v1.event import EventAPI
 from kolena._api.v1.fr import Asset as AssetAPI
 from kolena._api.v1.fr import TestRun as API
@@ -30,8 +35,10 @@ from kolena._utils import krequests
 from kolena._utils import log
 from kolena._utils.asset_path_mapper import AssetPathMapper
 from kolena._utils.batched_load import _BatchedLoader
+from kolena._utils.batched_load import BackgroundUploader
 from kolena._utils.batched_load import init_upload
 from kolena._utils.batched_load import upload_data_frame
+from kolena._utils.concurrency import iter_ordered
 from kolena._utils.consts import BatchSize
 from kolena._utils.dataframes.validators import validate_df_record_count
 from kolena._utils.dataframes.validators import validate_df_schema
@@ -45,14 +52,18 @@ from kolena.errors import InputValidationError
 from kolena.fr import InferenceModel
 from kolena.fr import Model
 from kolena.fr import TestSuite
+from kolena.fr._similarity import iter_pair_results
 from kolena.fr._utils import upload_image_chips
 from kolena.fr.datatypes import _ImageChipsDataFrame
 from kolena.fr.datatypes import _ResultStageFrame
 from kolena.fr.datatypes import EmbeddingDataFrame
+from kolena.fr.datatypes import EmbeddingDataFrameSchema
+from kolena.fr.datatypes import EmbeddingMatrix
 from kolena.fr.datatypes import ImageDataFrame
 from kolena.fr.datatypes import ImageResultDataFrame
 from kolena.fr.datatypes import ImageResultDataFrameSchema
 from kolena.fr.datatypes import PairDataFrame
+from kolena.fr.datatypes import PairDataFrameSchema
 from kolena.fr.datatypes import PairResultDataFrame
 from kolena.fr.datatypes import PairResultDataFrameSchema
 
@@ -126,32 +137,41 @@ class TestRun(ABC, Frozen, WithTelemetry):
         :raises InputValidationError: The requested `batch_size` failed validation.
         :raises RemoteError: Images could not be loaded for any reason.
         """
+        log.info("loading remaining images for test run")
+        df_image = _BatchedLoader.concat(self.iter_remaining_images(batch_size, prefetch=0), ImageDataFrame)
+        log.info("loaded remaining images for test run")
+        return df_image
+
+    @validate_arguments
+    def iter_remaining_images(self, batch_size: int = 1_000_000_000_000, prefetch: int = 1) -> Iterator[ImageDataFrame]:
+        """
+        Iterate over DataFrames containing records for the images in the configured test suite that do not yet have
+        results from the configured model, yielding each batch as soon as it has been downloaded.
+
+        Unlike [`TestRun.load_remaining_images`][kolena.fr.TestRun.load_remaining_images], only the batches currently
+        being downloaded or consumed are held in memory.
+
+        :param batch_size: Optionally specify the maximum number of image records to load in total.
+        :param prefetch: The number of batches to download in the background while the current batch is processed.
+        :return: Iterator of DataFrames containing records for the images that must be processed.
+        :raises InputValidationError: The requested `batch_size` or `prefetch` failed validation.
+        :raises RemoteError: Images could not be loaded for any reason.
+        """
         if batch_size <= 0:
             raise InputValidationError(f"invalid batch_size '{batch_size}': expected positive integer")
-        log.info("loading remaining images for test run")
+        if prefetch < 0:
+            raise InputValidationError(f"invalid prefetch '{prefetch}': expected non-negative integer")
         init_request = API.InitLoadRemainingImagesRequest(
             test_run_id=self.data.id,
             batch_size=batch_size,
             load_all=self._reset,
         )
-        with krequests.put(
-            endpoint_path=API.Path.INIT_LOAD_REMAINING_IMAGES.value,
-            data=json.dumps(dataclasses.asdict(init_request)),
-            stream=True,
-        ) as init_res:
-            krequests.raise_for_status(init_res)
-
-            load_uuid = None
-            try:
-                dfs: List[ImageDataFrame] = []
-                for line in init_res.iter_lines():
-                    partial_response = from_dict(data_class=LoadAPI.InitDownloadPartialResponse, data=json.loads(line))
-                    load_uuid = partial_response.uuid
-                    dfs.append(_BatchedLoader.load_path(partial_response.path, ImageDataFrame))
-                log.info("loaded remaining images for test run")
-                return _BatchedLoader.concat(dfs, ImageDataFrame)
-            finally:
-                _BatchedLoader.complete_load(load_uuid)
+        yield from _BatchedLoader.iter_data(
+            init_request,
+            API.Path.INIT_LOAD_REMAINING_IMAGES.value,
+            ImageDataFrame,
+            prefetch=prefetch,
+        )
 
     def upload_image_results(self, df_image_result: ImageResultDataFrame) -> int:
         """
@@ -221,10 +241,55 @@ class TestRun(ABC, Frozen, WithTelemetry):
         :raises InputValidationError: The requested `batch_size` failed validation.
         :raises RemoteError: Pairs could not be loaded for any reason.
         """
+        log.info("loading batch of image pairs for test run")
+        dfs_embedding: List[EmbeddingDataFrame] = []
+        dfs_pair: List[PairDataFrame] = []
+        for df_embedding, df_pair in self.iter_remaining_pairs(batch_size, prefetch=0):
+            if len(dfs_embedding) == 0 or df_embedding is not dfs_embedding[-1]:
+                dfs_embedding.append(df_embedding)
+            dfs_pair.append(df_pair)
+
+        df_embedding = _BatchedLoader.concat(dfs_embedding, EmbeddingDataFrame)
+        df_pair = _BatchedLoader.concat(dfs_pair, PairDataFrame)
+        log.info("loaded batch of image pairs for test run")
+        return df_embedding, df_pair
+
+    @validate_arguments
+    def iter_remaining_pairs(
+        self,
+        batch_size: int = 1_000_000_000_000,
+        prefetch: int = 1,
+        as_matrix: bool = False,
+        mmap_dir: Optional[str] = None,
+    ) -> Iterator[Tuple[Union[EmbeddingDataFrame, EmbeddingMatrix], PairDataFrame]]:
+        """
+        Iterate over batches of the image pairs in the configured test suite that have not yet had similarity scores
+        computed, yielding each batch as soon as it has been downloaded alongside the embeddings of its images.
+
+        Unlike [`TestRun.load_remaining_pairs`][kolena.fr.TestRun.load_remaining_pairs], only the batches currently
+        being downloaded or consumed are held in memory. Consecutive batches sharing the same embeddings are yielded
+        with the same embeddings object, downloaded once.
+
+        This method should not be called until all images in the [`TestRun`][kolena.fr.TestRun] have been processed.
+
+        :param batch_size: Optionally specify the maximum number of image pair records to load in total.
+        :param prefetch: The number of batches to download in the background while the current batch is processed.
+        :param as_matrix: Yield embeddings as an [`EmbeddingMatrix`][kolena.fr.datatypes.EmbeddingMatrix] of float32
+            embeddings decoded directly into a single buffer, rather than as an `EmbeddingDataFrame`.
+        :param mmap_dir: With `as_matrix`, optionally write each embedding matrix to an `.npy` file in this directory
+            and memory-map it rather than holding it in memory. Files are not removed once iteration completes.
+        :return: Iterator of `(df_embedding, df_pair)` tuples, as returned by
+            [`TestRun.load_remaining_pairs`][kolena.fr.TestRun.load_remaining_pairs], for each batch of pairs.
+        :raises InputValidationError: The requested `batch_size` or `prefetch` failed validation.
+        :raises RemoteError: Pairs could not be loaded for any reason.
+        """
         if batch_size <= 0:
             raise InputValidationError(f"invalid batch_size '{batch_size}': expected positive integer")
+        if prefetch < 0:
+            raise InputValidationError(f"invalid prefetch '{prefetch}': expected non-negative integer")
+        if mmap_dir is not None:
+            os.makedirs(mmap_dir, exist_ok=True)
 
-        log.info("loading batch of image pairs for test run")
         init_request = API.InitLoadRemainingPairsRequest(
             test_run_id=self.data.id,
             batch_size=batch_size,
@@ -239,24 +304,49 @@ class TestRun(ABC, Frozen, WithTelemetry):
 
             load_uuid_embedding = None
             load_uuid_pair = None
-            try:
-                dfs_embedding = []
-                dfs_pair = []
+
+            def iter_partial_responses() -> Iterator[Tuple[API.InitLoadRemainingPairsPartialResponse, bool]]:
+                nonlocal load_uuid_embedding, load_uuid_pair
+                previous_embeddings_path = None
                 for line in init_res.iter_lines():
                     partial_response = from_dict(
                         data_class=API.InitLoadRemainingPairsPartialResponse,
                         data=json.loads(line),
                     )
                     load_uuid_embedding = partial_response.embeddings.uuid
-                    dfs_embedding.append(_BatchedLoader.load_path(partial_response.embeddings.path, EmbeddingDataFrame))
                     load_uuid_pair = partial_response.pairs.uuid
-                    dfs_pair.append(_BatchedLoader.load_path(partial_response.pairs.path, PairDataFrame))
-
-                df_embedding = _BatchedLoader.concat(dfs_embedding, EmbeddingDataFrame)
-                df_pair = _BatchedLoader.concat(dfs_pair, PairDataFrame)
-                log.info("loaded batch of image pairs for test run")
-                return df_embedding, df_pair
+                    is_new_embeddings = partial_response.embeddings.path != previous_embeddings_path
+                    previous_embeddings_path = partial_response.embeddings.path
+                    yield partial_response, is_new_embeddings
+
+            def load_embeddings(
+                partial_response: API.InitLoadRemainingPairsPartialResponse,
+            ) -> Union[EmbeddingDataFrame, EmbeddingMatrix]:
+                if not as_matrix:
+                    return _BatchedLoader.load_path(partial_response.embeddings.path, EmbeddingDataFrame)
+                df_serialized = _BatchedLoader.load_path(partial_response.embeddings.path, None)
+                path = None
+                if mmap_dir is not None:
+                    digest = hashlib.sha256(partial_response.embeddings.path.encode("utf-8")).hexdigest()[:32]
+                    path = os.path.join(mmap_dir, f"embeddings-{digest}.npy")
+                return EmbeddingMatrix.from_serializable(df_serialized, path=path)
+
+            def load_batch(
+                item: Tuple[API.InitLoadRemainingPairsPartialResponse, bool],
+            ) -> Tuple[Optional[Union[EmbeddingDataFrame, EmbeddingMatrix]], PairDataFrame]:
+                partial_response, is_new_embeddings = item
+                # embeddings shared with the previous batch, which is yielded first, are not downloaded again
+                df_embedding = load_embeddings(partial_response) if is_new_embeddings else None
+                return df_embedding, _BatchedLoader.load_path(partial_response.pairs.path, PairDataFrame)
+
+            batches = iter_ordered(load_batch, iter_partial_responses(), max_workers=prefetch + 1)
+            try:
+                df_embedding_current: Optional[Union[EmbeddingDataFrame, EmbeddingMatrix]] = None
+                for _, (df_embedding, df_pair) in batches:
+                    df_embedding_current = df_embedding if df_embedding is not None else df_embedding_current
+                    yield df_embedding_current, df_pair
             finally:
+                batches.close()  # cancel any prefetched batches before completing the loads
                 for uuid in [load_uuid_embedding, load_uuid_pair]:
                     _BatchedLoader.complete_load(uuid)
 
@@ -290,13 +380,60 @@ class TestRun(ABC, Frozen, WithTelemetry):
         validate_df_record_count(df_validated)
         upload_data_frame(df_validated, BatchSize.UPLOAD_RECORDS.value, init_response.uuid)
 
-        request = API.UploadPairResultsRequest(uuid=init_response.uuid, test_run_id=self.data.id, reset=self._reset)
+        n_uploaded = self._complete_upload_pair_results(init_response.uuid)
+        log.success("uploaded pair results for test run")
+        return n_uploaded
+
+    def upload_pair_similarities(
+        self,
+        df_embedding: Union[EmbeddingDataFrame, EmbeddingMatrix],
+        df_pair: PairDataFrame,
+        metric: Literal["cosine", "l2"] = "cosine",
+        reduction: Literal["max", "all"] = "max",
+        batch_size: int = 1_000_000,
+    ) -> int:
+        """
+        Compute similarity scores for the provided image pairs from the provided embeddings, as returned by
+        [`TestRun.load_remaining_pairs`][kolena.fr.TestRun.load_remaining_pairs], and upload them as pair results.
+
+        All embeddings are gathered into a single float32 matrix and similarities are computed in vectorized batches of
+        `batch_size` pairs, each uploaded as soon as it is computed. Pairs where either image failed to enroll are
+        uploaded with an empty similarity.
+
+        :param df_embedding: The embeddings of the images in `df_pair`, as a DataFrame or as an
+            [`EmbeddingMatrix`][kolena.fr.datatypes.EmbeddingMatrix], which is used in place.
+        :param df_pair: DataFrame containing the image pairs for which to compute similarity scores.
+        :param metric: The similarity metric: `"cosine"` for cosine similarity or `"l2"` for the negated Euclidean
+            distance between embeddings, such that higher scores indicate more similar embeddings in both cases.
+        :param reduction: For images with multiple embeddings, `"max"` uploads a single record per pair with the highest
+            similarity across all combinations of embeddings, while `"all"` uploads `M x N` records per pair with the
+            `embedding_a_index` and `embedding_b_index` columns populated.
+        :param batch_size: The maximum number of pairs for which similarities are computed at once.
+        :return: Number of records successfully uploaded.
+        :raises InputValidationError: The provided embeddings or arguments failed validation.
+        :raises RemoteError: The pair results were unable to be successfully ingested for any reason.
+        """
+        log.info("computing and uploading pair results for test run")
+        if not isinstance(df_embedding, EmbeddingMatrix):
+            df_embedding = EmbeddingDataFrame(validate_df_schema(df_embedding, EmbeddingDataFrameSchema))
+        df_pair = PairDataFrame(validate_df_schema(df_pair, PairDataFrameSchema))
+        validate_df_record_count(df_pair)
+
+        with BackgroundUploader() as uploader:
+            for df_pair_result in iter_pair_results(df_embedding, df_pair, metric, reduction, batch_size):
+                uploader.submit(validate_df_schema(df_pair_result, PairResultDataFrameSchema, trusted=True))
+
+        n_uploaded = self._complete_upload_pair_results(uploader.uuid)
+        log.success("computed and uploaded pair results for test run")
+        return n_uploaded
+
+    def _complete_upload_pair_results(self, load_uuid: str) -> int:
+        request = API.UploadPairResultsRequest(uuid=load_uuid, test_run_id=self.data.id, reset=self._reset)
         finalize_res = krequests.put(
             endpoint_path=API.Path.COMPLETE_UPLOAD_PAIR_RESULTS.value,
             data=json.dumps(dataclasses.asdict(request)),
         )
         krequests.raise_for_status(finalize_res)
-        log.success("uploaded pair results for test run")
         response = from_dict(data_class=API.UploadPairResultsResponse, data=finalize_res.json())
         return response.n_uploaded
 
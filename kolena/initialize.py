@@ -19,16 +19,16 @@ from typing import Dict
 from typing import Optional
 from urllib.parse import urlparse
 
-import pandas as pd
-
 from kolena._api.v1.event import EventAPI
 from kolena._utils import log
 from kolena._utils import state
+from kolena._utils import token_cache
 from kolena._utils.consts import KOLENA_TOKEN_ENV
 from kolena._utils.endpoints import get_platform_url
 from kolena._utils.instrumentation import record_event
 from kolena._utils.instrumentation import set_profile
 from kolena._utils.instrumentation import upload_log
+from kolena._utils.profiling import configure_profiling
 from kolena._utils.state import _client_state
 from kolena.errors import InputValidationError
 from kolena.errors import MissingTokenError
@@ -39,6 +39,7 @@ def initialize(
     api_token: Optional[str] = None,
     verbose: bool = False,
     proxies: Optional[Dict[str, str]] = None,
+    profile_dir: Optional[str] = None,
     **kwargs: Any,
 ) -> None:
     """
@@ -82,6 +83,11 @@ def initialize(
         Step3 -->|Yes| End
     ```
 
+    !!! tip
+        Set the `KOLENA_TOKEN_CACHE_DIR` environment variable to cache the session credentials exchanged for the API
+        token on disk, readable only by the current user. Processes initializing with the same token then skip the
+        login request, and credentials are refreshed in the background shortly before they expire.
+
     !!! note
         As of version 0.29.0: the `entity` argument is no longer needed; the signature `initialize(entity, api_token)`
         has been deprecated and replaced by `initialize(api_token)`.
@@ -94,6 +100,9 @@ def initialize(
     :param proxies: Optionally configure client to run with `http` or `https` proxies. The `proxies` parameter
         is passed through to the `requests` package and can be
         [configured accordingly](https://requests.readthedocs.io/en/latest/user/advanced/#proxies).
+    :param profile_dir: Optionally profile each phase of test runs, such as inference and each evaluator callback,
+        with `cProfile`, writing a profile per phase and a summary of the top functions in each phase to a new
+        subdirectory of this directory. Can also be configured via the `KOLENA_PROFILE_DIR` environment variable.
     :raises InvalidTokenError: The provided `api_token` is not valid.
     :raises InputValidationError: The provided combination or number of args is not valid.
     :raises MissingTokenError: An API token could not be found.
@@ -121,7 +130,7 @@ def initialize(
             stacklevel=2,
         )
 
-    init_response = state.get_token(api_token, proxies=proxies)
+    init_response = token_cache.get_token(api_token, proxies=proxies)
     derived_telemetry = init_response.tenant_telemetry
     _client_state.update(
         api_token=api_token,
@@ -131,16 +140,22 @@ def initialize(
         telemetry=derived_telemetry,
         proxies=proxies,
     )
+    token_cache.schedule_refresh(_client_state)
 
     if used_deprecated_signature:
         upload_log("Client attempted to use deprecated entity auth signature.", "warn")
 
+    if profile_dir is not None:
+        configure_profiling(profile_dir)
+
     set_profile()
     record_event(EventAPI.RecordEventRequest(event_name=EventAPI.Event.INITIALIZE_SDK_CLIENT))
 
     log.info("initialized")
     if verbose:
         # Configure third party logging based on verbosity
+        import pandas as pd  # deferred, as pandas is expensive to import
+
         pd.set_option("display.max_colwidth", None)
         log.info(f"connected to {get_platform_url()}")
 
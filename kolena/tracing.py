@@ -0,0 +1,52 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Client-side tracing of the phases of loading, inference, evaluation and upload, as nested spans with counters such as
+the number of ``rows``, ``bytes``, ``requests`` and ``retries`` processed within each span.
+
+```python
+import kolena.tracing
+
+with kolena.tracing.tracing() as tracer:
+    test(model, test_suite, evaluator)
+
+print(tracer.summary())
+tracer.export("trace.json", format="chrome")  # open in chrome://tracing or https://ui.perfetto.dev
+```
+
+Completed spans can additionally be forwarded to an external metrics system via
+[`add_span_hook`][kolena.tracing.add_span_hook].
+"""
+# noreorder
+from kolena._utils.tracing import Span
+from kolena._utils.tracing import Tracer
+from kolena._utils.tracing import start_tracing
+from kolena._utils.tracing import stop_tracing
+from kolena._utils.tracing import tracing
+from kolena._utils.tracing import add_span_hook
+from kolena._utils.tracing import remove_span_hook
+from kolena._utils.tracing import span
+from kolena._utils.tracing import count
+
+__all__ = [
+    "Span",
+    "Tracer",
+    "start_tracing",
+    "stop_tracing",
+    "tracing",
+    "add_span_hook",
+    "remove_span_hook",
+    "span",
+    "count",
+]
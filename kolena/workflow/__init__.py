@@ -47,6 +47,8 @@ from .evaluator import EvaluatorConfiguration
 from .evaluator_function import BasicEvaluatorFunction
 from .evaluator_function import TestCases
 from .evaluator_function import EvaluationResults
+from .evaluator_function import StreamingEvaluatorFunction
+from .evaluator_function import TestCaseReducer
 from .evaluator_function import no_op_evaluator
 from .test_run import TestRun
 from .test_run import test
@@ -87,6 +89,8 @@ __all__ = [
     "BasicEvaluatorFunction",
     "TestCases",
     "EvaluationResults",
+    "StreamingEvaluatorFunction",
+    "TestCaseReducer",
     "no_op_evaluator",
     "TestRun",
     "test",
@@ -0,0 +1,158 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import glob
+import hashlib
+import os
+import shutil
+import time
+from types import CodeType
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from kolena._utils import log
+from kolena._utils.consts import BatchSize
+
+_SEGMENT_PATTERN = "segment-*.parquet"
+_JOURNAL_COLUMNS = ["test_sample", "inference"]
+
+
+def _digest(test_sample: str) -> bytes:
+    return hashlib.blake2b(test_sample.encode("utf-8"), digest_size=16).digest()
+
+
+def _canonical_const(const: Any) -> str:
+    # set constants iterate in hash-randomized order, which differs between processes, so their elements are sorted
+    if isinstance(const, frozenset):
+        return "frozenset({" + ",".join(sorted(_canonical_const(element) for element in const)) + "})"
+    if isinstance(const, tuple):
+        return "(" + ",".join(_canonical_const(element) for element in const) + ")"
+    if isinstance(const, CodeType):
+        return "<code>"  # nested code objects are omitted as their representation includes their address
+    return repr(const)
+
+
+def function_fingerprint(fn: Optional[Callable]) -> str:
+    """
+    Fingerprint the provided function by its qualified name, bytecode, and constants, such that journals written by
+    one version of an inference function are not replayed for another.
+    """
+    parts = [getattr(fn, "__module__", None) or "", getattr(fn, "__qualname__", None) or type(fn).__qualname__]
+    code = getattr(fn, "__code__", None)
+    if code is not None:
+        parts.append(code.co_code.hex())
+        parts.append(",".join(code.co_names))
+        parts.append(_canonical_const(code.co_consts))
+    return hashlib.blake2b("\0".join(parts).encode("utf-8"), digest_size=8).hexdigest()
+
+
+class InferenceJournal:
+    """
+    Local append-only journal of serialized ``(test_sample, inference)`` records, stored as parquet segments within the
+    provided directory.
+
+    Records are buffered in memory and written as a new segment every ``flush_size`` records or ``flush_interval``
+    seconds, whichever comes first. Segments are written to a temporary file and atomically moved into place, such that
+    a crash at most loses the records not yet flushed and never leaves a partially written segment behind.
+
+    Only a compact digest of each journaled test sample is held in memory. Journaled records are read back from disk
+    segment by segment.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        flush_size: int = BatchSize.JOURNAL_SEGMENT.value,
+        flush_interval: float = 30.0,
+    ) -> None:
+        if flush_size <= 0:
+            raise ValueError(f"invalid flush_size '{flush_size}': expected positive integer")
+        self.directory = directory
+        self._flush_size = flush_size
+        self._flush_interval = flush_interval
+        self._buffer: List[Tuple[str, str]] = []
+        self._last_flush = time.monotonic()
+        self._keys: Set[bytes] = set()
+        self.n_replayed = 0
+
+        os.makedirs(directory, exist_ok=True)
+        for tmp_file in glob.glob(os.path.join(directory, "*.tmp")):
+            os.remove(tmp_file)  # leftover from a crash while writing a segment
+        self._segments = sorted(glob.glob(os.path.join(directory, _SEGMENT_PATTERN)))
+        for df in self.iter_segments():
+            self._keys.update(_digest(ts) for ts in df["test_sample"])
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, test_sample: str) -> bool:
+        return _digest(test_sample) in self._keys
+
+    def iter_segments(self) -> Iterator[pd.DataFrame]:
+        """Iterate over the segments present in the journal when it was opened."""
+        for segment in self._segments:
+            try:
+                yield pq.read_table(segment, columns=_JOURNAL_COLUMNS).to_pandas()
+            except (OSError, pa.ArrowInvalid) as e:
+                log.warn(f"skipping unreadable inference journal segment '{segment}': {e}")
+
+    def iter_records(self, test_sample_digests: Set[bytes]) -> Iterator[Tuple[str, str]]:
+        """
+        Iterate over the journaled records, present when the journal was opened, of the test samples with the provided
+        digests, at most once per test sample.
+        """
+        remaining = set(test_sample_digests)
+        for df in self.iter_segments():
+            for test_sample, inference in zip(df["test_sample"], df["inference"]):
+                digest = _digest(test_sample)
+                if digest in remaining:
+                    remaining.remove(digest)
+                    self.n_replayed += 1
+                    yield test_sample, inference
+
+    def append(self, test_sample: str, inference: str) -> None:
+        self._buffer.append((test_sample, inference))
+        self._keys.add(_digest(test_sample))
+        if len(self._buffer) >= self._flush_size or time.monotonic() - self._last_flush >= self._flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if len(self._buffer) == 0:
+            return
+
+        segment = os.path.join(self.directory, f"segment-{time.time_ns():020d}-{os.getpid()}.parquet")
+        tmp_segment = f"{segment}.tmp"
+        table = pa.Table.from_pandas(pd.DataFrame(self._buffer, columns=_JOURNAL_COLUMNS), preserve_index=False)
+        with open(tmp_segment, "wb") as f:
+            pq.write_table(table, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_segment, segment)
+        self._buffer = []
+
+    def clear(self) -> None:
+        """Remove the journal and all of its segments from disk."""
+        self._buffer = []
+        self._keys = set()
+        self._segments = []
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -18,9 +18,11 @@ import dataclasses
 import json
 from abc import ABCMeta
 from abc import abstractmethod
+from collections import defaultdict
 from dataclasses import field
 from inspect import signature
 from typing import Callable
+from typing import Dict
 from typing import Iterator
 from typing import List
 from typing import Optional
@@ -33,6 +35,7 @@ from pydantic.dataclasses import dataclass
 from kolena._api.v1.generic import TestRun as API
 from kolena._utils import krequests
 from kolena._utils import log
+from kolena._utils.consts import BatchSize
 from kolena._utils.state import is_client_initialized
 from kolena._utils.validators import ValidatorConfig
 from kolena.workflow import EvaluatorConfiguration
@@ -44,6 +47,8 @@ from kolena.workflow import MetricsTestSuite
 from kolena.workflow import Plot
 from kolena.workflow import TestCase
 from kolena.workflow import TestSample as BaseTestSample
+from kolena.workflow import TestSuite
+from kolena.workflow._journal import _digest
 from kolena.workflow.evaluator import _configuration_description
 
 TestSample = TypeVar("TestSample", bound=BaseTestSample)
@@ -172,6 +177,158 @@ This `BasicEvaluatorFunction` is provided to the test run at runtime, and is exp
 """
 
 
+class TestCaseReducer(metaclass=ABCMeta):
+    """
+    Folds test-sample-level results into the aggregate metrics for a single test case, one chunk at a time.
+
+    A reducer is created by [`StreamingEvaluatorFunction.reducer`][kolena.workflow.StreamingEvaluatorFunction.reducer]
+    for every test case at every configuration, then repeatedly updated with the subset of each chunk belonging to its
+    test case. Implementations should keep only the running state necessary to compute the final metrics (e.g. counts
+    or sums) rather than retaining the provided lists.
+    """
+
+    @abstractmethod
+    def update(
+        self,
+        test_samples: List[TestSample],
+        ground_truths: List[GroundTruth],
+        inferences: List[Inference],
+        metrics_test_sample: List[MetricsTestSample],
+    ) -> None:
+        """
+        Fold a chunk of test samples belonging to this test case into the running state.
+
+        :param test_samples: The test samples in this chunk that belong to the test case.
+        :param ground_truths: Ground truths corresponding to `test_samples`, sequenced in the same order.
+        :param inferences: Inferences corresponding to `test_samples`, sequenced in the same order.
+        :param metrics_test_sample: Test-sample-level metrics corresponding to `test_samples`, sequenced in the same
+            order.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def compute(self) -> MetricsTestCase:
+        """
+        Compute the aggregate metrics for this test case once every chunk has been folded in.
+
+        :return: The [`MetricsTestCase`][kolena.workflow.MetricsTestCase] for this test case.
+        """
+        raise NotImplementedError
+
+    def compute_plots(self) -> Optional[List[Plot]]:
+        """
+        Optionally compute plots for this test case once every chunk has been folded in.
+
+        :return: Zero or more plots for this test case.
+        """
+        return None  # not required
+
+
+class StreamingEvaluatorFunction(metaclass=ABCMeta):
+    """
+    A chunked variant of [`BasicEvaluatorFunction`][kolena.workflow.BasicEvaluatorFunction] for test suites that are
+    too large to hold in memory at once.
+
+    Rather than receiving every test sample, ground truth, and inference in the test run in a single call, a streaming
+    evaluator receives them in chunks of at most `chunk_size` entries. Test-sample-level metrics computed for each chunk
+    are uploaded as they are produced and are folded into test-case-level metrics through one
+    [`TestCaseReducer`][kolena.workflow.TestCaseReducer] per test case, such that memory usage is bounded by the chunk
+    size rather than by the size of the test suite.
+
+    ```python
+    class AccuracyReducer(TestCaseReducer):
+        def __init__(self):
+            self.n_correct = 0
+            self.n_total = 0
+
+        def update(self, test_samples, ground_truths, inferences, metrics_test_sample):
+            self.n_correct += sum(mts.is_correct for mts in metrics_test_sample)
+            self.n_total += len(metrics_test_sample)
+
+        def compute(self) -> MetricsTestCase:
+            return MyTestCaseMetrics(accuracy=self.n_correct / self.n_total if self.n_total > 0 else 0)
+
+    class MyStreamingEvaluator(StreamingEvaluatorFunction):
+        def compute_test_sample_metrics(self, test_samples, ground_truths, inferences, configuration=None):
+            return [MyTestSampleMetrics(is_correct=gt.label == inf.label) for gt, inf in zip(ground_truths, inferences)]
+
+        def reducer(self, test_case, configuration=None) -> TestCaseReducer:
+            return AccuracyReducer()
+
+    test(model, test_suite, MyStreamingEvaluator(chunk_size=10_000))
+    ```
+
+    The same assumptions as for [`BasicEvaluatorFunction`][kolena.workflow.BasicEvaluatorFunction] apply:
+    test-sample-level metrics and ground truths do not vary by test case.
+
+    :param chunk_size: The maximum number of test samples provided to each call of
+        [`compute_test_sample_metrics`][kolena.workflow.StreamingEvaluatorFunction.compute_test_sample_metrics].
+    """
+
+    chunk_size: int
+    """The maximum number of test samples in each chunk, provided on instantiation."""
+
+    def __init__(self, chunk_size: int = BatchSize.EVALUATION_CHUNK.value):
+        if chunk_size <= 0:
+            raise ValueError(f"invalid chunk_size '{chunk_size}': expected positive integer")
+        self.chunk_size = chunk_size
+
+    def display_name(self) -> str:
+        """The name to display for this evaluator in Kolena. Defaults to the name of this class."""
+        return type(self).__name__
+
+    @abstractmethod
+    def compute_test_sample_metrics(
+        self,
+        test_samples: List[TestSample],
+        ground_truths: List[GroundTruth],
+        inferences: List[Inference],
+        configuration: Optional[EvaluatorConfiguration] = None,
+    ) -> List[MetricsTestSample]:
+        """
+        Compute metrics for every test sample in a chunk.
+
+        Must be implemented.
+
+        :param test_samples: The distinct test samples in this chunk.
+        :param ground_truths: Ground truths corresponding to `test_samples`, sequenced in the same order.
+        :param inferences: Inferences corresponding to `test_samples`, sequenced in the same order.
+        :param configuration: The evaluator configuration to use. Empty for implementations that are not configured.
+        :return: Test-sample-level metrics corresponding to and sequenced in the same order as `test_samples`.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def reducer(self, test_case: TestCase, configuration: Optional[EvaluatorConfiguration] = None) -> TestCaseReducer:
+        """
+        Create the [`TestCaseReducer`][kolena.workflow.TestCaseReducer] used to accumulate metrics for a test case.
+
+        Must be implemented.
+
+        :param test_case: The test case whose metrics are accumulated by the returned reducer.
+        :param configuration: The evaluator configuration to use. Empty for implementations that are not configured.
+        :return: A fresh reducer for this test case at this configuration.
+        """
+        raise NotImplementedError
+
+    def compute_test_suite_metrics(
+        self,
+        test_suite: TestSuite,
+        metrics: List[Tuple[TestCase, MetricsTestCase]],
+        configuration: Optional[EvaluatorConfiguration] = None,
+    ) -> Optional[MetricsTestSuite]:
+        """
+        Optionally compute [`TestSuite`][kolena.workflow.TestSuite]-level metrics from the metrics reduced for each test
+        case.
+
+        :param test_suite: The test suite in question.
+        :param metrics: The test-case-level metrics computed by each test case's reducer.
+        :param configuration: The evaluator configuration to use. Empty for implementations that are not configured.
+        :return: The test-suite-level metrics for this test suite.
+        """
+        return None  # not required
+
+
 class _TestCases(TestCases):
     def __init__(
         self,
@@ -243,6 +400,30 @@ class _TestCases(TestCases):
         return json.dumps(ts._to_dict(), sort_keys=True)
 
 
+class _TestCaseIndex:
+    """
+    Tracks test case membership for each test sample in a test suite without retaining the test samples themselves,
+    for use in routing chunks of results to the reducers of each test case.
+
+    Test samples are keyed by a fixed-size digest of their serialized form, such that the memory used by the index does
+    not depend on the size of the test samples.
+    """
+
+    def __init__(self) -> None:
+        self._test_case_ids: Dict[bytes, List[int]] = defaultdict(list)
+
+    def add(self, test_case_id: int, test_sample: TestSample) -> None:
+        self._test_case_ids[_digest(_TestCases._test_sample_key(test_sample))].append(test_case_id)
+
+    def group(self, test_samples: List[TestSample]) -> Dict[int, List[int]]:
+        """Group the indices of the provided test samples by the ID of each test case they belong to."""
+        indices_by_test_case_id: Dict[int, List[int]] = defaultdict(list)
+        for i, ts in enumerate(test_samples):
+            for test_case_id in self._test_case_ids.get(_digest(_TestCases._test_sample_key(ts)), []):
+                indices_by_test_case_id[test_case_id].append(i)
+        return indices_by_test_case_id
+
+
 def _is_configured(evaluator: BasicEvaluatorFunction) -> bool:
     param_values = list(signature(evaluator).parameters.values())
     return len(param_values) == 5 and issubclass(param_values[4].annotation, EvaluatorConfiguration)
@@ -39,7 +39,10 @@ from kolena._utils.frozen import Frozen
 from kolena._utils.instrumentation import telemetry
 from kolena._utils.instrumentation import with_event
 from kolena._utils.instrumentation import WithTelemetry
+from kolena._utils.metadata_cache import invalidate_metadata
+from kolena._utils.metadata_cache import load_metadata
 from kolena._utils.serde import from_dict
+from kolena._utils.tracing import count
 from kolena._utils.validators import validate_name
 from kolena._utils.validators import ValidatorConfig
 from kolena.errors import NotFoundError
@@ -83,7 +86,15 @@ class Model(Frozen, WithTelemetry, metaclass=ABCMeta):
     """
     Function transforming a [`TestSample`][kolena.workflow.TestSample] for a workflow into an
     [`Inference`][kolena.workflow.Inference] object. Required when using [`test`][kolena.workflow.test] or
-    [`TestRun.run`][kolena.workflow.TestRun.run].
+    [`TestRun.run`][kolena.workflow.TestRun.run], unless `infer_batch` is provided.
+    """
+
+    infer_batch: Optional[Callable[[List[TestSample]], List[Inference]]]
+    """
+    Optional function transforming a batch of [`TestSample`s][kolena.workflow.TestSample] into the corresponding list of
+    [`Inference`s][kolena.workflow.Inference], sequenced in the same order. When provided, this function is used in
+    place of `infer` by [`TestRun.run`][kolena.workflow.TestRun.run], which is useful for models that benefit from
+    batching or that wrap a remote model server. Either `infer` or `infer_batch` may be a coroutine function.
     """
 
     _id: int
@@ -101,18 +112,19 @@ class Model(Frozen, WithTelemetry, metaclass=ABCMeta):
         infer: Optional[Callable[[TestSample], Inference]] = None,
         metadata: Optional[Dict[str, Any]] = None,
         tags: Optional[Set[str]] = None,
+        infer_batch: Optional[Callable[[List[TestSample]], List[Inference]]] = None,
     ):
         if type(self) == Model:
             raise Exception("<Model> must be subclassed.")
         validate_name(name, FieldName.MODEL_NAME)
         try:
-            loaded = self.load(name, infer)
+            loaded = self.load(name, infer, infer_batch=infer_batch)
             if len(loaded.metadata.keys()) > 0 and loaded.metadata != metadata:
                 log.warn(f"mismatch in model metadata, using loaded metadata (loaded: {loaded.metadata})")
             if len(loaded.tags) > 0 and loaded.tags != tags:
                 log.warn(f"mismatch in model tags, using loaded tags (loaded: {loaded.tags})")
         except NotFoundError:
-            loaded = self.create(name, infer, metadata, tags)
+            loaded = self.create(name, infer, metadata, tags, infer_batch=infer_batch)
 
         self._populate_from_other(loaded)
 
@@ -124,6 +136,7 @@ class Model(Frozen, WithTelemetry, metaclass=ABCMeta):
         infer: Optional[Callable[[TestSample], Inference]] = None,
         metadata: Optional[Dict[str, Any]] = None,
         tags: Optional[Set[str]] = None,
+        infer_batch: Optional[Callable[[List[TestSample]], List[Inference]]] = None,
     ) -> "Model":
         """
         Create a new model.
@@ -132,6 +145,7 @@ class Model(Frozen, WithTelemetry, metaclass=ABCMeta):
         :param infer: Optional inference function for this model.
         :param metadata: Optional unstructured metadata to store with this model.
         :param tags: Optional set of tags to associate with this model.
+        :param infer_batch: Optional batched inference function for this model.
         :return: The newly created model.
         """
         validate_name(name, FieldName.MODEL_NAME)
@@ -139,23 +153,30 @@ class Model(Frozen, WithTelemetry, metaclass=ABCMeta):
         request = CoreAPI.CreateRequest(name=name, metadata=metadata, workflow=cls.workflow.name, tags=tags)
         res = krequests.post(endpoint_path=API.Path.CREATE.value, data=json.dumps(dataclasses.asdict(request)))
         krequests.raise_for_status(res)
-        obj = cls._from_data_with_infer(from_dict(data_class=CoreAPI.EntityData, data=res.json()), infer)
+        invalidate_metadata(API.Path.LOAD.value, name)
+        data = from_dict(data_class=CoreAPI.EntityData, data=res.json())
+        obj = cls._from_data_with_infer(data, infer, infer_batch)
         log.info(f"created model '{name}' ({get_model_url(obj._id)})")
         return obj
 
     @classmethod
     @with_event(event_name=EventAPI.Event.LOAD_MODEL)
-    def load(cls, name: str, infer: Optional[Callable[[TestSample], Inference]] = None) -> "Model":
+    def load(
+        cls,
+        name: str,
+        infer: Optional[Callable[[TestSample], Inference]] = None,
+        infer_batch: Optional[Callable[[List[TestSample]], List[Inference]]] = None,
+    ) -> "Model":
         """
         Load an existing model.
 
         :param name: The name of the model to load.
         :param infer: Optional inference function for this model.
+        :param infer_batch: Optional batched inference function for this model.
         """
         request = CoreAPI.LoadByNameRequest(name=name)
-        res = krequests.put(endpoint_path=API.Path.LOAD.value, data=json.dumps(dataclasses.asdict(request)))
-        krequests.raise_for_status(res)
-        obj = cls._from_data_with_infer(from_dict(data_class=CoreAPI.EntityData, data=res.json()), infer)
+        data = from_dict(data_class=CoreAPI.EntityData, data=load_metadata(API.Path.LOAD.value, request))
+        obj = cls._from_data_with_infer(data, infer, infer_batch)
         log.info(f"loaded model '{name}' ({get_model_url(obj._id)})")
         return obj
 
@@ -180,23 +201,34 @@ class Model(Frozen, WithTelemetry, metaclass=ABCMeta):
         log.info(f"loading inferences from model '{self.name}' on test case '{test_case.name}'")
         assert_workflows_match(self.workflow.name, test_case.workflow.name)
         for df_batch in _BatchedLoader.iter_data(
-            init_request=API.LoadInferencesRequest(
-                model_id=self._id,
-                test_case_id=test_case._id,
-                batch_size=BatchSize.LOAD_SAMPLES.value,
-            ),
+            init_request=self._load_inferences_request(test_case),
             endpoint_path=API.Path.LOAD_INFERENCES.value,
             df_class=TestSampleDataFrame,
         ):
-            for record in df_batch.itertuples():
-                test_sample = self.workflow.test_sample_type._from_dict(
-                    {**record.test_sample, _METADATA_KEY: record.test_sample_metadata},
-                )
-                ground_truth = self.workflow.ground_truth_type._from_dict(record.ground_truth)
-                inference = self.workflow.inference_type._from_dict(record.inference)
-                yield test_sample, ground_truth, inference
+            yield from self._inferences_from_data_frame(df_batch)
         log.info(f"loaded inferences from model '{self.name}' on test case '{test_case.name}'")
 
+    def _load_inferences_request(self, test_case: TestCase) -> API.LoadInferencesRequest:
+        return API.LoadInferencesRequest(
+            model_id=self._id,
+            test_case_id=test_case._id,
+            batch_size=BatchSize.LOAD_SAMPLES.value,
+        )
+
+    def _inferences_from_data_frame(
+        self,
+        df_batch: TestSampleDataFrame,
+    ) -> Iterator[Tuple[TestSample, GroundTruth, Inference]]:
+        # test samples are hydrated lazily, so only the number of rows is traced rather than a span over the batch
+        count("hydrated_rows", len(df_batch))
+        for record in df_batch.itertuples():
+            test_sample = self.workflow.test_sample_type._from_dict(
+                {**record.test_sample, _METADATA_KEY: record.test_sample_metadata},
+            )
+            ground_truth = self.workflow.ground_truth_type._from_dict(record.ground_truth)
+            inference = self.workflow.inference_type._from_dict(record.inference)
+            yield test_sample, ground_truth, inference
+
     def _populate_from_other(self, other: "Model") -> None:
         with self._unfrozen():
             self._id = other._id
@@ -205,12 +237,14 @@ class Model(Frozen, WithTelemetry, metaclass=ABCMeta):
             self.tags = other.tags
             self.workflow = other.workflow
             self.infer = other.infer
+            self.infer_batch = other.infer_batch
 
     @classmethod
     def _from_data_with_infer(
         cls,
         data: CoreAPI.EntityData,
         infer: Optional[Callable[[TestSample], Inference]] = None,
+        infer_batch: Optional[Callable[[List[TestSample]], List[Inference]]] = None,
     ) -> "Model":
         assert_workflows_match(cls.workflow.name, data.workflow)
         obj = cls.__new__(cls)
@@ -219,5 +253,6 @@ class Model(Frozen, WithTelemetry, metaclass=ABCMeta):
         obj.metadata = data.metadata
         obj.tags = data.tags
         obj.infer = infer
+        obj.infer_batch = infer_batch
         obj._freeze()
         return obj
@@ -42,7 +42,10 @@ from kolena._utils.frozen import Frozen
 from kolena._utils.instrumentation import telemetry
 from kolena._utils.instrumentation import with_event
 from kolena._utils.instrumentation import WithTelemetry
+from kolena._utils.metadata_cache import invalidate_metadata
+from kolena._utils.metadata_cache import load_metadata
 from kolena._utils.serde import from_dict
+from kolena._utils.tracing import count
 from kolena._utils.validators import validate_name
 from kolena._utils.validators import ValidatorConfig
 from kolena.errors import IncorrectUsageError
@@ -209,6 +212,7 @@ class TestCase(Frozen, WithTelemetry, metaclass=ABCMeta):
         request = CoreAPI.CreateRequest(name=name, description=description or "", workflow=cls.workflow.name)
         res = krequests.post(endpoint_path=API.Path.CREATE.value, data=json.dumps(dataclasses.asdict(request)))
         krequests.raise_for_status(res)
+        invalidate_metadata(API.Path.LOAD.value, name)
         data = from_dict(data_class=CoreAPI.EntityData, data=res.json())
         obj = cls._create_from_data(data)
         log.info(f"created test case '{name}' (v{obj.version})")
@@ -228,9 +232,7 @@ class TestCase(Frozen, WithTelemetry, metaclass=ABCMeta):
         :return: The loaded test case.
         """
         request = CoreAPI.LoadByNameRequest(name=name, version=version)
-        res = krequests.put(endpoint_path=API.Path.LOAD.value, data=json.dumps(dataclasses.asdict(request)))
-        krequests.raise_for_status(res)
-        data = from_dict(data_class=CoreAPI.EntityData, data=res.json())
+        data = from_dict(data_class=CoreAPI.EntityData, data=load_metadata(API.Path.LOAD.value, request))
         log.info(f"loaded test case '{name}' (v{data.version})")
         return cls._create_from_data(data)
 
@@ -252,22 +254,28 @@ class TestCase(Frozen, WithTelemetry, metaclass=ABCMeta):
         :return: An iterator yielding each test sample, paired with its ground truth, in this test case.
         """
         log.info(f"loading test samples in test case '{self.name}' (v{self.version})")
-        test_sample_type = self.workflow.test_sample_type
-        ground_truth_type = self.workflow.ground_truth_type
         init_request = CoreAPI.InitLoadContentsRequest(batch_size=BatchSize.LOAD_SAMPLES.value, test_case_id=self._id)
         for df in _BatchedLoader.iter_data(
             init_request=init_request,
             endpoint_path=API.Path.INIT_LOAD_TEST_SAMPLES.value,
             df_class=TestSampleDataFrame,
+            cache_key=f"workflow/test-case/{self._id}/v{self.version}/test-samples",
         ):
-            has_metadata = "test_sample_metadata" in df.columns
-            for record in df.itertuples():
-                metadata_field = record.test_sample_metadata if has_metadata else {}
-                test_sample = test_sample_type._from_dict({**record.test_sample, _METADATA_KEY: metadata_field})
-                ground_truth = ground_truth_type._from_dict(record.ground_truth)
-                yield test_sample, ground_truth
+            yield from self._test_samples_from_data_frame(df)
         log.info(f"loaded test samples in test case '{self.name}' (v{self.version})")
 
+    def _test_samples_from_data_frame(self, df: TestSampleDataFrame) -> Iterator[Tuple[TestSample, GroundTruth]]:
+        test_sample_type = self.workflow.test_sample_type
+        ground_truth_type = self.workflow.ground_truth_type
+        has_metadata = "test_sample_metadata" in df.columns
+        # test samples are hydrated lazily, so only the number of rows is traced rather than a span over the batch
+        count("hydrated_rows", len(df))
+        for record in df.itertuples():
+            metadata_field = record.test_sample_metadata if has_metadata else {}
+            test_sample = test_sample_type._from_dict({**record.test_sample, _METADATA_KEY: metadata_field})
+            ground_truth = ground_truth_type._from_dict(record.ground_truth)
+            yield test_sample, ground_truth
+
     class Editor:
         @dataclass(frozen=True)
         class _Edit:
@@ -362,6 +370,7 @@ class TestCase(Frozen, WithTelemetry, metaclass=ABCMeta):
             data=json.dumps(dataclasses.asdict(request)),
         )
         krequests.raise_for_status(complete_res)
+        invalidate_metadata(API.Path.LOAD.value, self.name)
         test_case_data = from_dict(data_class=CoreAPI.EntityData, data=complete_res.json())
         self._populate_from_other(self._create_from_data(test_case_data))
         log.success(f"edited test case '{self.name}' (v{self.version})")
@@ -441,6 +450,8 @@ class TestCase(Frozen, WithTelemetry, metaclass=ABCMeta):
             data=json.dumps(dataclasses.asdict(request)),
         )
         krequests.raise_for_status(response)
+        for name, _ in data:
+            invalidate_metadata(API.Path.LOAD.value, name)
         bulk_response = from_dict(data_class=CoreAPI.BulkProcessResponse, data=response.json())
 
         test_cases = []
@@ -11,18 +11,27 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
 import dataclasses
+import functools
+import inspect
 import json
+import os
 import time
 from abc import ABCMeta
 from collections import defaultdict
+from contextlib import nullcontext
 from typing import Any
+from typing import Callable
 from typing import cast
+from typing import ContextManager
 from typing import Dict
+from typing import Iterable
 from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Sequence
+from typing import Set
 from typing import Tuple
 from typing import Union
 
@@ -31,19 +40,27 @@ from pydantic import validate_arguments
 
 from kolena._api.v1.event import EventAPI
 from kolena._api.v1.generic import TestRun as API
+from kolena._api.v1.generic import TestSuite as TestSuiteAPI
 from kolena._utils import krequests
 from kolena._utils import log
 from kolena._utils.batched_load import _BatchedLoader
-from kolena._utils.batched_load import init_upload
-from kolena._utils.batched_load import upload_data_frame_chunk
+from kolena._utils.batched_load import BackgroundUploader
+from kolena._utils.batched_load import UploadSession
+from kolena._utils.concurrency import chunked
+from kolena._utils.concurrency import iter_ordered
 from kolena._utils.consts import BatchSize
+from kolena._utils.consts import UPLOAD_CHUNK_BYTES
 from kolena._utils.dataframes.validators import validate_df_schema
 from kolena._utils.endpoints import get_results_url
 from kolena._utils.frozen import Frozen
 from kolena._utils.instrumentation import report_crash
 from kolena._utils.instrumentation import with_event
 from kolena._utils.instrumentation import WithTelemetry
+from kolena._utils.profiling import phase
+from kolena._utils.serde import as_serialized_json
 from kolena._utils.serde import from_dict
+from kolena._utils.tracing import count
+from kolena._utils.tracing import span
 from kolena._utils.validators import ValidatorConfig
 from kolena.errors import IncorrectUsageError
 from kolena.errors import InputValidationError
@@ -64,14 +81,22 @@ from kolena.workflow._datatypes import MetricsDataFrame
 from kolena.workflow._datatypes import MetricsDataFrameSchema
 from kolena.workflow._datatypes import TestSampleDataFrame
 from kolena.workflow._datatypes import TestSampleDataFrameSchema
+from kolena.workflow._datatypes import TestSuiteTestSamplesDataFrame
+from kolena.workflow._journal import _digest
+from kolena.workflow._journal import function_fingerprint
+from kolena.workflow._journal import InferenceJournal
 from kolena.workflow.evaluator import _configuration_description
 from kolena.workflow.evaluator import _maybe_display_name
 from kolena.workflow.evaluator import _maybe_evaluator_configuration_to_api
 from kolena.workflow.evaluator_function import _is_configured
+from kolena.workflow.evaluator_function import _TestCaseIndex
 from kolena.workflow.evaluator_function import _TestCases
 from kolena.workflow.evaluator_function import BasicEvaluatorFunction
 from kolena.workflow.evaluator_function import EvaluationResults
+from kolena.workflow.evaluator_function import StreamingEvaluatorFunction
+from kolena.workflow.evaluator_function import TestCaseReducer
 from kolena.workflow.test_sample import _METADATA_KEY
+from kolena.workflow.test_suite import _test_samples_cache_key
 
 
 class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
@@ -83,8 +108,8 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
     :param test_suite: The test suite on which to test the model.
     :param evaluator: An optional evaluator implementation.
         Requires a previously configured server-side evaluator to default to if omitted.
-        (Please see [`BasicEvaluatorFunction`][kolena.workflow.evaluator_function.BasicEvaluatorFunction] for type
-        definition.)
+        (Please see [`BasicEvaluatorFunction`][kolena.workflow.evaluator_function.BasicEvaluatorFunction] and
+        [`StreamingEvaluatorFunction`][kolena.workflow.StreamingEvaluatorFunction] for type definitions.)
     :param configurations: a list of configurations to use when running the evaluator.
     :param reset: overwrites existing inferences if set.
     """
@@ -93,7 +118,7 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
 
     model: Model
     test_suite: TestSuite
-    evaluator: Optional[Union[Evaluator, BasicEvaluatorFunction]]
+    evaluator: Optional[Union[Evaluator, StreamingEvaluatorFunction, BasicEvaluatorFunction]]
     configurations: Optional[List[EvaluatorConfiguration]]
 
     @validate_arguments(config=ValidatorConfig)
@@ -101,7 +126,7 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
         self,
         model: Model,
         test_suite: TestSuite,
-        evaluator: Optional[Union[Evaluator, BasicEvaluatorFunction]] = None,
+        evaluator: Optional[Union[Evaluator, StreamingEvaluatorFunction, BasicEvaluatorFunction]] = None,
         configurations: Optional[List[EvaluatorConfiguration]] = None,
         reset: bool = False,
     ):
@@ -109,7 +134,8 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
             configurations = []
 
         is_evaluator_class = isinstance(evaluator, Evaluator)
-        is_evaluator_function = evaluator is not None and not is_evaluator_class
+        is_streaming_evaluator = isinstance(evaluator, StreamingEvaluatorFunction)
+        is_evaluator_function = evaluator is not None and not is_evaluator_class and not is_streaming_evaluator
         if is_evaluator_function and _is_configured(evaluator) and len(configurations) == 0:
             raise ValueError("evaluator requires configuration but no configurations provided")
 
@@ -130,7 +156,11 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
         self.reset = reset
 
         evaluator_display_name = (
-            None if evaluator is None else evaluator.display_name() if is_evaluator_class else evaluator.__name__
+            None
+            if evaluator is None
+            else evaluator.display_name()
+            if is_evaluator_class or is_streaming_evaluator
+            else evaluator.__name__
         )
         api_configurations = (
             [_maybe_evaluator_configuration_to_api(config) for config in self.configurations]
@@ -154,28 +184,159 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
         self._freeze()
 
     @with_event(event_name=EventAPI.Event.EXECUTE_TEST_RUN)
-    def run(self) -> None:
+    def run(self, batch_size: Optional[int] = None, concurrency: int = 1, journal_dir: Optional[str] = None) -> None:
         """
         Run the testing process, first extracting inferences for all test samples in the test suite then performing
         evaluation.
+
+        :param batch_size: The number of test samples provided to each call of
+            [`Model.infer_batch`][kolena.workflow.Model.infer_batch]. Defaults to 1 when the model only implements
+            `infer`, and to 32 when the model implements `infer_batch`.
+        :param concurrency: The number of inference requests (batches) to keep in flight at once. Values larger than 1
+            run `infer` or `infer_batch` in a thread pool, or concurrently on an event loop when these are coroutine
+            functions. Inferences are always uploaded in the order of the test samples.
+        :param journal_dir: Optional local directory in which to journal inferences as they are produced. When a run
+            is interrupted before its inferences are uploaded, e.g. by a crash or preemption, running again with the
+            same `journal_dir` skips inference on the journaled test samples and uploads their journaled inferences
+            instead. Journals are specific to the model's `infer` or `infer_batch` function and are discarded when
+            running with `reset=True`. Only journaled test samples still lacking inferences are uploaded. The journal
+            for a test run is removed once its inferences have been uploaded.
+
+        Inferences are uploaded incrementally in the background as inference proceeds and are committed once all test
+        samples have been processed, such that only a bounded number of inferences are held in memory at once.
         """
         try:
-            inferences = []
-            for ts in log.progress_bar(self.iter_test_samples(), desc="performing inference"):
-                if self.model.infer is None:  # only fail when `infer` is necessary
-                    raise ValueError("model must implement `infer`")
-                inferences.append((ts, self.model.infer(ts)))
-
-            if len(inferences) > 0:
-                log.success(f"performed inference on {len(inferences)} test samples")
-                log.info("uploading inferences")
-                self.upload_inferences(inferences)
-
-            self.evaluate()
+            with phase("test_run.run", test_run_id=self._id):
+                journal = None
+                if journal_dir is not None:
+                    journal = self._open_journal(journal_dir)
+
+                with phase("test_run.infer"):
+                    n_inferences = self._upload_inference_records(
+                        log.progress_bar(
+                            self._iter_inference_records(batch_size, concurrency, journal),
+                            desc="performing inference",
+                        ),
+                    )
+                n_replayed = 0
+                if journal is not None:
+                    n_replayed = journal.n_replayed
+                    journal.clear()
+                if n_replayed > 0:
+                    log.success(f"uploaded {n_replayed} journaled inferences")
+                if n_inferences - n_replayed > 0:
+                    log.success(f"performed inference on and uploaded {n_inferences - n_replayed} test samples")
+
+                self.evaluate()
         except Exception as e:
             report_crash(self._id, API.Path.MARK_CRASHED.value)
             raise e
 
+    def _iter_inference_records(
+        self,
+        batch_size: Optional[int],
+        concurrency: int,
+        journal: Optional[InferenceJournal],
+    ) -> Iterator[Tuple[str, str]]:
+        if journal is None:
+            for test_samples, inferences in self._iter_inference_batches(batch_size, concurrency):
+                yield from _serialize_inferences(test_samples, inferences)
+            return
+
+        # only journaled test samples still lacking inferences are replayed, after inference on the others
+        pending_digests: Set[bytes] = set()
+
+        def iter_pending() -> Iterator[TestSample]:
+            for ts in self.iter_test_samples():
+                test_sample = as_serialized_json(ts._to_dict())
+                if test_sample in journal:
+                    pending_digests.add(_digest(test_sample))
+                else:
+                    yield ts
+
+        try:
+            for test_samples, inferences in self._iter_inference_batches(batch_size, concurrency, iter_pending()):
+                for record in _serialize_inferences(test_samples, inferences):
+                    journal.append(*record)
+                    yield record
+        finally:
+            journal.flush()
+
+        if len(pending_digests) > 0:
+            log.info(f"resuming with {len(pending_digests)} journaled inferences from '{journal.directory}'")
+            yield from journal.iter_records(pending_digests)
+
+    def _open_journal(self, journal_dir: str) -> InferenceJournal:
+        # journals are specific to the inference function, such that inferences from a changed model are not replayed
+        infer = self.model.infer_batch if self.model.infer_batch is not None else self.model.infer
+        directory = os.path.join(journal_dir, f"test-run-{self._id}-{function_fingerprint(infer)}")
+        journal = InferenceJournal(directory)
+        if self.reset and len(journal) > 0:
+            log.info(f"discarding {len(journal)} journaled inferences from '{directory}' (reset=True)")
+            journal.clear()
+            journal = InferenceJournal(directory)
+        return journal
+
+    def _iter_inferences(
+        self,
+        batch_size: Optional[int],
+        concurrency: int,
+        test_samples: Optional[Iterable[TestSample]] = None,
+    ) -> Iterator[Tuple[TestSample, Inference]]:
+        for batch_test_samples, inferences in self._iter_inference_batches(batch_size, concurrency, test_samples):
+            yield from zip(batch_test_samples, inferences)
+
+    def _iter_inference_batches(
+        self,
+        batch_size: Optional[int],
+        concurrency: int,
+        test_samples: Optional[Iterable[TestSample]] = None,
+    ) -> Iterator[Tuple[List[TestSample], List[Inference]]]:
+        infer_batch = self._infer_batch_function()
+        if batch_size is None:
+            batch_size = BatchSize.INFER.value if self.model.infer_batch is not None else 1
+        if batch_size <= 0:
+            raise InputValidationError(f"invalid batch_size '{batch_size}': expected positive integer")
+        if concurrency <= 0:
+            raise InputValidationError(f"invalid concurrency '{concurrency}': expected positive integer")
+
+        batches = chunked(self.iter_test_samples() if test_samples is None else test_samples, batch_size)
+        for test_samples, inferences in iter_ordered(infer_batch, batches, max_workers=concurrency):
+            if len(inferences) != len(test_samples):
+                raise ValueError(f"expected {len(test_samples)} inferences from model, got {len(inferences)}")
+            yield test_samples, inferences
+
+    def _infer_batch_function(self) -> Callable[[List[TestSample]], Any]:
+        infer_batch = self._model_infer_batch_function()
+        if inspect.iscoroutinefunction(infer_batch):
+
+            async def infer_batch_traced(test_samples: List[TestSample]) -> List[Inference]:
+                with span("infer", rows=len(test_samples)):
+                    return await infer_batch(test_samples)
+
+            return infer_batch_traced
+
+        def infer_batch_traced(test_samples: List[TestSample]) -> List[Inference]:
+            with span("infer", rows=len(test_samples)):
+                return infer_batch(test_samples)
+
+        return infer_batch_traced
+
+    def _model_infer_batch_function(self) -> Callable[[List[TestSample]], Any]:
+        infer, infer_batch = self.model.infer, self.model.infer_batch
+        if infer_batch is not None:
+            return infer_batch
+
+        def infer_serial(test_samples: List[TestSample]) -> List[Inference]:
+            if infer is None:  # only fail when `infer` is necessary
+                raise ValueError("model must implement `infer`")
+            return [infer(ts) for ts in test_samples]
+
+        async def infer_gather(test_samples: List[TestSample]) -> List[Inference]:
+            return list(await asyncio.gather(*(infer(ts) for ts in test_samples)))
+
+        return infer_gather if inspect.iscoroutinefunction(infer) else infer_serial
+
     def load_test_samples(self) -> List[TestSample]:
         """
         Load the test samples in the test suite that do not yet have inferences uploaded.
@@ -192,11 +353,10 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
         """
         test_sample_type = self.model.workflow.test_sample_type
         for df_batch in self._iter_test_samples_batch():
+            # test samples are hydrated lazily, so only the number of rows is traced rather than a span over the batch
+            count("hydrated_rows", len(df_batch))
             for record in df_batch.itertuples():
-                test_sample = test_sample_type._from_dict(
-                    {**record.test_sample, _METADATA_KEY: record.test_sample_metadata},
-                )
-                yield test_sample
+                yield test_sample_type._from_dict({**record.test_sample, _METADATA_KEY: record.test_sample_metadata})
 
     def _iter_all_inferences(self) -> Iterator[Tuple[TestSample, GroundTruth, Inference]]:
         """
@@ -204,22 +364,33 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
 
         :return: an iterator exposing the ground truths and inferences for all test samples in the test run.
         """
+        for test_samples, ground_truths, inferences in self._iter_all_inferences_batch():
+            yield from zip(test_samples, ground_truths, inferences)
+
+    def _iter_all_inferences_batch(
+        self,
+        batch_size: int = BatchSize.LOAD_SAMPLES.value,
+    ) -> Iterator[Tuple[List[TestSample], List[GroundTruth], List[Inference]]]:
+        if batch_size <= 0:
+            raise InputValidationError(f"invalid batch_size '{batch_size}': expected positive integer")
         log.info(f"loading inferences from model '{self.model.name}' on test suite '{self.test_suite.name}'")
+        workflow = self.test_suite.workflow
         for df_batch in _BatchedLoader.iter_data(
-            init_request=API.LoadTestSampleInferencesRequest(
-                test_run_id=self._id,
-                batch_size=BatchSize.LOAD_SAMPLES.value,
-            ),
+            init_request=API.LoadTestSampleInferencesRequest(test_run_id=self._id, batch_size=batch_size),
             endpoint_path=API.Path.LOAD_INFERENCES.value,
             df_class=TestSampleDataFrame,
         ):
-            for record in df_batch.itertuples():
-                test_sample = self.test_suite.workflow.test_sample_type._from_dict(
-                    {**record.test_sample, _METADATA_KEY: record.test_sample_metadata},
-                )
-                ground_truth = self.test_suite.workflow.ground_truth_type._from_dict(record.ground_truth)
-                inference = self.test_suite.workflow.inference_type._from_dict(record.inference)
-                yield test_sample, ground_truth, inference
+            test_samples, ground_truths, inferences = [], [], []
+            with span("hydrate", rows=len(df_batch)):
+                for record in df_batch.itertuples():
+                    test_samples.append(
+                        workflow.test_sample_type._from_dict(
+                            {**record.test_sample, _METADATA_KEY: record.test_sample_metadata},
+                        ),
+                    )
+                    ground_truths.append(workflow.ground_truth_type._from_dict(record.ground_truth))
+                    inferences.append(workflow.inference_type._from_dict(record.inference))
+            yield test_samples, ground_truths, inferences
         log.info(f"loaded inferences from model '{self.model.name}' on test suite '{self.test_suite.name}'")
 
     @validate_arguments(config=ValidatorConfig)
@@ -229,18 +400,44 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
 
         :param inferences: the inferences, paired with their corresponding test samples, to upload.
         """
-        if len(inferences) == 0:
-            return
+        self._upload_inferences_streaming(inferences)
 
-        inference_dicts = [(ts._to_dict(), inf._to_dict()) for ts, inf in inferences]
-        df = pd.DataFrame(inference_dicts, columns=["test_sample", "inference"])
-        df_validated = TestSampleDataFrame(validate_df_schema(df, TestSampleDataFrameSchema, trusted=True))
-        df_serializable = df_validated.as_serializable()
-
-        init_response = init_upload()
-        upload_data_frame_chunk(df_serializable, init_response.uuid)
+    def _upload_inferences_streaming(self, inferences: Iterable[Tuple[TestSample, Inference]]) -> int:
+        return self._upload_inference_records(_serialize_inference(ts, inf) for ts, inf in inferences)
 
-        request = API.UploadInferencesRequest(uuid=init_response.uuid, test_run_id=self._id, reset=self.reset)
+    def _upload_inference_records(self, records: Iterable[Tuple[str, str]]) -> int:
+        """
+        Upload serialized inference records in chunks of at most ``BatchSize.UPLOAD_INFERENCES`` records or
+        ``UPLOAD_CHUNK_BYTES`` serialized bytes as they are produced, then commit the upload once all records have been
+        consumed. Nothing is committed if consuming the records fails, leaving the test run intact for resumption with
+        ``reset=False``.
+        """
+        n_inferences = 0
+        chunk: List[Tuple[str, str]] = []
+        n_bytes = 0
+        with BackgroundUploader() as uploader:
+            for record in records:
+                chunk.append(record)
+                n_bytes += len(record[0]) + len(record[1])
+                n_inferences += 1
+                if len(chunk) >= BatchSize.UPLOAD_INFERENCES.value or n_bytes >= UPLOAD_CHUNK_BYTES:
+                    uploader.submit(self._inferences_data_frame(chunk))
+                    chunk, n_bytes = [], 0
+            if len(chunk) > 0:
+                uploader.submit(self._inferences_data_frame(chunk))
+
+        if uploader.uuid is not None:
+            self._complete_inferences_upload(uploader.uuid)
+        return n_inferences
+
+    @staticmethod
+    def _inferences_data_frame(records: List[Tuple[str, str]]) -> pd.DataFrame:
+        with span("validate", rows=len(records)):
+            df = pd.DataFrame(records, columns=["test_sample", "inference"])
+            return validate_df_schema(df, TestSampleDataFrameSchema, trusted=True)
+
+    def _complete_inferences_upload(self, uuid: str) -> None:
+        request = API.UploadInferencesRequest(uuid=uuid, test_run_id=self._id, reset=self.reset)
         res = krequests.put(
             endpoint_path=API.Path.UPLOAD_INFERENCES.value,
             data=json.dumps(dataclasses.asdict(request)),
@@ -260,10 +457,13 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
         # TODO: assert that testing is complete?
         t0 = time.time()
         log.info("commencing evaluation")
-        if isinstance(self.evaluator, Evaluator):
-            self._perform_evaluation(self.evaluator)
-        else:
-            self._perform_streamlined_evaluation(self.evaluator)
+        with phase("test_run.evaluate", test_run_id=self._id):
+            if isinstance(self.evaluator, Evaluator):
+                self._perform_evaluation(self.evaluator)
+            elif isinstance(self.evaluator, StreamingEvaluatorFunction):
+                self._perform_streaming_evaluation(self.evaluator)
+            else:
+                self._perform_streamlined_evaluation(self.evaluator)
 
         log.success(f"completed evaluation in {time.time() - t0:0.1f} seconds")
         log.success(f"results: {get_results_url(self.model.workflow.name, self.model._id, self.test_suite._id)}")
@@ -277,54 +477,72 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
         test_case_metrics: Dict[int, Dict[Optional[EvaluatorConfiguration], MetricsTestCase]] = {}
         test_case_plots: Dict[int, Dict[Optional[EvaluatorConfiguration], Optional[List[Plot]]]] = {}
 
-        for test_case in self.test_suite.test_cases:
-            log.info(f"evaluating test case '{test_case.name}'")
-            test_case_metrics_by_config = {}
-            test_case_plots_by_config = {}
-            inferences = self.model.load_inferences(test_case)
+        with UploadSession() as session:
+            for test_case in self.test_suite.test_cases:
+                test_case_metrics[test_case._id], test_case_plots[test_case._id] = self._evaluate_test_case(
+                    evaluator,
+                    test_case,
+                    configurations,
+                    session,
+                )
+            session.wait()
 
+            log.info("computing test suite metrics")
+            test_suite_metrics: Dict[Optional[EvaluatorConfiguration], Optional[MetricsTestSuite]] = {}
             for configuration in configurations:
-                configuration_description = _configuration_description(configuration)
-                log.info(f"computing test sample metrics {configuration_description}")
-                metrics_test_sample = evaluator.compute_test_sample_metrics(test_case, inferences, configuration)
+                test_case_with_metrics = [
+                    (tc, test_case_metrics[tc._id][configuration]) for tc in self.test_suite.test_cases
+                ]
+                log.info(f"computing test suite metrics {_configuration_description(configuration)}")
+                with phase("compute_test_suite_metrics"):
+                    metrics_test_suite = evaluator.compute_test_suite_metrics(
+                        self.test_suite,
+                        test_case_with_metrics,
+                        configuration,
+                    )
+                test_suite_metrics[configuration] = metrics_test_suite
+
+            log.info("uploading test case metrics, test case plots, and test suite metrics")
+            self._upload_test_case_metrics(test_case_metrics, session)
+            self._upload_test_case_plots(test_case_plots, session)
+            self._upload_test_suite_metrics(test_suite_metrics, session)
+
+    def _evaluate_test_case(
+        self,
+        evaluator: Evaluator,
+        test_case: TestCase,
+        configurations: Sequence[Optional[EvaluatorConfiguration]],
+        session: UploadSession,
+    ) -> Tuple[
+        Dict[Optional[EvaluatorConfiguration], MetricsTestCase],
+        Dict[Optional[EvaluatorConfiguration], Optional[List[Plot]]],
+    ]:
+        log.info(f"evaluating test case '{test_case.name}'")
+        test_case_metrics_by_config = {}
+        test_case_plots_by_config = {}
+        with span("load_inferences", test_case=test_case.name):
+            inferences = self.model.load_inferences(test_case)
 
-                log.info(f"uploading test sample metrics {configuration_description}")
-                self._upload_test_sample_metrics(test_case, metrics_test_sample, configuration)
+        for configuration in configurations:
+            configuration_description = _configuration_description(configuration)
+            log.info(f"computing test sample metrics {configuration_description}")
+            with phase("compute_test_sample_metrics", test_case=test_case.name, rows=len(inferences)):
+                metrics_test_sample = evaluator.compute_test_sample_metrics(test_case, inferences, configuration)
+            self._upload_test_sample_metrics(test_case, metrics_test_sample, configuration, session)
 
-                log.info(f"computing test case metrics {configuration_description}")
-                # TODO: sort? order returned from evaluator may not match inferences order
-                mts = [metrics for _, metrics in metrics_test_sample]
+            log.info(f"computing test case metrics {configuration_description}")
+            # TODO: sort? order returned from evaluator may not match inferences order
+            mts = [metrics for _, metrics in metrics_test_sample]
+            with phase("compute_test_case_metrics", test_case=test_case.name):
                 metrics_test_case = evaluator.compute_test_case_metrics(test_case, inferences, mts, configuration)
-                test_case_metrics_by_config[configuration] = metrics_test_case
+            test_case_metrics_by_config[configuration] = metrics_test_case
 
-                log.info(f"computing test case plots {configuration_description}")
+            log.info(f"computing test case plots {configuration_description}")
+            with phase("compute_test_case_plots", test_case=test_case.name):
                 plots_test_case = evaluator.compute_test_case_plots(test_case, inferences, mts, configuration)
-                test_case_plots_by_config[configuration] = plots_test_case
-
-            test_case_metrics[test_case._id] = test_case_metrics_by_config
-            test_case_plots[test_case._id] = test_case_plots_by_config
-
-        log.info("uploading test case metrics")
-        self._upload_test_case_metrics(test_case_metrics)
-        log.info("uploading test case plots")
-        self._upload_test_case_plots(test_case_plots)
-
-        log.info("computing test suite metrics")
-        test_suite_metrics: Dict[Optional[EvaluatorConfiguration], Optional[MetricsTestSuite]] = {}
-        for configuration in configurations:
-            test_case_with_metrics = [
-                (tc, test_case_metrics[tc._id][configuration]) for tc in self.test_suite.test_cases
-            ]
-            log.info(f"computing test suite metrics {_configuration_description(configuration)}")
-            metrics_test_suite = evaluator.compute_test_suite_metrics(
-                self.test_suite,
-                test_case_with_metrics,
-                configuration,
-            )
-            test_suite_metrics[configuration] = metrics_test_suite
+            test_case_plots_by_config[configuration] = plots_test_case
 
-        log.info("uploading test suite metrics")
-        self._upload_test_suite_metrics(test_suite_metrics)
+        return test_case_metrics_by_config, test_case_plots_by_config
 
     def _perform_streamlined_evaluation(self, evaluator: BasicEvaluatorFunction) -> None:
         test_samples, ground_truths, inferences = [], [], []
@@ -343,6 +561,8 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
         test_case_plots: Dict[int, Dict[Optional[EvaluatorConfiguration], List[Plot]]] = defaultdict(dict)
         test_suite_metrics: Dict[Optional[EvaluatorConfiguration], MetricsTestSuite] = dict()
 
+        session = UploadSession()
+
         def process_results(results: Optional[EvaluationResults], config: Optional[EvaluatorConfiguration]) -> None:
             if results is None:
                 log.info(f"no results {_configuration_description(config)}")
@@ -353,6 +573,7 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
                 test_case=None,
                 metrics=results.metrics_test_sample,
                 configuration=config,
+                session=session,
             )
             for test_case, metrics in results.metrics_test_case:
                 test_case_metrics[test_case._id][config] = metrics
@@ -361,28 +582,114 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
             if results.metrics_test_suite is not None:
                 test_suite_metrics[config] = results.metrics_test_suite
 
-        if _is_configured(evaluator):
-            for configuration in self.configurations:
-                test_case_test_samples._set_configuration(configuration)
-                evaluation_results = evaluator(
-                    test_samples,
-                    ground_truths,
-                    inferences,
-                    test_case_test_samples,
-                    configuration,
-                )
-                process_results(evaluation_results, configuration)
-        else:
-            test_case_test_samples._set_configuration(None)
-            evaluation_results = evaluator(test_samples, ground_truths, inferences, test_case_test_samples)
-            process_results(evaluation_results, None)
+        with session:
+            if _is_configured(evaluator):
+                for configuration in self.configurations:
+                    test_case_test_samples._set_configuration(configuration)
+                    with phase("evaluator", rows=len(test_samples)):
+                        evaluation_results = evaluator(
+                            test_samples,
+                            ground_truths,
+                            inferences,
+                            test_case_test_samples,
+                            configuration,
+                        )
+                    process_results(evaluation_results, configuration)
+            else:
+                test_case_test_samples._set_configuration(None)
+                with phase("evaluator", rows=len(test_samples)):
+                    evaluation_results = evaluator(test_samples, ground_truths, inferences, test_case_test_samples)
+                process_results(evaluation_results, None)
+            session.wait()
+
+            log.info("uploading test case metrics, test case plots, and test suite metrics")
+            self._upload_test_case_metrics(test_case_metrics, session)
+            self._upload_test_case_plots(test_case_plots, session)
+            self._upload_test_suite_metrics(test_suite_metrics, session)
+
+    def _perform_streaming_evaluation(self, evaluator: StreamingEvaluatorFunction) -> None:
+        configurations: List[Optional[EvaluatorConfiguration]] = [*self.configurations] or [None]
+        test_case_index = self._load_test_case_index()
+        reducers: Dict[Optional[EvaluatorConfiguration], Dict[int, TestCaseReducer]] = {
+            config: {tc._id: evaluator.reducer(tc, config) for tc in self.test_suite.test_cases}
+            for config in configurations
+        }
+        test_case_metrics: Dict[int, Dict[Optional[EvaluatorConfiguration], MetricsTestCase]] = defaultdict(dict)
+        test_case_plots: Dict[int, Dict[Optional[EvaluatorConfiguration], Optional[List[Plot]]]] = defaultdict(dict)
+        test_suite_metrics: Dict[Optional[EvaluatorConfiguration], Optional[MetricsTestSuite]] = {}
 
-        log.info("uploading test case metrics")
-        self._upload_test_case_metrics(test_case_metrics)
-        log.info("uploading test case plots")
-        self._upload_test_case_plots(test_case_plots)
-        log.info("uploading test suite metrics")
-        self._upload_test_suite_metrics(test_suite_metrics)
+        with UploadSession() as session:
+            n_processed = 0
+            for test_samples, ground_truths, inferences in self._iter_all_inferences_batch(evaluator.chunk_size):
+                indices_by_test_case_id = test_case_index.group(test_samples)
+                for config in configurations:
+                    with phase("compute_test_sample_metrics", rows=len(test_samples)):
+                        metrics = evaluator.compute_test_sample_metrics(test_samples, ground_truths, inferences, config)
+                    if len(metrics) != len(test_samples):
+                        raise ValueError(
+                            f"expected {len(test_samples)} test sample metrics {_configuration_description(config)}, "
+                            f"got {len(metrics)}",
+                        )
+
+                    session.add(
+                        self._test_sample_metrics_key(None, config),
+                        self._test_sample_metrics_data_frame(list(zip(test_samples, metrics))),
+                    )
+
+                    for test_case_id, indices in indices_by_test_case_id.items():
+                        reducers[config][test_case_id].update(
+                            [test_samples[i] for i in indices],
+                            [ground_truths[i] for i in indices],
+                            [inferences[i] for i in indices],
+                            [metrics[i] for i in indices],
+                        )
+                n_processed += len(test_samples)
+                log.info(f"computed test sample metrics for {n_processed} test samples")
+
+            log.info("uploading test sample metrics")
+            for config in configurations:
+                self._commit_test_sample_metrics(session, None, config)
+
+            for config in configurations:
+                log.info(f"computing test case metrics {_configuration_description(config)}")
+                for test_case in self.test_suite.test_cases:
+                    reducer = reducers[config][test_case._id]
+                    with phase("compute_test_case_metrics", test_case=test_case.name):
+                        test_case_metrics[test_case._id][config] = reducer.compute()
+                        test_case_plots[test_case._id][config] = reducer.compute_plots()
+
+                log.info(f"computing test suite metrics {_configuration_description(config)}")
+                with phase("compute_test_suite_metrics"):
+                    test_suite_metrics[config] = evaluator.compute_test_suite_metrics(
+                        self.test_suite,
+                        [(tc, test_case_metrics[tc._id][config]) for tc in self.test_suite.test_cases],
+                        config,
+                    )
+            session.wait()
+
+            log.info("uploading test case metrics, test case plots, and test suite metrics")
+            self._upload_test_case_metrics(test_case_metrics, session)
+            self._upload_test_case_plots(test_case_plots, session)
+            self._upload_test_suite_metrics(test_suite_metrics, session)
+
+    def _load_test_case_index(self) -> _TestCaseIndex:
+        test_case_index = _TestCaseIndex()
+        test_sample_type = self.test_suite.workflow.test_sample_type
+        for df_batch in _BatchedLoader.iter_data(
+            init_request=TestSuiteAPI.LoadTestSamplesRequest(
+                test_suite_id=self.test_suite._id,
+                batch_size=BatchSize.LOAD_SAMPLES.value,
+            ),
+            endpoint_path=TestSuiteAPI.Path.INIT_LOAD_TEST_SAMPLES.value,
+            df_class=TestSuiteTestSamplesDataFrame,
+            cache_key=_test_samples_cache_key(self.test_suite),
+        ):
+            for record in df_batch.itertuples():
+                test_sample = test_sample_type._from_dict(
+                    {**record.test_sample, _METADATA_KEY: record.test_sample_metadata},
+                )
+                test_case_index.add(int(record.test_case_id), test_sample)
+        return test_case_index
 
     def _iter_test_samples_batch(
         self,
@@ -407,17 +714,55 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
         test_case: Optional[TestCase],
         metrics: List[Tuple[TestSample, MetricsTestSample]],
         configuration: Optional[EvaluatorConfiguration],
+        session: Optional[UploadSession] = None,
     ) -> None:
-        metrics_records = [(ts._to_dict(), ts_metrics._to_dict()) for ts, ts_metrics in metrics]
-        df = pd.DataFrame(metrics_records, columns=["test_sample", "metrics"])
-        df_validated = MetricsDataFrame(validate_df_schema(df, MetricsDataFrameSchema, trusted=True))
-        df_serializable = df_validated.as_serializable()
+        with _upload_session(session) as upload_session:
+            key = self._test_sample_metrics_key(test_case, configuration)
+            upload_session.add(key, self._test_sample_metrics_data_frame(metrics))
+            self._commit_test_sample_metrics(upload_session, test_case, configuration)
+
+    @staticmethod
+    def _test_sample_metrics_key(
+        test_case: Optional[TestCase],
+        configuration: Optional[EvaluatorConfiguration],
+    ) -> Tuple[str, Optional[int], Optional[EvaluatorConfiguration]]:
+        return (
+            API.Path.UPLOAD_TEST_SAMPLE_METRICS.value,
+            test_case._id if test_case is not None else None,
+            configuration,
+        )
+
+    def _commit_test_sample_metrics(
+        self,
+        session: UploadSession,
+        test_case: Optional[TestCase],
+        configuration: Optional[EvaluatorConfiguration],
+    ) -> None:
+        session.commit(
+            self._test_sample_metrics_key(test_case, configuration),
+            functools.partial(
+                self._complete_test_sample_metrics_upload,
+                test_case=test_case,
+                configuration=configuration,
+            ),
+        )
 
-        init_response = init_upload()
-        upload_data_frame_chunk(df_serializable, init_response.uuid)
+    @staticmethod
+    def _test_sample_metrics_data_frame(metrics: List[Tuple[TestSample, MetricsTestSample]]) -> pd.DataFrame:
+        with span("serialize", rows=len(metrics)):
+            metrics_records = [(ts._to_dict(), ts_metrics._to_dict()) for ts, ts_metrics in metrics]
+            df = pd.DataFrame(metrics_records, columns=["test_sample", "metrics"])
+            df_validated = MetricsDataFrame(validate_df_schema(df, MetricsDataFrameSchema, trusted=True))
+            return df_validated.as_serializable()
 
+    def _complete_test_sample_metrics_upload(
+        self,
+        uuid: str,
+        test_case: Optional[TestCase],
+        configuration: Optional[EvaluatorConfiguration],
+    ) -> None:
         request = API.UploadTestSampleMetricsRequest(
-            uuid=init_response.uuid,
+            uuid=uuid,
             test_run_id=self._id,
             test_case_id=test_case._id if test_case is not None else None,
             configuration=_maybe_evaluator_configuration_to_api(configuration),
@@ -431,6 +776,7 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
     def _upload_test_case_metrics(
         self,
         metrics: Dict[int, Dict[Optional[EvaluatorConfiguration], MetricsTestCase]],
+        session: Optional[UploadSession] = None,
     ) -> None:
         records = [
             (test_case_id, _maybe_display_name(config), tc_metrics._to_dict())
@@ -438,11 +784,12 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
             for config, tc_metrics in tc_metrics_by_config.items()
         ]
         df = pd.DataFrame(records, columns=["test_case_id", "configuration_display_name", "metrics"])
-        return self._upload_aggregate_metrics(API.Path.UPLOAD_TEST_CASE_METRICS.value, df)
+        return self._upload_aggregate_metrics(API.Path.UPLOAD_TEST_CASE_METRICS.value, df, session)
 
     def _upload_test_case_plots(
         self,
         plots: Dict[int, Dict[Optional[EvaluatorConfiguration], Optional[List[Plot]]]],
+        session: Optional[UploadSession] = None,
     ) -> None:
         records = [
             (test_case_id, _maybe_display_name(config), tc_plot._to_dict())
@@ -451,11 +798,12 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
             for tc_plot in tc_plots or []
         ]
         df = pd.DataFrame(records, columns=["test_case_id", "configuration_display_name", "metrics"])
-        return self._upload_aggregate_metrics(API.Path.UPLOAD_TEST_CASE_PLOTS.value, df)
+        return self._upload_aggregate_metrics(API.Path.UPLOAD_TEST_CASE_PLOTS.value, df, session)
 
     def _upload_test_suite_metrics(
         self,
         metrics: Dict[Optional[EvaluatorConfiguration], Optional[MetricsTestSuite]],
+        session: Optional[UploadSession] = None,
     ) -> None:
         records: List[Tuple[Optional[str], Dict[str, Any]]] = [
             (_maybe_display_name(config), ts_metrics._to_dict())
@@ -463,17 +811,27 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
             if ts_metrics is not None
         ]
         df = pd.DataFrame(records, columns=["configuration_display_name", "metrics"])
-        return self._upload_aggregate_metrics(API.Path.UPLOAD_TEST_SUITE_METRICS.value, df)
+        return self._upload_aggregate_metrics(API.Path.UPLOAD_TEST_SUITE_METRICS.value, df, session)
 
-    def _upload_aggregate_metrics(self, endpoint_path: str, df: pd.DataFrame) -> None:
+    def _upload_aggregate_metrics(
+        self,
+        endpoint_path: str,
+        df: pd.DataFrame,
+        session: Optional[UploadSession] = None,
+    ) -> None:
         df_validated = MetricsDataFrame(validate_df_schema(df, MetricsDataFrameSchema, trusted=True))
         df_serializable = df_validated.as_serializable()
 
-        init_response = init_upload()
-        upload_data_frame_chunk(df_serializable, init_response.uuid)
+        with _upload_session(session) as upload_session:
+            upload_session.add(endpoint_path, df_serializable)
+            upload_session.commit(
+                endpoint_path,
+                functools.partial(self._complete_aggregate_metrics_upload, endpoint_path=endpoint_path),
+            )
 
+    def _complete_aggregate_metrics_upload(self, uuid: str, endpoint_path: str) -> None:
         request = API.UploadAggregateMetricsRequest(
-            uuid=init_response.uuid,
+            uuid=uuid,
             test_run_id=self._id,
             test_suite_id=self.test_suite._id,
         )
@@ -486,13 +844,29 @@ class TestRun(Frozen, WithTelemetry, metaclass=ABCMeta):
         krequests.raise_for_status(res)
 
 
+def _upload_session(session: Optional[UploadSession]) -> ContextManager[UploadSession]:
+    return nullcontext(session) if session is not None else UploadSession()
+
+
+def _serialize_inferences(test_samples: List[TestSample], inferences: List[Inference]) -> List[Tuple[str, str]]:
+    with span("serialize", rows=len(test_samples)):
+        return [_serialize_inference(ts, inf) for ts, inf in zip(test_samples, inferences)]
+
+
+def _serialize_inference(test_sample: TestSample, inference: Inference) -> Tuple[str, str]:
+    return as_serialized_json(test_sample._to_dict()), as_serialized_json(inference._to_dict())
+
+
 @validate_arguments(config=ValidatorConfig)
 def test(
     model: Model,
     test_suite: TestSuite,
-    evaluator: Optional[Union[Evaluator, BasicEvaluatorFunction]] = None,
+    evaluator: Optional[Union[Evaluator, StreamingEvaluatorFunction, BasicEvaluatorFunction]] = None,
     configurations: Optional[List[EvaluatorConfiguration]] = None,
     reset: bool = False,
+    batch_size: Optional[int] = None,
+    concurrency: int = 1,
+    journal_dir: Optional[str] = None,
 ) -> None:
     """
     Test a [`Model`][kolena.workflow.Model] on a [`TestSuite`][kolena.workflow.TestSuite] using a specific
@@ -508,13 +882,23 @@ def test(
     :param test_suite: The test suite on which to test the model.
     :param evaluator: An optional evaluator implementation.
         Requires a previously configured server-side evaluator to default to if omitted.
-        (Please see [`BasicEvaluatorFunction`][kolena.workflow.evaluator_function.BasicEvaluatorFunction] for type
-        definition.)
+        (Please see [`BasicEvaluatorFunction`][kolena.workflow.evaluator_function.BasicEvaluatorFunction] and
+        [`StreamingEvaluatorFunction`][kolena.workflow.StreamingEvaluatorFunction] for type definitions.)
     :param configurations: A list of configurations to use when running the evaluator.
     :param reset: Overwrites existing inferences if set.
+    :param batch_size: The number of test samples provided to each call of
+        [`Model.infer_batch`][kolena.workflow.Model.infer_batch]. See [`TestRun.run`][kolena.workflow.TestRun.run].
+    :param concurrency: The number of inference requests to keep in flight at once. See
+        [`TestRun.run`][kolena.workflow.TestRun.run].
+    :param journal_dir: Optional local directory in which to journal inferences, such that an interrupted run can be
+        resumed without repeating inference. See [`TestRun.run`][kolena.workflow.TestRun.run].
     """
     if not test_suite.test_cases:
         raise IncorrectUsageError(
             f"test suite '{test_suite.name}' has no test cases, please add test cases" f" to the test suite",
         )
-    TestRun(model, test_suite, evaluator, configurations, reset).run()
+    TestRun(model, test_suite, evaluator, configurations, reset).run(
+        batch_size=batch_size,
+        concurrency=concurrency,
+        journal_dir=journal_dir,
+    )
@@ -39,6 +39,8 @@ from kolena._utils.frozen import Frozen
 from kolena._utils.instrumentation import telemetry
 from kolena._utils.instrumentation import with_event
 from kolena._utils.instrumentation import WithTelemetry
+from kolena._utils.metadata_cache import invalidate_metadata
+from kolena._utils.metadata_cache import load_metadata
 from kolena._utils.serde import from_dict
 from kolena._utils.validators import validate_name
 from kolena._utils.validators import ValidatorConfig
@@ -206,6 +208,7 @@ class TestSuite(Frozen, WithTelemetry, metaclass=ABCMeta):
         request = CoreAPI.CreateRequest(name=name, description=description or "", workflow=cls.workflow.name, tags=tags)
         res = krequests.post(endpoint_path=API.Path.CREATE, data=json.dumps(dataclasses.asdict(request)))
         krequests.raise_for_status(res)
+        invalidate_metadata(API.Path.LOAD.value, name)
         data = from_dict(data_class=CoreAPI.EntityData, data=res.json())
         obj = cls._create_from_data(data)
         log.info(f"created test suite '{name}' (v{obj.version}) ({get_test_suite_url(obj._id)})")
@@ -226,9 +229,7 @@ class TestSuite(Frozen, WithTelemetry, metaclass=ABCMeta):
         """
         cls._validate_workflow()
         request = CoreAPI.LoadByNameRequest(name=name, version=version)
-        res = krequests.put(endpoint_path=API.Path.LOAD, data=json.dumps(dataclasses.asdict(request)))
-        krequests.raise_for_status(res)
-        data = from_dict(data_class=CoreAPI.EntityData, data=res.json())
+        data = from_dict(data_class=CoreAPI.EntityData, data=load_metadata(API.Path.LOAD.value, request))
         obj = cls._create_from_data(data)
         log.info(f"loaded test suite '{name}' (v{obj.version}) ({get_test_suite_url(obj._id)})")
         return obj
@@ -342,6 +343,7 @@ class TestSuite(Frozen, WithTelemetry, metaclass=ABCMeta):
         )
         res = krequests.post(endpoint_path=API.Path.EDIT, data=json.dumps(dataclasses.asdict(request)))
         krequests.raise_for_status(res)
+        invalidate_metadata(API.Path.LOAD.value, self.name)
         test_suite_data = from_dict(data_class=CoreAPI.EntityData, data=res.json())
         self._populate_from_other(self._create_from_data(test_suite_data))
         log.success(f"edited test suite '{self.name}' (v{self.version}) ({get_test_suite_url(self._id)})")
@@ -362,6 +364,7 @@ class TestSuite(Frozen, WithTelemetry, metaclass=ABCMeta):
             ),
             endpoint_path=API.Path.INIT_LOAD_TEST_SAMPLES,
             df_class=TestSuiteTestSamplesDataFrame,
+            cache_key=_test_samples_cache_key(self),
         ):
             for record in df_batch.itertuples():
                 test_sample = self.workflow.test_sample_type._from_dict(
@@ -371,3 +374,7 @@ class TestSuite(Frozen, WithTelemetry, metaclass=ABCMeta):
 
         test_case_id_to_test_case = {tc._id: tc for tc in self.test_cases}
         return [(test_case_id_to_test_case[tc_id], samples) for tc_id, samples in test_case_id_to_samples.items()]
+
+
+def _test_samples_cache_key(test_suite: TestSuite) -> str:
+    return f"workflow/test-suite/{test_suite._id}/v{test_suite.version}/test-samples"
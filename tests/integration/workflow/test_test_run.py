@@ -36,8 +36,10 @@ from kolena.workflow import Inference
 from kolena.workflow import MetricsTestCase
 from kolena.workflow import MetricsTestSample
 from kolena.workflow import no_op_evaluator
+from kolena.workflow import StreamingEvaluatorFunction
 from kolena.workflow import test
 from kolena.workflow import TestCase
+from kolena.workflow import TestCaseReducer
 from kolena.workflow import TestCases
 from kolena.workflow import TestRun
 from kolena.workflow import TestSample
@@ -213,6 +215,27 @@ def test__test__reset(
     assert_sorted_list_equal(test_run.load_test_samples(), test_samples)
 
 
+def test__test__infer_batch(
+    dummy_test_suites: List[TestSuite],
+    dummy_test_samples: List[DummyTestSample],
+) -> None:
+    batches: List[List[DummyTestSample]] = []
+
+    def infer_batch(test_samples: List[DummyTestSample]) -> List[DummyInference]:
+        batches.append(test_samples)
+        return [DummyInference(score=ts.value / 10) for ts in test_samples]
+
+    name = with_test_prefix(f"{__file__}::test__test__infer_batch model")
+    model = Model(name=name, infer_batch=infer_batch)
+    evaluator = TestTestDummyEvaluator(configurations=[DummyConfiguration(value="test__test__infer_batch")])
+
+    test(model, dummy_test_suites[0], evaluator, batch_size=3, concurrency=2)
+
+    assert all(len(batch) <= 3 for batch in batches)
+    assert_sorted_list_equal([ts for batch in batches for ts in batch], dummy_test_samples)
+    assert TestRun(model, dummy_test_suites[0], evaluator).load_test_samples() == []
+
+
 def test__test__mark_crashed(
     dummy_test_suites: List[TestSuite],
 ) -> None:
@@ -373,6 +396,59 @@ def test__test__function_evaluator__with_skip(
     TestRun(dummy_model, dummy_test_suites[0], dummy_evaluator_function_with_config, config)
 
 
+class DummyTestCaseReducer(TestCaseReducer):
+    def __init__(self, value: int):
+        self.value = value
+        self.n_samples = 0
+
+    def update(
+        self,
+        test_samples: List[DummyTestSample],
+        ground_truths: List[DummyGroundTruth],
+        inferences: List[DummyInference],
+        metrics_test_sample: List[DummyMetricsTestSample],
+    ) -> None:
+        self.n_samples += len(test_samples)
+
+    def compute(self) -> DummyMetricsTestCase:
+        return DummyMetricsTestCase(value=self.value)
+
+
+class DummyStreamingEvaluator(StreamingEvaluatorFunction):
+    def __init__(self, chunk_size: int):
+        super().__init__(chunk_size=chunk_size)
+        self.fixed_random_value = random.randint(0, 1_000_000_000)
+        self.reducers: List[DummyTestCaseReducer] = []
+
+    def compute_test_sample_metrics(
+        self,
+        test_samples: List[DummyTestSample],
+        ground_truths: List[DummyGroundTruth],
+        inferences: List[DummyInference],
+        configuration: Optional[DummyConfiguration] = None,
+    ) -> List[DummyMetricsTestSample]:
+        return [DummyMetricsTestSample(value=self.fixed_random_value) for _ in test_samples]
+
+    def reducer(self, test_case: TestCase, configuration: Optional[DummyConfiguration] = None) -> TestCaseReducer:
+        reducer = DummyTestCaseReducer(self.fixed_random_value)
+        self.reducers.append(reducer)
+        return reducer
+
+
+def test__test__streaming_evaluator(
+    dummy_model: Model,
+    dummy_test_suites: List[TestSuite],
+    dummy_test_samples: List[DummyTestSample],
+) -> None:
+    evaluator = DummyStreamingEvaluator(chunk_size=2)
+    config = [DummyConfiguration(value="a"), DummyConfiguration(value="b")]
+    test(dummy_model, dummy_test_suites[0], evaluator, config)
+
+    n_test_cases = len(dummy_test_suites[0].test_cases)
+    assert len(evaluator.reducers) == n_test_cases * len(config)
+    assert all(reducer.n_samples > 0 for reducer in evaluator.reducers)
+
+
 @pytest.mark.depends(on=["test__test"])
 def test__test__remote_evaluator(
     dummy_model: Model,
@@ -0,0 +1,103 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import io
+import json
+import re
+from typing import Any
+from typing import List
+
+import pandas as pd
+import pytest
+import requests_mock
+
+import kolena.aio
+from kolena._api.v1.batched_load import BatchedLoad as API
+from tests.unit.conftest import parquet_bytes
+
+
+pytestmark = pytest.mark.usefixtures("initialized")
+
+
+def test__iter_data() -> None:
+    dfs = [pd.DataFrame(dict(value=[i, i + 1])) for i in range(0, 6, 2)]
+    lines = "\n".join(json.dumps(dict(uuid="load-uuid", path=f"path-{i}")) for i in range(len(dfs)))
+
+    async def collect(transport: kolena.aio.AsyncTransport) -> List[pd.DataFrame]:
+        return [
+            df
+            async for df in kolena.aio.iter_data(
+                API.BaseInitDownloadRequest(batch_size=2),
+                "/init",
+                None,
+                transport=transport,
+            )
+        ]
+
+    transport = kolena.aio.AsyncTransport(max_connections=4)
+    with requests_mock.Mocker() as mocker:
+        mocker.put(re.compile(".*/init$"), text=lines)
+        for i, df in enumerate(dfs):
+            mocker.get(re.compile(f".*{API.Path.download_by_path(f'path-{i}')}$"), content=parquet_bytes(df))
+        complete = mocker.put(re.compile(f".*{API.Path.COMPLETE_DOWNLOAD.value}$"))
+        got = asyncio.run(collect(transport))
+    transport.close()
+
+    assert [df["value"].tolist() for df in got] == [df["value"].tolist() for df in dfs]
+    assert complete.call_count == 1
+    assert complete.last_request.json() == dict(uuid="load-uuid")
+
+
+def test__upload_data_frame() -> None:
+    df = pd.DataFrame(dict(value=list(range(10))))
+    uploaded: List[pd.DataFrame] = []
+
+    def upload(request: Any, context: Any) -> str:
+        uploaded.append(pd.read_parquet(io.BytesIO(request.body.read())))
+        return ""
+
+    async def run() -> None:
+        init_response = await kolena.aio.init_upload()
+        await kolena.aio.upload_data_frame(df, init_response.uuid, batch_size=3)
+
+    with requests_mock.Mocker() as mocker:
+        mocker.put(re.compile(f".*{API.Path.INIT_UPLOAD.value}$"), json=dict(uuid="upload-uuid"))
+        mocker.get(
+            re.compile(f".*{API.Path.upload_signed_url('upload-uuid')}$"),
+            json=dict(signed_url="https://signed.url/upload"),
+        )
+        mocker.put("https://signed.url/upload", text=upload)
+        asyncio.run(run())
+
+    assert len(uploaded) == 4
+    assert sorted(v for df_chunk in uploaded for v in df_chunk["value"]) == list(range(10))
+
+
+def test__upload_data_frame_chunk__retry() -> None:
+    df = pd.DataFrame(dict(value=[0]))
+    with requests_mock.Mocker() as mocker:
+        signed_url = mocker.get(
+            re.compile(f".*{API.Path.upload_signed_url('upload-uuid')}$"),
+            [dict(status_code=500), dict(json=dict(signed_url="https://signed.url/upload"))],
+        )
+        upload = mocker.put("https://signed.url/upload")
+        asyncio.run(kolena.aio.upload_data_frame_chunk(df, "upload-uuid"))
+
+    assert signed_url.call_count == 2
+    assert upload.call_count == 1
+
+
+def test__async_transport__invalid() -> None:
+    with pytest.raises(ValueError):
+        kolena.aio.AsyncTransport(max_connections=0)
@@ -0,0 +1,35 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+from typing import Iterator
+
+import pandas as pd
+import pytest
+
+from kolena._utils.state import _client_state
+
+
+@pytest.fixture
+def initialized() -> Iterator[None]:
+    _client_state.update(api_token="api-token", jwt_token="jwt-token", tenant="tenant")
+    try:
+        yield
+    finally:
+        _client_state.reset()
+
+
+def parquet_bytes(df: pd.DataFrame) -> bytes:
+    buffer = io.BytesIO()
+    df.to_parquet(buffer)
+    return buffer.getvalue()
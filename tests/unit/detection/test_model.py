@@ -11,11 +11,73 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from typing import Any
+from typing import Dict
+from typing import List
+
+import pandas as pd
 import pytest
 
+from kolena.detection import TestImage
+from kolena.detection import TestSuite
+from kolena.detection._datatypes import LoadInferencesDataFrame
+from kolena.detection.inference import BoundingBox
 from kolena.detection.model import Model
 
 
 def test__init__validate_name() -> None:
     with pytest.raises(ValueError):
         Model("")
+
+
+def _inference_batches() -> List[pd.DataFrame]:
+    images = [TestImage(f"s3://bucket/image-{i}.jpg", dataset="dataset", metadata=dict(index=i)) for i in range(4)]
+    inferences = [
+        [BoundingBox("car", 0.9, (0, 0), (10, 10))],
+        [],
+        None,
+        [BoundingBox("bus", 0.4, (1.5, 2.5), (3.5, 4.5)), BoundingBox("car", 0.7, (5, 5), (6, 6))],
+    ]
+    memberships = [(30, 0), (10, 0), (10, 1), (20, 3), (10, 3), (30, 2), (20, 0), (10, 2)]
+    records = [
+        (
+            *TestImage._to_record(images[i]),
+            test_case_id,
+            None if inferences[i] is None else [inference._to_dict() for inference in inferences[i]],
+        )
+        for test_case_id, i in memberships
+    ]
+    columns = ["locator", "dataset", "ground_truths", "metadata", "test_case_id", "inferences"]
+    df = LoadInferencesDataFrame(pd.DataFrame.from_records(records, columns=columns)).as_serializable()
+    return [df.iloc[:3], df.iloc[3:]]
+
+
+def test__iter_inferences_by_test_case(monkeypatch: pytest.MonkeyPatch) -> None:
+    batches = _inference_batches()
+    monkeypatch.setattr(Model, "_iter_inference_batch_for_test_suite", lambda *args, **kwargs: iter(batches))
+    model = Model.__new__(Model)
+    hydrated = []
+
+    def inferences_from_record(record: Any) -> Any:
+        hydrated.append(record.locator)
+        return Model._inferences_from_record(model, record)
+
+    object.__setattr__(model, "_inferences_from_record", inferences_from_record)
+    test_suite = TestSuite.__new__(TestSuite)
+    groups = list(model.iter_inferences_by_test_case(test_suite))
+
+    df_all = LoadInferencesDataFrame.from_serializable(pd.concat(batches, ignore_index=True))
+    expected: Dict[int, List[Any]] = {}
+    for record in df_all.itertuples():
+        expected.setdefault(record.test_case_id, []).append(Model._inferences_from_record(model, record))
+
+    assert [test_case_id for test_case_id, _ in groups] == [10, 20, 30]
+    assert dict(groups) == expected
+    assert sorted(hydrated) == sorted(set(df_all["locator"]))
+    # images shared between test cases are hydrated once and shared between groups
+    assert dict(groups)[10][0] is dict(groups)[20][1]
+
+
+def test__iter_inferences_by_test_case__empty(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(Model, "_iter_inference_batch_for_test_suite", lambda *args, **kwargs: iter([]))
+    assert Model.__new__(Model).load_inferences_by_test_case(TestSuite.__new__(TestSuite)) == {}
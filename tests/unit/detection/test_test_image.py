@@ -15,9 +15,12 @@ import uuid
 from typing import Any
 from typing import Dict
 
+import pandas as pd
+import pandera as pa
 import pytest
 from pydantic import ValidationError
 
+import kolena.detection._datatypes  # noqa: F401 -- registers checks
 import kolena.detection.metadata
 from kolena.detection import TestImage
 from kolena.detection.ground_truth import BoundingBox
@@ -189,3 +192,13 @@ def test__test_image__infinite_metadata(metadata: Dict[str, Any]) -> None:
 )
 def test__test_image__equality(a: TestImage, b: TestImage, expected: bool) -> None:
     assert (a == b) is expected
+
+
+def test__validate_ground_truths() -> None:
+    check = pa.Check._validate_ground_truths()
+    ground_truth = dict(data_type="DETECTION/BOUNDING_BOX", data_object=dict(label="car"))
+    assert check(pd.Series([[ground_truth], [], None, [ground_truth, ground_truth]])).check_passed
+    assert not check(pd.Series([[ground_truth], [dict(data_type="DETECTION/BOUNDING_BOX")]])).check_passed
+    assert not check(
+        pd.Series([[ground_truth], [dict(data_type="DETECTION/BOUNDING_BOX", data_object={})]])
+    ).check_passed
@@ -0,0 +1,291 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import re
+from types import SimpleNamespace
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests_mock
+
+from kolena import classification
+from kolena._api.v1.batched_load import BatchedLoad as BatchedLoadAPI
+from kolena._api.v1.detection import TestRun as API
+from kolena._api.v1.workflow import WorkflowType
+from kolena.detection import Model
+from kolena.detection import TestCase
+from kolena.detection import TestImage
+from kolena.detection import TestRun
+from kolena.detection import TestSuite
+from kolena.detection._datatypes import LoadInferencesDataFrame
+from kolena.detection.inference import BoundingBox
+from kolena.errors import CustomMetricsException
+from kolena.errors import InputValidationError
+
+LOCATORS = [f"s3://bucket/image-{i}.jpg" for i in range(4)]
+
+
+pytestmark = pytest.mark.usefixtures("initialized")
+
+
+@pytest.fixture
+def mocker() -> Iterator[requests_mock.Mocker]:
+    with requests_mock.Mocker() as mocker:
+        mocker.post(re.compile(f".*{API.Path.CREATE_OR_RETRIEVE.value}$"), json=dict(test_run_id=3))
+        mocker.put(re.compile(f".*{BatchedLoadAPI.Path.INIT_UPLOAD.value}$"), json=dict(uuid="upload-uuid"))
+        mocker.get(
+            re.compile(f".*{BatchedLoadAPI.Path.upload_signed_url('upload-uuid')}$"),
+            json=dict(signed_url="https://signed.url/upload"),
+        )
+        mocker.put(re.compile(f".*{API.Path.UPLOAD_IMAGE_RESULTS.value}$"), text="{}")
+        mocker.uploaded = []
+
+        def upload(request: Any, context: Any) -> str:
+            mocker.uploaded.append(pd.read_parquet(io.BytesIO(request.body.read())))
+            return ""
+
+        mocker.put("https://signed.url/upload", text=upload)
+        yield mocker
+
+
+def _test_run(is_classification: bool = False, **kwargs: Any) -> TestRun:
+    model_class, test_suite_class, test_run_class, workflow = (
+        (classification.Model, classification.TestSuite, classification.TestRun, WorkflowType.CLASSIFICATION)
+        if is_classification
+        else (Model, TestSuite, TestRun, WorkflowType.DETECTION)
+    )
+    model, test_suite = model_class.__new__(model_class), test_suite_class.__new__(test_suite_class)
+    object.__setattr__(model, "_id", 1)
+    object.__setattr__(model, "_workflow", workflow)
+    object.__setattr__(test_suite, "_id", 2)
+    test_run = test_run_class(model, test_suite, **kwargs)
+    test_run._locator_to_image_id = {locator: 10 + i for i, locator in enumerate(LOCATORS)}
+    return test_run
+
+
+def _uploaded(mocker: requests_mock.Mocker) -> pd.DataFrame:
+    df = pd.concat(mocker.uploaded, ignore_index=True)
+    return df.sort_values(["test_sample_id", "ignore", "confidence"], ignore_index=True)
+
+
+def test__add_inferences_batch(mocker: requests_mock.Mocker) -> None:
+    boxes = np.array([[0, 0, 10, 10], [1.5, 2.5, 3.5, 4.5], [5, 5, 6, 6]])
+    with _test_run() as test_run:
+        test_run.add_inferences_batch(
+            locators=LOCATORS,
+            counts=[2, 0, 1, 0],
+            labels=["car", "bus", "car"],
+            confidences=[0.9, 0.4, 0.7],
+            boxes=boxes,
+            ignored=[False, False, False, True],
+        )
+    df_batch = _uploaded(mocker)
+    completed = [request for request in mocker.request_history if request.path.endswith("/upload-inferences/complete")]
+    assert completed[0].json() == dict(uuid="upload-uuid", test_run_id=3, reset=False)
+
+    mocker.uploaded.clear()
+    with _test_run() as test_run:
+        images = [TestImage(locator, dataset="") for locator in LOCATORS]
+        test_run.add_inferences(images[0], [BoundingBox("car", 0.9, (0, 0), (10, 10))])
+        test_run.add_inferences(images[0], [BoundingBox("bus", 0.4, (1.5, 2.5), (3.5, 4.5))])
+        test_run.add_inferences(images[1], [])
+        test_run.add_inferences(images[2], [BoundingBox("car", 0.7, (5, 5), (6, 6))])
+        test_run.add_inferences(images[3], None)
+    df_expected = _uploaded(mocker)
+
+    pd.testing.assert_frame_equal(df_batch[df_expected.columns], df_expected)
+
+
+def test__add_inferences_batch__classification(mocker: requests_mock.Mocker) -> None:
+    with _test_run(is_classification=True) as test_run:
+        test_run.add_inferences_batch(LOCATORS[:2], [1, 1], ["cat", "dog"], np.array([0.5, 1.0]))
+        test_run.add_inferences(classification.TestImage(LOCATORS[2], dataset=""), [])
+
+    df = _uploaded(mocker)
+    assert df["test_sample_id"].tolist() == [10, 11, 12]
+    assert df["data_type"].tolist() == ["CLASSIFICATION_LABEL", "CLASSIFICATION_LABEL", None]
+    assert df["label"].tolist() == ["cat", "dog", None]
+    assert df["polygon"].tolist() == [None, None, None]
+
+
+def test__add_inferences_batch__chunks(mocker: requests_mock.Mocker, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        "kolena.detection._internal.test_run.BatchSize",
+        SimpleNamespace(UPLOAD_RESULTS=SimpleNamespace(value=4)),
+    )
+    with _test_run() as test_run:
+        for _ in range(3):
+            test_run.add_inferences_batch(LOCATORS[:2], [2, 1], ["a", "b", "c"], [0.1, 0.2, 0.3], np.ones((3, 4)))
+        test_run.add_inferences(TestImage(LOCATORS[2], dataset=""), [])
+        test_run.add_inferences_batch(LOCATORS[:1], [9], ["a"] * 9, [0.5] * 9, np.ones((9, 4)))
+
+    # only full chunks are uploaded before the final chunk
+    assert [len(df) for df in mocker.uploaded] == [4, 4, 4, 4, 3]
+    assert sum(df["test_sample_id"].tolist().count(12) for df in mocker.uploaded) == 1
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(locators=["s3://bucket/unknown.jpg"], counts=[1], labels=["a"], confidences=[0.5]),
+        dict(locators=LOCATORS[:1], counts=[1, 1], labels=["a"], confidences=[0.5]),
+        dict(locators=LOCATORS[:1], counts=[-1], labels=[], confidences=[]),
+        dict(locators=LOCATORS[:1], counts=[1.5], labels=["a"], confidences=[0.5]),
+        dict(locators=LOCATORS[:1], counts=[2], labels=["a"], confidences=[0.5]),
+        dict(locators=LOCATORS[:1], counts=[1], labels=[" "], confidences=[0.5]),
+        dict(locators=LOCATORS[:1], counts=[1], labels=[1], confidences=[0.5]),
+        dict(locators=LOCATORS[:1], counts=[1], labels=["a"], confidences=[1.5]),
+        dict(locators=LOCATORS[:1], counts=[1], labels=["a"], confidences=[np.nan]),
+        dict(locators=LOCATORS[:1], counts=[1], labels=["a"], confidences=[0.5], boxes=np.zeros((1, 3))),
+        dict(locators=LOCATORS[:1], counts=[1], labels=["a"], confidences=[0.5], boxes=np.full((1, 4), np.inf)),
+        dict(locators=LOCATORS[:1], counts=[1], labels=["a"], confidences=[0.5], ignored=[True]),
+    ],
+)
+def test__add_inferences_batch__invalid(mocker: requests_mock.Mocker, kwargs: Dict[str, List[Any]]) -> None:
+    with _test_run() as test_run:
+        with pytest.raises(InputValidationError):
+            test_run.add_inferences_batch(**kwargs)
+    assert mocker.uploaded == []
+
+
+@pytest.mark.parametrize("is_classification", [False, True])
+def test__add_inferences_batch__boxes_workflow(mocker: requests_mock.Mocker, is_classification: bool) -> None:
+    # detection inferences require boxes, classification inferences must not have any
+    boxes = np.ones((1, 4)) if is_classification else None
+    with _test_run(is_classification=is_classification) as test_run:
+        with pytest.raises(InputValidationError, match="boxes"):
+            test_run.add_inferences_batch(LOCATORS[:1], [1], ["a"], [0.5], boxes=boxes)
+    assert mocker.uploaded == []
+
+
+def _count_inferences(inferences: List[Any]) -> Dict[str, int]:
+    n_inferences = sum(len(sample_inferences or []) for _, sample_inferences in inferences)
+    return dict(n_images=len(inferences), n_inferences=n_inferences)
+
+
+def _raise_for_empty(inferences: List[Any]) -> Dict[str, int]:
+    if any(sample_inferences == [] for _, sample_inferences in inferences):
+        raise ValueError("empty inferences")
+    return {}
+
+
+def _custom_metrics_test_run(monkeypatch: pytest.MonkeyPatch, **kwargs: Any) -> TestRun:
+    images = [TestImage(locator, dataset="", metadata=dict(index=i)) for i, locator in enumerate(LOCATORS)]
+    inferences = [[BoundingBox("car", 0.9, (0, 0), (10, 10))], [], None]
+    records = [
+        (
+            *TestImage._to_record(image),
+            0,
+            None if image_inferences is None else [i._to_dict() for i in image_inferences],
+        )
+        for image, image_inferences in zip(images, inferences)
+    ]
+    columns = ["locator", "dataset", "ground_truths", "metadata", "test_case_id", "inferences"]
+    df_serialized = LoadInferencesDataFrame(pd.DataFrame.from_records(records, columns=columns)).as_serializable()
+    df_samples = LoadInferencesDataFrame.from_serializable(df_serialized)
+    groups = [(10, np.array([0, 1, 2])), (20, np.array([0])), (99, np.array([2]))]
+    monkeypatch.setattr(Model, "_group_inferences_by_test_case", lambda *args, **_: (df_samples, groups))
+
+    test_cases = []
+    for test_case_id in [20, 30, 10]:
+        test_case = TestCase.__new__(TestCase)
+        object.__setattr__(test_case, "_id", test_case_id)
+        object.__setattr__(test_case, "name", f"test-case-{test_case_id}")
+        test_cases.append(test_case)
+
+    model, test_suite = Model.__new__(Model), TestSuite.__new__(TestSuite)
+    object.__setattr__(model, "_id", 1)
+    object.__setattr__(model, "name", "model")
+    object.__setattr__(model, "_workflow", WorkflowType.DETECTION)
+    object.__setattr__(test_suite, "_id", 2)
+    object.__setattr__(test_suite, "name", "test-suite")
+    object.__setattr__(test_suite, "test_cases", test_cases)
+    return TestRun(model, test_suite, **kwargs)
+
+
+@pytest.mark.parametrize("concurrency,processes", [(1, False), (4, False), (2, True)])
+def test__compute_custom_metrics(
+    mocker: requests_mock.Mocker,
+    monkeypatch: pytest.MonkeyPatch,
+    concurrency: int,
+    processes: bool,
+) -> None:
+    test_run = _custom_metrics_test_run(
+        monkeypatch,
+        custom_metrics_callback=_count_inferences,
+        custom_metrics_concurrency=concurrency,
+        custom_metrics_processes=processes,
+    )
+
+    custom_metrics = test_run._compute_custom_metrics()
+    assert custom_metrics == {
+        2: {
+            20: dict(n_images=1, n_inferences=1),
+            30: dict(n_images=0, n_inferences=0),
+            10: dict(n_images=3, n_inferences=1),
+        },
+    }
+    assert list(custom_metrics[2].keys()) == [20, 30, 10]
+
+
+@pytest.mark.parametrize("concurrency,processes", [(1, False), (4, False), (2, True)])
+def test__compute_custom_metrics__error(
+    mocker: requests_mock.Mocker,
+    monkeypatch: pytest.MonkeyPatch,
+    concurrency: int,
+    processes: bool,
+) -> None:
+    test_run = _custom_metrics_test_run(
+        monkeypatch,
+        custom_metrics_callback=_raise_for_empty,
+        custom_metrics_concurrency=concurrency,
+        custom_metrics_processes=processes,
+    )
+    with pytest.raises(CustomMetricsException, match="test-case-10"):
+        test_run._compute_custom_metrics()
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test__iter_custom_metrics__bounded(
+    mocker: requests_mock.Mocker,
+    monkeypatch: pytest.MonkeyPatch,
+    concurrency: int,
+) -> None:
+    n_grouped = 0
+
+    def iter_groups(*args: Any, **kwargs: Any) -> Iterator[Tuple[int, List[Any]]]:
+        nonlocal n_grouped
+        for test_case_id in range(10):
+            n_grouped += 1
+            yield test_case_id, []
+
+    monkeypatch.setattr(Model, "iter_inferences_by_test_case", iter_groups)
+    test_run = _test_run(custom_metrics_callback=_count_inferences, custom_metrics_concurrency=concurrency)
+
+    results = test_run._iter_custom_metrics(range(10))
+    test_case_id, get_metrics = next(results)
+    assert (test_case_id, get_metrics()) == (0, dict(n_images=0, n_inferences=0))
+    assert n_grouped == concurrency
+    assert [test_case_id for test_case_id, _ in results] == list(range(1, 10))
+
+
+def test__custom_metrics_concurrency__invalid(mocker: requests_mock.Mocker) -> None:
+    with pytest.raises(InputValidationError):
+        _test_run(custom_metrics_concurrency=0)
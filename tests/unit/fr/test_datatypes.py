@@ -11,11 +11,22 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
+from typing import Any
+
 import numpy as np
 import pandas as pd
 import pandera as pa
 import pytest
 
+from kolena._api.v1.fr import Asset
+from kolena._utils.asset_path_mapper import AssetPathMapper
+from kolena._utils.serde import serialize_embedding_vector
+from kolena.errors import InputValidationError
+from kolena.fr.datatypes import _ResultStageFrame
+from kolena.fr.datatypes import EmbeddingDataFrame
+from kolena.fr.datatypes import EmbeddingMatrix
+from kolena.fr.datatypes import ImageResultDataFrame
 from kolena.fr.datatypes import ImageResultDataFrameSchema
 from kolena.fr.datatypes import PairResultDataFrameSchema
 
@@ -64,3 +75,162 @@ def test__pair_result_schema() -> None:
     # null values for similarity (nullable) should not fail validation
     df.iloc[0] = (0, None)
     PairResultDataFrameSchema.validate(df)
+
+
+@pytest.mark.parametrize(
+    "check,valid,invalid",
+    [
+        (
+            pa.Check._validate_bounding_box(),
+            [np.zeros(4, dtype=np.float32), np.zeros(4, dtype=np.int64), None],
+            [np.zeros(5), np.zeros(4, dtype=object), [0, 0, 0, 0]],
+        ),
+        (
+            pa.Check._validate_landmarks(),
+            [np.zeros(10, dtype=np.float16), np.zeros(10, dtype=np.uint8), None],
+            [np.zeros((5, 2)), np.zeros(10, dtype=bool), "landmarks"],
+        ),
+        (
+            pa.Check._validate_rgb_image(),
+            [np.zeros((8, 4, 3), dtype=np.uint8), np.zeros((2, 2, 3), dtype=np.uint8), None],
+            [np.zeros((8, 4, 3)), np.zeros((8, 4), dtype=np.uint8), np.zeros((8, 4, 4), dtype=np.uint8)],
+        ),
+        (
+            pa.Check._validate_embedding_vector(),
+            [np.zeros(256, dtype=np.float32), np.zeros((2, 3)), None],
+            [[0.0, 1.0], "embedding"],
+        ),
+        (
+            pa.Check._validate_tags(),
+            [{"a": "b"}, {}, None],
+            [{"a": 1}, {1: "b"}, ["a", "b"]],
+        ),
+        (
+            pa.Check._validate_json_object(),
+            [{"a": [1, 2]}, {}, None],
+            [[1, 2], "{}"],
+        ),
+    ],
+)
+def test__checks(check: pa.Check, valid: list, invalid: list) -> None:
+    assert check(pd.Series(valid * 10, dtype=object)).check_passed
+    assert check(pd.Series([cell for cell in valid if cell is not None], dtype=object)).check_passed
+    for cell in invalid:
+        assert not check(pd.Series([*valid, cell], dtype=object)).check_passed
+
+
+def test__validate_optional_dimension() -> None:
+    check = pa.Check._validate_optional_dimension()
+    assert check(pd.Series([1, 100, -1], dtype=np.int64)).check_passed
+    assert check(pd.Series([1, 100, -1], dtype="Int64")).check_passed
+    assert check(pd.Series([1, None, -1], dtype="Int64")).check_passed
+    assert check(pd.Series([1, np.uint8(2)], dtype=object)).check_passed
+    assert not check(pd.Series([1, 0], dtype=np.int64)).check_passed
+    assert not check(pd.Series([1, -2], dtype=np.int64)).check_passed
+    assert not check(pd.Series([1.0, 2.0], dtype=np.float64)).check_passed
+
+
+def test__result_stage_frame__from_image_result_data_frame() -> None:
+    chip = np.zeros((4, 4, 3), dtype=np.uint8)
+    embeddings = [np.random.rand(8).astype(np.float32), None, np.random.rand(2, 8).astype(np.float32)]
+    df = ImageResultDataFrame(
+        dict(
+            image_id=[1, 2, 3],
+            bounding_box=[np.array([0, 1, 2, 3], dtype=np.float32), None, np.array([1.5, 2, 3, 4], dtype=np.float32)],
+            landmarks=[np.arange(10, dtype=np.float32), None, np.arange(10, dtype=np.int32)],
+            quality_input_image=[chip, None, chip],
+            fr_input_image=[None, None, chip],
+            quality=[0.5, np.nan, 0.25],
+            embedding=embeddings,
+            failure_reason=[None, "no face", None],
+        ),
+    )
+    path_mapper = AssetPathMapper(Asset.Config(bucket="bucket", prefix="prefix"))
+    df_stage = _ResultStageFrame.from_image_result_data_frame(10, "uuid", df, path_mapper)
+
+    assert df_stage["test_run_id"].tolist() == [10, 10, 10]
+    assert df_stage["image_id"].tolist() == [1, 2, 3]
+    assert df_stage["bbox"].tolist() == ["[0.0, 1.0, 2.0, 3.0]", None, "[1.5, 2.0, 3.0, 4.0]"]
+    assert df_stage["lmks"].tolist() == [json.dumps(list(map(float, range(10)))), None, json.dumps(list(range(10)))]
+    assert df_stage["embedding"].tolist() == [
+        serialize_embedding_vector(embeddings[0]),
+        None,
+        serialize_embedding_vector(embeddings[2]),
+    ]
+    assert [json.loads(assets) for assets in df_stage["assets"]] == [
+        dict(quality_input_image="s3://bucket/prefix/10/1/quality-uuid.png"),
+        {},
+        dict(
+            quality_input_image="s3://bucket/prefix/10/3/quality-uuid.png",
+            fr_input_image="s3://bucket/prefix/10/3/fr-uuid.png",
+        ),
+    ]
+    assert df_stage["metadata"].tolist() == ['{"quality": 0.5}', "{}", '{"quality": 0.25}']
+    assert df_stage["failure_reason"].tolist() == [None, "no face", None]
+
+
+def _serialized_embeddings() -> pd.DataFrame:
+    return pd.DataFrame(
+        dict(
+            image_id=[3, 1, 2, 3, 5, 4],
+            embedding=[
+                serialize_embedding_vector(np.full(4, 3.0, dtype=np.float32)),
+                serialize_embedding_vector(np.full(4, 1.0, dtype=np.float64)),
+                None,
+                serialize_embedding_vector(np.full(4, 3.5, dtype=np.float32)),
+                serialize_embedding_vector(np.arange(8, dtype=np.float32).reshape(2, 4)),
+                serialize_embedding_vector(np.asfortranarray(np.arange(12, dtype=np.float32).reshape(3, 4))),
+            ],
+        ),
+    )
+
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test__embedding_matrix__from_serializable(mmap: bool, tmp_path: Any) -> None:
+    path = str(tmp_path / "embeddings.npy") if mmap else None
+    embeddings = EmbeddingMatrix.from_serializable(_serialized_embeddings(), path=path)
+
+    assert embeddings.image_ids.tolist() == [1, 2, 3, 4, 5]
+    assert embeddings.counts.tolist() == [1, 0, 2, 3, 2]
+    assert embeddings.offsets.tolist() == [0, 1, 1, 3, 6]
+    assert embeddings.matrix.shape == (8, 4) and embeddings.matrix.dtype == np.float32
+    assert np.array_equal(embeddings.embeddings(3), [[3.0] * 4, [3.5] * 4])
+    assert np.array_equal(embeddings.embeddings(4), np.arange(12).reshape(3, 4))
+    assert embeddings.embeddings(2) is None
+    if mmap:
+        assert isinstance(embeddings.matrix, np.memmap)
+        assert np.array_equal(np.load(path), embeddings.matrix)
+
+    df_expected = EmbeddingDataFrame.from_serializable(_serialized_embeddings())
+    df_got = embeddings.to_embedding_data_frame()
+    assert df_got["image_id"].tolist() == df_expected["image_id"].tolist()
+    for got, expected in zip(df_got["embedding"], df_expected["embedding"]):
+        assert (got is None and expected is None) or np.array_equal(got, expected)
+
+
+def test__embedding_matrix__from_embedding_data_frame() -> None:
+    df_embedding = EmbeddingDataFrame.from_serializable(_serialized_embeddings())
+    embeddings = EmbeddingMatrix.from_embedding_data_frame(df_embedding)
+    expected = EmbeddingMatrix.from_serializable(_serialized_embeddings())
+    assert embeddings.image_ids.tolist() == expected.image_ids.tolist()
+    assert embeddings.counts.tolist() == expected.counts.tolist()
+    assert np.array_equal(embeddings.matrix, expected.matrix)
+
+
+def test__embedding_matrix__invalid() -> None:
+    embeddings = EmbeddingMatrix.from_serializable(_serialized_embeddings())
+    with pytest.raises(InputValidationError):
+        embeddings.embeddings(6)
+
+    df = pd.DataFrame(
+        dict(
+            image_id=[1, 2],
+            embedding=[serialize_embedding_vector(np.zeros(4)), serialize_embedding_vector(np.zeros(8))],
+        ),
+    )
+    with pytest.raises(InputValidationError):
+        EmbeddingMatrix.from_serializable(df)
+
+    df_embedding = EmbeddingDataFrame(dict(image_id=[1, 1], embedding=[np.zeros(4), np.zeros(4)]))
+    with pytest.raises(InputValidationError):
+        EmbeddingMatrix.from_embedding_data_frame(df_embedding)
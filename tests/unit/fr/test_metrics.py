@@ -0,0 +1,195 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from types import SimpleNamespace
+from typing import Any
+from typing import Iterator
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kolena.errors import InputValidationError
+from kolena.fr.metrics import compute_test_case_metrics
+from kolena.fr.metrics import score_distribution
+from kolena.fr.metrics import ScoreDistribution
+
+FMRS = [0, 1e-3, 1e-2, 0.1, 0.5, 1]
+
+
+def _scores(n: int, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    is_same = rng.random(n) < 0.2
+    similarity = np.where(is_same, rng.normal(0.5, 0.2, n), rng.normal(0.0, 0.2, n))
+    similarity[rng.random(n) < 0.01] = np.nan
+    return similarity, is_same
+
+
+def _distribution(similarity: np.ndarray, is_same: np.ndarray, bins: Optional[int], batch_size: int = 1000) -> Any:
+    distribution = ScoreDistribution(bins=bins)
+    for start in range(0, len(similarity), batch_size):
+        distribution.update(similarity[start : start + batch_size], is_same[start : start + batch_size])
+    return distribution
+
+
+def _brute_force(similarity: np.ndarray, is_same: np.ndarray, threshold: float) -> Tuple[float, float]:
+    match = similarity >= threshold  # NaN never matches
+    return float(np.mean(match[~is_same])), float(1 - np.mean(match[is_same]))
+
+
+def test__score_distribution__exact() -> None:
+    similarity, is_same = _scores(10_000)
+    distribution = _distribution(similarity, is_same, bins=None)
+
+    assert distribution.n_genuine == np.count_nonzero(is_same)
+    assert distribution.n_imposter == np.count_nonzero(~is_same)
+    assert distribution.n_genuine_fte == np.count_nonzero(is_same & np.isnan(similarity))
+    assert distribution.n_imposter_fte == np.count_nonzero(~is_same & np.isnan(similarity))
+
+    n_imposter = np.count_nonzero(~is_same)
+    for metrics in distribution.metrics_at_fmr(FMRS):
+        assert (metrics.fmr, metrics.fnmr) == _brute_force(similarity, is_same, metrics.threshold)
+        assert metrics.fmr <= metrics.target_fmr
+        # the threshold is the lowest achieving the target: any lower imposter score would exceed it
+        lower = similarity[~is_same & (similarity < metrics.threshold)]
+        if len(lower) > 0:
+            assert np.mean(~is_same & (similarity >= lower.max())) * len(is_same) / n_imposter > metrics.target_fmr
+
+
+def test__score_distribution__histogram() -> None:
+    similarity, is_same = _scores(10_000)
+    exact = _distribution(similarity, is_same, bins=None)
+    histogram = _distribution(similarity, is_same, bins=2**12)
+
+    for metrics, metrics_exact in zip(histogram.metrics_at_fmr(FMRS), exact.metrics_at_fmr(FMRS)):
+        assert metrics.fmr <= metrics.target_fmr
+        if np.isfinite(metrics.threshold):
+            assert (metrics.fmr, metrics.fnmr) == _brute_force(similarity, is_same, metrics.threshold)
+            assert metrics.threshold == pytest.approx(metrics_exact.threshold, abs=2 / 2**12)
+
+
+def test__score_distribution__out_of_range() -> None:
+    distribution = ScoreDistribution(bins=4, score_range=(0, 1))
+    distribution.update([-5.0, 0.3, 0.6, 5.0, None], [False, False, False, False, True])
+
+    assert distribution.n_genuine_fte == 1
+    np.testing.assert_array_equal(
+        distribution.thresholds_at_fmr([0, 0.25, 0.5, 0.75, 1]),
+        [np.inf, 0.75, 0.5, 0.25, -np.inf],
+    )
+    np.testing.assert_array_equal(distribution.fmr([-np.inf, 0.25, 0.5, 0.75, np.inf]), [1, 0.75, 0.5, 0.25, 0])
+    np.testing.assert_array_equal(distribution.fnmr([-np.inf, np.inf]), [1, 1])
+
+
+@pytest.mark.parametrize("bins", [None, 256])
+def test__score_distribution__merge(bins: Optional[int]) -> None:
+    similarity, is_same = _scores(5_000)
+    distribution = _distribution(similarity, is_same, bins=bins, batch_size=5_000)
+    merged = _distribution(similarity[:1234], is_same[:1234], bins=bins, batch_size=100)
+    merged.merge(_distribution(similarity[1234:], is_same[1234:], bins=bins, batch_size=300))
+
+    assert merged.n_genuine == distribution.n_genuine
+    assert merged.n_imposter_fte == distribution.n_imposter_fte
+    assert merged.metrics_at_fmr(FMRS) == distribution.metrics_at_fmr(FMRS)
+    with pytest.raises(InputValidationError):
+        merged.merge(ScoreDistribution(bins=128))
+
+
+def test__score_distribution__data_frame() -> None:
+    similarity, is_same = _scores(1_000)
+    df = pd.DataFrame(dict(similarity=similarity, is_same=is_same, locator_a="s3://bucket/a.png"))
+    distribution = score_distribution([df.iloc[:500], df.iloc[500:]], bins=None)
+
+    assert distribution.metrics_at_fmr(FMRS) == _distribution(similarity, is_same, bins=None).metrics_at_fmr(FMRS)
+    curve = distribution.curve()
+    assert np.all(np.diff(curve.fmr) >= 0)
+    assert np.all(np.diff(curve.fnmr) <= 0)
+    np.testing.assert_array_equal(curve.tmr, 1 - curve.fnmr)
+
+
+def test__score_distribution__multiple_embeddings() -> None:
+    similarity, is_same = _scores(1_000)
+    rng = np.random.default_rng(1)
+    # each pair has 1 to 3 records, e.g. one per pair of embeddings, the highest of which is the pair's score
+    n_records = rng.integers(1, 4, len(similarity))
+    image_pair_id = np.repeat(np.arange(len(similarity)), n_records)
+    df = pd.DataFrame(
+        dict(
+            image_pair_id=image_pair_id,
+            similarity=similarity[image_pair_id] - rng.random(len(image_pair_id)) * (n_records[image_pair_id] > 1),
+            is_same=is_same[image_pair_id],
+            embedding_a_index=0,
+            embedding_b_index=0,
+        ),
+    )
+    df.loc[~df["image_pair_id"].duplicated(), "similarity"] = similarity  # first record of each pair holds the max
+    expected = _distribution(similarity, is_same, bins=None)
+
+    distribution = ScoreDistribution(bins=None)
+    distribution.update(df)
+    assert (distribution.n_genuine, distribution.n_imposter) == (expected.n_genuine, expected.n_imposter)
+    assert distribution.n_genuine_fte == expected.n_genuine_fte
+    assert distribution.metrics_at_fmr(FMRS) == expected.metrics_at_fmr(FMRS)
+
+    # records of a pair split across batches are counted once
+    batches = [df.iloc[start : start + 97] for start in range(0, len(df), 97)]
+    assert score_distribution(batches, bins=None).metrics_at_fmr(FMRS) == expected.metrics_at_fmr(FMRS)
+    assert score_distribution(batches, bins=None).n_imposter == expected.n_imposter
+
+
+def test__score_distribution__empty() -> None:
+    distribution = ScoreDistribution()
+    np.testing.assert_array_equal(distribution.thresholds_at_fmr([0.1]), [np.inf])
+    assert np.isnan(distribution.fmr([0.5])).all()
+    assert np.isnan(distribution.fnmr([0.5])).all()
+
+
+@pytest.mark.parametrize(
+    "update",
+    [
+        lambda distribution: distribution.update([0.1, 0.2]),
+        lambda distribution: distribution.update([0.1, 0.2], [True]),
+        lambda distribution: distribution.update(pd.DataFrame(dict(similarity=[0.1], is_same=[True])), [True]),
+        lambda distribution: distribution.thresholds_at_fmr([1.5]),
+        lambda distribution: distribution.metrics_at_fmr([0.1, 0.2], [0.5]),
+        lambda _: ScoreDistribution(bins=0),
+        lambda _: ScoreDistribution(score_range=(1, 0)),
+    ],
+)
+def test__score_distribution__invalid(update: Any) -> None:
+    with pytest.raises(InputValidationError):
+        update(ScoreDistribution())
+
+
+def test__compute_test_case_metrics() -> None:
+    scores = {name: _scores(2_000, seed=seed) for seed, name in enumerate(["a", "b"])}
+
+    class FakeModel:
+        def iter_pair_results(self, test_case: Any, batch_size: int) -> Iterator[pd.DataFrame]:
+            similarity, is_same = scores[test_case.name]
+            for start in range(0, len(similarity), batch_size):
+                end = start + batch_size
+                yield pd.DataFrame(dict(similarity=similarity[start:end], is_same=is_same[start:end]))
+
+    test_cases = [SimpleNamespace(name="a"), SimpleNamespace(name="b"), SimpleNamespace(name="a")]
+    baseline = _distribution(*scores["a"], bins=None)
+    metrics = compute_test_case_metrics(FakeModel(), test_cases, FMRS, baseline=baseline, bins=None, batch_size=300)
+
+    assert list(metrics.keys()) == ["a", "b"]
+    assert metrics["a"].metrics == baseline.metrics_at_fmr(FMRS)
+    thresholds = baseline.thresholds_at_fmr(FMRS)
+    for test_case_metrics, threshold in zip(metrics["b"].metrics, thresholds):
+        assert test_case_metrics.threshold == threshold
+        assert (test_case_metrics.fmr, test_case_metrics.fnmr) == _brute_force(*scores["b"], threshold)
@@ -0,0 +1,133 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import itertools
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from kolena._utils.dataframes.validators import validate_df_schema
+from kolena.errors import InputValidationError
+from kolena.fr._similarity import iter_pair_results
+from kolena.fr.datatypes import EmbeddingDataFrame
+from kolena.fr.datatypes import PairDataFrame
+from kolena.fr.datatypes import PairResultDataFrameSchema
+
+
+def _cosine(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def _l2(a: np.ndarray, b: np.ndarray) -> float:
+    return -float(np.linalg.norm(a - b))
+
+
+EMBEDDINGS = {
+    1: np.random.rand(8),
+    2: np.random.rand(8),
+    3: np.random.rand(2, 8),
+    4: None,
+    5: np.random.rand(3, 8),
+}
+DF_EMBEDDING = EmbeddingDataFrame(dict(image_id=list(EMBEDDINGS.keys()), embedding=list(EMBEDDINGS.values())))
+DF_PAIR = PairDataFrame(
+    dict(
+        image_pair_id=[10, 11, 12, 13, 14],
+        image_a_id=[1, 1, 3, 4, 2],
+        image_b_id=[2, 3, 5, 1, 2],
+    ),
+)
+
+
+def _expected_max(image_a_id: int, image_b_id: int, metric: str) -> Optional[float]:
+    a, b = EMBEDDINGS[image_a_id], EMBEDDINGS[image_b_id]
+    if a is None or b is None:
+        return None
+    fn = _cosine if metric == "cosine" else _l2
+    return max(fn(ea, eb) for ea, eb in itertools.product(np.atleast_2d(a), np.atleast_2d(b)))
+
+
+@pytest.mark.parametrize("metric", ["cosine", "l2"])
+@pytest.mark.parametrize("batch_size", [1, 2, 100])
+def test__iter_pair_results__max(metric: str, batch_size: int) -> None:
+    dfs = list(iter_pair_results(DF_EMBEDDING, DF_PAIR, metric=metric, batch_size=batch_size))
+    assert len(dfs) == -(-len(DF_PAIR) // batch_size)
+    df = pd.concat(dfs, ignore_index=True)
+
+    assert list(df.columns) == ["image_pair_id", "similarity"]
+    assert df["image_pair_id"].tolist() == DF_PAIR["image_pair_id"].tolist()
+    for record, similarity in zip(DF_PAIR.itertuples(), df["similarity"]):
+        expected = _expected_max(record.image_a_id, record.image_b_id, metric)
+        if expected is None:
+            assert np.isnan(similarity)
+        else:
+            assert similarity == pytest.approx(expected, abs=1e-5)
+
+
+def test__iter_pair_results__all() -> None:
+    df = pd.concat(iter_pair_results(DF_EMBEDDING, DF_PAIR, reduction="all", batch_size=2), ignore_index=True)
+
+    df_enrolled = df[df["similarity"].notna()]
+    expected = [
+        (pair.image_pair_id, i, j, _cosine(a, b))
+        for pair in DF_PAIR.itertuples()
+        if EMBEDDINGS[pair.image_a_id] is not None and EMBEDDINGS[pair.image_b_id] is not None
+        for (i, a), (j, b) in itertools.product(
+            enumerate(np.atleast_2d(EMBEDDINGS[pair.image_a_id])),
+            enumerate(np.atleast_2d(EMBEDDINGS[pair.image_b_id])),
+        )
+    ]
+    got = list(
+        zip(
+            df_enrolled["image_pair_id"],
+            df_enrolled["embedding_a_index"],
+            df_enrolled["embedding_b_index"],
+            df_enrolled["similarity"],
+        ),
+    )
+    assert [record[:3] for record in got] == [record[:3] for record in expected]
+    assert [record[3] for record in got] == pytest.approx([record[3] for record in expected], abs=1e-5)
+
+    df_failed = df[df["similarity"].isna()]
+    assert df_failed["image_pair_id"].tolist() == [13]
+    assert df_failed["embedding_a_index"].tolist() == [0] and df_failed["embedding_b_index"].tolist() == [0]
+    validate_df_schema(df, PairResultDataFrameSchema)
+
+
+def test__iter_pair_results__all_failed() -> None:
+    df_embedding = EmbeddingDataFrame(dict(image_id=[1, 2], embedding=[None, None]))
+    df_pair = PairDataFrame(dict(image_pair_id=[1], image_a_id=[1], image_b_id=[2]))
+    (df,) = iter_pair_results(df_embedding, df_pair)
+    assert df["image_pair_id"].tolist() == [1]
+    assert df["similarity"].isna().all()
+
+
+def test__iter_pair_results__invalid() -> None:
+    df_pair = PairDataFrame(dict(image_pair_id=[1], image_a_id=[1], image_b_id=[6]))
+    with pytest.raises(InputValidationError):
+        list(iter_pair_results(DF_EMBEDDING, df_pair))
+
+    df_embedding = EmbeddingDataFrame(dict(image_id=[1, 1], embedding=[np.random.rand(8), np.random.rand(8)]))
+    with pytest.raises(InputValidationError):
+        list(iter_pair_results(df_embedding, DF_PAIR))
+
+    df_embedding = EmbeddingDataFrame(dict(image_id=[1, 2], embedding=[np.random.rand(8), np.random.rand(4)]))
+    with pytest.raises(InputValidationError):
+        list(iter_pair_results(df_embedding, DF_PAIR))
+
+    with pytest.raises(InputValidationError):
+        list(iter_pair_results(DF_EMBEDDING, DF_PAIR, metric="dot"))
+    with pytest.raises(InputValidationError):
+        list(iter_pair_results(DF_EMBEDDING, DF_PAIR, batch_size=0))
@@ -11,11 +11,34 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import io
+import re
+from types import SimpleNamespace
+from typing import Any
+from typing import List
+
+import numpy as np
+import pandas as pd
 import pytest
+import requests_mock
 
+from kolena._api.v1.batched_load import BatchedLoad as BatchedLoadAPI
+from kolena._api.v1.fr import TestCase as API
+from kolena.errors import InputValidationError
 from kolena.fr.test_case import TestCase
 
 
+pytestmark = pytest.mark.usefixtures("initialized")
+
+
+def _locators(prefix: str, n: int) -> List[str]:
+    return [f"s3://bucket/{prefix}/{i}.png" for i in range(n)]
+
+
+def _pairs(editor: TestCase.Editor) -> List[tuple]:
+    return sorted(editor._data_frame().itertuples(index=False, name=None))
+
+
 def test__init__validate_name() -> None:
     with pytest.raises(ValueError):
         TestCase("")
@@ -24,3 +47,157 @@ def test__init__validate_name() -> None:
 def test__create__validate_name() -> None:
     with pytest.raises(ValueError):
         TestCase.create("")
+
+
+def test__editor__add_pairs() -> None:
+    locators_a, locators_b = _locators("a", 4), _locators("b", 4)
+    editor = TestCase.Editor("description")
+    editor.add(locators_a[0], locators_b[0], True)
+    editor.add_pairs(locators_a, locators_b, np.array([False, True, False, True]))
+    editor.add_pairs(pd.DataFrame(dict(locator_a=locators_a[:2], locator_b=locators_b[:2], is_same=[1, 0])))
+    editor.add(locators_a[1], locators_b[1], True)
+
+    assert _pairs(editor) == [
+        (locators_a[0], locators_b[0], True),
+        (locators_a[1], locators_b[1], True),
+        (locators_a[2], locators_b[2], False),
+        (locators_a[3], locators_b[3], True),
+    ]
+
+
+def test__editor__add_pairs__deduplicate() -> None:
+    n = 10_000
+    rng = np.random.default_rng(0)
+    locators_a = np.array(_locators("a", 100), dtype=object)[rng.integers(0, 100, n)]
+    locators_b = np.array(_locators("b", 100), dtype=object)[rng.integers(0, 100, n)]
+    is_same = rng.random(n) > 0.5
+
+    editor = TestCase.Editor("description")
+    editor.add_pairs(locators_a, locators_b, is_same)
+
+    expected = {}
+    for record in zip(locators_a, locators_b, is_same):
+        expected[record[:2]] = record
+    assert _pairs(editor) == sorted(expected.values())
+
+
+def test__editor__add_pairs__remove() -> None:
+    locators_a, locators_b = _locators("a", 3), _locators("b", 3)
+    editor = TestCase.Editor("description")
+    editor.add_pairs(locators_a, locators_b, [True, False, True])
+    editor.add(locators_a[1], locators_b[1], True)
+    editor.remove(locators_a[1], locators_b[1])
+    editor.remove(locators_a[2], locators_b[2])
+    with pytest.raises(KeyError):
+        editor.remove(locators_a[2], locators_b[2])
+
+    assert _pairs(editor) == [(locators_a[0], locators_b[0], True)]
+
+
+def test__editor__remove__re_add() -> None:
+    locators_a, locators_b = _locators("a", 4), _locators("b", 4)
+    df_initial = pd.DataFrame(dict(locator_a=locators_a, locator_b=locators_b, is_same=[True] * 4))
+    editor = TestCase.Editor("description")
+    editor._frames.append(df_initial)
+    editor._initial_samples = df_initial
+
+    for i in range(4):
+        editor.remove(locators_a[i], locators_b[i])
+    assert len(editor._frame_hashes) == 1  # existing pairs are hashed once, not scanned on every removal
+    with pytest.raises(KeyError):
+        editor.remove(locators_a[0], locators_b[0])
+
+    # additions following a removal are kept
+    editor.add(locators_a[1], locators_b[1], False)
+    editor.add_pairs(locators_a[2:3], locators_b[2:3], [False])
+    assert _pairs(editor) == [(locators_a[1], locators_b[1], False), (locators_a[2], locators_b[2], False)]
+    assert editor._edited()
+
+    editor.remove(locators_a[2], locators_b[2])
+    assert _pairs(editor) == [(locators_a[1], locators_b[1], False)]
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        (pd.DataFrame(dict(locator_a=["s3://bucket/a.png"], locator_b=["s3://bucket/b.png"])),),
+        (pd.DataFrame(dict(locator_a=["s3://bucket/a.png"], locator_b=["s3://bucket/b.png"], is_same=[None])),),
+        (pd.DataFrame(dict(locator_a=["s3://bucket/a.png"], locator_b=["s3://bucket/b.txt"], is_same=[True])),),
+        (["s3://bucket/a.png"], ["s3://bucket/b.png"], [True, False]),
+        (["s3://bucket/a.png"], ["s3://bucket/b.png"]),
+    ],
+)
+def test__editor__add_pairs__invalid(args: tuple) -> None:
+    editor = TestCase.Editor("description")
+    with pytest.raises(InputValidationError):
+        editor.add_pairs(*args)
+    assert len(editor._data_frame()) == 0
+
+
+def test__editor__edited() -> None:
+    df_initial = pd.DataFrame(dict(locator_a=_locators("a", 3), locator_b=_locators("b", 3), is_same=[True] * 3))
+    editor = TestCase.Editor("description")
+    editor._frames.append(df_initial)
+    editor._initial_samples = df_initial
+    editor.add_pairs(df_initial.iloc[::-1])
+    assert not editor._edited()
+
+    editor.add(df_initial["locator_a"][0], df_initial["locator_b"][0], False)
+    assert editor._edited()
+
+
+def test__edit__add_pairs() -> None:
+    test_case = TestCase._create_from_data(
+        API.EntityData(
+            id=1,
+            name="test case",
+            version=1,
+            description="",
+            image_count=2,
+            pair_count_genuine=1,
+            pair_count_imposter=0,
+        ),
+    )
+    df_existing = pd.DataFrame(dict(locator_a=["s3://bucket/x.png"], locator_b=["s3://bucket/y.png"], is_same=[True]))
+    n = 25
+    locators_a, locators_b = _locators("a", n), _locators("b", n)
+    uploaded: List[pd.DataFrame] = []
+
+    def upload(request: Any, context: Any) -> str:
+        uploaded.append(pd.read_parquet(io.BytesIO(request.body.read())))
+        return ""
+
+    with requests_mock.Mocker() as mocker:
+        mocker.put(re.compile(f".*{BatchedLoadAPI.Path.INIT_UPLOAD.value}$"), json=dict(uuid="upload-uuid"))
+        mocker.get(
+            re.compile(f".*{BatchedLoadAPI.Path.upload_signed_url('upload-uuid')}$"),
+            json=dict(signed_url="https://signed.url/upload"),
+        )
+        mocker.put("https://signed.url/upload", text=upload)
+        complete = mocker.post(
+            re.compile(f".*{API.Path.COMPLETE_EDIT.value}$"),
+            json=dict(
+                id=1,
+                name="test case",
+                version=2,
+                description="",
+                image_count=2 * n + 2,
+                pair_count_genuine=n + 1,
+                pair_count_imposter=0,
+            ),
+        )
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr(TestCase, "load_data", lambda self: df_existing)
+            batch_size = SimpleNamespace(UPLOAD_RECORDS=SimpleNamespace(value=10))
+            monkeypatch.setattr("kolena.fr.test_case.BatchSize", batch_size)
+            with test_case.edit() as editor:
+                editor.add_pairs(locators_a, locators_b, [True] * n)
+                editor.add(locators_a[0], locators_b[0], True)
+
+    assert [len(df) for df in uploaded] == [10, 10, 6]
+    df_uploaded = pd.concat(uploaded, ignore_index=True)
+    assert sorted(df_uploaded.itertuples(index=False, name=None)) == sorted(
+        [("s3://bucket/x.png", "s3://bucket/y.png", True)] + list(zip(locators_a, locators_b, [True] * n)),
+    )
+    assert complete.last_request.json()["uuid"] == "upload-uuid"
+    assert test_case.version == 2
@@ -0,0 +1,163 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import re
+from typing import Any
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests_mock
+
+from kolena._api.v1.batched_load import BatchedLoad as BatchedLoadAPI
+from kolena._api.v1.fr import TestImages as API
+from kolena.errors import InputValidationError
+from kolena.fr import TestImages
+
+
+pytestmark = pytest.mark.usefixtures("initialized")
+
+
+def _mock_upload(mocker: requests_mock.Mocker) -> List[pd.DataFrame]:
+    uploaded: List[pd.DataFrame] = []
+
+    def upload(request: Any, context: Any) -> str:
+        uploaded.append(pd.read_parquet(io.BytesIO(request.body.read())))
+        return ""
+
+    mocker.put(re.compile(f".*{BatchedLoadAPI.Path.INIT_UPLOAD.value}$"), json=dict(uuid="upload-uuid"))
+    mocker.get(
+        re.compile(f".*{BatchedLoadAPI.Path.upload_signed_url('upload-uuid')}$"),
+        json=dict(signed_url="https://signed.url/upload"),
+    )
+    mocker.put("https://signed.url/upload", text=upload)
+    mocker.put(re.compile(f".*{API.Path.COMPLETE_REGISTER.value}$"), text="{}")
+    return uploaded
+
+
+def _completed(mocker: requests_mock.Mocker) -> List[Any]:
+    return [request for request in mocker.request_history if request.path.endswith(API.Path.COMPLETE_REGISTER.value)]
+
+
+def _locators(prefix: str, n: int) -> List[str]:
+    return [f"s3://bucket/{prefix}/{i}.png" for i in range(n)]
+
+
+def test__register_frame() -> None:
+    n = 5
+    df_original = pd.DataFrame(
+        dict(
+            locator=_locators("original", n),
+            data_source="source",
+            width=100,
+            height=np.arange(1, n + 1),
+            bounding_box=[np.array([0, 0, 10, 10])] + [None] * (n - 1),
+            tags=[{"k": "v"}] + [None] * (n - 1),
+        ),
+    )
+    df_augmented = pd.DataFrame(
+        dict(
+            locator=_locators("augmented", 2),
+            original_locator=_locators("original", 2),
+            augmentation_spec=[{"rotate": 90}, {"flip": True}],
+            width=[50, None],
+        ),
+    )
+    df = pd.concat([df_original, df_augmented], ignore_index=True)
+
+    with requests_mock.Mocker() as mocker:
+        uploaded = _mock_upload(mocker)
+        TestImages.register_frame(df, batch_size=3)
+        completed = _completed(mocker)
+
+    assert len(completed) == 1 and completed[0].json() == dict(uuid="upload-uuid")
+    assert [len(df_chunk) for df_chunk in uploaded] == [3, 3, 1]
+    df_uploaded = pd.concat(uploaded, ignore_index=True)
+    assert df_uploaded["locator"].tolist() == df["locator"].tolist()
+    assert df_uploaded["image_id"].tolist() == [-1] * 7
+    assert df_uploaded["width"].tolist() == [100] * n + [50, -1]
+    assert df_uploaded["height"].tolist() == [1, 2, 3, 4, 5, -1, -1]
+    assert df_uploaded["data_source"].tolist() == ["source"] * n + [None, None]
+    assert df_uploaded["original_locator"].tolist() == [None] * n + _locators("original", 2)
+    assert df_uploaded["augmentation_spec"].tolist()[n:] == ['{"rotate": 90}', '{"flip": true}']
+    assert df_uploaded["tags"].tolist() == ['{"k": "v"}'] + ["{}"] * 6
+
+
+def test__register_frame__matches_register() -> None:
+    bounding_box = np.array([1, 2, 3, 4])
+    df = pd.DataFrame(
+        dict(
+            locator=_locators("original", 2) + _locators("augmented", 1),
+            data_source=["source", "source", None],
+            width=[10, 20, None],
+            height=[10, 20, None],
+            original_locator=[None, None, _locators("original", 1)[0]],
+            augmentation_spec=[None, None, {"rotate": 90}],
+            bounding_box=[bounding_box, None, None],
+        ),
+    )
+
+    with requests_mock.Mocker() as mocker:
+        uploaded_frame = _mock_upload(mocker)
+        TestImages.register_frame(df)
+
+    with requests_mock.Mocker() as mocker:
+        uploaded_register = _mock_upload(mocker)
+        with TestImages.register() as registrar:
+            registrar.add(_locators("original", 2)[0], "source", 10, 10, bounding_box=bounding_box)
+            registrar.add(_locators("original", 2)[1], "source", 20, 20)
+            registrar.add_augmented(_locators("original", 1)[0], _locators("augmented", 1)[0], {"rotate": 90})
+
+    pd.testing.assert_frame_equal(uploaded_frame[0], uploaded_register[0])
+
+
+@pytest.mark.parametrize(
+    "df",
+    [
+        pd.DataFrame(dict(data_source=["source"], width=[1], height=[1])),
+        pd.DataFrame(dict(locator=["s3://bucket/a.png"], data_source=["source"], width=[1], height=[1], extra=[0])),
+        pd.DataFrame(dict(locator=["s3://bucket/a.png"] * 2, data_source="source", width=1, height=1)),
+        pd.DataFrame(dict(locator=["s3://bucket/a.png"], data_source=[None], width=[1], height=[1])),
+        pd.DataFrame(dict(locator=["s3://bucket/a.png"], data_source=["source"], height=[1])),
+        pd.DataFrame(
+            dict(locator=["s3://bucket/a.png"], data_source=["s"], width=[1], height=[1], augmentation_spec=[{}]),
+        ),
+        pd.DataFrame(dict(locator=["s3://bucket/a.png"], original_locator=["s3://bucket/b.png"])),
+        pd.DataFrame(
+            dict(
+                locator=["s3://bucket/a.png"],
+                data_source=["source"],
+                original_locator=["s3://bucket/b.png"],
+                augmentation_spec=[{}],
+            ),
+        ),
+    ],
+)
+def test__register_frame__invalid(df: pd.DataFrame) -> None:
+    with requests_mock.Mocker() as mocker:
+        uploaded = _mock_upload(mocker)
+        with pytest.raises(InputValidationError):
+            TestImages.register_frame(df)
+        assert mocker.call_count == 0
+    assert uploaded == []
+
+
+def test__register_frame__invalid_chunk() -> None:
+    df = pd.DataFrame(dict(locator=_locators("a", 3) + ["s3://bucket/a.txt"], data_source="s", width=1, height=1))
+    with requests_mock.Mocker() as mocker:
+        _mock_upload(mocker)
+        with pytest.raises(InputValidationError):
+            TestImages.register_frame(df, batch_size=2)
+        assert _completed(mocker) == []
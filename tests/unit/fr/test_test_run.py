@@ -0,0 +1,174 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import re
+from types import SimpleNamespace
+from typing import Any
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests_mock
+
+from kolena._utils.serde import serialize_embedding_vector
+from kolena.errors import InputValidationError
+from kolena.fr import EmbeddingMatrix
+from kolena.fr import TestRun
+from tests.unit.conftest import parquet_bytes
+
+
+pytestmark = pytest.mark.usefixtures("initialized")
+
+
+def _test_run() -> TestRun:
+    test_run = TestRun.__new__(TestRun)
+    object.__setattr__(test_run, "data", SimpleNamespace(id=1))
+    object.__setattr__(test_run, "_id", 1)
+    object.__setattr__(test_run, "_reset", False)
+    return test_run
+
+
+def _mock_downloads(mocker: requests_mock.Mocker, dfs_by_path: dict) -> None:
+    for path, df in dfs_by_path.items():
+        mocker.get(re.compile(f".*/batched-load/download/by-path/{path}$"), content=parquet_bytes(df))
+    mocker.put(re.compile(".*/batched-load/download/complete$"), text="{}")
+
+
+def _completed_uuids(mocker: requests_mock.Mocker) -> List[str]:
+    return [request.json()["uuid"] for request in mocker.request_history if request.path.endswith("/download/complete")]
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test__iter_remaining_images(prefetch: int) -> None:
+    dfs_by_path = {f"images-{i}": pd.DataFrame(dict(image_id=[2 * i, 2 * i + 1], locator=["a", "b"])) for i in range(3)}
+    lines = "\n".join(json.dumps(dict(uuid="load-uuid", path=path)) for path in dfs_by_path.keys())
+
+    with requests_mock.Mocker() as mocker:
+        mocker.put(re.compile(".*/fr/test-run/load-remaining-images/init$"), text=lines)
+        _mock_downloads(mocker, dfs_by_path)
+        dfs = list(_test_run().iter_remaining_images(prefetch=prefetch))
+        assert _completed_uuids(mocker) == ["load-uuid"]
+
+    assert [df["image_id"].tolist() for df in dfs] == [[0, 1], [2, 3], [4, 5]]
+
+
+def test__load_remaining_images() -> None:
+    dfs_by_path = {f"images-{i}": pd.DataFrame(dict(image_id=[2 * i, 2 * i + 1], locator=["a", "b"])) for i in range(3)}
+    lines = "\n".join(json.dumps(dict(uuid="load-uuid", path=path)) for path in dfs_by_path.keys())
+
+    with requests_mock.Mocker() as mocker:
+        mocker.put(re.compile(".*/fr/test-run/load-remaining-images/init$"), text=lines)
+        _mock_downloads(mocker, dfs_by_path)
+        df = _test_run().load_remaining_images()
+
+    assert df["image_id"].tolist() == list(range(6))
+
+
+def _embeddings(image_ids: List[int]) -> pd.DataFrame:
+    return pd.DataFrame(
+        dict(
+            image_id=image_ids,
+            embedding=[serialize_embedding_vector(np.full(4, i, dtype=np.float32)) for i in image_ids],
+        ),
+    )
+
+
+def _pair_lines(embeddings_paths: List[str]) -> str:
+    return "\n".join(
+        json.dumps(
+            dict(
+                pairs=dict(uuid="pairs-uuid", path=f"pairs-{i}"),
+                embeddings=dict(uuid="embeddings-uuid", path=embeddings_path),
+            ),
+        )
+        for i, embeddings_path in enumerate(embeddings_paths)
+    )
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test__iter_remaining_pairs(prefetch: int) -> None:
+    dfs_by_path = {
+        "embeddings-a": _embeddings([0, 1]),
+        "embeddings-b": _embeddings([2, 3]),
+        **{f"pairs-{i}": pd.DataFrame(dict(image_pair_id=[i], image_a_id=[0], image_b_id=[1])) for i in range(4)},
+    }
+
+    with requests_mock.Mocker() as mocker:
+        mocker.put(
+            re.compile(".*/fr/test-run/load-remaining-pairs/init$"),
+            text=_pair_lines(["embeddings-a", "embeddings-a", "embeddings-b", "embeddings-b"]),
+        )
+        _mock_downloads(mocker, dfs_by_path)
+        batches = list(_test_run().iter_remaining_pairs(prefetch=prefetch))
+
+        assert sorted(_completed_uuids(mocker)) == ["embeddings-uuid", "pairs-uuid"]
+        downloads = [request.path for request in mocker.request_history if "/by-path/" in request.path]
+        assert sorted(path.rsplit("/", 1)[-1] for path in downloads if "embeddings" in path) == [
+            "embeddings-a",
+            "embeddings-b",
+        ]
+
+    assert [df_pair["image_pair_id"].tolist() for _, df_pair in batches] == [[0], [1], [2], [3]]
+    assert [df_embedding["image_id"].tolist() for df_embedding, _ in batches] == [[0, 1], [0, 1], [2, 3], [2, 3]]
+    assert batches[0][0] is batches[1][0]
+    assert batches[2][0] is batches[3][0]
+
+
+def test__iter_remaining_pairs__as_matrix(tmp_path: Any) -> None:
+    dfs_by_path = {
+        "embeddings-a": _embeddings([0, 1]),
+        **{f"pairs-{i}": pd.DataFrame(dict(image_pair_id=[i], image_a_id=[0], image_b_id=[1])) for i in range(2)},
+    }
+
+    with requests_mock.Mocker() as mocker:
+        mocker.put(
+            re.compile(".*/fr/test-run/load-remaining-pairs/init$"),
+            text=_pair_lines(["embeddings-a", "embeddings-a"]),
+        )
+        _mock_downloads(mocker, dfs_by_path)
+        batches = list(_test_run().iter_remaining_pairs(as_matrix=True, mmap_dir=str(tmp_path)))
+
+    embeddings = batches[0][0]
+    assert isinstance(embeddings, EmbeddingMatrix)
+    assert batches[1][0] is embeddings
+    assert embeddings.image_ids.tolist() == [0, 1]
+    assert np.array_equal(embeddings.matrix, [[0.0] * 4, [1.0] * 4])
+    assert len(list(tmp_path.glob("embeddings-*.npy"))) == 1
+
+
+def test__load_remaining_pairs() -> None:
+    dfs_by_path = {
+        "embeddings-a": _embeddings([0, 1]),
+        "embeddings-b": _embeddings([2, 3]),
+        **{f"pairs-{i}": pd.DataFrame(dict(image_pair_id=[i], image_a_id=[0], image_b_id=[1])) for i in range(3)},
+    }
+
+    with requests_mock.Mocker() as mocker:
+        mocker.put(
+            re.compile(".*/fr/test-run/load-remaining-pairs/init$"),
+            text=_pair_lines(["embeddings-a", "embeddings-a", "embeddings-b"]),
+        )
+        _mock_downloads(mocker, dfs_by_path)
+        df_embedding, df_pair = _test_run().load_remaining_pairs()
+
+    assert df_embedding["image_id"].tolist() == [0, 1, 2, 3]
+    assert df_pair["image_pair_id"].tolist() == [0, 1, 2]
+
+
+def test__iter_remaining__invalid() -> None:
+    with pytest.raises(InputValidationError):
+        next(_test_run().iter_remaining_images(prefetch=-1))
+    with pytest.raises(InputValidationError):
+        next(_test_run().iter_remaining_pairs(batch_size=0))
@@ -0,0 +1,81 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import io
+import re
+import threading
+from typing import Any
+from typing import Dict
+
+import numpy as np
+import pytest
+import requests_mock
+from PIL import Image
+from requests_toolbelt import MultipartDecoder
+
+from kolena.errors import RemoteError
+from kolena.fr._utils import upload_image_chips
+from kolena.fr.datatypes import _ImageChipsDataFrame
+
+
+pytestmark = pytest.mark.usefixtures("initialized")
+
+
+def _image_chips(n: int) -> _ImageChipsDataFrame:
+    return _ImageChipsDataFrame(
+        dict(
+            test_run_id=[1] * n,
+            image_id=list(range(n)),
+            key=["fr"] * n,
+            uuid=["load-uuid"] * n,
+            image=[np.full((4, 4, 3), i, dtype=np.uint8) for i in range(n)],
+        ),
+    )
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test__upload_image_chips(max_workers: int) -> None:
+    uploaded: Dict[str, np.ndarray] = {}
+    n_requests = []
+    lock = threading.Lock()
+
+    def bulk_upload(request: Any, context: Any) -> str:
+        decoder = MultipartDecoder(request.body.read(), request.headers["Content-Type"])
+        with lock:
+            n_requests.append(len(decoder.parts))
+            for part in decoder.parts:
+                filename = re.search(b'filename="([^"]+)"', part.headers[b"Content-Disposition"]).group(1).decode()
+                uploaded[filename] = np.asarray(Image.open(io.BytesIO(part.content)))
+        return "{}"
+
+    with requests_mock.Mocker() as mocker:
+        mocker.put(re.compile(".*/fr/asset/upload/bulk$"), text=bulk_upload)
+        upload_image_chips(_image_chips(10), batch_size=4, max_workers=max_workers)
+
+    assert sorted(n_requests) == [2, 4, 4]
+    assert sorted(uploaded.keys()) == sorted(f"1/{i}/fr-load-uuid.png" for i in range(10))
+    for i in range(10):
+        assert np.array_equal(uploaded[f"1/{i}/fr-load-uuid.png"], np.full((4, 4, 3), i, dtype=np.uint8))
+
+
+def test__upload_image_chips__empty() -> None:
+    with requests_mock.Mocker() as mocker:
+        upload_image_chips(_image_chips(0))
+        assert mocker.call_count == 0
+
+
+def test__upload_image_chips__failure() -> None:
+    with requests_mock.Mocker() as mocker:
+        mocker.put(re.compile(".*/fr/asset/upload/bulk$"), status_code=500)
+        with pytest.raises(RemoteError):
+            upload_image_chips(_image_chips(10), batch_size=2, max_workers=2)
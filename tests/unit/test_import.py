@@ -0,0 +1,58 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import subprocess
+import sys
+
+import pytest
+
+import kolena
+
+# upper bound on the time taken by `import kolena`, in seconds, to catch eager imports of heavy dependencies
+IMPORT_TIME_BUDGET = 1.0
+
+HEAVY_MODULES = ["pandas", "pandera", "shapely", "PIL", "sklearn", "scipy"]
+
+
+def _run(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+
+
+def test__import__lazy() -> None:
+    imported = _run(f"import json, sys, kolena; print(json.dumps([m for m in {HEAVY_MODULES} if m in sys.modules]))")
+    assert json.loads(imported) == []
+
+
+def test__import__budget() -> None:
+    code = "import time; t0 = time.perf_counter(); import kolena; print(time.perf_counter() - t0)"
+    elapsed = min(float(_run(code)) for _ in range(3))
+    assert elapsed < IMPORT_TIME_BUDGET, f"'import kolena' took {elapsed:0.3f}s, budget {IMPORT_TIME_BUDGET:0.3f}s"
+
+
+def test__import__submodules() -> None:
+    imported = _run("import json, sys, kolena.workflow; print(json.dumps('kolena.fr' in sys.modules))")
+    assert json.loads(imported) is False
+
+    assert kolena.fr.TestCase is not None
+    assert kolena.workflow.TestCase is not None
+    assert callable(kolena.initialize)
+    assert {"initialize", "fr", "detection", "workflow"} <= set(dir(kolena))
+    with pytest.raises(AttributeError):
+        kolena.unknown
+
+
+def test__import__all() -> None:
+    assert set(kolena.__all__) == {"initialize", *kolena._LAZY_SUBMODULES}
+    exported = _run("import json; from kolena import *; print(json.dumps([aio.__name__, tracing.__name__]))")
+    assert json.loads(exported) == ["kolena.aio", "kolena.tracing"]
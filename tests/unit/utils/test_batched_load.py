@@ -0,0 +1,139 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import functools
+import itertools
+import threading
+from typing import Any
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from kolena._api.v1.batched_load import BatchedLoad
+from kolena._utils.batched_load import BackgroundUploader
+from kolena._utils.batched_load import UploadSession
+
+
+def _init_upload_patch() -> Any:
+    return patch(
+        "kolena._utils.batched_load.init_upload",
+        return_value=BatchedLoad.InitiateUploadResponse(uuid="uuid"),
+    )
+
+
+def test__background_uploader() -> None:
+    uploaded = []
+    main_thread = threading.current_thread()
+
+    def upload(df: pd.DataFrame, uuid: str) -> None:
+        assert threading.current_thread() is not main_thread
+        uploaded.append((uuid, df["value"].tolist()))
+
+    with _init_upload_patch() as init_patched, patch("kolena._utils.batched_load.upload_data_frame_chunk", upload):
+        with BackgroundUploader(max_pending=1) as uploader:
+            assert uploader.uuid is None
+            for i in range(5):
+                uploader.submit(pd.DataFrame(dict(value=[i, i + 1])))
+
+    init_patched.assert_called_once()
+    assert uploader.uuid == "uuid"
+    assert uploader.n_chunks == 5
+    assert uploaded == [("uuid", [i, i + 1]) for i in range(5)]
+
+
+def test__background_uploader__empty() -> None:
+    with _init_upload_patch() as init_patched:
+        with BackgroundUploader() as uploader:
+            ...
+    init_patched.assert_not_called()
+    assert uploader.uuid is None
+
+
+def test__background_uploader__upload_failure() -> None:
+    def upload(df: pd.DataFrame, uuid: str) -> None:
+        raise RuntimeError("upload failed")
+
+    with _init_upload_patch(), patch("kolena._utils.batched_load.upload_data_frame_chunk", upload):
+        with pytest.raises(RuntimeError, match="upload failed"):
+            with BackgroundUploader() as uploader:
+                for i in range(5):
+                    uploader.submit(pd.DataFrame(dict(value=[i])))
+
+
+def test__background_uploader__producer_failure() -> None:
+    def upload(df: pd.DataFrame, uuid: str) -> None:
+        raise RuntimeError("upload failed")
+
+    # failure in producer takes precedence over failures in the background thread
+    with _init_upload_patch(), patch("kolena._utils.batched_load.upload_data_frame_chunk", upload):
+        with pytest.raises(ValueError, match="producer failed"):
+            with BackgroundUploader() as uploader:
+                uploader.submit(pd.DataFrame(dict(value=[0])))
+                raise ValueError("producer failed")
+
+
+def test__upload_session() -> None:
+    uuids = itertools.count()
+    uploaded = []
+    committed = []
+
+    def upload(df: pd.DataFrame, uuid: str) -> None:
+        uploaded.append((uuid, df["value"].tolist()))
+
+    def commit(key: str, uuid: str) -> None:
+        # all parts are uploaded before the commit
+        committed.append((key, uuid, sorted(v for u, values in uploaded if u == uuid for v in values)))
+
+    with patch(
+        "kolena._utils.batched_load.init_upload",
+        side_effect=lambda: BatchedLoad.InitiateUploadResponse(uuid=f"uuid-{next(uuids)}"),
+    ), patch("kolena._utils.batched_load.upload_data_frame_chunk", upload):
+        with UploadSession(max_workers=4, part_bytes=1) as session:
+            for key in ["a", "b", "c"]:
+                for i in range(3):
+                    session.add(key, pd.DataFrame(dict(value=[i])))
+            for key in ["a", "b", "c"]:
+                session.commit(key, functools.partial(commit, key))
+            session.commit("d", functools.partial(commit, "d"))  # no-op without data
+
+    assert len(uploaded) == 9  # one part per data frame
+    assert sorted(key for key, _, _ in committed) == ["a", "b", "c"]
+    assert len({uuid for _, uuid, _ in committed}) == 3
+    assert all(values == [0, 1, 2] for _, _, values in committed)
+
+
+def test__upload_session__accumulates_parts() -> None:
+    with _init_upload_patch(), patch("kolena._utils.batched_load.upload_data_frame_chunk") as upload_patched:
+        with UploadSession() as session:
+            for i in range(10):
+                session.add("key", pd.DataFrame(dict(value=[i])))
+            session.commit("key", lambda uuid: None)
+
+    upload_patched.assert_called_once()
+    assert upload_patched.call_args.args[0]["value"].tolist() == list(range(10))
+
+
+def test__upload_session__upload_failure() -> None:
+    committed = []
+
+    def upload(df: pd.DataFrame, uuid: str) -> None:
+        raise RuntimeError("upload failed")
+
+    with _init_upload_patch(), patch("kolena._utils.batched_load.upload_data_frame_chunk", upload):
+        with pytest.raises(RuntimeError, match="upload failed"):
+            with UploadSession(part_bytes=1) as session:
+                session.add("key", pd.DataFrame(dict(value=[0])))
+                session.commit("key", committed.append)
+
+    assert committed == []
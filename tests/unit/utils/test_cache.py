@@ -0,0 +1,166 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Iterator
+from typing import List
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from kolena._utils.batched_load import _BatchedLoader
+from kolena._utils.cache import _file_lock
+from kolena._utils.cache import ContentCache
+from kolena._utils.cache import get_content_cache
+from kolena._utils.consts import KOLENA_CACHE_DIR_ENV
+
+
+def _loader(n_batches: int, calls: List[int]) -> Iterator[pd.DataFrame]:
+    calls.append(n_batches)
+    for i in range(n_batches):
+        yield pd.DataFrame(dict(value=[i, i + 1], name=[f"a{i}", f"b{i}"]))
+
+
+def _collect(dfs: Iterator[pd.DataFrame]) -> pd.DataFrame:
+    return pd.concat(list(dfs), ignore_index=True)
+
+
+def test__content_cache(tmp_path: Path) -> None:
+    cache = ContentCache(str(tmp_path))
+    calls: List[int] = []
+    expected = _collect(_loader(3, []))
+
+    pd.testing.assert_frame_equal(_collect(cache.iter_data("key", lambda: _loader(3, calls))), expected)
+    pd.testing.assert_frame_equal(_collect(cache.iter_data("key", lambda: _loader(3, calls))), expected)
+    assert calls == [3]  # second iteration served from cache
+
+    # shared between instances, e.g. different processes
+    pd.testing.assert_frame_equal(
+        _collect(ContentCache(str(tmp_path)).iter_data("key", lambda: _loader(3, calls))),
+        expected,
+    )
+    assert calls == [3]
+
+    _collect(cache.iter_data("other-key", lambda: _loader(1, calls)))
+    assert calls == [3, 1]
+
+
+def test__content_cache__incomplete(tmp_path: Path) -> None:
+    cache = ContentCache(str(tmp_path))
+    calls: List[int] = []
+
+    # abandoned iteration is not cached
+    next(cache.iter_data("key", lambda: _loader(3, calls)))
+
+    def failing_loader() -> Iterator[pd.DataFrame]:
+        yield from _loader(1, calls)
+        raise RuntimeError("download failed")
+
+    with pytest.raises(RuntimeError):
+        _collect(cache.iter_data("key", failing_loader))
+
+    assert len(_collect(cache.iter_data("key", lambda: _loader(3, calls)))) == 6
+    assert calls == [3, 1, 3]
+    assert len(os.listdir(os.path.join(str(tmp_path), "entries"))) == 1  # no temporary entries left behind
+
+
+def _is_locked(cache: ContentCache, key: str) -> bool:
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    with _file_lock(os.path.join(cache._locks_dir, f"{digest}.lock"), exclusive=True, blocking=False) as locked:
+        return not locked
+
+
+def test__content_cache__nested(tmp_path: Path) -> None:
+    cache = ContentCache(str(tmp_path))
+    calls: List[int] = []
+    expected = _collect(_loader(2, []))
+
+    # no lock is held while the caller consumes data, neither on miss nor on hit
+    for _ in range(2):
+        outer = cache.iter_data("key", lambda: _loader(2, calls))
+        dfs = [next(outer)]
+        assert not _is_locked(cache, "key")
+        pd.testing.assert_frame_equal(_collect(cache.iter_data("key", lambda: _loader(2, calls))), expected)
+        pd.testing.assert_frame_equal(_collect(dfs + list(outer)), expected)
+
+    # abandoned iteration does not keep the entry locked
+    abandoned = cache.iter_data("key", lambda: _loader(2, calls))
+    next(abandoned)
+    assert not _is_locked(cache, "key")
+    assert calls == [2, 2]
+
+
+def test__content_cache__evicted_while_reading(tmp_path: Path) -> None:
+    cache = ContentCache(str(tmp_path))
+    calls: List[int] = []
+    expected = _collect(_loader(3, []))
+    _collect(cache.iter_data("key", lambda: _loader(3, calls)))
+
+    dfs = cache.iter_data("key", lambda: _loader(3, calls))
+    got = [next(dfs)]
+    cache.max_bytes = 0
+    cache._evict()
+    got.extend(dfs)  # resumes from the loader after the rows already read
+    pd.testing.assert_frame_equal(_collect(got), expected)
+    assert calls == [3, 3]
+
+
+def test__content_cache__eviction(tmp_path: Path) -> None:
+    cache = ContentCache(str(tmp_path), max_bytes=0)
+    calls: List[int] = []
+    _collect(cache.iter_data("a", lambda: _loader(1, calls)))
+    entry_bytes = sum(size for _, size, _ in cache._entries())
+    assert entry_bytes == 0  # evicted immediately as the cache is over budget
+
+    cache = ContentCache(str(tmp_path), max_bytes=10**6)
+    _collect(cache.iter_data("a", lambda: _loader(1, calls)))
+    entry_bytes = sum(size for _, size, _ in cache._entries())
+    cache.max_bytes = 2 * entry_bytes
+    _collect(cache.iter_data("b", lambda: _loader(1, calls)))
+    time.sleep(0.01)
+    _collect(cache.iter_data("a", lambda: _loader(1, calls)))  # "a" more recently used than "b"
+    _collect(cache.iter_data("c", lambda: _loader(1, calls)))  # evicts "b"
+    assert calls == [1, 1, 1, 1]
+
+    _collect(cache.iter_data("a", lambda: _loader(1, calls)))
+    _collect(cache.iter_data("b", lambda: _loader(1, calls)))
+    assert calls == [1, 1, 1, 1, 1]
+
+
+def test__get_content_cache(tmp_path: Path) -> None:
+    with patch.dict(os.environ, {KOLENA_CACHE_DIR_ENV: ""}):
+        assert get_content_cache() is None
+    with patch.dict(os.environ, {KOLENA_CACHE_DIR_ENV: str(tmp_path)}):
+        cache = get_content_cache()
+        assert cache is not None
+        assert os.path.dirname(cache.directory) == str(tmp_path)
+
+
+def test__batched_loader__iter_data__cache(tmp_path: Path) -> None:
+    calls: List[int] = []
+    with patch.dict(os.environ, {KOLENA_CACHE_DIR_ENV: str(tmp_path)}), patch.object(
+        _BatchedLoader,
+        "_iter_download",
+        side_effect=lambda *args: _loader(2, calls),
+    ):
+        for _ in range(3):
+            got = _collect(_BatchedLoader.iter_data(None, "path", None, cache_key="key"))
+            assert got["value"].tolist() == [0, 1, 1, 2]
+        assert calls == [2]
+
+        _collect(_BatchedLoader.iter_data(None, "path", None))  # not cached without key
+        assert calls == [2, 2]
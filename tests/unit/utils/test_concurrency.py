@@ -0,0 +1,89 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import random
+import threading
+import time
+from typing import Iterator
+
+import pytest
+
+from kolena._utils.concurrency import chunked
+from kolena._utils.concurrency import iter_ordered
+
+
+def test__chunked() -> None:
+    assert list(chunked(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert list(chunked([], 3)) == []
+    with pytest.raises(ValueError):
+        list(chunked(range(3), 0))
+
+
+@pytest.mark.parametrize("max_workers", [1, 2, 8])
+def test__iter_ordered(max_workers: int) -> None:
+    def fn(x: int) -> int:
+        time.sleep(random.random() / 1000)
+        return x * 2
+
+    assert list(iter_ordered(fn, range(50), max_workers=max_workers)) == [(x, x * 2) for x in range(50)]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test__iter_ordered__coroutine(max_workers: int) -> None:
+    async def fn(x: int) -> int:
+        await asyncio.sleep(random.random() / 1000)
+        return x + 1
+
+    assert list(iter_ordered(fn, range(20), max_workers=max_workers)) == [(x, x + 1) for x in range(20)]
+
+
+def test__iter_ordered__bounded_in_flight() -> None:
+    lock = threading.Lock()
+    n_in_flight = 0
+    max_in_flight = 0
+
+    def fn(x: int) -> int:
+        nonlocal n_in_flight, max_in_flight
+        with lock:
+            n_in_flight += 1
+            max_in_flight = max(max_in_flight, n_in_flight)
+        time.sleep(0.001)
+        with lock:
+            n_in_flight -= 1
+        return x
+
+    n_consumed = 0
+
+    def items() -> Iterator[int]:
+        nonlocal n_consumed
+        for x in range(30):
+            n_consumed += 1
+            yield x
+
+    for x, _ in iter_ordered(fn, items(), max_workers=3):
+        assert n_consumed <= x + 3  # items are consumed lazily
+    assert max_in_flight <= 3
+
+
+def test__iter_ordered__error() -> None:
+    def fn(x: int) -> int:
+        if x == 5:
+            raise RuntimeError("failed")
+        return x
+
+    with pytest.raises(RuntimeError):
+        list(iter_ordered(fn, range(10), max_workers=3))
+
+    with pytest.raises(ValueError):
+        list(iter_ordered(fn, range(10), max_workers=0))
@@ -14,7 +14,9 @@
 import numpy as np
 
 from kolena._utils.serde import deserialize_embedding_vector
+from kolena._utils.serde import deserialize_embedding_vectors
 from kolena._utils.serde import serialize_embedding_vector
+from kolena._utils.serde import serialize_embedding_vectors
 
 
 def test__embedding_vector__serde() -> None:
@@ -25,3 +27,39 @@ def test__embedding_vector__serde() -> None:
         got = deserialize_embedding_vector(serialized)
         assert np.array_equal(got, want)
         assert got.dtype == want.dtype
+
+
+def test__embedding_vectors__serialize() -> None:
+    base = np.random.rand(4, 6)
+    vectors = [
+        base.astype(np.float32),
+        base.astype(np.float32) + 1,  # same header as the previous vector
+        base.astype(">f8"),
+        np.asfortranarray(base),
+        base[:, ::2],  # neither C- nor F-contiguous
+        base[0],
+        np.array([], dtype=np.float32),
+        np.array(["a", "bc"]),
+    ]
+    got = serialize_embedding_vectors(vectors)
+    assert got == [serialize_embedding_vector(vector) for vector in vectors]
+    for serialized, vector in zip(got, vectors):
+        assert np.array_equal(deserialize_embedding_vector(serialized), vector)
+
+
+def test__embedding_vectors__deserialize() -> None:
+    base = np.random.rand(4, 6)
+    vectors = [
+        base.astype(np.float32),
+        base.astype(np.float32) + 1,
+        base.astype(">f8"),
+        np.asfortranarray(base),
+        base[0],
+        np.array([], dtype=np.float32),
+        np.array(["a", "bc"]),
+    ]
+    got = deserialize_embedding_vectors([serialize_embedding_vector(vector) for vector in vectors])
+    for got_vector, vector in zip(got, vectors):
+        assert np.array_equal(got_vector, vector)
+        assert got_vector.dtype == vector.dtype
+        assert got_vector.flags.writeable
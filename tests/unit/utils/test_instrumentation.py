@@ -0,0 +1,105 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+from typing import Any
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from kolena._api.v1.event import EventAPI
+from kolena._utils import instrumentation
+from kolena._utils.instrumentation import EventQueue
+from kolena._utils.state import kolena_session
+
+
+pytestmark = pytest.mark.usefixtures("initialized")
+
+
+def test__event_queue() -> None:
+    posted: List[Any] = []
+    with patch("requests.Session.post", side_effect=lambda url, json, **kwargs: posted.append((url, json))):
+        queue = EventQueue(batch_size=2)
+        for i in range(5):
+            assert queue.put(EventAPI.Path.EVENT.value, dict(event_name=f"event-{i}"))
+        assert queue.flush(timeout=5)
+
+    assert [payload["event_name"] for _, payload in posted] == [f"event-{i}" for i in range(5)]
+    assert all(url.endswith(EventAPI.Path.EVENT.value) for url, _ in posted)
+
+
+def test__event_queue__non_blocking_and_drops_on_overflow() -> None:
+    unblock = threading.Event()
+    posted: List[Any] = []
+
+    def post(url: str, json: Any, **kwargs: Any) -> None:
+        unblock.wait()
+        posted.append(json)
+
+    with patch("requests.Session.post", side_effect=post):
+        queue = EventQueue(max_size=2, batch_size=1)
+        assert queue.put(EventAPI.Path.EVENT.value, dict(event_name="a"))  # picked up by the worker and blocked
+        assert not queue.flush(timeout=0.1)
+        assert queue.put(EventAPI.Path.EVENT.value, dict(event_name="b"))
+        assert queue.put(EventAPI.Path.EVENT.value, dict(event_name="c"))
+        assert not queue.put(EventAPI.Path.EVENT.value, dict(event_name="d"))
+        assert queue.n_dropped == 1
+        unblock.set()
+        assert queue.flush(timeout=5)
+
+    assert [payload["event_name"] for payload in posted] == ["a", "b", "c"]
+
+
+def test__event_queue__client_state() -> None:
+    tokens: List[str] = []
+
+    def post(url: str, json: Any, auth: Any, **kwargs: Any) -> None:
+        tokens.append(auth.jwt)
+
+    with patch("requests.Session.post", side_effect=post):
+        queue = EventQueue()
+        with patch("kolena._utils.state.get_token") as get_token:
+            get_token.return_value.access_token = "session-jwt"
+            get_token.return_value.tenant = "session-tenant"
+            with kolena_session("session-token"):
+                queue.put(EventAPI.Path.EVENT.value, dict(event_name="session"))
+        queue.put(EventAPI.Path.EVENT.value, dict(event_name="global"))
+        assert queue.flush(timeout=5)
+
+    assert tokens == ["session-jwt", "jwt-token"]
+
+
+def test__event_queue__failure_ignored() -> None:
+    with patch("requests.Session.post", side_effect=ConnectionError):
+        queue = EventQueue()
+        queue.put(EventAPI.Path.EVENT.value, dict(event_name="a"))
+        assert queue.flush(timeout=5)
+
+
+def test__record_event() -> None:
+    with patch.object(instrumentation._event_queue, "put") as put, patch("kolena._utils.krequests.post") as post:
+        instrumentation.record_event(EventAPI.RecordEventRequest(event_name="event"))
+
+    post.assert_not_called()
+    put.assert_called_once_with(EventAPI.Path.EVENT.value, dict(event_name="event", additional_metadata=None))
+
+
+def test__set_profile() -> None:
+    with patch.object(instrumentation._event_queue, "put") as put, patch(
+        "kolena._utils.krequests.put",
+    ) as krequests_put:
+        instrumentation.set_profile()
+
+    krequests_put.assert_not_called()
+    put.assert_called_once_with(EventAPI.Path.PROFILE.value, None, method="put")
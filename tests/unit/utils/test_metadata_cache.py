@@ -0,0 +1,129 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from typing import List
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+
+from kolena._api.v1.core import TestCase as CoreAPI
+from kolena._utils.consts import KOLENA_METADATA_CACHE_DIR_ENV
+from kolena._utils.consts import KOLENA_METADATA_CACHE_TTL_ENV
+from kolena._utils.metadata_cache import get_metadata_cache
+from kolena._utils.metadata_cache import MetadataCache
+
+ENDPOINT = "/test-case/load-by-name"
+
+
+def _patch_load(calls: List[Any], delay: float = 0) -> Any:
+    def load(endpoint_path: str, request: CoreAPI.LoadByNameRequest) -> Any:
+        time.sleep(delay)
+        calls.append(request)
+        return dict(name=request.name, version=request.version or len(calls))
+
+    return patch("kolena._utils.metadata_cache._load", side_effect=load)
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test__metadata_cache(tmp_path: Path, persistent: bool) -> None:
+    directory: Optional[str] = str(tmp_path) if persistent else None
+    calls: List[Any] = []
+    with _patch_load(calls):
+        cache = MetadataCache(ttl=60, directory=directory)
+        request = CoreAPI.LoadByNameRequest(name="a")
+        assert cache.load(ENDPOINT, request) == dict(name="a", version=1)
+        assert cache.load(ENDPOINT, request) == dict(name="a", version=1)
+        assert cache.load(ENDPOINT, CoreAPI.LoadByNameRequest(name="a", version=3)) == dict(name="a", version=3)
+        assert cache.load(ENDPOINT, CoreAPI.LoadByNameRequest(name="b")) == dict(name="b", version=3)
+        assert len(calls) == 3
+
+        # shared between processes only when persistent
+        MetadataCache(ttl=60, directory=directory).load(ENDPOINT, request)
+        assert len(calls) == (3 if persistent else 4)
+
+        cache.invalidate(ENDPOINT, "a")
+        cache.load(ENDPOINT, request)
+        cache.load(ENDPOINT, CoreAPI.LoadByNameRequest(name="a", version=3))
+        cache.load(ENDPOINT, CoreAPI.LoadByNameRequest(name="b"))
+        assert [r.name for r in calls[-2:]] == ["a", "a"]
+        if persistent:
+            MetadataCache(ttl=60, directory=directory).load(ENDPOINT, request)  # invalidated on disk
+            assert [r.name for r in calls[-2:]] == ["a", "a"]
+
+
+def test__metadata_cache__ttl() -> None:
+    calls: List[Any] = []
+    with _patch_load(calls):
+        cache = MetadataCache(ttl=0.05)
+        request = CoreAPI.LoadByNameRequest(name="a")
+        cache.load(ENDPOINT, request)
+        cache.load(ENDPOINT, request)
+        time.sleep(0.1)
+        cache.load(ENDPOINT, request)
+    assert len(calls) == 2
+
+
+def test__metadata_cache__coalesce() -> None:
+    calls: List[Any] = []
+    cache = MetadataCache(ttl=60)
+    request = CoreAPI.LoadByNameRequest(name="a")
+    results = []
+    with _patch_load(calls, delay=0.05):
+        threads = [threading.Thread(target=lambda: results.append(cache.load(ENDPOINT, request))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert len(calls) == 1
+    assert results == [dict(name="a", version=1)] * 8
+
+
+def test__get_metadata_cache(tmp_path: Path) -> None:
+    with patch.dict(os.environ, {KOLENA_METADATA_CACHE_TTL_ENV: ""}):
+        assert get_metadata_cache() is None
+    with patch.dict(os.environ, {KOLENA_METADATA_CACHE_TTL_ENV: "30", KOLENA_METADATA_CACHE_DIR_ENV: str(tmp_path)}):
+        cache = get_metadata_cache()
+        assert cache is not None and cache.ttl == 30 and cache.directory == str(tmp_path)
+        assert get_metadata_cache() is cache
+
+
+@pytest.mark.parametrize("contents", ["{", "[]", '{"data": {}}', '{"expires_at": "never", "data": {}}'])
+def test__metadata_cache__malformed_entry(tmp_path: Path, contents: str) -> None:
+    calls: List[Any] = []
+    with _patch_load(calls):
+        request = CoreAPI.LoadByNameRequest(name="a")
+        MetadataCache(ttl=60, directory=str(tmp_path)).load(ENDPOINT, request)
+        (entry,) = [path for path in os.listdir(tmp_path) if path.endswith(".json")]
+        with open(os.path.join(tmp_path, entry), "w") as f:
+            f.write(contents)
+
+        assert MetadataCache(ttl=60, directory=str(tmp_path)).load(ENDPOINT, request) == dict(name="a", version=2)
+        assert len(calls) == 2
+        assert MetadataCache(ttl=60, directory=str(tmp_path)).load(ENDPOINT, request) == dict(name="a", version=2)
+        assert len(calls) == 2
+
+
+def test__metadata_cache__key_locks() -> None:
+    calls: List[Any] = []
+    with _patch_load(calls):
+        cache = MetadataCache(ttl=60)
+        for i in range(1000):
+            cache.load(ENDPOINT, CoreAPI.LoadByNameRequest(name=f"test-case-{i}"))
+    # locks are striped over keys rather than created per key
+    assert len(cache._key_locks) <= 64
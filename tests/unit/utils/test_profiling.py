@@ -0,0 +1,102 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import pstats
+import sys
+import tempfile
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from kolena._utils.consts import KOLENA_PROFILE_DIR_ENV
+from kolena._utils.profiling import configure_profiling
+from kolena._utils.profiling import phase
+from kolena._utils.tracing import tracing
+
+
+@pytest.fixture
+def profile_dir() -> Iterator[str]:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        configure_profiling(tmp_dir)
+        try:
+            yield tmp_dir
+        finally:
+            configure_profiling(None)
+
+
+def outer_work() -> int:
+    return sum(range(1000))
+
+
+def inner_work() -> int:
+    return sum(i * i for i in range(1000))
+
+
+def _functions(path: str) -> set:
+    return {func_name for _, _, func_name in pstats.Stats(path).stats.keys()}
+
+
+def test__phase__disabled() -> None:
+    with tracing() as tracer:
+        with phase("a"):
+            ...
+    assert [s.name for s in tracer.spans] == ["a"]
+
+
+def test__phase__profiled(profile_dir: str) -> None:
+    with tracing() as tracer:
+        with phase("outer"):
+            outer_work()
+            for _ in range(2):
+                with phase("inner"):
+                    inner_work()
+
+    assert [s.name for s in tracer.spans] == ["inner", "inner", "outer"]
+    (out_dir,) = os.listdir(profile_dir)
+    assert out_dir.startswith("outer-")
+    out_dir = os.path.join(profile_dir, out_dir)
+    assert sorted(os.listdir(out_dir)) == ["inner.prof", "outer.prof", "summary.txt"]
+
+    # nested phases are excluded from their parents' profiles
+    assert "outer_work" in _functions(os.path.join(out_dir, "outer.prof"))
+    assert "inner_work" not in _functions(os.path.join(out_dir, "outer.prof"))
+    assert "inner_work" in _functions(os.path.join(out_dir, "inner.prof"))
+    inner_stats = pstats.Stats(os.path.join(out_dir, "inner.prof")).stats
+    (n_calls,) = [stat[1] for (_, _, func_name), stat in inner_stats.items() if func_name == "inner_work"]
+    assert n_calls == 2  # accumulated across both occurrences
+
+    with open(os.path.join(out_dir, "summary.txt")) as f:
+        summary = f.read()
+    assert "===== outer =====" in summary and "===== inner =====" in summary
+    assert "inner_work" in summary
+
+
+def test__phase__environment() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with patch.dict("os.environ", {KOLENA_PROFILE_DIR_ENV: tmp_dir}):
+            with phase("a"):
+                outer_work()
+        assert len(os.listdir(tmp_dir)) == 1
+
+
+def test__phase__other_profiler_active(profile_dir: str) -> None:
+    previous = sys.getprofile()
+    sys.setprofile(lambda *args: None)
+    try:
+        with phase("a"):
+            outer_work()
+    finally:
+        sys.setprofile(previous)
+    assert os.listdir(profile_dir) == []
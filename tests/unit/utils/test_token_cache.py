@@ -0,0 +1,113 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import base64
+import json
+import os
+import stat
+import tempfile
+import time
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+import kolena._api.v1.token as API
+from kolena._utils import token_cache
+from kolena._utils.consts import KOLENA_TOKEN_CACHE_DIR_ENV
+from kolena._utils.state import _ClientState
+
+
+def _jwt(expires_at: float) -> str:
+    def encode(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode("utf-8")).decode("utf-8").rstrip("=")
+
+    return f"{encode(dict(alg='HS256'))}.{encode(dict(sub='user', exp=int(expires_at)))}.signature"
+
+
+def _response(expires_in: float) -> API.ValidateResponse:
+    return API.ValidateResponse(
+        tenant="tenant",
+        access_token=_jwt(time.time() + expires_in),
+        token_type="bearer",
+        tenant_telemetry=False,
+    )
+
+
+@pytest.fixture
+def cache_dir() -> Iterator[str]:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = os.path.join(tmp_dir, "tokens")
+        with patch.dict("os.environ", {KOLENA_TOKEN_CACHE_DIR_ENV: directory}):
+            yield directory
+
+
+def test__jwt_expiry() -> None:
+    assert token_cache.jwt_expiry(_jwt(1234567890)) == 1234567890
+    assert token_cache.jwt_expiry("not-a-jwt") is None
+    assert token_cache.jwt_expiry("a.b.c") is None
+
+
+def test__get_token__disabled() -> None:
+    response = _response(3600)
+    with patch("kolena._utils.state.get_token", return_value=response) as get_token:
+        assert token_cache.get_token("api-token") == response
+        assert token_cache.get_token("api-token") == response
+    assert get_token.call_count == 2
+
+
+def test__get_token__cached(cache_dir: str) -> None:
+    response = _response(3600)
+    with patch("kolena._utils.state.get_token", return_value=response) as get_token:
+        assert token_cache.get_token("api-token", base_url="https://a") == response
+        assert token_cache.get_token("api-token", base_url="https://a") == response
+        assert get_token.call_count == 1
+
+        assert token_cache.get_token("other-token", base_url="https://a") == response
+        assert token_cache.get_token("api-token", base_url="https://b") == response
+        assert get_token.call_count == 3
+
+    (path, *_) = [os.path.join(cache_dir, file) for file in os.listdir(cache_dir)]
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert stat.S_IMODE(os.stat(cache_dir).st_mode) == 0o700
+    with open(path) as f:
+        assert "api-token" not in f.read()
+
+
+def test__get_token__expired(cache_dir: str) -> None:
+    expiring, fresh = _response(token_cache.MIN_VALIDITY / 2), _response(3600)
+    with patch("kolena._utils.state.get_token", side_effect=[expiring, fresh]) as get_token:
+        assert token_cache.get_token("api-token", base_url="https://a") == expiring
+        assert token_cache.get_token("api-token", base_url="https://a") == fresh
+        assert token_cache.get_token("api-token", base_url="https://a") == fresh
+    assert get_token.call_count == 2
+
+
+def test__schedule_refresh(cache_dir: str) -> None:
+    expiring, fresh = _response(token_cache.REFRESH_MARGIN / 2), _response(3600)
+    client_state = _ClientState(base_url="https://a", api_token="api-token", jwt_token=expiring.access_token)
+    with patch("kolena._utils.state.get_token", return_value=fresh) as get_token:
+        token_cache.schedule_refresh(client_state)
+        token_cache._refresh_timer.join(timeout=5)
+
+    get_token.assert_called_once()
+    assert client_state.jwt_token == fresh.access_token
+    assert token_cache.TokenCache(cache_dir).load("api-token", "https://a") == fresh
+    token_cache._refresh_timer.cancel()  # next refresh, scheduled ahead of the fresh token's expiry
+
+
+def test__schedule_refresh__disabled() -> None:
+    client_state = _ClientState(base_url="https://a", api_token="api-token", jwt_token=_response(0).access_token)
+    with patch("kolena._utils.state.get_token") as get_token:
+        token_cache.schedule_refresh(client_state)
+    get_token.assert_not_called()
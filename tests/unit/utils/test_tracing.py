@@ -0,0 +1,135 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import contextvars
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from kolena._utils.batched_load import upload_data_frame_chunk
+from kolena._utils.tracing import add_span_hook
+from kolena._utils.tracing import count
+from kolena._utils.tracing import remove_span_hook
+from kolena._utils.tracing import Span
+from kolena._utils.tracing import span
+from kolena._utils.tracing import traced
+from kolena._utils.tracing import tracing
+
+
+def test__span__disabled() -> None:
+    with span("a") as current:
+        count("rows", 10)
+    assert current is None
+
+
+def test__span__nested() -> None:
+    @traced("c")
+    def fn() -> None:
+        count("rows", 2)
+
+    with tracing() as tracer:
+        with span("a", key="value") as a:
+            count("requests")
+            with span("b") as b:
+                count("rows", 3)
+                fn()
+
+    assert [s.name for s in tracer.spans] == ["c", "b", "a"]
+    c = tracer.spans[0]
+    assert c.parent_id == b.span_id and b.parent_id == a.span_id and a.parent_id is None
+    assert a.attributes == dict(key="value")
+    assert a.counters == dict(requests=1) and b.counters == dict(rows=3) and c.counters == dict(rows=2)
+    assert tracer.counters == dict(requests=1, rows=5)
+    assert a.duration >= b.duration >= c.duration
+    assert tracer.summary()["b"] == dict(count=1, duration=b.duration)
+
+    with span("d"):
+        ...
+    assert len(tracer.spans) == 3  # no longer tracing
+
+
+def test__span__threads() -> None:
+    def work(i: int) -> None:
+        with span("work"):
+            count("rows", i)
+
+    with tracing() as tracer:
+        with span("parent") as parent:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = [executor.submit(contextvars.copy_context().run, work, i) for i in range(8)]
+                for future in futures:
+                    future.result()
+
+    work_spans = [s for s in tracer.spans if s.name == "work"]
+    assert len(work_spans) == 8
+    assert all(s.parent_id == parent.span_id for s in work_spans)
+    assert tracer.counters["rows"] == sum(range(8))
+
+
+def test__span__hook() -> None:
+    completed: List[Span] = []
+    add_span_hook(completed.append)
+    try:
+        with span("a"):
+            count("bytes", 100)
+    finally:
+        remove_span_hook(completed.append)
+
+    assert len(completed) == 1
+    assert completed[0].name == "a" and completed[0].counters == dict(bytes=100)
+
+
+def test__tracer__export() -> None:
+    with tracing() as tracer:
+        with span("a", test_case="tc"):
+            count("rows", 5)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tracer.export(os.path.join(tmp_dir, "trace.json"))
+        with open(os.path.join(tmp_dir, "trace.json")) as f:
+            exported = json.load(f)
+        assert exported["counters"] == dict(rows=5)
+        assert exported["spans"][0]["name"] == "a"
+
+        tracer.export(os.path.join(tmp_dir, "chrome.json"), format="chrome")
+        with open(os.path.join(tmp_dir, "chrome.json")) as f:
+            chrome = json.load(f)
+        (event,) = chrome["traceEvents"]
+        assert event["name"] == "a" and event["ph"] == "X"
+        assert event["args"] == dict(test_case="tc", rows=5)
+
+        with pytest.raises(ValueError):
+            tracer.export(os.path.join(tmp_dir, "trace.txt"), format="txt")
+
+
+def test__upload_data_frame_chunk__counters() -> None:
+    signed_url_response = MagicMock(json=MagicMock(return_value=dict(signed_url="https://signed.url")))
+    get = MagicMock(side_effect=[ConnectionError(), signed_url_response])
+    with patch("kolena._utils.krequests.get", get), patch("requests.put"):
+        with patch("kolena._utils.krequests.raise_for_status"):
+            with patch("kolena._utils.krequests.get_connection_args", return_value={}):
+                with tracing() as tracer:
+                    upload_data_frame_chunk(pd.DataFrame(dict(a=[1, 2, 3])), "uuid")
+
+    assert [s.name for s in tracer.spans] == ["encode_parquet", "upload_chunk", "encode_parquet", "upload_chunk"]
+    assert tracer.counters["retries"] == 1
+    assert tracer.counters["requests"] == 4
+    assert tracer.counters["rows"] == 6
+    assert tracer.counters["bytes"] > 0
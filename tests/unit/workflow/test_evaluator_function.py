@@ -23,6 +23,7 @@ from kolena.workflow import Image
 from kolena.workflow import Inference
 from kolena.workflow import MetricsTestCase
 from kolena.workflow import MetricsTestSample
+from kolena.workflow.evaluator_function import _TestCaseIndex
 from kolena.workflow.evaluator_function import _TestCases
 from kolena.workflow.evaluator_function import EvaluationResults
 
@@ -148,3 +149,18 @@ def test__evaluation_results() -> None:
     assert got.metrics_test_case == test_case_metrics
     assert got.plots_test_case == []
     assert got.metrics_test_suite is None
+
+
+def test__test_case_index() -> None:
+    test_samples = [DummyTestSample(locator=f"s3://dummy/{i}.jpg") for i in range(4)]
+    test_case_index = _TestCaseIndex()
+    for ts in test_samples[:3]:
+        test_case_index.add(1, ts)
+    for ts in test_samples[1:]:
+        test_case_index.add(2, ts)
+
+    chunk = [test_samples[3], test_samples[0], DummyTestSample(locator="s3://dummy/unknown.jpg"), test_samples[2]]
+    assert test_case_index.group(chunk) == {1: [1, 3], 2: [0, 3]}
+    assert test_case_index.group([]) == {}
+    # test samples are indexed by fixed-size digests rather than by their serialized form
+    assert all(isinstance(key, bytes) and len(key) == 16 for key in test_case_index._test_case_ids.keys())
@@ -0,0 +1,119 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from kolena.workflow._journal import _digest
+from kolena.workflow._journal import function_fingerprint
+from kolena.workflow._journal import InferenceJournal
+
+
+def _records(start: int, stop: int) -> list:
+    return [(f'{{"id": {i}}}', f'{{"label": {i % 2}}}') for i in range(start, stop)]
+
+
+def test__inference_journal(tmp_path: Path) -> None:
+    directory = str(tmp_path / "journal")
+    journal = InferenceJournal(directory, flush_size=3)
+    for record in _records(0, 7):
+        journal.append(*record)
+    assert len(journal) == 7
+    assert '{"id": 6}' in journal
+    assert len(os.listdir(directory)) == 2  # last record not yet flushed
+
+    # unflushed records are lost on reopen
+    reopened = InferenceJournal(directory, flush_size=3)
+    assert len(reopened) == 6
+    assert '{"id": 6}' not in reopened
+    assert [tuple(row) for df in reopened.iter_segments() for row in df.itertuples(index=False)] == _records(0, 6)
+
+    journal.flush()
+    reopened = InferenceJournal(directory)
+    assert len(reopened) == 7
+    assert [tuple(row) for df in reopened.iter_segments() for row in df.itertuples(index=False)] == _records(0, 7)
+
+    reopened.clear()
+    assert len(reopened) == 0
+    assert not os.path.exists(directory)
+
+
+def test__inference_journal__partial_segment(tmp_path: Path) -> None:
+    directory = str(tmp_path / "journal")
+    journal = InferenceJournal(directory, flush_size=2)
+    for record in _records(0, 2):
+        journal.append(*record)
+    partial_segment = os.path.join(directory, "segment-99999999999999999999-1.parquet.tmp")
+    with open(partial_segment, "wb") as f:
+        f.write(b"PAR1")
+
+    reopened = InferenceJournal(directory)
+    assert len(reopened) == 2
+    assert not os.path.exists(partial_segment)
+
+
+def test__inference_journal__invalid_flush_size(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        InferenceJournal(str(tmp_path), flush_size=0)
+
+
+def test__inference_journal__iter_records(tmp_path: Path) -> None:
+    directory = str(tmp_path / "journal")
+    journal = InferenceJournal(directory, flush_size=2)
+    for record in _records(0, 5) + _records(1, 2):
+        journal.append(*record)
+    journal.flush()
+
+    reopened = InferenceJournal(directory)
+    digests = {_digest(test_sample) for test_sample, _ in _records(1, 3) + _records(7, 8)}
+    assert list(reopened.iter_records(digests)) == _records(1, 3)
+    assert reopened.n_replayed == 2
+
+
+def test__function_fingerprint() -> None:
+    def infer(x: int) -> int:
+        return x + 1
+
+    def infer_changed(x: int) -> int:
+        return x + 2
+
+    assert function_fingerprint(infer) == function_fingerprint(infer)
+    assert function_fingerprint(infer) != function_fingerprint(infer_changed)
+    assert function_fingerprint(None) == function_fingerprint(None)
+    # same qualified name and bytecode, different constants
+    assert function_fingerprint(lambda x: x + 1) != function_fingerprint(lambda x: x + 2)
+
+
+def test__function_fingerprint__hash_seed(tmp_path: Path) -> None:
+    # set constants iterate in hash-randomized order, which must not affect the fingerprint across processes
+    module = tmp_path / "infer_module.py"
+    module.write_text(
+        "def infer(x):\n"
+        "    return x in {'alpha', 'beta', 'gamma', 'delta'} or x in ({'epsilon', 'zeta', 'eta'}, 1)\n",
+    )
+    script = (
+        "from infer_module import infer\n"
+        "from kolena.workflow._journal import function_fingerprint\n"
+        "print(function_fingerprint(infer))\n"
+    )
+
+    def fingerprint(seed: int) -> str:
+        env = {**os.environ, "PYTHONHASHSEED": str(seed)}
+        env["PYTHONPATH"] = os.pathsep.join([str(tmp_path), env.get("PYTHONPATH", "")])
+        return subprocess.check_output([sys.executable, "-c", script], env=env, text=True).strip()
+
+    assert len({fingerprint(seed) for seed in range(4)}) == 1
@@ -0,0 +1,476 @@
+# Copyright 2021-2023 Kolena Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import itertools
+from pathlib import Path
+from typing import Any
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from pydantic.dataclasses import dataclass
+
+from kolena._api.v1.batched_load import BatchedLoad
+from kolena._api.v1.core import TestCase as CoreAPI
+from kolena._utils.serde import as_serialized_json
+from kolena._utils.tracing import tracing
+from kolena.errors import InputValidationError
+from kolena.workflow import define_workflow
+from kolena.workflow import EvaluatorConfiguration
+from kolena.workflow import GroundTruth
+from kolena.workflow import Image
+from kolena.workflow import Inference
+from kolena.workflow import MetricsTestCase
+from kolena.workflow import MetricsTestSample
+from kolena.workflow import MetricsTestSuite
+from kolena.workflow import StreamingEvaluatorFunction
+from kolena.workflow import TestCaseReducer
+from kolena.workflow import TestRun
+from kolena.workflow._journal import InferenceJournal
+from kolena.workflow.evaluator_function import _TestCaseIndex
+
+
+@dataclass(frozen=True)
+class DummyTestSample(Image):
+    value: int
+
+
+@dataclass(frozen=True)
+class DummyGroundTruth(GroundTruth):
+    label: bool
+
+
+@dataclass(frozen=True)
+class DummyInference(Inference):
+    label: bool
+
+
+@dataclass(frozen=True)
+class DummyMetricsTestSample(MetricsTestSample):
+    is_correct: bool
+
+
+@dataclass(frozen=True)
+class DummyMetricsTestCase(MetricsTestCase):
+    n_correct: int
+    n_total: int
+
+
+@dataclass(frozen=True)
+class DummyMetricsTestSuite(MetricsTestSuite):
+    n_test_cases: int
+
+
+@dataclass(frozen=True)
+class DummyConfiguration(EvaluatorConfiguration):
+    invert: bool
+
+    def display_name(self) -> str:
+        return f"invert={self.invert}"
+
+
+DUMMY_WORKFLOW, TestCase, TestSuite, Model = define_workflow(
+    name="dummy-streaming-workflow",
+    test_sample_type=DummyTestSample,
+    ground_truth_type=DummyGroundTruth,
+    inference_type=DummyInference,
+)
+
+
+class CountingReducer(TestCaseReducer):
+    def __init__(self) -> None:
+        self.n_correct = 0
+        self.n_total = 0
+        self.n_updates = 0
+
+    def update(
+        self,
+        test_samples: List[DummyTestSample],
+        ground_truths: List[DummyGroundTruth],
+        inferences: List[DummyInference],
+        metrics_test_sample: List[DummyMetricsTestSample],
+    ) -> None:
+        self.n_correct += sum(mts.is_correct for mts in metrics_test_sample)
+        self.n_total += len(metrics_test_sample)
+        self.n_updates += 1
+
+    def compute(self) -> DummyMetricsTestCase:
+        return DummyMetricsTestCase(n_correct=self.n_correct, n_total=self.n_total)
+
+
+class DummyStreamingEvaluator(StreamingEvaluatorFunction):
+    def compute_test_sample_metrics(
+        self,
+        test_samples: List[DummyTestSample],
+        ground_truths: List[DummyGroundTruth],
+        inferences: List[DummyInference],
+        configuration: Optional[DummyConfiguration] = None,
+    ) -> List[DummyMetricsTestSample]:
+        invert = configuration is not None and configuration.invert
+        return [
+            DummyMetricsTestSample(is_correct=(gt.label == inf.label) != invert)
+            for gt, inf in zip(ground_truths, inferences)
+        ]
+
+    def reducer(self, test_case: TestCase, configuration: Optional[DummyConfiguration] = None) -> TestCaseReducer:
+        return CountingReducer()
+
+    def compute_test_suite_metrics(
+        self,
+        test_suite: TestSuite,
+        metrics: List[Tuple[TestCase, MetricsTestCase]],
+        configuration: Optional[DummyConfiguration] = None,
+    ) -> DummyMetricsTestSuite:
+        return DummyMetricsTestSuite(n_test_cases=len(metrics))
+
+
+def _test_case(test_case_id: int) -> TestCase:
+    return TestCase._create_from_data(
+        CoreAPI.EntityData(
+            id=test_case_id,
+            name=f"test_case_{test_case_id}",
+            version=1,
+            description="",
+            workflow=DUMMY_WORKFLOW.name,
+        ),
+    )
+
+
+def _test_run(test_cases: List[TestCase], configurations: List[EvaluatorConfiguration]) -> TestRun:
+    test_suite = TestSuite.__new__(TestSuite)
+    object.__setattr__(test_suite, "_id", 1)
+    object.__setattr__(test_suite, "name", "test_suite")
+    object.__setattr__(test_suite, "test_cases", test_cases)
+    model = Model.__new__(Model)
+    object.__setattr__(model, "name", "model")
+    test_run = TestRun.__new__(TestRun)
+    object.__setattr__(test_run, "_id", 1)
+    object.__setattr__(test_run, "model", model)
+    object.__setattr__(test_run, "test_suite", test_suite)
+    object.__setattr__(test_run, "configurations", configurations)
+    return test_run
+
+
+@pytest.mark.parametrize("configurations", [[], [DummyConfiguration(invert=False), DummyConfiguration(invert=True)]])
+def test__perform_streaming_evaluation(configurations: List[DummyConfiguration]) -> None:
+    test_case_a, test_case_b = _test_case(1), _test_case(2)
+    test_samples = [DummyTestSample(locator=f"s3://dummy/{i}.jpg", value=i) for i in range(10)]
+    ground_truths = [DummyGroundTruth(label=i % 2 == 0) for i in range(10)]
+    inferences = [DummyInference(label=i % 3 == 0) for i in range(10)]
+
+    test_case_index = _TestCaseIndex()
+    for ts in test_samples[:6]:
+        test_case_index.add(test_case_a._id, ts)
+    for ts in test_samples[4:]:
+        test_case_index.add(test_case_b._id, ts)
+
+    def iter_batch(batch_size: int) -> Iterator[Tuple[List[Any], List[Any], List[Any]]]:
+        for i in range(0, len(test_samples), batch_size):
+            yield test_samples[i : i + batch_size], ground_truths[i : i + batch_size], inferences[i : i + batch_size]
+
+    evaluator = DummyStreamingEvaluator(chunk_size=3)
+    test_run = _test_run([test_case_a, test_case_b], configurations)
+    uuids = itertools.count()
+    with patch.object(TestRun, "_iter_all_inferences_batch", side_effect=iter_batch), patch.object(
+        TestRun,
+        "_load_test_case_index",
+        return_value=test_case_index,
+    ), patch(
+        "kolena._utils.batched_load.init_upload",
+        side_effect=lambda: BatchedLoad.InitiateUploadResponse(uuid=f"uuid-{next(uuids)}"),
+    ), patch(
+        "kolena._utils.batched_load.upload_data_frame_chunk",
+    ) as upload_patched, patch.object(
+        TestRun,
+        "_complete_test_sample_metrics_upload",
+    ) as complete_patched, patch.object(
+        TestRun,
+        "_upload_test_case_metrics",
+    ) as test_case_metrics_patched, patch.object(
+        TestRun,
+        "_upload_test_case_plots",
+        new=MagicMock(),
+    ), patch.object(
+        TestRun,
+        "_upload_test_suite_metrics",
+    ) as test_suite_metrics_patched:
+        test_run._perform_streaming_evaluation(evaluator)
+
+    n_configurations = max(len(configurations), 1)
+    # chunks are accumulated into a single part and upload per configuration
+    assert upload_patched.call_count == n_configurations
+    assert len({call.args[1] for call in upload_patched.call_args_list}) == n_configurations
+    assert sum(len(call.args[0]) for call in upload_patched.call_args_list) == 10 * n_configurations
+    assert complete_patched.call_count == n_configurations
+    assert {call.args[0] for call in complete_patched.call_args_list} == {
+        call.args[1] for call in upload_patched.call_args_list
+    }
+
+    test_case_metrics = test_case_metrics_patched.call_args.args[0]
+    is_correct = [gt.label == inf.label for gt, inf in zip(ground_truths, inferences)]
+    for config in configurations or [None]:
+        invert = config is not None and config.invert
+        expected_a = sum(c != invert for c in is_correct[:6])
+        expected_b = sum(c != invert for c in is_correct[4:])
+        assert test_case_metrics[1][config] == DummyMetricsTestCase(n_correct=expected_a, n_total=6)
+        assert test_case_metrics[2][config] == DummyMetricsTestCase(n_correct=expected_b, n_total=6)
+    test_suite_metrics = test_suite_metrics_patched.call_args.args[0]
+    assert test_suite_metrics == {config: DummyMetricsTestSuite(n_test_cases=2) for config in configurations or [None]}
+
+
+def test__perform_streaming_evaluation__mismatched_metrics() -> None:
+    class BadStreamingEvaluator(DummyStreamingEvaluator):
+        def compute_test_sample_metrics(self, *args: Any, **kwargs: Any) -> List[DummyMetricsTestSample]:
+            return []
+
+    test_samples = [DummyTestSample(locator="s3://dummy/0.jpg", value=0)]
+    batch = (test_samples, [DummyGroundTruth(label=True)], [DummyInference(label=True)])
+    test_run = _test_run([_test_case(1)], [])
+    with patch.object(TestRun, "_iter_all_inferences_batch", return_value=iter([batch])), patch.object(
+        TestRun,
+        "_load_test_case_index",
+        return_value=_TestCaseIndex(),
+    ):
+        with pytest.raises(ValueError):
+            test_run._perform_streaming_evaluation(BadStreamingEvaluator())
+
+
+def test__streaming_evaluator_function__invalid_chunk_size() -> None:
+    with pytest.raises(ValueError):
+        DummyStreamingEvaluator(chunk_size=0)
+
+
+def _test_run_with_model(infer: Any = None, infer_batch: Any = None) -> TestRun:
+    test_run = _test_run([], [])
+    object.__setattr__(test_run.model, "infer", infer)
+    object.__setattr__(test_run.model, "infer_batch", infer_batch)
+    return test_run
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+@pytest.mark.parametrize("batch_size", [None, 1, 3])
+def test__iter_inferences__infer(batch_size: Optional[int], concurrency: int) -> None:
+    test_samples = [DummyTestSample(locator=f"s3://dummy/{i}.jpg", value=i) for i in range(10)]
+    test_run = _test_run_with_model(infer=lambda ts: DummyInference(label=ts.value % 2 == 0))
+    with patch.object(TestRun, "iter_test_samples", return_value=iter(test_samples)):
+        got = list(test_run._iter_inferences(batch_size, concurrency))
+    assert got == [(ts, DummyInference(label=ts.value % 2 == 0)) for ts in test_samples]
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+@pytest.mark.parametrize("batch_size", [None, 4])
+def test__iter_inferences__infer_batch(batch_size: Optional[int], concurrency: int) -> None:
+    test_samples = [DummyTestSample(locator=f"s3://dummy/{i}.jpg", value=i) for i in range(10)]
+    batch_sizes = []
+
+    def infer_batch(batch: List[DummyTestSample]) -> List[DummyInference]:
+        batch_sizes.append(len(batch))
+        return [DummyInference(label=ts.value % 2 == 0) for ts in batch]
+
+    test_run = _test_run_with_model(infer_batch=infer_batch)
+    with patch.object(TestRun, "iter_test_samples", return_value=iter(test_samples)):
+        got = list(test_run._iter_inferences(batch_size, concurrency))
+    assert got == [(ts, DummyInference(label=ts.value % 2 == 0)) for ts in test_samples]
+    assert sorted(batch_sizes, reverse=True) == ([10] if batch_size is None else [4, 4, 2])
+
+
+def test__iter_inferences__coroutine() -> None:
+    test_samples = [DummyTestSample(locator=f"s3://dummy/{i}.jpg", value=i) for i in range(10)]
+
+    async def infer(ts: DummyTestSample) -> DummyInference:
+        await asyncio.sleep(0)
+        return DummyInference(label=ts.value % 2 == 0)
+
+    test_run = _test_run_with_model(infer=infer)
+    with patch.object(TestRun, "iter_test_samples", return_value=iter(test_samples)):
+        got = list(test_run._iter_inferences(3, 2))
+    assert got == [(ts, DummyInference(label=ts.value % 2 == 0)) for ts in test_samples]
+
+
+def test__iter_inferences__invalid() -> None:
+    test_samples = [DummyTestSample(locator=f"s3://dummy/{i}.jpg", value=i) for i in range(3)]
+    with patch.object(TestRun, "iter_test_samples", return_value=iter(test_samples)):
+        with pytest.raises(ValueError):  # missing infer
+            list(_test_run_with_model()._iter_inferences(None, 1))
+
+    with patch.object(TestRun, "iter_test_samples", return_value=iter([])):
+        assert list(_test_run_with_model()._iter_inferences(None, 1)) == []  # no failure when infer unnecessary
+
+    with patch.object(TestRun, "iter_test_samples", return_value=iter(test_samples)):
+        with pytest.raises(ValueError):  # wrong number of inferences
+            list(_test_run_with_model(infer_batch=lambda batch: batch[1:])._iter_inferences(None, 1))
+
+    for batch_size, concurrency in [(0, 1), (1, 0)]:
+        with pytest.raises(InputValidationError):
+            list(_test_run_with_model(infer=lambda ts: ts)._iter_inferences(batch_size, concurrency))
+
+
+@pytest.mark.parametrize("chunk_bytes,expected_chunks", [(1_000_000, 1), (1, 10)])
+def test__upload_inferences_streaming(chunk_bytes: int, expected_chunks: int) -> None:
+    test_samples = [DummyTestSample(locator=f"s3://dummy/{i}.jpg", value=i) for i in range(10)]
+    inferences = [(ts, DummyInference(label=ts.value % 2 == 0)) for ts in test_samples]
+    test_run = _test_run([], [])
+    with patch("kolena.workflow.test_run.UPLOAD_CHUNK_BYTES", chunk_bytes), patch(
+        "kolena._utils.batched_load.init_upload",
+        return_value=BatchedLoad.InitiateUploadResponse(uuid="uuid"),
+    ) as init_patched, patch(
+        "kolena._utils.batched_load.upload_data_frame_chunk",
+    ) as upload_patched, patch.object(
+        TestRun,
+        "_complete_inferences_upload",
+    ) as complete_patched:
+        assert test_run._upload_inferences_streaming(iter(inferences)) == 10
+
+    init_patched.assert_called_once()
+    assert upload_patched.call_count == expected_chunks
+    assert {call.args[1] for call in upload_patched.call_args_list} == {"uuid"}
+    uploaded = [row for call in upload_patched.call_args_list for row in call.args[0].itertuples(index=False)]
+    assert [row.test_sample for row in uploaded] == [as_serialized_json(ts._to_dict()) for ts in test_samples]
+    assert [row.inference for row in uploaded] == [as_serialized_json(inf._to_dict()) for _, inf in inferences]
+    complete_patched.assert_called_once_with("uuid")
+
+
+def test__upload_inferences_streaming__failure() -> None:
+    def iter_inferences() -> Iterator[Tuple[DummyTestSample, DummyInference]]:
+        yield DummyTestSample(locator="s3://dummy/0.jpg", value=0), DummyInference(label=True)
+        raise RuntimeError("inference failed")
+
+    test_run = _test_run([], [])
+    with patch("kolena.workflow.test_run.UPLOAD_CHUNK_BYTES", 1), patch(
+        "kolena._utils.batched_load.init_upload",
+        return_value=BatchedLoad.InitiateUploadResponse(uuid="uuid"),
+    ), patch("kolena._utils.batched_load.upload_data_frame_chunk"), patch.object(
+        TestRun,
+        "_complete_inferences_upload",
+    ) as complete_patched:
+        with pytest.raises(RuntimeError):
+            test_run._upload_inferences_streaming(iter_inferences())
+
+    # nothing is committed when inference fails, such that the test run can be resumed
+    complete_patched.assert_not_called()
+
+
+def test__upload_inferences_streaming__empty() -> None:
+    with patch("kolena._utils.batched_load.init_upload") as init_patched, patch.object(
+        TestRun,
+        "_complete_inferences_upload",
+    ) as complete_patched:
+        assert _test_run([], [])._upload_inferences_streaming(iter([])) == 0
+    init_patched.assert_not_called()
+    complete_patched.assert_not_called()
+
+
+def test__iter_inference_records__journal(tmp_path: Path) -> None:
+    test_samples = [DummyTestSample(locator=f"s3://dummy/{i}.jpg", value=i) for i in range(10)]
+    inferred = []
+    preempted = []
+
+    def infer(ts: DummyTestSample) -> DummyInference:
+        if ts.value == 7 and len(preempted) == 0:
+            preempted.append(ts.value)
+            raise RuntimeError("preempted")
+        inferred.append(ts.value)
+        return DummyInference(label=ts.value % 2 == 0)
+
+    journal_dir = str(tmp_path / "journal")
+    test_run = _test_run_with_model(infer=infer)
+    with patch.object(TestRun, "iter_test_samples", side_effect=lambda: iter(test_samples)):
+        with pytest.raises(RuntimeError):
+            list(test_run._iter_inference_records(None, 1, InferenceJournal(journal_dir, flush_size=100)))
+        assert inferred == list(range(7))
+
+        records = list(test_run._iter_inference_records(None, 1, InferenceJournal(journal_dir)))
+
+    assert inferred == list(range(10))  # journaled test samples are not inferred again
+    expected = [(ts, DummyInference(label=ts.value % 2 == 0)) for ts in test_samples]
+    # journaled inferences are replayed after inference on the remaining test samples
+    expected = expected[7:] + expected[:7]
+    assert records == [(as_serialized_json(ts._to_dict()), as_serialized_json(inf._to_dict())) for ts, inf in expected]
+
+
+def test__iter_inference_records__journal__uploaded(tmp_path: Path) -> None:
+    test_samples = [DummyTestSample(locator=f"s3://dummy/{i}.jpg", value=i) for i in range(10)]
+    inferred = []
+
+    def infer(ts: DummyTestSample) -> DummyInference:
+        inferred.append(ts.value)
+        return DummyInference(label=ts.value % 2 == 0)
+
+    journal_dir = str(tmp_path / "journal")
+    test_run = _test_run_with_model(infer=infer)
+    with patch.object(TestRun, "iter_test_samples", side_effect=lambda: iter(test_samples)):
+        list(test_run._iter_inference_records(None, 1, InferenceJournal(journal_dir)))
+
+    # e.g. the process died after uploading but before clearing the journal: only remaining test samples are replayed
+    journal = InferenceJournal(journal_dir)
+    with patch.object(TestRun, "iter_test_samples", side_effect=lambda: iter(test_samples[8:])):
+        records = list(test_run._iter_inference_records(None, 1, journal))
+    assert inferred == list(range(10))
+    assert records == [
+        (as_serialized_json(ts._to_dict()), as_serialized_json(DummyInference(label=ts.value % 2 == 0)._to_dict()))
+        for ts in test_samples[8:]
+    ]
+    assert journal.n_replayed == 2
+
+
+def test__open_journal(tmp_path: Path) -> None:
+    def infer(ts: DummyTestSample) -> DummyInference:
+        return DummyInference(label=True)
+
+    def infer_changed(ts: DummyTestSample) -> DummyInference:
+        return DummyInference(label=False)
+
+    test_run, test_run_changed = _test_run_with_model(infer=infer), _test_run_with_model(infer=infer_changed)
+    object.__setattr__(test_run, "reset", False)
+    object.__setattr__(test_run_changed, "reset", False)
+    journal = test_run._open_journal(str(tmp_path))
+    journal.append('{"id": 0}', '{"label": true}')
+    journal.flush()
+    assert len(test_run._open_journal(str(tmp_path))) == 1
+    assert len(test_run_changed._open_journal(str(tmp_path))) == 0
+
+    object.__setattr__(test_run, "reset", True)
+    assert len(test_run._open_journal(str(tmp_path))) == 0
+    object.__setattr__(test_run, "reset", False)
+    assert len(test_run._open_journal(str(tmp_path))) == 0
+
+
+def test__iter_test_samples__lazy() -> None:
+    df_batch = pd.DataFrame(
+        dict(
+            test_sample=[dict(locator=f"s3://dummy/{i}.jpg", value=i) for i in range(5)],
+            test_sample_metadata=[{} for _ in range(5)],
+        ),
+    )
+    hydrated = []
+    from_dict = DummyTestSample._from_dict
+
+    def hydrate(record: Any) -> DummyTestSample:
+        hydrated.append(record["value"])
+        return from_dict(record)
+
+    test_run = _test_run([], [])
+    with patch.object(TestRun, "_iter_test_samples_batch", return_value=iter([df_batch])):
+        with patch.object(DummyTestSample, "_from_dict", side_effect=hydrate):
+            with tracing() as tracer:
+                test_samples = test_run.iter_test_samples()
+                assert next(test_samples).value == 0
+                assert hydrated == [0]  # test samples are hydrated as they are consumed rather than per batch
+                assert [ts.value for ts in test_samples] == [1, 2, 3, 4]
+    assert tracer.counters["hydrated_rows"] == 5